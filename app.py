@@ -1,6 +1,9 @@
 ﻿import os, sys, logging
+from importlib.machinery import SourceFileLoader
 from pathlib import Path
 
+import streamlit as st
+
 def _project_root():
     p = Path(__file__).resolve()
     for _ in range(8):
@@ -19,11 +22,21 @@ os.environ.setdefault("HEALTH_DIR", str(ROOT/"shared_data"/"health"))
 
 logging.basicConfig(level=logging.INFO)
 
+@st.cache_resource(show_spinner=False)
+def _compiled(path: str, mtime_ns: int):
+    """
+    Code object of app_old.py, built once per source change.
+
+    Streamlit re-runs this script on every interaction; the loader reads
+    __pycache__ bytecode when it is current instead of compiling ~6k lines.
+    """
+    return SourceFileLoader("app_old", path).get_code("app_old")
+
 target = ROOT / "app_old.py"
 if not target.exists():
     raise SystemExit(f"[FATAL] app_old.py not found: {target}")
 
-code = compile(target.read_text(encoding="utf-8"), str(target), "exec")
+code = _compiled(str(target), target.stat().st_mtime_ns)
 globals_dict = {
     "__name__": "__main__",
     "__file__": str(target),
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Audit write benchmark: daily JSON array rewrite vs the segment journal
+
+Appends --entries audit entries the way AuditableSignalManager._audit_log
+used to (load audit_<day>.json, append, rewrite with indent=2) and via
+shared.segment_journal.SegmentJournal, then times lookups of an order by
+client_order_id and the most recent 100 records:
+
+- array:   json.load of the whole file, then a scan
+- journal: in-memory offset index, one seek / tail read
+
+    python benchmarks/bench_audit_journal.py [--entries 1000] [--lookups 1000]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def timed(func, repeat: int = 1) -> float:
+    """Microseconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from shared.segment_journal import SegmentJournal
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench_audit_journal_"))
+    entries = [{
+        "timestamp": 1_792_358_000.0 + i,
+        "action": "ORDER_STATUS_UPDATED",
+        "record_type": "OrderIntentRecord",
+        "record_id": f"{i:016x}",
+        "details": {"client_order_id": f"{i:016x}", "symbol": "BTCUSDT", "side": "BUY",
+                    "quantity": 0.001, "price": 65000.0, "status": "FILLED"},
+    } for i in range(args.entries)]
+
+    audit_file = tmp / "audit_20741.json"
+
+    def rewrite(entry):
+        logs = []
+        if audit_file.exists():
+            with open(audit_file, "r", encoding="utf-8") as f:
+                logs = json.load(f)
+        logs.append(entry)
+        with open(audit_file, "w", encoding="utf-8") as f:
+            json.dump(logs, f, indent=2, ensure_ascii=False)
+
+    journal = SegmentJournal(tmp / "journal", prefix="audit")
+
+    print(f"{args.entries} audit entries")
+    print(f"{'case':<28} {'total ms':>10} {'us/op':>10}")
+    for case, write in (("append: array rewrite", rewrite),
+                        ("append: journal", lambda e: journal.append(e["record_id"], e, ts=e["timestamp"]))):
+        start = time.perf_counter()
+        for entry in entries:
+            write(entry)
+        elapsed = time.perf_counter() - start
+        print(f"{case:<28} {elapsed * 1e3:>10.1f} {elapsed / len(entries) * 1e6:>10.1f}")
+
+    ids = [random.choice(entries)["record_id"] for _ in range(args.lookups)]
+
+    def array_lookup():
+        with open(audit_file, "r", encoding="utf-8") as f:
+            logs = json.load(f)
+        wanted = ids[0]
+        return next(e for e in reversed(logs) if e["record_id"] == wanted)
+
+    def array_recent():
+        with open(audit_file, "r", encoding="utf-8") as f:
+            return json.load(f)[-100:]
+
+    lookup_iter = iter(ids * 2)
+    cases = {
+        "get by id: array": (array_lookup, 20),
+        "get by id: journal": (lambda: journal.get(next(lookup_iter)), args.lookups),
+        "recent 100: array": (array_recent, 20),
+        "recent 100: journal": (lambda: journal.recent(100), 200),
+    }
+    for case, (func, repeat) in cases.items():
+        print(f"{case:<28} {'':>10} {timed(func, repeat):>10.1f}")
+    print(f"journal stats: {journal.stats()}")
+    journal.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Backtest engine benchmark
+
+Generates synthetic 1m random-walk closes (default: 40 symbols x 365 days)
+and times the vectorized replay. With --jsonl the bars are also written as
+history files so the parse and .npz cache paths are timed too.
+
+    python benchmarks/bench_backtest.py --symbols 40 --days 365 [--jsonl]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+
+from coin_quant.backtest.data import PriceSeries, load_klines
+from coin_quant.backtest.engine import BacktestConfig, run_backtest
+
+MINUTE_MS = 60_000
+
+
+def synthetic_series(n_symbols: int, days: int, seed: int = 1):
+    rng = np.random.default_rng(seed)
+    bars = days * 24 * 60
+    ts = np.arange(bars, dtype=np.int64) * MINUTE_MS + 1_700_000_000_000
+    series = {}
+    for i in range(n_symbols):
+        symbol = f"SYM{i:03d}USDT"
+        log_returns = rng.normal(0, 0.0015, bars)
+        prices = 100.0 * np.exp(np.cumsum(log_returns))
+        series[symbol] = PriceSeries(symbol, ts, prices)
+    return series
+
+
+def write_history(series, history_dir: Path):
+    history_dir.mkdir(parents=True, exist_ok=True)
+    for symbol, s in series.items():
+        with open(history_dir / f"{symbol}_1m.jsonl", "w") as f:
+            for t, c in zip(s.timestamps.tolist(), s.prices.tolist()):
+                f.write(json.dumps({"symbol": symbol, "timestamp": t, "close": c}) + "\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=40)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--jsonl", action="store_true", help="Also time JSONL parse and cache load")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    series = synthetic_series(args.symbols, args.days)
+    bars = sum(len(s) for s in series.values())
+    print(f"generated {bars:,} bars in {time.perf_counter() - started:.2f}s")
+
+    if args.jsonl:
+        with tempfile.TemporaryDirectory() as tmp:
+            history_dir = Path(tmp)
+            write_history(series, history_dir)
+            for label in ("parse", "cached"):
+                started = time.perf_counter()
+                series = {s: load_klines(s, history_dir) for s in series}
+                print(f"load ({label}): {time.perf_counter() - started:.2f}s")
+
+    result = run_backtest(series, BacktestConfig())
+    summary = result.summary()
+    print(f"backtest: {result.elapsed_sec:.2f}s "
+          f"({bars / max(result.elapsed_sec, 1e-9) / 1e6:.1f}M bars/s), "
+          f"{summary['trades']:,} trades, net {summary['net_pnl']:.2f}, "
+          f"max drawdown {summary['max_drawdown_pct']:.2f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Circuit breaker benchmark: hot-path cost and trip latency
+
+- is_trading_allowed(): the state-word read vs the previous checks
+  (E-STOP flag + state enum comparison)
+- record_exchange_error() below the threshold (ring counter add)
+- trip latency on an error burst: time from the call that crosses the
+  threshold until a spinning reader thread sees trading blocked (the 5 s
+  monitor poll used to bound this at up to 5 s)
+- feeder lag trip latency: time past the heartbeat deadline until trading
+  is blocked by the monitor thread
+
+Runs in a temporary working directory (guardrails/StateBus write shared_data/).
+
+    python benchmarks/bench_circuit_breaker.py [--calls 1000000] [--trials 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+
+def per_call_ns(func, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    parser.add_argument("--trials", type=int, default=20)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    os.chdir(tempfile.mkdtemp(prefix="bench_circuit_breaker_"))
+    import logging
+    logging.disable(logging.CRITICAL)
+    from shared.circuit_breaker import CircuitBreaker, CircuitBreakerState
+
+    cb = CircuitBreaker()
+    cb.record_heartbeat("feeder")
+
+    def previous_check():
+        if cb.estop_status.active:
+            return False
+        if cb.cb_status.state == CircuitBreakerState.OPEN:
+            return False
+        return True
+
+    print(f"{'case':<40} {'result':>12}")
+    print(f"{'is_trading_allowed (state word)':<40} {per_call_ns(cb.is_trading_allowed, args.calls):>9.0f} ns")
+    print(f"{'previous checks (flag + enum)':<40} {per_call_ns(previous_check, args.calls):>9.0f} ns")
+    cb.cb_config.exchange_error_threshold = 10**9
+    print(f"{'record_exchange_error (no trip)':<40} "
+          f"{per_call_ns(lambda: cb.record_exchange_error('HTTP 503'), args.calls // 10):>9.0f} ns")
+    cb.cb_config.exchange_error_threshold = 3
+
+    latencies = []
+    for _ in range(args.trials):
+        cb._exchange_error_counter.clear()
+        cb.manual_reset()
+        seen = []
+        ready = threading.Event()
+
+        def reader():
+            ready.set()
+            while cb.is_trading_allowed():
+                pass
+            seen.append(time.perf_counter())
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        ready.wait()
+        cb.record_exchange_error("HTTP 503")
+        cb.record_exchange_error("HTTP 503")
+        start = time.perf_counter()
+        cb.record_exchange_error("HTTP 503")
+        thread.join()
+        latencies.append((seen[0] - start) * 1e6)
+    print(f"{'error burst trip latency':<40} {statistics.median(latencies):>9.0f} us"
+          f"  (max {max(latencies):.0f} us)")
+
+    cb.manual_reset()
+    cb.config.E_STOP = False
+    cb.cb_config.feeder_lag_threshold = 0.2
+    cb.record_heartbeat("feeder")
+    cb.start()
+    overshoot = []
+    for _ in range(min(args.trials, 5)):
+        cb.manual_reset()
+        cb.record_heartbeat("feeder")
+        cb._wakeup.set()
+        while cb.is_trading_allowed():
+            time.sleep(0.0005)
+        overshoot.append((time.time() - cb._last_feeder_heartbeat - cb.cb_config.feeder_lag_threshold) * 1e3)
+    cb.stop()
+    print(f"{'feeder lag trip past deadline':<40} {statistics.median(overshoot):>9.1f} ms"
+          f"  (max {max(overshoot):.1f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Payload encoding benchmark: JSON as written today vs the binary codec
+
+For a feeder snapshot (--symbols tickers with --levels book levels per
+side) and an ARES signals file (--signals signals), reports encode and
+decode throughput and bytes on disk for:
+
+- json (indent=2): AtomicWriter.write_json / safe_read_json today
+- json (compact):  separators=(",", ":")
+- orjson:          if installed (shared/lean_json.py's optional backend)
+- binary:          coin_quant.shared.codec
+
+    python benchmarks/bench_codec.py [--symbols 40] [--levels 20] [--signals 10] [--seconds 1.0]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+
+def make_feeder_snapshot(symbols: int, levels: int):
+    rng = random.Random(7)
+    symbol_data = {}
+    names = [f"SYM{i}USDT" for i in range(symbols)]
+    for name in names:
+        price = rng.uniform(0.01, 60000)
+        tick = price * 1e-4
+        symbol_data[name] = {
+            "symbol": name,
+            "price": price,
+            "volume": rng.uniform(1e3, 1e7),
+            "change": rng.uniform(-8, 8),
+            "timestamp": 1_792_358_000_000 + rng.randrange(1000),
+            "received_at": 1_792_358_000.0 + rng.random(),
+            "trace": {"trace_id": f"{rng.getrandbits(64):016x}", "received_ts": 1_792_358_000.5,
+                      "stamps": {"ws_receive": 2_537_931_115_322, "snapshot": 2_537_931_344_436}},
+            "book": {
+                "symbol": name,
+                "bids": [[price - tick * (i + 1), rng.uniform(0.01, 50)] for i in range(levels)],
+                "asks": [[price + tick * (i + 1), rng.uniform(0.01, 50)] for i in range(levels)],
+                "mid": price, "spread_bps": 2.0, "imbalance": rng.uniform(-1, 1),
+                "last_update_id": rng.randrange(10 ** 10), "updated_at": 1_792_358_000.2,
+            },
+        }
+    return {"timestamp": 1_792_358_001.0, "symbols": names, "symbol_data": symbol_data,
+            "ws_connected": True, "rest_api_ok": True, "last_update": 1_792_358_000.9}
+
+
+def make_ares_signals(count: int):
+    rng = random.Random(11)
+    signals = []
+    for i in range(count):
+        change = rng.uniform(1, 8)
+        signals.append({
+            "symbol": f"SYM{i}USDT", "side": rng.choice(["BUY", "SELL"]), "price": rng.uniform(1, 60000),
+            "size": 0.3, "confidence": 0.6, "strategy": "simple_ma", "timestamp": 1_792_358_001.0,
+            "reason": f"Price change: {change:.2f}%",
+            "market": {"mid": 100.0, "spread_bps": 1.5, "imbalance": 0.2, "expected_slippage_bps": 3.1,
+                       "notional": 30.0, "book_updated_at": 1_792_358_000.2},
+            "trace": {"trace_id": f"{rng.getrandbits(64):016x}", "parent_id": "ab12", "stamps": {"signal": 1}},
+        })
+    return {"timestamp": 1_792_358_001.0, "signals": signals, "count": count}
+
+
+def throughput(func, arg, seconds: float):
+    """Calls per second and microseconds per call"""
+    calls = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while True:
+        func(arg)
+        calls += 1
+        if calls % 10 == 0 and time.perf_counter() >= deadline:
+            break
+    elapsed = time.perf_counter() - start
+    return calls / elapsed, elapsed / calls * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=40)
+    parser.add_argument("--levels", type=int, default=20)
+    parser.add_argument("--signals", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=1.0, help="Measurement time per case")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+    from coin_quant.shared import codec
+
+    formats = {
+        "json (indent=2)": (lambda d: json.dumps(d, ensure_ascii=False, indent=2).encode("utf-8"),
+                            lambda b: json.loads(b)),
+        "json (compact)": (lambda d: json.dumps(d, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+                           lambda b: json.loads(b)),
+    }
+    try:
+        import orjson
+        formats["orjson"] = (orjson.dumps, orjson.loads)
+    except ImportError:
+        pass
+
+    payloads = {
+        "feeder_snapshot": make_feeder_snapshot(args.symbols, args.levels),
+        "ares_signals": make_ares_signals(args.signals),
+    }
+    for name, data in payloads.items():
+        formats["binary"] = (lambda d, n=name: codec.encode(n, d), lambda b: codec.decode(b)[2])
+        assert codec.decode(codec.encode(name, data))[2] == data
+        print(f"\n{name}")
+        print(f"{'format':<17} {'bytes':>9} {'enc/s':>9} {'enc us':>9} {'dec/s':>9} {'dec us':>9}")
+        for fmt, (enc, dec) in formats.items():
+            blob = enc(data)
+            enc_rate, enc_us = throughput(enc, data, args.seconds)
+            dec_rate, dec_us = throughput(dec, blob, args.seconds)
+            print(f"{fmt:<17} {len(blob):>9} {enc_rate:>9.0f} {enc_us:>9.1f} {dec_rate:>9.0f} {dec_us:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
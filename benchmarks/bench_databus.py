@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+DataBus symbol-card benchmark
+
+Builds a synthetic shared_data tree (price snapshots, ares_signals.json
+covering half the symbols, one ARES file per symbol, positions) and times
+a dashboard refresh at 10/40/200 symbols:
+
+- per-symbol: the previous get_symbol_data() loop without file memoization
+- bulk cold:  get_all_symbols_data() on a fresh DataBus
+- bulk warm:  get_all_symbols_data() again with unchanged files
+
+    python benchmarks/bench_databus.py [--sizes 10 40 200] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def build_tree(root: Path, n_symbols: int):
+    symbols = [f"SYM{i:03d}USDT" for i in range(n_symbols)]
+    (root / "snapshots").mkdir(parents=True)
+    (root / "ares").mkdir()
+    now = time.time()
+    signals = {}
+    positions = {}
+    for i, symbol in enumerate(symbols):
+        (root / "snapshots" / f"prices_{symbol.lower()}.json").write_text(json.dumps(
+            {"symbol": symbol, "price": 100.0 + i, "timestamp": now, "volume": 1.0}))
+        (root / "ares" / f"{symbol.lower()}.json").write_text(json.dumps(
+            {"symbol": symbol, "signal": "BUY", "confidence": 0.6, "timestamp": now - i}))
+        if i % 2 == 0:
+            signals[symbol] = {"signal": "SELL", "confidence": 0.4, "timestamp": now}
+        if i % 3 == 0:
+            positions[symbol] = {"side": "LONG", "size": 1.0, "entry_price": 100.0}
+    (root / "ares_signals.json").write_text(json.dumps(signals))
+    (root / "positions_snapshot.json").write_text(json.dumps(positions))
+    return symbols
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 40, 200])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+    print(f"{'symbols':>8} {'per-symbol ms':>14} {'bulk cold ms':>13} {'bulk warm ms':>13} {'parses':>7}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            symbols = build_tree(root, n)
+            os.environ["SHARED_DATA_DIR"] = str(root)
+            from coin_quant.shared import data_access, pathing
+            pathing.paths = pathing.Paths()
+            data_access.get_paths = lambda: pathing.paths
+
+            def timed(fn):
+                best = float("inf")
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    fn()
+                    best = min(best, time.perf_counter() - started)
+                return best * 1000
+
+            legacy = data_access.DataBus(file_cache=False)
+            per_symbol = timed(lambda: {s: legacy.get_symbol_data(s) for s in symbols})
+            cold = timed(lambda: data_access.DataBus().get_all_symbols_data(symbols))
+            bus = data_access.DataBus()
+            bus.get_all_symbols_data(symbols)
+            parses = bus.file_cache.misses
+            warm = timed(lambda: bus.get_all_symbols_data(symbols))
+            print(f"{n:>8} {per_symbol:>14.2f} {cold:>13.2f} {warm:>13.2f} {parses:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Dedup window benchmark: one hour of orders at --rate orders/hour
+
+Replays --rate unique client order ids spread over an hour (simulated
+clock), each followed by a replay --dup-lag seconds later, through:
+
+- admission dict:  SignalOrderAdmission before DedupWindow (rebuild the dict
+                   on every add, min() past 1000 entries)
+- filter set:      IntegrityFilters before DedupWindow (drop an arbitrary
+                   half of the set past 1000 keys)
+- DedupWindow:     300 s window, in memory and with persistence
+
+and reports the cost per order and how many replays got through.
+
+    python benchmarks/bench_dedup_window.py [--rate 100000] [--dup-lag 60]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+WINDOW_SEC = 300
+
+
+class AdmissionDict:
+    def __init__(self):
+        self.recent_orders = {}
+
+    def check_and_add(self, key, now):
+        last = self.recent_orders.get(key)
+        if last is not None and now - last < WINDOW_SEC:
+            return True
+        self.recent_orders = {k: ts for k, ts in self.recent_orders.items() if now - ts < WINDOW_SEC}
+        self.recent_orders[key] = now
+        if len(self.recent_orders) > 1000:
+            del self.recent_orders[min(self.recent_orders, key=self.recent_orders.get)]
+        return False
+
+
+class FilterSet:
+    def __init__(self):
+        self.tracker = set()
+
+    def check_and_add(self, key, now):
+        if key in self.tracker:
+            return True
+        self.tracker.add(key)
+        if len(self.tracker) > 1000:
+            for old in list(self.tracker)[:500]:
+                self.tracker.discard(old)
+        return False
+
+
+def workload(rate: int, dup_lag: float):
+    """(now, key) events: every order plus one replay dup_lag seconds later"""
+    step = 3600.0 / rate
+    events = []
+    for n in range(rate):
+        key = f"{n:032x}"
+        events.append((n * step, key))
+        events.append((n * step + dup_lag, key))
+    events.sort()
+    return events
+
+
+def run(label: str, dedup, events, orders: int):
+    start = time.perf_counter()
+    duplicates = sum(dedup.check_and_add(key, now) for now, key in events)
+    elapsed = time.perf_counter() - start
+    missed = orders - duplicates
+    print(f"{label:<28} {elapsed / len(events) * 1e6:>9.2f} us/order {missed:>10} replays passed")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rate", type=int, default=100_000, help="Orders per hour")
+    parser.add_argument("--dup-lag", type=float, default=60.0, help="Seconds until each replay")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from shared.dedup_window import DedupWindow
+
+    events = workload(args.rate, args.dup_lag)
+    print(f"{args.rate} orders/hour + {args.rate} replays after {args.dup_lag:.0f} s")
+    run("DedupWindow (memory)", DedupWindow(WINDOW_SEC, max_keys=100_000), events, args.rate)
+    path = Path(tempfile.mkdtemp(prefix="bench_dedup_window_")) / "dedup.log"
+    persisted = DedupWindow(WINDOW_SEC, max_keys=100_000, persist_path=path)
+    run("DedupWindow (persisted)", persisted, events, args.rate)
+    persisted.close()
+    start = time.perf_counter()
+    restored = DedupWindow(WINDOW_SEC, persist_path=path, clock=lambda: events[-1][0])
+    print(f"{'restore after restart':<28} {(time.perf_counter() - start) * 1e3:>9.2f} ms"
+          f"       {restored.stats()['restored']:>10} keys")
+    run("filter set (half eviction)", FilterSet(), events, args.rate)
+    run("admission dict (rebuild)", AdmissionDict(), events, args.rate)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
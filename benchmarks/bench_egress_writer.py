@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Feeder egress benchmark: write syscalls and bytes per second for a 40-symbol feed
+
+Simulates --seconds of feeder ticks at --hz (prices move for a random half
+of the symbols per tick, the canonical ts advances once per second) and
+writes health.json + health/uds.json, databus_snapshot.json and one
+prices_{SYMBOL}.json per symbol:
+
+- before: per view json.dumps(indent=2) and an fsynced temp-file write
+          plus rename, with health written twice and the directory
+          created every call, as the writers did before the emitter
+- after:  one EgressEmitter batch per tick (compact JSON, uds.json linked,
+          fsync per durability class); views are compared by their content
+          without ts/timestamp, as feeder_egress_writer does, so a new
+          second alone does not force a rewrite, and unchanged views are
+          refreshed every 5 s (FEEDER_EGRESS_REFRESH_SEC)
+
+Hashing the whole payload instead would skip a view only while the
+canonical ts (whole seconds) stays the same: health and the databus would
+be rewritten every second however little changed, and at 1 Hz or slower
+nothing would ever be skipped.
+
+The feeder module itself pulls in the environment guardrails on import,
+so the views are built here the same way it builds them.
+
+    python benchmarks/bench_egress_writer.py [--symbols 40] [--hz 4] [--seconds 30]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def views(tick: int, hz: int, prices: dict):
+    ts = 1_760_000_000 + tick // hz
+    stamp = {"ts": ts, "timestamp": ts}
+    yield "health", {"service": "feeder", "status": "GREEN", **stamp, "stale": False}
+    yield "databus", {**stamp, "symbols": sorted(prices), "stale": False, "source": "feeder"}
+    for symbol, price in prices.items():
+        yield symbol, {"symbol": symbol, **stamp, "source": "feeder", "last_price": price,
+                       "orderbook": {"bids": [[round(price - 0.1 * i, 2), 1.0] for i in range(1, 6)],
+                                     "asks": [[round(price + 0.1 * i, 2), 1.0] for i in range(1, 6)]}}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=40)
+    parser.add_argument("--hz", type=int, default=4)
+    parser.add_argument("--seconds", type=int, default=30)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from shared.egress_emitter import EgressEmitter
+
+    root = Path(tempfile.mkdtemp(prefix="bench_egress_"))
+    rng = random.Random(1)
+    ticks = args.hz * args.seconds
+    feed = []
+    prices = {f"SYM{n}USDT": 100.0 + n for n in range(args.symbols)}
+    for tick in range(ticks):
+        for symbol in rng.sample(sorted(prices), len(prices) // 2):
+            prices[symbol] = round(prices[symbol] + rng.choice((-0.1, 0.1)), 2)
+        feed.append(list(views(tick, args.hz, dict(prices))))
+
+    def path_for(name: str, base: Path) -> Path:
+        if name == "health":
+            return base / "health.json"
+        if name == "databus":
+            return base / "databus_snapshot.json"
+        return base / "snapshots" / f"prices_{name}.json"
+
+    # before
+    base = root / "before"
+    counts = {"syscalls": 0, "bytes": 0}
+
+    def old_write(path: Path, text: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = text.encode("utf-8")
+        tmp = path.with_name(path.name + ".tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        os.write(fd, data)
+        os.fsync(fd)
+        os.close(fd)
+        os.replace(tmp, path)
+        counts["syscalls"] += 6  # mkdir, open, write, fsync, close, rename
+        counts["bytes"] += len(data)
+
+    start = time.perf_counter()
+    for tick_views in feed:
+        for name, data in tick_views:
+            text = json.dumps(data, indent=2, ensure_ascii=False)
+            old_write(path_for(name, base), text)
+            if name == "health":
+                old_write(base / "health" / "uds.json", text)
+    before_wall = time.perf_counter() - start
+    before = dict(counts)
+
+    # after
+    base = root / "after"
+    emitter = EgressEmitter(refresh_interval=5.0)
+    durability = {"health": "volatile", "databus": "periodic"}
+    start = time.perf_counter()
+    for tick, tick_views in enumerate(feed):
+        emitter.clock = lambda tick=tick: tick / args.hz  # simulated feed time for fsync periods and refreshes
+        for name, data in tick_views:
+            payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            content = {k: v for k, v in data.items() if k not in ("ts", "timestamp")}
+            key = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            aliases = (base / "health" / "uds.json",) if name == "health" else ()
+            emitter.stage(path_for(name, base), payload, durability.get(name, "volatile"), aliases, key)
+        emitter.flush()
+    after_wall = time.perf_counter() - start
+    after = emitter.stats()
+
+    print(f"{args.symbols} symbols, {args.hz} Hz, {args.seconds} s of feed ({ticks} ticks)")
+    print(f"{'case':<10} {'syscalls/s':>11} {'bytes/s':>10} {'wall ms/tick':>13}")
+    print(f"{'before':<10} {before['syscalls'] / args.seconds:>11.0f} {before['bytes'] / args.seconds:>10.0f} "
+          f"{before_wall / ticks * 1e3:>13.2f}")
+    print(f"{'after':<10} {after['syscalls'] / args.seconds:>11.0f} {after['bytes'] / args.seconds:>10.0f} "
+          f"{after_wall / ticks * 1e3:>13.2f}")
+    print(f"after: writes={after['writes']} skipped={after['skipped']} links={after['links']} "
+          f"fsyncs={after['fsyncs']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
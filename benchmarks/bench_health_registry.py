@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Health check benchmark: file polling vs push-based registry
+
+- cycle: CPU and wall time of one HealthManager.get_overall_health() call
+  (4 components), reading the health files vs one registry snapshot
+  (reused for HEALTH_SNAPSHOT_TTL_SEC, and fetched on every call)
+- staleness: delay between a component's deadline (last update +
+  threshold) and a consumer noticing it, for a file poller running every
+  --poll seconds vs the registry watchdog event
+
+    python benchmarks/bench_health_registry.py [--cycles 2000] [--poll 3.0] [--trials 5]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+
+def bench_cycles(cycles: int, tmp: Path):
+    from coin_quant.shared.health import HealthManager
+    from coin_quant.shared.health_registry import (HealthRegistry, HealthRegistryClient,
+                                                   HealthRegistryServer)
+
+    def make_manager(registry_port=None):
+        manager = HealthManager()
+        for component in ("feeder", "ares", "trader", "memory"):
+            setattr(manager, f"{component}_health_path", tmp / f"{component}.json")
+        manager.registry_enabled = registry_port is not None
+        if registry_port is not None:
+            manager._registry = HealthRegistryClient("127.0.0.1", registry_port, timeout=1.0)
+        return manager
+
+    def publish(manager):
+        manager.set_feeder_health("ok", symbols=["BTCUSDT", "ETHUSDT"])
+        manager.set_ares_health("ok", signal_count=12)
+        manager.set_trader_health("ok", orders_count=3)
+        manager.set_memory_health("ok", integrity_ok=True)
+
+    def run(manager):
+        cpu, wall = time.process_time(), time.perf_counter()
+        for _ in range(cycles):
+            manager.get_overall_health()
+        return (time.process_time() - cpu) / cycles * 1e6, (time.perf_counter() - wall) / cycles * 1e6
+
+    files = make_manager()
+    publish(files)
+    results = {"files": run(files)}
+
+    server = HealthRegistryServer(HealthRegistry(stale_after=30), "127.0.0.1", 0)
+    server.start()
+    try:
+        registry = make_manager(server.port)
+        publish(registry)
+        time.sleep(0.1)
+        results["registry"] = run(registry)
+        registry.snapshot_ttl = 0  # one datagram round trip per check
+        results["registry rtt"] = run(registry)
+    finally:
+        server.stop()
+    return results
+
+
+def bench_staleness(threshold: float, poll: float, trials: int, tmp: Path):
+    from coin_quant.shared.health_registry import HealthRegistry
+    from coin_quant.shared.io import atomic_write_json, safe_read_json
+
+    file_path = tmp / "stale_probe.json"
+    file_latencies, push_latencies = [], []
+    for _ in range(trials):
+        # file poller at a random phase, as the aggregator loop would be
+        updated = time.time()
+        atomic_write_json(file_path, {"status": "ok", "last_update_ts": updated})
+        time.sleep(random.uniform(0, poll))
+        while True:
+            data = safe_read_json(file_path) or {}
+            if time.time() - data.get("last_update_ts", 0) > threshold:
+                file_latencies.append(time.time() - (updated + threshold))
+                break
+            time.sleep(poll)
+
+        registry = HealthRegistry(stale_after=threshold)
+        detected = threading.Event()
+        detected_at = []
+        registry.subscribe(lambda e: e["type"] == "stale" and (detected_at.append(time.monotonic()), detected.set()))
+        registry.start()
+        pushed = time.monotonic()
+        registry.update("probe", {"status": "ok"})
+        detected.wait(threshold + 5)
+        registry.stop()
+        push_latencies.append(detected_at[0] - (pushed + threshold))
+    return file_latencies, push_latencies
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cycles", type=int, default=2000)
+    parser.add_argument("--threshold", type=float, default=0.5, help="Staleness threshold seconds")
+    parser.add_argument("--poll", type=float, default=3.0, help="File poll interval (aggregator default 3s)")
+    parser.add_argument("--trials", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["COIN_QUANT_DATA_DIR"] = tmp
+        tmp = Path(tmp)
+        cycles = bench_cycles(args.cycles, tmp)
+        print(f"{'health cycle':<14} {'cpu us':>9} {'wall us':>9}")
+        for name, (cpu_us, wall_us) in cycles.items():
+            print(f"{name:<14} {cpu_us:>9.1f} {wall_us:>9.1f}")
+
+        file_lat, push_lat = bench_staleness(args.threshold, args.poll, args.trials, tmp)
+        print(f"\nstaleness detection latency (threshold {args.threshold}s, poll {args.poll}s, {args.trials} trials)")
+        for name, values in (("file poll", file_lat), ("registry", push_lat)):
+            print(f"{name:<14} mean {statistics.mean(values) * 1000:>8.1f} ms  max {max(values) * 1000:>8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Service cold-start benchmark: `python -X importtime` per service module
+
+Each module is imported in a fresh interpreter --repeat times (after one
+warm-up run that writes __pycache__), pointed at an empty data directory.
+Reports the median cumulative import time and the heaviest direct
+dependencies, and exits 1 if:
+
+- a module's median exceeds its budget (ms), or
+- importing it created files or directories (import-time side effects)
+
+    python benchmarks/bench_import.py [--repeat 5] [--budget coin_quant.trader.service=120] [--scale 1.0]
+
+Budgets are for a developer laptop; --scale multiplies all of them for
+slower CI machines.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SRC = Path(__file__).parent.parent / "src"
+
+# Median cumulative import time budgets in ms. NumPy (order books,
+# strategies) and asyncio are real dependencies of the feeder and ARES;
+# requests, websockets and psutil are imported on first use.
+BUDGETS_MS = {
+    "coin_quant": 10.0,
+    "coin_quant.shared.config": 30.0,
+    "coin_quant.shared.data_access": 100.0,
+    "coin_quant.trader.service": 120.0,
+    "coin_quant.ares.service": 220.0,
+    "coin_quant.feeder.service": 260.0,
+}
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_once(module: str, data_dir: Path):
+    """(cumulative us of `module`, [(cumulative us, direct dependency)])"""
+    env = dict(os.environ, PYTHONPATH=str(SRC), COIN_QUANT_DATA_DIR=str(data_dir))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, env=env, timeout=120)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            rows.append((int(match.group(2)), len(match.group(3)), match.group(4)))
+    total = next(cumulative for cumulative, depth, name in rows if name == module and depth == 1)
+    # lines are printed children-first: the direct dependencies are the
+    # depth-3 lines (two spaces below the module) before the module line
+    end = next(i for i, (_, depth, name) in enumerate(rows) if name == module and depth == 1)
+    start = max((i + 1 for i, (_, depth, _) in enumerate(rows[:end]) if depth == 1), default=0)
+    children = [(cumulative, name) for cumulative, depth, name in rows[start:end] if depth == 3]
+    return total, sorted(children, reverse=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", action="append", default=[], metavar="MODULE=MS",
+                        help="Override or add a budget")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply all budgets")
+    parser.add_argument("--top", type=int, default=4, help="Heaviest dependencies to list")
+    args = parser.parse_args()
+
+    budgets = dict(BUDGETS_MS)
+    for item in args.budget:
+        module, _, ms = item.partition("=")
+        budgets[module] = float(ms)
+
+    failures = []
+    print(f"{'module':<32} {'median ms':>10} {'budget':>8}  heaviest imports (ms)")
+    for module, budget in budgets.items():
+        budget *= args.scale
+        with tempfile.TemporaryDirectory(prefix="bench_import_") as tmp:
+            data_dir = Path(tmp) / "shared_data"
+            import_once(module, data_dir)
+            runs = [import_once(module, data_dir) for _ in range(args.repeat)]
+            created = sorted(str(p.relative_to(tmp)) for p in Path(tmp).rglob("*"))
+        median_ms = statistics.median(total for total, _ in runs) / 1000.0
+        heaviest = ", ".join(f"{name} {us / 1000.0:.0f}" for us, name in runs[-1][1][: args.top])
+        status = "ok" if median_ms <= budget else "OVER"
+        print(f"{module:<32} {median_ms:>10.1f} {budget:>8.0f}  {heaviest}  {status}")
+        if median_ms > budget:
+            failures.append(f"{module}: {median_ms:.1f} ms > {budget:.0f} ms")
+        if created:
+            failures.append(f"{module}: import created {created}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Integrity filter benchmark: trades per second through apply_all_filters
+
+Runs --trades distinct, passing trades (unique order ids, SOT PnL, no
+cooldown hit) through the full seven-filter chain with the root logger at
+INFO writing to a temporary file, as the trader runs, and reports the
+throughput, the log bytes written and the aggregated counters.
+
+    python benchmarks/bench_integrity_filters.py [--trades 100000]
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--trades", type=int, default=100_000)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    log_file = Path(tempfile.mkdtemp(prefix="bench_integrity_filters_")) / "trader.log"
+    logging.basicConfig(filename=log_file, level=logging.INFO)
+    from shared.integrity_filters import BalanceView, IntegrityFilters
+    from shared.pnl_calculator import calculate_net_pnl
+
+    pnl = calculate_net_pnl(10.0, 1000.0, "TAKER")
+    trades = [{
+        "strategy_id": "s1", "strategy_name": "trend_multi_tf", "symbol": f"SYM{n}USDT",
+        "order_id": str(n), "trade_id": str(n), "ts_ns": n * 10**9, "notional": 1000.0,
+        "gross_pnl": 10.0, "net_pnl": pnl.net_pnl, "maker_taker": "TAKER",
+        "calculation_source": pnl.calculation_source, "expected_return_pct": 1.0,
+    } for n in range(args.trades)]
+
+    filters = IntegrityFilters({"global_cooldown_sec": 60}, balance_view=BalanceView(100000.0))
+    apply = filters.apply_all_filters
+    start = time.perf_counter()
+    passed = sum(apply(trade)[0] for trade in trades)
+    elapsed = time.perf_counter() - start
+
+    print(f"{'trades':<28} {args.trades:>12}")
+    print(f"{'passed':<28} {passed:>12}")
+    print(f"{'us per trade':<28} {elapsed / args.trades * 1e6:>12.1f}")
+    print(f"{'trades per second':<28} {args.trades / elapsed:>12.0f}")
+    print(f"{'log bytes per trade':<28} {log_file.stat().st_size / args.trades:>12.1f}")
+    print(f"counters: {filters.get_counters()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
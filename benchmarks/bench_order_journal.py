@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Order journal benchmark: orders.ndjson scans vs the indexed OrderJournal
+
+Writes --orders historical orders to an orders.ndjson (one line per order,
+FILLED except --open-ratio of them; --update-ratio of them preceded by a
+NEW line), then times:
+
+- scan lookup:  OrderRouter._check_existing_order before the journal index
+                (json.loads every line until the client_order_id matches;
+                a new order never matches, so it reads the whole file)
+- scan replay:  StateStore._load_state before the journal index
+- journal:      cold open (no checkpoint, full replay), checkpoint write,
+                open from checkpoint + --tail appended lines, lookups, append
+
+    python benchmarks/bench_order_journal.py [--orders 1000000] [--tail 10000]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def order_line(n: int, status: str) -> str:
+    return json.dumps({
+        "order_id": f"paper_{1_792_358_000_000 + n}", "client_order_id": f"{n:016x}",
+        "symbol": "BTCUSDT", "side": "BUY", "order_type": "LIMIT_IOC", "quantity": 0.001,
+        "price": 65000.0, "status": status, "filled_quantity": 0.001 if status == "FILLED" else 0.0,
+        "filled_price": 65000.0 if status == "FILLED" else 0.0, "timestamp": 1_792_358_000.0 + n,
+        "update_time": 1_792_358_000.0 + n, "metadata": {},
+    }, separators=(",", ":")) + "\n"
+
+
+def timed(label: str, func, repeat: int = 1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeat
+    unit, scale = ("ms", 1e3) if elapsed >= 1e-3 else ("us", 1e6)
+    print(f"{label:<40} {elapsed * scale:>10.1f} {unit}")
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--update-ratio", type=float, default=0.2)
+    parser.add_argument("--open-ratio", type=float, default=0.001)
+    parser.add_argument("--tail", type=int, default=10_000, help="Lines appended after the checkpoint")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from shared.order_journal import OrderJournal
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench_order_journal_"))
+    path = tmp / "orders.ndjson"
+    rng = random.Random(7)
+    with open(path, "w", encoding="utf-8") as f:
+        for n in range(args.orders):
+            if rng.random() < args.open_ratio:
+                f.write(order_line(n, "NEW"))
+                continue
+            if rng.random() < args.update_ratio:
+                f.write(order_line(n, "NEW"))
+            f.write(order_line(n, "FILLED"))
+    print(f"{args.orders} orders, {path.stat().st_size / 1e6:.0f} MB journal")
+
+    def scan_lookup(client_order_id="new-order"):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                data = json.loads(line)
+                if data.get("client_order_id") == client_order_id:
+                    return data
+        return None
+
+    def scan_replay():
+        open_orders = {}
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                data = json.loads(line)
+                if data.get("status") in ("NEW", "PARTIALLY_FILLED"):
+                    open_orders[data["order_id"]] = data
+        return open_orders
+
+    timed("scan lookup (miss, per order placed)", scan_lookup)
+    timed("scan replay (startup)", scan_replay)
+
+    journal = timed("journal cold open (full replay)", lambda: OrderJournal(path, checkpoint_every=0))
+    timed("journal checkpoint write", journal.checkpoint)
+    print(f"{'checkpoint size':<40} {journal.checkpoint_path.stat().st_size / 1e6:>10.1f} MB")
+    journal.close()
+
+    with open(path, "a", encoding="utf-8") as f:
+        for n in range(args.orders, args.orders + args.tail):
+            f.write(order_line(n, "NEW"))
+    journal = timed(f"journal open (checkpoint + {args.tail} tail)",
+                    lambda: OrderJournal(path, checkpoint_every=0))
+    assert journal.stats()["replayed_lines"] == args.tail
+
+    ids = [f"{rng.randrange(args.orders):016x}" for _ in range(1000)]
+    hits = iter(ids)
+    timed("journal lookup hit (one seek)", lambda: journal.get_by_client_id(next(hits)), repeat=1000)
+    timed("journal lookup miss", lambda: journal.get_by_client_id("new-order"), repeat=1000)
+    new_ids = iter(range(10**9, 10**9 + 1000))
+    timed("journal append", lambda: journal.append(json.loads(order_line(next(new_ids), "NEW"))),
+          repeat=1000)
+    print(f"journal stats: {journal.stats()}")
+    journal.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Paper matching benchmark: replay throughput and a slippage-vs-size sweep
+
+Builds a seeded synthetic stream of depth snapshots and trade ticks (or
+reads a recorded NDJSON stream with --events), replays it through
+PaperMatchingEngine with a market order every --order-every events at
+several order sizes, and reports events per second plus fill ratio,
+slippage against the arrival mid, maker share and fees per size.
+
+    python benchmarks/bench_paper_matching.py [--events 200000] [--events-file rec.ndjson]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+
+def synthetic_events(count: int, seed: int):
+    rng = random.Random(seed)
+    mid, ts = 65000.0, 0.0
+    for n in range(count):
+        ts += 0.1
+        mid += rng.gauss(0, 2.0)
+        if n % 4 == 0:
+            yield {"type": "book", "symbol": "BTCUSDT", "ts": ts,
+                   "bids": [[round(mid - 0.5 - i, 1), rng.uniform(0.05, 1.5)] for i in range(20)],
+                   "asks": [[round(mid + 0.5 + i, 1), rng.uniform(0.05, 1.5)] for i in range(20)]}
+        else:
+            side = rng.choice(("BUY", "SELL"))
+            price = round(mid + (0.5 if side == "BUY" else -0.5), 1)
+            yield {"type": "trade", "symbol": "BTCUSDT", "ts": ts, "price": price,
+                   "qty": rng.expovariate(10.0), "side": side}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--events-file", type=Path, default=None)
+    parser.add_argument("--order-every", type=int, default=200)
+    parser.add_argument("--sizes", type=str, default="0.01,0.1,1,5")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from shared.paper_matching import PaperMatchingEngine, PaperOrder, load_events
+
+    if args.events_file:
+        events = list(load_events(args.events_file))
+    else:
+        events = list(synthetic_events(args.events, args.seed))
+    order_times = [float(e["ts"]) for e in events[::args.order_every]]
+
+    print(f"{'size':>8} {'events/s':>10} {'fill %':>8} {'slip bps':>9} {'maker %':>8} {'fees':>10}")
+    for size in (float(s) for s in args.sizes.split(",")):
+        engine = PaperMatchingEngine(latency_ms=50, latency_jitter_ms=20, seed=args.seed)
+        orders = [(ts, PaperOrder(f"o{n}", "BTCUSDT", "BUY" if n % 2 else "SELL", "MARKET", size))
+                  for n, ts in enumerate(order_times)]
+        start = time.perf_counter()
+        engine.replay(events, orders)
+        elapsed = time.perf_counter() - start
+        stats = engine.stats()["BTCUSDT"]
+        fill_pct = stats["filled_qty"] / (size * len(orders)) * 100
+        print(f"{size:>8g} {len(events) / elapsed:>10.0f} {fill_pct:>8.1f} {stats['slippage_bps']:>9.2f} "
+              f"{stats['maker_ratio'] * 100:>8.1f} {stats['fees']:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+PositionOracle benchmark: cost of one position sweep over many symbols
+
+- before: each symbol probes up to three position file paths and parses
+          the one it finds on every call (the pre-cache _get_local_position)
+- after:  one reconcile() against an in-memory account response, then
+          get_position() per symbol and one get_positions() for the whole map
+
+Also times get_last_fill_price on a large trades file (it used to read
+every line to take the last one).
+
+    python benchmarks/bench_position_oracle.py [--symbols 200] [--rounds 20]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def old_local_position(symbol: str):
+    """_get_local_position before the cached map"""
+    normalized_symbol = symbol.lower()
+    for path in (Path(f"shared_data/positions/{normalized_symbol}_position.json"),
+                 Path(f"shared_data/positions/{symbol.upper()}_position.json"),
+                 Path(f"shared_data/{normalized_symbol}_position.json")):
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--trade-lines", type=int, default=100_000)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from shared.position_oracle import PositionOracle
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_position_oracle_"))
+    symbols = [f"SYM{n}USDT" for n in range(args.symbols)]
+    root = Path("shared_data")
+    (root / "positions").mkdir(parents=True)
+    now = time.time() - 3600  # stale locals, so lookups fall through to the exchange map
+    for n, symbol in enumerate(symbols):
+        # spread the files over the three historical locations
+        path = [root / "positions" / f"{symbol.lower()}_position.json",
+                root / "positions" / f"{symbol}_position.json",
+                root / f"{symbol.lower()}_position.json"][n % 3]
+        path.write_text(json.dumps({"qty": 1.0, "avg_price": 10.0, "timestamp": now}))
+    account = {"balances": [{"asset": s[:-4], "free": "1.0", "locked": "0"} for s in symbols]}
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for symbol in symbols:
+            old_local_position(symbol)
+    before = (time.perf_counter() - start) / args.rounds
+
+    oracle = PositionOracle(fetch_account=lambda: account)
+    start = time.perf_counter()
+    oracle.reconcile()
+    reconcile = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for symbol in symbols:
+            oracle.get_position(symbol)
+    after = (time.perf_counter() - start) / args.rounds
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        oracle.get_positions()
+    snapshot = (time.perf_counter() - start) / args.rounds
+
+    trades = root / "trades" / "btcusdt_trades.jsonl"
+    trades.parent.mkdir()
+    with open(trades, "w") as f:
+        for n in range(args.trade_lines):
+            f.write(json.dumps({"symbol": "BTCUSDT", "price": 65000.0 + n, "qty": 0.001}) + "\n")
+    start = time.perf_counter()
+    with open(trades) as f:
+        json.loads(f.readlines()[-1])
+    fill_before = time.perf_counter() - start
+    oracle._fill_prices.clear()
+    start = time.perf_counter()
+    oracle.get_last_fill_price("BTCUSDT")
+    fill_after = time.perf_counter() - start
+
+    print(f"{'case':<40} {'ms':>10}")
+    print(f"{'sweep before (file probes)':<40} {before * 1e3:>10.3f}")
+    print(f"{'reconcile (one account response)':<40} {reconcile * 1e3:>10.3f}")
+    print(f"{'sweep after (get_position)':<40} {after * 1e3:>10.3f}")
+    print(f"{'sweep after (get_positions)':<40} {snapshot * 1e3:>10.3f}")
+    print(f"{'last fill before (readlines)':<40} {fill_before * 1e3:>10.3f}")
+    print(f"{'last fill after (tail read)':<40} {fill_after * 1e3:>10.3f}")
+    print(f"drift: {oracle.get_drift_metrics()['drift_symbols']} symbols")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Price read benchmark: shared-memory price board vs the files read today
+
+For --symbols symbols, reports the cost of one consistent read of all
+latest prices and of one symbol's price via:
+
+- prices_<symbol>.json: one open + parse per symbol (PriceOracle, UI)
+- feeder_snapshot.json: one parse of the whole snapshot (ARES, trader)
+- price board:          coin_quant.shared.price_board snapshot() / get()
+
+Optionally a writer thread publishes at --write-rate ticks/s meanwhile so
+torn-slot retries show up in the reader stats.
+
+    python benchmarks/bench_price_board.py [--symbols 40] [--seconds 1.0] [--write-rate 0]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+
+def throughput(func, seconds: float):
+    """Calls per second and microseconds per call"""
+    calls = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while True:
+        func()
+        calls += 1
+        if calls % 10 == 0 and time.perf_counter() >= deadline:
+            break
+    elapsed = time.perf_counter() - start
+    return calls / elapsed, elapsed / calls * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=40)
+    parser.add_argument("--seconds", type=float, default=1.0, help="Measurement time per case")
+    parser.add_argument("--write-rate", type=float, default=0.0, help="Concurrent ticks/s (0: none)")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+    from coin_quant.shared.price_board import PriceBoardReader, PriceBoardWriter
+
+    names = [f"SYM{i}USDT" for i in range(args.symbols)]
+    tmp = Path(tempfile.mkdtemp(prefix="bench_price_board_"))
+    symbol_data = {}
+    for i, name in enumerate(names):
+        tick = {"symbol": name, "price": 100.0 + i, "volume": 1e6, "change": 1.0,
+                "timestamp": 1_792_358_000_000, "received_at": time.time()}
+        symbol_data[name] = tick
+        (tmp / f"prices_{name.lower()}.json").write_text(json.dumps(tick))
+    (tmp / "feeder_snapshot.json").write_text(json.dumps(
+        {"timestamp": time.time(), "symbols": names, "symbol_data": symbol_data}, indent=2))
+
+    writer = PriceBoardWriter(f"bench_price_board_{id(tmp)}", capacity=256)
+    reader = PriceBoardReader(writer.name, data_dir=tmp, fallback=False)
+    for name, tick in symbol_data.items():
+        writer.publish(name, tick["price"], bid=tick["price"] - 0.01, ask=tick["price"] + 0.01)
+
+    stop = threading.Event()
+
+    def publish_loop():
+        interval = 1.0 / args.write_rate
+        i = 0
+        while not stop.is_set():
+            writer.publish(names[i % len(names)], 100.0 + i % 7)
+            i += 1
+            time.sleep(interval)
+
+    thread = None
+    if args.write_rate > 0:
+        thread = threading.Thread(target=publish_loop, daemon=True)
+        thread.start()
+
+    def read_files():
+        return {n: json.loads((tmp / f"prices_{n.lower()}.json").read_bytes())["price"] for n in names}
+
+    def read_snapshot():
+        data = json.loads((tmp / "feeder_snapshot.json").read_bytes())
+        return {n: e["price"] for n, e in data["symbol_data"].items()}
+
+    one = names[len(names) // 2]
+    cases = {
+        "all: prices_*.json": read_files,
+        "all: feeder_snapshot": read_snapshot,
+        "all: board snapshot": reader.snapshot,
+        "one: prices_*.json": lambda: json.loads((tmp / f"prices_{one.lower()}.json").read_bytes()),
+        "one: board get": lambda: reader.get(one),
+    }
+    print(f"{args.symbols} symbols, write rate {args.write_rate:.0f}/s")
+    print(f"{'case':<22} {'reads/s':>10} {'us/read':>10}")
+    try:
+        for case, func in cases.items():
+            rate, us = throughput(func, args.seconds)
+            print(f"{case:<22} {rate:>10.0f} {us:>10.1f}")
+        print(f"reader stats: {reader.stats()}")
+    finally:
+        stop.set()
+        if thread is not None:
+            thread.join()
+        reader.close()
+        writer.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
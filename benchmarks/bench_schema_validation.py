@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Schema validation benchmark: microseconds per record, before and after the registry
+
+- trade log:   validate_trade_schema before the registry (open + parse
+               trade_schema.json, then jsonschema.validate, which builds a
+               validator per call) vs the compiled, watched schema
+- price snapshot: the hand-written validate_symbol_snapshot_schema vs the
+               compiled SYMBOL_SNAPSHOT_SCHEMA, strict and sampled
+- state bus:   the hand-written required-keys loop vs the compiled schema
+
+jsonschema is optional: without it the "before" trade row only covers
+reading and parsing the schema file.
+
+    python benchmarks/bench_schema_validation.py [--records 100000] [--sample-every 100]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+TRADE_SCHEMA = {
+    "type": "object",
+    "required": ["strategy_id", "order_id", "trade_id", "ts_ns", "notional", "side",
+                 "symbol", "qty", "price", "net_pnl"],
+    "properties": {
+        "strategy_id": {"type": "string", "minLength": 1},
+        "order_id": {"type": "string"},
+        "trade_id": {"type": "string"},
+        "is_replay": {"type": "boolean"},
+        "ts_ns": {"type": "integer", "minimum": 1},
+        "notional": {"type": "number", "exclusiveMinimum": 0},
+        "side": {"enum": ["BUY", "SELL"]},
+        "maker_taker": {"enum": ["MAKER", "TAKER"]},
+        "symbol": {"type": "string", "pattern": "^[A-Z0-9]+$"},
+        "qty": {"type": "number", "minimum": 0},
+        "price": {"type": "number", "minimum": 0},
+        "gross_pnl": {"type": "number"},
+        "fee": {"type": "number"},
+        "net_pnl": {"type": "number"},
+    },
+}
+
+TRADE = {
+    "strategy_id": "trend_multi_tf", "order_id": "12345", "trade_id": "67890", "is_replay": False,
+    "ts_ns": 1_760_000_000_000_000_000, "notional": 65.0, "side": "BUY", "maker_taker": "TAKER",
+    "symbol": "BTCUSDT", "qty": 0.001, "price": 65000.0, "gross_pnl": 0.0, "fee": 0.026,
+    "net_pnl": -0.026,
+}
+
+SNAPSHOT = {
+    "symbol": "BTCUSDT", "ts": 1_760_000_000, "timestamp": 1_760_000_000, "source": "feeder",
+    "last_price": 65000.0, "orderbook": {"bids": [[64999.9, 1.2]], "asks": [[65000.1, 0.8]]},
+}
+
+
+def hand_written_snapshot_check(data):
+    """validate_symbol_snapshot_schema before the registry"""
+    if not isinstance(data, dict):
+        return False, "Must be dict"
+    for field in ["symbol", "ts", "source"]:
+        if field not in data:
+            return False, f"Missing required field: {field}"
+    symbol = data["symbol"]
+    if not isinstance(symbol, str) or symbol != symbol.upper() or not symbol.endswith("USDT"):
+        return False, "bad symbol"
+    ts = data["ts"]
+    if not isinstance(ts, int) or ts > 1e10:
+        return False, "bad ts"
+    if data["source"] != "feeder":
+        return False, "bad source"
+    if "orderbook" in data:
+        ob = data["orderbook"]
+        if not isinstance(ob, dict):
+            return False, "bad orderbook"
+        for side in ["bids", "asks"]:
+            if side in ob and not isinstance(ob[side], list):
+                return False, "bad side"
+    return True, None
+
+
+def hand_written_state_check(data):
+    """StateBus._validate_schema before the registry"""
+    for key in ['env', 'service_heartbeats', 'symbols', 'ares',
+                'risk', 'orders', 'circuit_breaker', 'version']:
+        if key not in data:
+            return False
+    return True
+
+
+def per_record_us(func, record, records: int) -> float:
+    start = time.perf_counter()
+    for _ in range(records):
+        func(record)
+    return (time.perf_counter() - start) / records * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--sample-every", type=int, default=100)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from shared.schema_registry import SchemaRegistry
+
+    schema_path = Path(tempfile.mkdtemp(prefix="bench_schema_")) / "trade_schema.json"
+    schema_path.write_text(json.dumps(TRADE_SCHEMA))
+    try:
+        from jsonschema import validate
+        old_label = "trade: file read + jsonschema"
+    except ImportError:
+        validate = None
+        old_label = "trade: file read (no jsonschema)"
+
+    def old_trade_check(record):
+        with open(schema_path, "r", encoding="utf-8") as f:
+            schema = json.load(f)
+        if validate is not None:
+            validate(instance=record, schema=schema)
+
+    registry = SchemaRegistry(mode="strict")
+    registry.register("trade", path=schema_path)
+    # the snapshot schema as feeder_egress_writer registers it (that module pulls in the
+    # environment guardrails on import, so the dict is repeated here)
+    registry.register("snapshot", {
+        "type": "object",
+        "required": ["symbol", "ts", "source"],
+        "properties": {
+            "symbol": {"type": "string", "pattern": "^[^a-z]*USDT$"},
+            "ts": {"type": "integer", "maximum": 10_000_000_000},
+            "source": {"const": "feeder"},
+            "orderbook": {"type": "object",
+                          "properties": {"bids": {"type": "array"}, "asks": {"type": "array"}}},
+        },
+    })
+    registry.register("state_bus", {"type": "object", "required": [
+        "env", "service_heartbeats", "symbols", "ares", "risk", "orders", "circuit_breaker", "version"]})
+    state = dict.fromkeys(["env", "service_heartbeats", "symbols", "ares", "risk", "orders",
+                           "circuit_breaker", "version", "estop", "last_updated"], {})
+    assert registry.validate("trade", TRADE) == (True, None)
+    assert registry.validate("snapshot", SNAPSHOT) == (True, None)
+
+    sampled = SchemaRegistry(mode="sampled", sample_every=args.sample_every)
+    sampled.register("snapshot", registry._entries["snapshot"].schema)
+
+    rows = [
+        (old_label, per_record_us(old_trade_check, TRADE, args.records // 10)),
+        ("trade: compiled (strict)", per_record_us(lambda r: registry.validate("trade", r), TRADE, args.records)),
+        ("snapshot: hand-written", per_record_us(hand_written_snapshot_check, SNAPSHOT, args.records)),
+        ("snapshot: compiled function only",
+         per_record_us(registry._entries["snapshot"].validator, SNAPSHOT, args.records)),
+        ("snapshot: compiled (strict)",
+         per_record_us(lambda r: registry.check("snapshot", r), SNAPSHOT, args.records)),
+        (f"snapshot: compiled (1/{args.sample_every})",
+         per_record_us(lambda r: sampled.check("snapshot", r), SNAPSHOT, args.records)),
+        ("state bus: hand-written", per_record_us(hand_written_state_check, state, args.records)),
+        ("state bus: compiled (strict)",
+         per_record_us(lambda r: registry.check("state_bus", r), state, args.records)),
+    ]
+    print(f"{'case':<36} {'us/record':>10}")
+    for label, us in rows:
+        print(f"{label:<36} {us:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
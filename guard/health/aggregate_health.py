@@ -21,6 +21,11 @@ from shared.ssot_path_resolver import (get_component_health_path,
                                        get_health_dir, get_health_path,
                                        log_resolved_paths)
 
+try:
+    from coin_quant.shared.health_registry import HealthSubscriber
+except ImportError:
+    HealthSubscriber = None
+
 
 class HealthAggregator:
     """Health 파일 통합 관리자"""
@@ -33,6 +38,10 @@ class HealthAggregator:
         self.interval_sec = interval_sec
         self.running = False
         self.thread = None
+        
+        # Health registry 구독: 변경 시 즉시 재집계, 미연결 시 파일 폴링
+        self.subscriber = None
+        self._changed = threading.Event()
         self.logger = self._setup_logging()
         
         # SSOT 경로
@@ -69,6 +78,9 @@ class HealthAggregator:
             return
         
         self.running = True
+        if HealthSubscriber is not None:
+            self.subscriber = HealthSubscriber(callback=lambda event: self._changed.set())
+            self.subscriber.start()
         self.thread = threading.Thread(target=self._aggregation_loop, daemon=True)
         self.thread.start()
         self.logger.info(f"Health Aggregator started (interval: {self.interval_sec}s)")
@@ -78,8 +90,12 @@ class HealthAggregator:
     def stop(self):
         """Aggregator 중지"""
         self.running = False
+        self._changed.set()
         if self.thread:
             self.thread.join(timeout=5)
+        if self.subscriber:
+            self.subscriber.stop()
+            self.subscriber = None
         self.logger.info("Health Aggregator stopped")
     
     def _aggregation_loop(self):
@@ -102,8 +118,9 @@ class HealthAggregator:
                     self._log_health_status(aggregated)
                     last_log_time = current_time
                 
-                # 대기
-                time.sleep(self.interval_sec)
+                # 대기 (registry 이벤트가 오면 즉시 깨어남)
+                self._changed.wait(self.interval_sec)
+                self._changed.clear()
                 
             except Exception as e:
                 self.logger.error(f"Aggregation loop error: {e}")
@@ -126,12 +143,34 @@ class HealthAggregator:
             "aggregator_version": "1.0",
         }
         
+        # Registry 미러 (구독 중일 때만) - 파일보다 우선
+        registry_components = {}
+        if self.subscriber is not None and self.subscriber.connected:
+            registry_components = self.subscriber.components
+        
         # 각 컴포넌트 health 파일 읽기
         for component in self.components:
             component_path = get_component_health_path(component)
             
-             try:
-                if component_path.exists():
+            try:
+                if component in registry_components:
+                    component_data = dict(registry_components[component])
+                    last_ts = component_data.get("last_update_ts", current_time)
+                    aggregated["components"][component] = {
+                        "status": component_data.get("status", "UNKNOWN"),
+                        "last_ts": last_ts,
+                        "age_sec": max(0.0, current_time - last_ts),
+                        "data": component_data
+                    }
+                    component_status = str(component_data.get("status", "UNKNOWN")).upper()
+                    if component_data.get("stale") and aggregated["global_status"] == "GREEN":
+                        aggregated["global_status"] = "YELLOW"
+                    if component_status in ("RED", "ERROR"):
+                        aggregated["global_status"] = "RED"
+                    elif component_status == "YELLOW" and aggregated["global_status"] != "RED":
+                        aggregated["global_status"] = "YELLOW"
+                
+                elif component_path.exists():
                     # UTF-8 BOM 처리
                     with open(component_path, "r", encoding="utf-8-sig") as f:
                         component_data = json.load(f)
@@ -11,6 +11,11 @@ from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Deque
 
+try:
+    from coin_quant.shared.metrics import metrics_registry
+except ImportError:
+    metrics_registry = None
+
 
 logger = logging.getLogger(__name__)
 
@@ -58,9 +63,26 @@ class HealthMetrics:
         self.system_start_ts = time.time()
         self.total_restarts = 0
 
+        # Unified registry gauges (optional)
+        self._register_registry_metrics()
+
         # Load existing metrics
         self._load_metrics()
 
+    def _register_registry_metrics(self):
+        """Mirror health metrics into the unified registry when available"""
+        self._registry_enabled = metrics_registry is not None
+        if not self._registry_enabled:
+            return
+        r = metrics_registry
+        self._g_dor = r.gauge("coin_quant_health_dor", "1 if the last DOR check passed")
+        self._g_availability = r.gauge(
+            "coin_quant_health_availability_percent", "Component availability", ["component"])
+        self._g_consecutive = r.gauge(
+            "coin_quant_health_consecutive_failures", "Consecutive probe failures", ["component"])
+        self._c_restarts = r.counter(
+            "coin_quant_health_restarts_total", "Component restarts", ["component"])
+
     def _load_metrics(self):
         """Load metrics from disk"""
         try:
@@ -170,6 +192,13 @@ class HealthMetrics:
                     downtime = metrics.total_failures * 60
                     metrics.availability_pct = max(0, (total_time - downtime) / total_time * 100)
 
+                if self._registry_enabled:
+                    self._g_availability.labels(component=component_name).set(metrics.availability_pct)
+                    self._g_consecutive.labels(component=component_name).set(metrics.consecutive_failures)
+
+            if self._registry_enabled:
+                self._g_dor.set(1 if dor else 0)
+
             # Save metrics
             self._save_metrics()
 
@@ -184,6 +213,8 @@ class HealthMetrics:
 
             self.component_metrics[component].restart_count += 1
             self.total_restarts += 1
+            if self._registry_enabled:
+                self._c_restarts.labels(component=component).inc()
 
             self._save_metrics()
 
@@ -13,9 +13,24 @@ from typing import Any, Dict, Optional
 
 from shared.paths import get_repo_root
 
+try:
+    from coin_quant.shared.process_registry import process_registry
+except ImportError:
+    process_registry = None
+
 logger = logging.getLogger(__name__)
 
 
+def _registered_process(service_name: str):
+    """Registered (and still alive) process entry for a service, if any"""
+    if process_registry is None:
+        return None
+    try:
+        return process_registry.lookup(service_name)
+    except Exception:
+        return None
+
+
 def restart_service(service_name: str) -> bool:
     """
     Restart a service with proper environment setup
@@ -55,7 +70,18 @@ def _kill_service_processes(service_name: str):
     try:
         import psutil
 
-        # Find processes by name
+        # Registered services are singletons: terminate the registered PID first
+        entry = _registered_process(service_name)
+        if entry is not None:
+            try:
+                logger.info(f"Killing {service_name} process: PID {entry.pid}")
+                proc = psutil.Process(entry.pid)
+                proc.terminate()
+                proc.wait(timeout=5)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.TimeoutExpired):
+                pass
+
+        # Then sweep by cmdline for unregistered or stray instances
         for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
             try:
                 cmdline = proc.info['cmdline']
@@ -244,6 +270,20 @@ def get_service_status(service_name: str) -> Dict[str, Any]:
     try:
         import psutil
         
+        entry = _registered_process(service_name)
+        if entry is not None:
+            return {
+                "service_name": service_name,
+                "running": True,
+                "processes": [{
+                    "pid": entry.pid,
+                    "name": service_name,
+                    "cmdline": entry.cmdline,
+                    "create_time": entry.create_time
+                }],
+                "process_count": 1
+            }
+        
         processes = []
         for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'create_time']):
             try:
@@ -2,59 +2,84 @@
 Shared utilities and modules for coin_quant trading system
 """
 
-# 주요 모듈들을 import하여 쉽게 접근할 수 있도록 함
-try:
-    from .metrics_collector import (get_metrics_stats, get_recent_metrics,
-                                    metrics_collector, record_execution_metric,
-                                    record_file_io_metric,
-                                    record_watchdog_metric,
-                                    start_metrics_collection,
-                                    stop_metrics_collection)
-except ImportError:
-    # metrics_collector 모듈이 없는 경우 더미 함수들 제공
-    def start_metrics_collection():
-        pass
+import importlib
 
-    def stop_metrics_collection():
-        pass
+# 주요 심볼은 처음 접근할 때 import (패키지 import만으로 metrics_collector의
+# 전역 수집기 등이 생성되지 않도록 함)
+_EXPORTS = {
+    "metrics_collector": "metrics_collector",
+    "start_metrics_collection": "metrics_collector",
+    "stop_metrics_collection": "metrics_collector",
+    "record_execution_metric": "metrics_collector",
+    "record_file_io_metric": "metrics_collector",
+    "record_watchdog_metric": "metrics_collector",
+    "get_metrics_stats": "metrics_collector",
+    "get_recent_metrics": "metrics_collector",
+    "normalize_symbol": "symbol_utils",
+    "TelemetryCollector": "telemetry",
+}
 
-    def record_execution_metric(*args, **kwargs):
-        pass
 
-    def record_file_io_metric(*args, **kwargs):
-        pass
+# 모듈이 없는 경우의 더미 구현
+def _start_metrics_collection():
+    pass
+
+
+def _stop_metrics_collection():
+    pass
 
-    def record_watchdog_metric(*args, **kwargs):
-        pass
 
-    def get_metrics_stats():
-        return {}
+def _record_metric(*args, **kwargs):
+    pass
 
-    def get_recent_metrics(*args, **kwargs):
-        return []
 
+def _get_metrics_stats():
+    return {}
 
-try:
-    from .symbol_utils import normalize_symbol
-except ImportError:
 
-    def normalize_symbol(symbol):
-        return symbol.lower()
+def _get_recent_metrics(*args, **kwargs):
+    return []
 
 
-try:
-    from .telemetry import TelemetryCollector
-except ImportError:
+def _normalize_symbol(symbol):
+    return symbol.lower()
 
-    class TelemetryCollector:
-        def __init__(self):
-            pass
 
-        def start(self):
-            pass
+class _TelemetryCollector:
+    def __init__(self):
+        pass
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
 
-        def stop(self):
-            pass
+_FALLBACKS = {
+    "metrics_collector": None,
+    "start_metrics_collection": _start_metrics_collection,
+    "stop_metrics_collection": _stop_metrics_collection,
+    "record_execution_metric": _record_metric,
+    "record_file_io_metric": _record_metric,
+    "record_watchdog_metric": _record_metric,
+    "get_metrics_stats": _get_metrics_stats,
+    "get_recent_metrics": _get_recent_metrics,
+    "normalize_symbol": _normalize_symbol,
+    "TelemetryCollector": _TelemetryCollector,
+}
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    except ImportError:
+        value = _FALLBACKS[name]
+    globals()[name] = value
+    return value
 
 
 __all__ = [
@@ -14,6 +14,7 @@ import threading
 from collections import deque
 
 from shared.guardrails import get_guardrails
+from shared.segment_journal import SegmentJournal
 from shared.state_bus import get_state_bus
 
 
@@ -84,6 +85,9 @@ class OrderIntentRecord:
 class AuditableSignalManager:
     """감사 가능한 신호 관리자"""
     
+    # 저널 세그먼트 크기 (초과 시 새 세그먼트로 회전)
+    JOURNAL_SEGMENT_BYTES = 16 * 1024 * 1024
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.guardrails = get_guardrails()
@@ -100,6 +104,17 @@ class AuditableSignalManager:
         self.orders_dir.mkdir(parents=True, exist_ok=True)
         self.audit_dir.mkdir(parents=True, exist_ok=True)
         
+        # 추가 전용 저널 (신호/주문은 ID로, 감사 로그는 시간으로 조회)
+        self.signal_journal = SegmentJournal(
+            self.signals_dir, prefix="signals", max_segment_bytes=self.JOURNAL_SEGMENT_BYTES
+        )
+        self.order_journal = SegmentJournal(
+            self.orders_dir, prefix="orders", max_segment_bytes=self.JOURNAL_SEGMENT_BYTES
+        )
+        self.audit_journal = SegmentJournal(
+            self.audit_dir, prefix="audit", max_segment_bytes=self.JOURNAL_SEGMENT_BYTES
+        )
+        
         # 중복 제거를 위한 롤링 윈도우
         self._signal_window: deque = deque(maxlen=1000)
         self._order_window: deque = deque(maxlen=1000)
@@ -383,12 +398,7 @@ class AuditableSignalManager:
     def _save_signal_record(self, record: ImmutableSignalRecord) -> bool:
         """신호 기록 저장"""
         try:
-            signal_file = self.signals_dir / f"{record.signal_id}.json"
-            
-            record_dict = asdict(record)
-            with open(signal_file, 'w', encoding='utf-8') as f:
-                json.dump(record_dict, f, indent=2, ensure_ascii=False)
-            
+            self.signal_journal.append(record.signal_id, asdict(record), ts=record.generated_at)
             return True
             
         except Exception as e:
@@ -398,12 +408,7 @@ class AuditableSignalManager:
     def _save_order_record(self, record: OrderIntentRecord) -> bool:
         """주문 기록 저장"""
         try:
-            order_file = self.orders_dir / f"{record.client_order_id}.json"
-            
-            record_dict = asdict(record)
-            with open(order_file, 'w', encoding='utf-8') as f:
-                json.dump(record_dict, f, indent=2, ensure_ascii=False)
-            
+            self.order_journal.append(record.client_order_id, asdict(record), ts=record.updated_at)
             return True
             
         except Exception as e:
@@ -411,15 +416,17 @@ class AuditableSignalManager:
             return False
     
     def _load_order_record(self, client_order_id: str) -> Optional[OrderIntentRecord]:
-        """주문 기록 로드"""
+        """주문 기록 로드 (저널 인덱스에서 한 번의 seek)"""
         try:
-            order_file = self.orders_dir / f"{client_order_id}.json"
-            
-            if not order_file.exists():
-                return None
+            record_dict = self.order_journal.get(client_order_id)
             
-            with open(order_file, 'r', encoding='utf-8') as f:
-                record_dict = json.load(f)
+            if record_dict is None:
+                # 저널 이전의 레코드별 파일
+                order_file = self.orders_dir / f"{client_order_id}.json"
+                if not order_file.exists():
+                    return None
+                with open(order_file, 'r', encoding='utf-8') as f:
+                    record_dict = json.load(f)
             
             return OrderIntentRecord(**record_dict)
             
@@ -440,21 +447,8 @@ class AuditableSignalManager:
                 'details': asdict(record) if hasattr(record, '__dict__') else str(record)
             }
             
-            # 감사 로그 파일에 저장
-            audit_file = self.audit_dir / f"audit_{int(current_time // 86400)}.json"  # 일별 파일
-            
-            # 기존 로그 로드
-            audit_logs = []
-            if audit_file.exists():
-                with open(audit_file, 'r', encoding='utf-8') as f:
-                    audit_logs = json.load(f)
-            
-            # 새 로그 추가
-            audit_logs.append(audit_entry)
-            
-            # 파일 저장
-            with open(audit_file, 'w', encoding='utf-8') as f:
-                json.dump(audit_logs, f, indent=2, ensure_ascii=False)
+            # 감사 저널에 추가 (기존 파일을 다시 쓰지 않음)
+            self.audit_journal.append(audit_entry['record_id'], audit_entry, ts=current_time)
             
             self._stats["audit_entries"] += 1
             
@@ -488,24 +482,43 @@ class AuditableSignalManager:
         """통계 반환"""
         return self._stats.copy()
     
+    def get_audit_log(self, since: float, until: Optional[float] = None) -> List[Dict[str, Any]]:
+        """기간별 감사 로그 반환 (시간 인덱스)"""
+        try:
+            entries = []
+            for _, ts, entry in self.audit_journal.since(since):
+                if until is not None and ts > until:
+                    break
+                entries.append(entry)
+            return entries
+            
+        except Exception as e:
+            self.logger.error(f"Audit log retrieval failed: {e}")
+            return []
+    
+    def _recent_records(self, journal: SegmentJournal, limit: int) -> List[Dict[str, Any]]:
+        """저널 끝에서부터 ID별 최신 기록 반환 (최신순)"""
+        records = []
+        seen: Set[str] = set()
+        for record_id, _, record_dict in journal.iter_recent(batch=max(1, min(limit, 1024))):
+            if record_id in seen:
+                continue
+            seen.add(record_id)
+            records.append(record_dict)
+            if len(records) >= limit:
+                break
+        return records
+    
     def get_recent_signals(self, limit: int = 100) -> List[ImmutableSignalRecord]:
         """최근 신호 기록 반환"""
         try:
             signals = []
             
-            # 신호 파일 목록 가져오기
-            signal_files = sorted(self.signals_dir.glob("*.json"), key=lambda x: x.stat().st_mtime, reverse=True)
-            
-            for signal_file in signal_files[:limit]:
+            for record_dict in self._recent_records(self.signal_journal, limit):
                 try:
-                    with open(signal_file, 'r', encoding='utf-8') as f:
-                        record_dict = json.load(f)
-                    
-                    signal = ImmutableSignalRecord(**record_dict)
-                    signals.append(signal)
-                    
+                    signals.append(ImmutableSignalRecord(**record_dict))
                 except Exception as e:
-                    self.logger.warning(f"Failed to load signal file {signal_file}: {e}")
+                    self.logger.warning(f"Failed to load signal record: {e}")
                     continue
             
             return signals
@@ -519,19 +532,11 @@ class AuditableSignalManager:
         try:
             orders = []
             
-            # 주문 파일 목록 가져오기
-            order_files = sorted(self.orders_dir.glob("*.json"), key=lambda x: x.stat().st_mtime, reverse=True)
-            
-            for order_file in order_files[:limit]:
+            for record_dict in self._recent_records(self.order_journal, limit):
                 try:
-                    with open(order_file, 'r', encoding='utf-8') as f:
-                        record_dict = json.load(f)
-                    
-                    order = OrderIntentRecord(**record_dict)
-                    orders.append(order)
-                    
+                    orders.append(OrderIntentRecord(**record_dict))
                 except Exception as e:
-                    self.logger.warning(f"Failed to load order file {order_file}: {e}")
+                    self.logger.warning(f"Failed to load order record: {e}")
                     continue
             
             return orders
@@ -1,6 +1,12 @@
 #!/usr/bin/env python3
 """
 Circuit Breaker & E-STOP - 글로벌 제어 평면
+
+Trip conditions are evaluated when their inputs arrive (order failures,
+exchange errors, heartbeats, PnL and schema violations), with sliding
+windows kept as bucketed ring counters. The monitor thread only sleeps
+until the next feeder heartbeat deadline or poll (E-STOP flag, StateBus).
+is_trading_allowed() reads a single state word without taking the lock.
 """
 
 import json
@@ -24,6 +30,11 @@ class CircuitBreakerState(Enum):
     HALF_OPEN = "HALF_OPEN"  # 부분 복구 시도
 
 
+# 상태 워드 비트 (0 = 거래 허용)
+_BLOCK_CIRCUIT = 1
+_BLOCK_ESTOP = 2
+
+
 class CircuitBreakerReason(Enum):
     """회로 차단기 트리거 이유"""
     FEEDER_LAG = "FEEDER_LAG"  # 피더 지연
@@ -46,6 +57,16 @@ class CircuitBreakerConfig:
     order_failure_threshold: int = 5  # 연속 실패 횟수
     order_failure_window: float = 300.0  # 5분 윈도우
     
+    # 거래소 오류 임계값
+    exchange_error_threshold: int = 3
+    exchange_error_window: float = 300.0  # 5분 윈도우
+    
+    # 슬라이딩 윈도우 버킷 수 (윈도우 / 버킷 = 시간 해상도)
+    window_buckets: int = 60
+    
+    # E-STOP 플래그 / 상태 버스 폴링 주기
+    poll_interval: float = 5.0
+    
     # 일일 손실 한도
     daily_loss_threshold: float = 1000.0  # USD
     
@@ -79,6 +100,57 @@ class CircuitBreakerStatus:
             self.active_conditions = []
 
 
+class RingCounter:
+    """버킷 링 기반 슬라이딩 윈도우 카운터 (add/count 상각 O(1))
+    
+    Events are counted in `buckets` fixed-width time buckets; the count
+    covers the current bucket and the buckets - 1 before it, i.e. the last
+    window - window/buckets to window seconds.
+    """
+    
+    def __init__(self, window: float, buckets: int = 60):
+        self.window = window
+        self.width = window / buckets
+        self._counts = [0] * buckets
+        self._head: Optional[int] = None  # 최신 버킷의 절대 인덱스
+        self._total = 0
+    
+    def _advance(self, now: float):
+        index = int(now // self.width)
+        if self._head is None:
+            self._head = index
+            return
+        steps = index - self._head
+        if steps <= 0:
+            return  # 같은 버킷 (또는 시계 역행)
+        size = len(self._counts)
+        if steps >= size:
+            self._counts = [0] * size
+            self._total = 0
+        else:
+            for i in range(self._head + 1, index + 1):
+                slot = i % size
+                self._total -= self._counts[slot]
+                self._counts[slot] = 0
+        self._head = index
+    
+    def add(self, now: float, n: int = 1) -> int:
+        """이벤트 추가 후 윈도우 내 개수 반환"""
+        self._advance(now)
+        self._counts[self._head % len(self._counts)] += n
+        self._total += n
+        return self._total
+    
+    def count(self, now: float) -> int:
+        """윈도우 내 개수"""
+        self._advance(now)
+        return self._total
+    
+    def clear(self):
+        self._counts = [0] * len(self._counts)
+        self._total = 0
+
+
 @dataclass
 class EStopStatus:
     """E-STOP 상태"""
@@ -108,13 +180,28 @@ class CircuitBreaker:
         self.cb_status = CircuitBreakerStatus()
         self.estop_status = EStopStatus()
         
-        # 모니터링 데이터
+        # 상태 워드: 0이면 거래 허용 (is_trading_allowed는 락 없이 읽음)
+        self._state_word = 0
+        
+        # 모니터링 데이터 (최근 기록 + 슬라이딩 윈도우 카운터)
         self._feeder_heartbeats: deque = deque(maxlen=100)
         self._order_failures: deque = deque(maxlen=100)
         self._exchange_errors: deque = deque(maxlen=100)
+        self._order_failure_counter = RingCounter(
+            self.cb_config.order_failure_window, self.cb_config.window_buckets
+        )
+        self._exchange_error_counter = RingCounter(
+            self.cb_config.exchange_error_window, self.cb_config.window_buckets
+        )
+        self._last_feeder_heartbeat = time.time()  # 첫 하트비트 유예: feeder_lag_threshold
+        self._realized_pnl_today = 0.0
+        self._schema_violations = 0
+        self._last_estop_flag: Optional[bool] = None  # 마지막으로 본 E_STOP 설정값
         
-        # 락
+        # 락 / 모니터 깨우기 / 중지 신호
         self._lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
         
         # 통계
         self._stats = {
@@ -133,11 +220,19 @@ class CircuitBreaker:
         # 복구 스레드
         self._recovery_thread: Optional[threading.Thread] = None
         self._recovery_running = False
+        
+        # 상태 버스 갱신 시 즉시 평가 (하트비트 / 일일 손익)
+        self.state_bus.add_listener("heartbeat", self._on_heartbeat)
+        self.state_bus.add_listener("risk", self._on_risk_update)
     
     def start(self):
         """회로 차단기 시작"""
         try:
+            # 상태 버스의 마지막 하트비트/손익으로 초기화
+            self._sync_from_state_bus()
+            
             # 모니터링 스레드 시작
+            self._stopped.clear()
             self._monitor_running = True
             self._monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
             self._monitor_thread.start()
@@ -157,6 +252,11 @@ class CircuitBreaker:
         try:
             self._monitor_running = False
             self._recovery_running = False
+            self._stopped.set()
+            self._wakeup.set()
+            
+            self.state_bus.remove_listener("heartbeat", self._on_heartbeat)
+            self.state_bus.remove_listener("risk", self._on_risk_update)
             
             if self._monitor_thread:
                 self._monitor_thread.join(timeout=5.0)
@@ -170,27 +270,36 @@ class CircuitBreaker:
             self.logger.error(f"Failed to stop Circuit Breaker: {e}")
     
     def _monitor_loop(self):
-        """모니터링 루프"""
+        """모니터링 루프: 다음 하트비트 마감 또는 폴링 주기까지 대기"""
+        next_poll = 0.0
         while self._monitor_running:
             try:
                 current_time = time.time()
                 
-                # E-STOP 상태 확인
-                self._check_estop_status()
-                
-                # 회로 차단기 상태 확인
-                if self.cb_status.state == CircuitBreakerState.CLOSED:
-                    self._check_circuit_breaker_conditions()
+                if current_time >= next_poll:
+                    # E-STOP 플래그 / 상태 버스 (다른 경로로 갱신되는 입력)
+                    self._check_estop_status()
+                    self._sync_from_state_bus()
+                    next_poll = current_time + self.cb_config.poll_interval
                 
-                # 상태 버스에 업데이트
-                self._update_state_bus()
+                # 피더 하트비트 마감 확인 (마감이 지났으면 상태 버스 하트비트를 다시 읽고 판단)
+                if (self.cb_status.state == CircuitBreakerState.CLOSED and
+                        time.time() - self._last_feeder_heartbeat > self.cb_config.feeder_lag_threshold):
+                    self._sync_from_state_bus()
+                    if self._check_feeder_lag():
+                        self._evaluate(CircuitBreakerReason.FEEDER_LAG, "feeder_lag")
                 
-                # 5초마다 모니터링
-                time.sleep(5.0)
+                deadline = next_poll
+                if self.cb_status.state == CircuitBreakerState.CLOSED:
+                    deadline = min(deadline, self._last_feeder_heartbeat + self.cb_config.feeder_lag_threshold)
+                timeout = deadline - time.time()
+                if timeout > 0:
+                    self._wakeup.wait(timeout)
+                self._wakeup.clear()
                 
             except Exception as e:
                 self.logger.error(f"Circuit breaker monitor error: {e}")
-                time.sleep(5.0)
+                time.sleep(self.cb_config.poll_interval)
     
     def _recovery_loop(self):
         """복구 루프"""
@@ -212,88 +321,96 @@ class CircuitBreaker:
                     self._auto_reset()
                 
                 # 30초마다 복구 시도
-                time.sleep(30.0)
+                self._stopped.wait(30.0)
                 
             except Exception as e:
                 self.logger.error(f"Circuit breaker recovery error: {e}")
-                time.sleep(30.0)
+                self._stopped.wait(30.0)
     
-    def _check_estop_status(self):
-        """E-STOP 상태 확인"""
+    def _set_state_word(self):
+        """상태 워드 갱신 (락 보유 상태에서 호출)"""
+        word = 0
+        if self.cb_status.state == CircuitBreakerState.OPEN:
+            word |= _BLOCK_CIRCUIT
+        if self.estop_status.active:
+            word |= _BLOCK_ESTOP
+        self._state_word = word
+    
+    def _sync_from_state_bus(self):
+        """상태 버스의 피더 하트비트 / 일일 손익 반영"""
         try:
-            # 가드레일에서 E-STOP 상태 확인
-            estop_active = self.config.E_STOP
-            
-            if estop_active != self.estop_status.active:
-                if estop_active:
-                    # E-STOP 활성화
-                    self.estop_status.active = True
-                    self.estop_status.triggered_at = time.time()
-                    self.estop_status.triggered_by = "system"
-                    self.estop_status.reason = "E-STOP flag enabled"
-                    
-                    self._stats["estop_activations"] += 1
-                    self.logger.warning("E-STOP ACTIVATED - All trading halted")
-                else:
-                    # E-STOP 비활성화
-                    self.estop_status.active = False
-                    self.logger.info("E-STOP DEACTIVATED - Trading resumed")
-            
-            self.estop_status.last_check = time.time()
+            heartbeat = self.state_bus.get_service_status("feeder")
+            if heartbeat and heartbeat.ts > self._last_feeder_heartbeat:
+                self._last_feeder_heartbeat = heartbeat.ts
             
+            risk = self.state_bus.get_state().risk
+            if risk is not None:
+                self.update_pnl(risk.realized_pnl_today)
+                
         except Exception as e:
-            self.logger.error(f"Failed to check E-STOP status: {e}")
+            self.logger.error(f"Failed to sync from state bus: {e}")
+    
+    def _on_heartbeat(self, service: str, heartbeat):
+        """상태 버스 하트비트 리스너"""
+        self.record_heartbeat(service, heartbeat.ts)
+    
+    def _on_risk_update(self, risk):
+        """상태 버스 리스크 리스너"""
+        self.update_pnl(risk.realized_pnl_today)
     
-    def _check_circuit_breaker_conditions(self):
-        """회로 차단기 조건 확인"""
+    def _check_estop_status(self):
+        """E-STOP 상태 확인 (설정 플래그가 바뀔 때만 반영)"""
         try:
-            current_time = time.time()
-            active_conditions = []
-            
-            # 1. 피더 지연 확인
-            if self._check_feeder_lag():
-                active_conditions.append("feeder_lag")
-            
-            # 2. 주문 실패 확인
-            if self._check_order_failures():
-                active_conditions.append("order_failures")
-            
-            # 3. 거래소 오류 확인
-            if self._check_exchange_errors():
-                active_conditions.append("exchange_errors")
-            
-            # 4. 일일 손실 한도 확인
-            if self._check_daily_loss_limit():
-                active_conditions.append("daily_loss_limit")
-            
-            # 5. 스키마 위반 확인
-            if self._check_schema_violations():
-                active_conditions.append("schema_violations")
+            # 가드레일에서 E-STOP 상태 확인
+            estop_flag = bool(self.config.E_STOP)
             
-            # 조건이 활성화된 경우 회로 차단기 트리거
-            if active_conditions:
-                self._trigger_circuit_breaker(
-                    reason=CircuitBreakerReason.SYSTEM_ERROR,
-                    details=f"Active conditions: {', '.join(active_conditions)}"
-                )
+            if estop_flag != self._last_estop_flag:
+                self._last_estop_flag = estop_flag
+                if estop_flag:
+                    self.activate_estop("system", "E-STOP flag enabled")
+                elif self.estop_status.triggered_by == "system":
+                    # 플래그가 건 E-STOP만 해제 (수동/이벤트 E-STOP은 유지)
+                    self.deactivate_estop()
             
-            # 활성 조건 업데이트
-            self.cb_status.active_conditions = active_conditions
+            self.estop_status.last_check = time.time()
             
         except Exception as e:
-            self.logger.error(f"Failed to check circuit breaker conditions: {e}")
+            self.logger.error(f"Failed to check E-STOP status: {e}")
+    
+    def activate_estop(self, triggered_by: str = "manual", reason: str = ""):
+        """E-STOP 활성화 (즉시 거래 차단)"""
+        with self._lock:
+            if self.estop_status.active:
+                return
+            self.estop_status.active = True
+            self.estop_status.triggered_at = time.time()
+            self.estop_status.triggered_by = triggered_by
+            self.estop_status.reason = reason
+            self._set_state_word()
+            self._stats["estop_activations"] += 1
+        self.logger.warning("E-STOP ACTIVATED - All trading halted")
+    
+    def deactivate_estop(self):
+        """E-STOP 비활성화"""
+        with self._lock:
+            if not self.estop_status.active:
+                return
+            self.estop_status.active = False
+            self._set_state_word()
+        self.logger.info("E-STOP DEACTIVATED - Trading resumed")
+    
+    def _evaluate(self, reason: CircuitBreakerReason, condition: str):
+        """입력 도착 시 조건 평가: 활성 조건 기록 후 회로 차단기 트리거"""
+        with self._lock:
+            if condition not in self.cb_status.active_conditions:
+                self.cb_status.active_conditions = self.cb_status.active_conditions + [condition]
+        self._trigger_circuit_breaker(reason=reason, details=f"Active conditions: {condition}")
     
     def _check_feeder_lag(self) -> bool:
-        """피더 지연 확인"""
+        """피더 지연 확인 (하트비트가 없으면 시작 시점부터 지연으로 간주)"""
         try:
-            # 상태 버스에서 피더 하트비트 확인
-            feeder_heartbeat = self.state_bus.get_service_heartbeat("feeder")
-            if not feeder_heartbeat:
-                return True  # 피더 하트비트가 없으면 지연으로 간주
-            
             current_time = time.time()
-            last_heartbeat = feeder_heartbeat.get('ts', 0)
-            lag = current_time - last_heartbeat
+            lag = current_time - self._last_feeder_heartbeat
             
             if lag > self.cb_config.feeder_lag_threshold:
                 self.logger.warning(f"Feeder lag detected: {lag:.1f}s > {self.cb_config.feeder_lag_threshold}s")
@@ -308,16 +425,11 @@ class CircuitBreaker:
     def _check_order_failures(self) -> bool:
         """주문 실패 확인"""
         try:
-            current_time = time.time()
-            
-            # 최근 주문 실패 확인
-            recent_failures = [
-                failure for failure in self._order_failures
-                if current_time - failure['timestamp'] < self.cb_config.order_failure_window
-            ]
+            with self._lock:
+                recent_failures = self._order_failure_counter.count(time.time())
             
-            if len(recent_failures) >= self.cb_config.order_failure_threshold:
-                self.logger.warning(f"Order failure threshold exceeded: {len(recent_failures)} failures in {self.cb_config.order_failure_window}s")
+            if recent_failures >= self.cb_config.order_failure_threshold:
+                self.logger.warning(f"Order failure threshold exceeded: {recent_failures} failures in {self.cb_config.order_failure_window}s")
                 return True
             
             return False
@@ -329,16 +441,11 @@ class CircuitBreaker:
     def _check_exchange_errors(self) -> bool:
         """거래소 오류 확인"""
         try:
-            current_time = time.time()
-            
-            # 최근 거래소 오류 확인
-            recent_errors = [
-                error for error in self._exchange_errors
-                if current_time - error['timestamp'] < 300.0  # 5분 윈도우
-            ]
+            with self._lock:
+                recent_errors = self._exchange_error_counter.count(time.time())
             
-            if len(recent_errors) >= 3:  # 5분 내 3회 이상 오류
-                self.logger.warning(f"Exchange error threshold exceeded: {len(recent_errors)} errors in 5 minutes")
+            if recent_errors >= self.cb_config.exchange_error_threshold:
+                self.logger.warning(f"Exchange error threshold exceeded: {recent_errors} errors in {self.cb_config.exchange_error_window}s")
                 return True
             
             return False
@@ -350,9 +457,7 @@ class CircuitBreaker:
     def _check_daily_loss_limit(self) -> bool:
         """일일 손실 한도 확인"""
         try:
-            # 상태 버스에서 리스크 데이터 확인
-            risk_data = self.state_bus.get_risk_data()
-            realized_pnl = risk_data.get('realized_pnl_today', 0.0)
+            realized_pnl = self._realized_pnl_today
             
             if realized_pnl < -self.cb_config.daily_loss_threshold:
                 self.logger.warning(f"Daily loss limit exceeded: {realized_pnl} < -{self.cb_config.daily_loss_threshold}")
@@ -364,44 +469,26 @@ class CircuitBreaker:
             self.logger.error(f"Failed to check daily loss limit: {e}")
             return False
     
-    def _check_schema_violations(self) -> bool:
-        """스키마 위반 확인"""
-        try:
-            # 상태 버스에서 스키마 위반 확인
-            state_data = self.state_bus.get_state()
-            if state_data.get('schema_violations', 0) > 0:
-                self.logger.warning("Schema violations detected")
-                return True
-            
-            return False
-            
-        except Exception as e:
-            self.logger.error(f"Failed to check schema violations: {e}")
-            return False
-    
     def _trigger_circuit_breaker(self, reason: CircuitBreakerReason, details: str = ""):
         """회로 차단기 트리거"""
         try:
             with self._lock:
-                if self.cb_status.state == CircuitBreakerState.CLOSED:
-                    self.cb_status.state = CircuitBreakerState.OPEN
-                    self.cb_status.reason = reason
-                    self.cb_status.triggered_at = time.time()
-                    self.cb_status.last_trigger_reason = details
-                    self.cb_status.trigger_count += 1
-                    
-                    self._stats["circuit_breaker_trips"] += 1
-                    self._stats["last_trip_time"] = time.time()
-                    
-                    self.logger.error(f"CIRCUIT BREAKER TRIGGERED: {reason.value} - {details}")
-                    
-                    # 상태 버스에 업데이트
-                    self.state_bus.update_circuit_breaker(
-                        active=True,
-                        reason=reason.value,
-                        since_ts=self.cb_status.triggered_at,
-                        details=details
-                    )
+                if self.cb_status.state != CircuitBreakerState.CLOSED:
+                    return
+                self.cb_status.state = CircuitBreakerState.OPEN
+                self._set_state_word()
+                self.cb_status.reason = reason
+                self.cb_status.triggered_at = time.time()
+                self.cb_status.last_trigger_reason = details
+                self.cb_status.trigger_count += 1
+                
+                self._stats["circuit_breaker_trips"] += 1
+                self._stats["last_trip_time"] = self.cb_status.triggered_at
+            
+            self.logger.error(f"CIRCUIT BREAKER TRIGGERED: {reason.value} - {details}")
+            
+            # 상태 버스에 업데이트 (거래 차단 이후, 락 밖에서)
+            self.state_bus.set_circuit_breaker(active=True, reason=reason.value)
             
         except Exception as e:
             self.logger.error(f"Failed to trigger circuit breaker: {e}")
@@ -415,6 +502,8 @@ class CircuitBreaker:
                     self.cb_status.recovery_attempts += 1
                     self.cb_status.last_recovery_attempt = time.time()
                     
+                    self._set_state_word()
+                    
                     self._stats["recovery_attempts"] += 1
                     self.logger.info(f"Circuit breaker recovery attempt {self.cb_status.recovery_attempts}")
                     
@@ -424,6 +513,7 @@ class CircuitBreaker:
                     else:
                         # 복구 실패, 다시 열림
                         self.cb_status.state = CircuitBreakerState.OPEN
+                        self._set_state_word()
                         self.cb_status.triggered_at = time.time()
                         self.logger.warning("Circuit breaker recovery failed, remaining open")
             
@@ -463,22 +553,19 @@ class CircuitBreaker:
         try:
             with self._lock:
                 self.cb_status.state = CircuitBreakerState.CLOSED
+                self._set_state_word()
                 self.cb_status.reason = None
                 self.cb_status.last_trigger_reason = ""
                 self.cb_status.active_conditions = []
+                self._schema_violations = 0
                 
                 self._stats["recovery_successes"] += 1
                 self._stats["last_recovery_time"] = time.time()
-                
-                self.logger.info("Circuit breaker reset - Trading resumed")
-                
-                # 상태 버스에 업데이트
-                self.state_bus.update_circuit_breaker(
-                    active=False,
-                    reason="",
-                    since_ts=0.0,
-                    details=""
-                )
+            
+            self.logger.info("Circuit breaker reset - Trading resumed")
+            
+            # 상태 버스에 업데이트
+            self.state_bus.set_circuit_breaker(active=False)
             
         except Exception as e:
             self.logger.error(f"Failed to reset circuit breaker: {e}")
@@ -494,54 +581,64 @@ class CircuitBreaker:
         except Exception as e:
             self.logger.error(f"Failed to auto-reset circuit breaker: {e}")
     
-    def _update_state_bus(self):
-        """상태 버스 업데이트"""
-        try:
-            # 회로 차단기 상태 업데이트
-            self.state_bus.update_circuit_breaker(
-                active=self.cb_status.state == CircuitBreakerState.OPEN,
-                reason=self.cb_status.reason.value if self.cb_status.reason else "",
-                since_ts=self.cb_status.triggered_at,
-                details=self.cb_status.last_trigger_reason
-            )
-            
-            # E-STOP 상태 업데이트
-            self.state_bus.update_estop(
-                active=self.estop_status.active,
-                triggered_at=self.estop_status.triggered_at,
-                triggered_by=self.estop_status.triggered_by,
-                reason=self.estop_status.reason
-            )
-            
-        except Exception as e:
-            self.logger.error(f"Failed to update state bus: {e}")
-    
     def record_order_failure(self, order_id: str, error: str):
-        """주문 실패 기록"""
+        """주문 실패 기록 (임계값 도달 시 즉시 트리거)"""
         try:
+            current_time = time.time()
             with self._lock:
                 self._order_failures.append({
                     'order_id': order_id,
                     'error': error,
-                    'timestamp': time.time()
+                    'timestamp': current_time
                 })
+                recent_failures = self._order_failure_counter.add(current_time)
+            
+            if recent_failures >= self.cb_config.order_failure_threshold:
+                self._evaluate(CircuitBreakerReason.ORDER_FAILURE, "order_failures")
             
         except Exception as e:
             self.logger.error(f"Failed to record order failure: {e}")
     
     def record_exchange_error(self, error: str, details: str = ""):
-        """거래소 오류 기록"""
+        """거래소 오류 기록 (임계값 도달 시 즉시 트리거)"""
         try:
+            current_time = time.time()
             with self._lock:
                 self._exchange_errors.append({
                     'error': error,
                     'details': details,
-                    'timestamp': time.time()
+                    'timestamp': current_time
                 })
+                recent_errors = self._exchange_error_counter.add(current_time)
+            
+            if recent_errors >= self.cb_config.exchange_error_threshold:
+                self._evaluate(CircuitBreakerReason.EXCHANGE_ERROR, "exchange_errors")
             
         except Exception as e:
             self.logger.error(f"Failed to record exchange error: {e}")
     
+    def record_heartbeat(self, service: str = "feeder", ts: float = None):
+        """서비스 하트비트 기록 (피더 지연 마감 연장)"""
+        if service != "feeder":
+            return
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            self._feeder_heartbeats.append(ts)
+            if ts > self._last_feeder_heartbeat:
+                self._last_feeder_heartbeat = ts
+    
+    def update_pnl(self, realized_pnl_today: float):
+        """일일 실현 손익 갱신 (손실 한도 초과 시 즉시 트리거)"""
+        self._realized_pnl_today = realized_pnl_today
+        if realized_pnl_today < -self.cb_config.daily_loss_threshold:
+            self._evaluate(CircuitBreakerReason.DAILY_LOSS_LIMIT, "daily_loss_limit")
+    
+    def record_schema_violation(self, details: str = ""):
+        """스키마 위반 기록 (즉시 트리거)"""
+        with self._lock:
+            self._schema_violations += 1
+        self._evaluate(CircuitBreakerReason.SCHEMA_VIOLATION, "schema_violations")
+    
     def manual_trigger(self, reason: str, details: str = ""):
         """수동 트리거"""
         try:
@@ -562,21 +659,8 @@ class CircuitBreaker:
             self.logger.error(f"Failed to manual reset circuit breaker: {e}")
     
     def is_trading_allowed(self) -> bool:
-        """거래 허용 여부 확인"""
-        try:
-            # E-STOP 확인
-            if self.estop_status.active:
-                return False
-            
-            # 회로 차단기 확인
-            if self.cb_status.state == CircuitBreakerState.OPEN:
-                return False
-            
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Failed to check trading allowed: {e}")
-            return False
+        """거래 허용 여부 확인 (상태 워드 1회 읽기, 락 없음)"""
+        return self._state_word == 0
     
     def get_status(self) -> Dict[str, Any]:
         """상태 반환"""
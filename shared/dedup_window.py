@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Dedup Window - time-ordered duplicate detection with O(1) expiry
+
+Keys live in an OrderedDict in insertion (= time) order, so expiring is
+popping from the front until the oldest key is inside the window, and the
+max_keys cap always evicts the oldest key, never a fresh one. Insert, check
+and expire are O(1) amortized.
+
+With persist_path every insert is appended as "<ts>\\t<key>" to a small
+log; on open the log is replayed (expired keys skipped), and once it holds
+more than twice the live keys it is rewritten with just the live ones.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+# Log lines below which the persistence log is never compacted
+_COMPACT_MIN_LINES = 10_000
+
+
+class DedupWindow:
+    """Set of recently seen keys that forgets keys older than window_sec"""
+
+    def __init__(self, window_sec: float, max_keys: Optional[int] = None,
+                 persist_path: Optional[Union[str, Path]] = None,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            window_sec: How long a key is remembered after it was added
+            max_keys: Cap on remembered keys (oldest evicted first; None: no cap)
+            persist_path: Append-only log replayed on open (None: memory only)
+            clock: Time source (wall clock, so persisted timestamps survive restarts)
+        """
+        self.window_sec = window_sec
+        self.max_keys = max_keys
+        self.persist_path = Path(persist_path) if persist_path else None
+        self.clock = clock
+
+        self._keys: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._file = None
+        self._log_lines = 0
+        self._stats = {"added": 0, "duplicates": 0, "expired": 0, "evicted": 0,
+                       "restored": 0, "compactions": 0}
+        if self.persist_path:
+            self._restore()
+
+    # ------------------------------------------------------------------
+    # Core
+
+    def _expire(self, now: float):
+        cutoff = now - self.window_sec
+        keys = self._keys
+        while keys:
+            key, ts = next(iter(keys.items()))
+            if ts > cutoff:
+                break
+            keys.popitem(last=False)
+            self._stats["expired"] += 1
+
+    def _insert(self, key: str, now: float):
+        keys = self._keys
+        if key in keys:
+            keys.move_to_end(key)
+        keys[key] = now
+        if self.max_keys is not None:
+            while len(keys) > self.max_keys:
+                keys.popitem(last=False)
+                self._stats["evicted"] += 1
+        self._stats["added"] += 1
+        if self.persist_path:
+            self._log(key, now)
+
+    def seen(self, key: str, now: Optional[float] = None) -> bool:
+        """True if key was added within the window"""
+        with self._lock:
+            self._expire(self.clock() if now is None else now)
+            return key in self._keys
+
+    def add(self, key: str, now: Optional[float] = None):
+        """Remember key (re-adding restarts its window)"""
+        with self._lock:
+            now = self.clock() if now is None else now
+            self._expire(now)
+            self._insert(key, now)
+
+    def check_and_add(self, key: str, now: Optional[float] = None) -> bool:
+        """True if key is a duplicate; otherwise remember it and return False
+
+        A duplicate does not restart the window of the original key.
+        """
+        with self._lock:
+            now = self.clock() if now is None else now
+            self._expire(now)
+            if key in self._keys:
+                self._stats["duplicates"] += 1
+                return True
+            self._insert(key, now)
+            return False
+
+    def __contains__(self, key: str) -> bool:
+        return self.seen(key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire(self.clock())
+            return len(self._keys)
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+            if self.persist_path:
+                self._rewrite()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "keys": len(self._keys), "log_lines": self._log_lines}
+
+    # ------------------------------------------------------------------
+    # Persistence
+
+    def _restore(self):
+        try:
+            f = open(self.persist_path, "r", encoding="utf-8")
+        except OSError:
+            return
+        with f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # torn last write
+                ts, sep, key = line.rstrip("\n").partition("\t")
+                if not sep:
+                    continue
+                try:
+                    ts = float(ts)
+                except ValueError:
+                    continue
+                self._log_lines += 1
+                if key in self._keys:
+                    self._keys.move_to_end(key)
+                self._keys[key] = ts
+        self._expire(self.clock())
+        if self.max_keys is not None:
+            while len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+        self._stats["restored"] = len(self._keys)
+        # drop expired lines and any torn tail before appending
+        self._rewrite()
+
+    def _log(self, key: str, ts: float):
+        if self._log_lines > _COMPACT_MIN_LINES and self._log_lines > 2 * len(self._keys):
+            self._rewrite()
+            return
+        try:
+            if self._file is None:
+                self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.persist_path, "a", encoding="utf-8")
+            self._file.write(f"{ts!r}\t{key}\n")
+            self._file.flush()
+            self._log_lines += 1
+        except OSError as e:
+            print(f"[ERROR] DedupWindow persist: {e}")
+
+    def _rewrite(self):
+        """Replace the log with one line per live key"""
+        self._close_file()
+        temp = self.persist_path.with_name(self.persist_path.name + ".tmp")
+        try:
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp, "w", encoding="utf-8") as f:
+                f.writelines(f"{ts!r}\t{key}\n" for key, ts in self._keys.items())
+            os.replace(temp, self.persist_path)
+        except OSError as e:
+            print(f"[ERROR] DedupWindow compact: {e}")
+            return
+        self._log_lines = len(self._keys)
+        self._stats["compactions"] += 1
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        with self._lock:
+            self._close_file()
@@ -1,16 +1,24 @@
 #!/usr/bin/env python3
 """
-Doctor Runner - Read-only sequential lightweight system checker
+Doctor Runner - Read-only concurrent lightweight system checker
+
+체크는 의존성 그래프로 정의되고, 독립적인 체크는 워커 스레드에서 동시에
+실행됩니다. 각 체크에는 데드라인이 있어 멈춘 프로브 하나가 전체 진단을
+막지 않으며, 진행 상황은 체크가 끝나는 즉시 기록됩니다. 비싼 체크
+(프로세스 스캔, 계좌 스냅샷, 리소스)는 짧은 TTL 동안 결과를 재사용합니다.
 """
 
 import json
 import os
+import queue
 import sys
+import threading
 import time
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import psutil
 
@@ -24,15 +32,62 @@ from shared.atomic_io import (append_ndjson_atomic, read_json_atomic,
 from shared.environment_guardrails import (check_service_pid_lock,
                                            get_repo_paths)
 
+CheckResult = Tuple[bool, Dict[str, Any]]
+
+# 체크별 기본 데드라인 / 동시 실행 워커 수
+DEFAULT_CHECK_TIMEOUT_SEC = float(os.getenv("DOCTOR_CHECK_TIMEOUT_SEC", "5"))
+DEFAULT_MAX_WORKERS = int(os.getenv("DOCTOR_MAX_WORKERS", "4"))
+
+# 비싼 체크 결과 캐시 (UI 버튼을 연달아 눌러도 재실행하지 않음) - 프로세스 단위
+_CHECK_CACHE: Dict[str, Tuple[float, bool, Dict[str, Any]]] = {}
+_CHECK_CACHE_LOCK = threading.Lock()
+
+
+@dataclass
+class DoctorCheck:
+    """Doctor 체크 정의 (의존성 그래프의 노드)"""
+    name: str
+    func: Callable[[], CheckResult]
+    depends_on: Tuple[str, ...] = ()
+    timeout_sec: float = DEFAULT_CHECK_TIMEOUT_SEC
+    cache_ttl_sec: float = 0.0
+
+
+def _get_cached_result(name: str, ttl_sec: float) -> Optional[Tuple[float, bool, Dict[str, Any]]]:
+    """TTL 내의 캐시된 체크 결과 (cached_at, success, details)"""
+    with _CHECK_CACHE_LOCK:
+        cached = _CHECK_CACHE.get(name)
+    if cached and time.time() - cached[0] <= ttl_sec:
+        return cached
+    return None
+
+
+def _store_cached_result(name: str, success: bool, details: Dict[str, Any]):
+    with _CHECK_CACHE_LOCK:
+        _CHECK_CACHE[name] = (time.time(), success, dict(details or {}))
+
+
+def clear_check_cache():
+    """캐시된 체크 결과 모두 삭제"""
+    with _CHECK_CACHE_LOCK:
+        _CHECK_CACHE.clear()
+
 
 class DoctorRunner:
     """Doctor Runner - 읽기 전용 시스템 진단"""
     
-    def __init__(self):
+    def __init__(self, on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 max_workers: Optional[int] = None):
         self.paths = get_repo_paths()
         self.run_id = str(uuid.uuid4())[:8]
         self.start_time = time.time()
         self.steps = []
+        self.on_progress = on_progress
+        self.max_workers = max(1, max_workers or DEFAULT_MAX_WORKERS)
+        
+        # health.json은 여러 체크가 공유 - 실행당 한 번만 읽기
+        self._health_data: Optional[Dict[str, Any]] = None
+        self._health_lock = threading.Lock()
         self.progress_file = self.paths["shared_data"] / "doctor" / f"run_{self.run_id}.ndjson"
         self.summary_file = self.paths["shared_data"] / "doctor" / "summary.json"
         self.lock_file = self.paths["shared_data"] / "doctor" / "doctor.lock"
@@ -59,8 +114,8 @@ class DoctorRunner:
                 "timestamp": time.time()
             })
             
-            # 3. 순차적 체크 실행
-            success = self._run_sequential_checks(mode)
+            # 3. 의존성 그래프 순서로 동시 체크 실행
+            success = self._run_checks(mode)
             
             # 4. 결과 요약 생성
             self._generate_summary()
@@ -105,80 +160,140 @@ class DoctorRunner:
         """진행 상황 기록"""
         data["run_id"] = self.run_id
         append_ndjson_atomic(self.progress_file, data)
+        if self.on_progress:
+            try:
+                self.on_progress(data)
+            except Exception as e:
+                print(f"Progress callback failed: {e}")
     
-    def _run_sequential_checks(self, mode: str) -> bool:
-        """순차적 체크 실행"""
-        checks = [
-            ("env_parity", self._check_environment_parity),
-            ("duplicate_instances", self._check_duplicate_instances),
-            ("health_snapshot", self._check_health_snapshot),
-            ("feeder", self._check_feeder),
-            ("uds", self._check_uds),
-            ("ares", self._check_ares),
-            ("trader_guardrails", self._check_trader_guardrails),
-            ("account_snapshot", self._check_account_snapshot),
-            ("autoheal", self._check_autoheal),
-            ("resources", self._check_resources)
+    def _build_checks(self) -> List[DoctorCheck]:
+        """체크 그래프 정의 (선언 순서 = 보고서 순서)"""
+        return [
+            DoctorCheck("env_parity", self._check_environment_parity),
+            DoctorCheck("duplicate_instances", self._check_duplicate_instances,
+                        timeout_sec=10.0, cache_ttl_sec=30.0),
+            DoctorCheck("health_snapshot", self._check_health_snapshot),
+            DoctorCheck("feeder", self._check_feeder),
+            DoctorCheck("uds", self._check_uds, depends_on=("health_snapshot",)),
+            DoctorCheck("ares", self._check_ares),
+            DoctorCheck("trader_guardrails", self._check_trader_guardrails, depends_on=("health_snapshot",)),
+            DoctorCheck("account_snapshot", self._check_account_snapshot, cache_ttl_sec=15.0),
+            DoctorCheck("autoheal", self._check_autoheal, depends_on=("health_snapshot",)),
+            DoctorCheck("resources", self._check_resources, cache_ttl_sec=30.0),
         ]
+    
+    def _run_checks(self, mode: str) -> bool:
+        """
+        의존성이 해결된 체크를 워커 스레드로 동시 실행
         
+        - 체크별 데드라인 초과 시 fail(timed_out) 처리 후 다음 체크 진행
+          (멈춘 스레드는 daemon이라 프로세스 종료를 막지 않음)
+        - 의존 체크가 끝나지 못하면(타임아웃/예외) 후속 체크는 skip
+        - mode="full"이면 캐시를 무시하고 모두 새로 실행
+        """
+        checks = self._build_checks()
+        order = {check.name: i for i, check in enumerate(checks)}
+        pending = {check.name: check for check in checks}
+        running: Dict[str, Tuple[DoctorCheck, float]] = {}
+        incomplete = set()
+        results: "queue.Queue[Tuple[str, bool, Optional[Dict[str, Any]], Optional[Exception]]]" = queue.Queue()
+        use_cache = mode != "full"
         total_steps = len(checks)
-        all_passed = True
         
-        for i, (step_name, check_func) in enumerate(checks):
-            pct = int((i / total_steps) * 100)
-            
-            # running 상태 기록
-            self._write_progress({
-                "step": step_name,
-                "status": "running",
-                "msg_ko": self._get_step_message(step_name),
-                "pct": pct,
-                "timestamp": time.time()
-            })
-            
-            # 체크 실행
+        def worker(check: DoctorCheck):
             try:
-                success, details = check_func()
-                status = "pass" if success else "fail"
-                
-                if not success:
-                    all_passed = False
-                
-                # 결과 기록
-                result = {
-                    "step": step_name,
-                    "status": status,
-                    "pct": pct,
-                    "timestamp": time.time()
-                }
-                
-                if details:
-                    result.update(details)
+                success, details = check.func()
+                results.put((check.name, success, details, None))
+            except Exception as e:
+                results.put((check.name, False, None, e))
+        
+        def record(result: Dict[str, Any]):
+            self.steps.append(result)
+            result["pct"] = int(len(self.steps) / total_steps * 100)
+            result["timestamp"] = time.time()
+            self._write_progress(dict(result))
+        
+        while pending or running:
+            # 의존성이 모두 끝난 체크 시작
+            for name in list(pending):
+                if len(running) >= self.max_workers:
+                    break
+                check = pending[name]
+                if any(dep in pending or dep in running for dep in check.depends_on):
+                    continue
+                del pending[name]
                 
-                self._write_progress(result)
-                self.steps.append(result)
+                blocked = [dep for dep in check.depends_on if dep in incomplete]
+                if blocked:
+                    incomplete.add(name)
+                    record({"step": name, "status": "skip",
+                            "reason": f"dependency did not complete: {blocked}"})
+                    continue
                 
-                # 50-100ms 간격
-                time.sleep(0.075)
+                cached = _get_cached_result(name, check.cache_ttl_sec) if use_cache and check.cache_ttl_sec else None
+                if cached:
+                    cached_at, success, details = cached
+                    record({"step": name, "status": "pass" if success else "fail", **details,
+                            "cached": True, "cache_age_sec": round(time.time() - cached_at, 1)})
+                    continue
                 
-            except Exception as e:
-                # 오류 처리
                 self._write_progress({
-                    "step": step_name,
-                    "status": "fail",
-                    "reason": str(e),
-                    "pct": pct,
+                    "step": name,
+                    "status": "running",
+                    "msg_ko": self._get_step_message(name),
+                    "pct": int(len(self.steps) / total_steps * 100),
                     "timestamp": time.time()
                 })
-                all_passed = False
-                self.steps.append({
-                    "step": step_name,
-                    "status": "fail",
-                    "reason": str(e),
-                    "pct": pct
-                })
+                running[name] = (check, time.monotonic() + check.timeout_sec)
+                threading.Thread(target=worker, args=(check,), name=f"doctor-{name}", daemon=True).start()
+            
+            if not running:
+                if pending:
+                    # 해결 불가능한 의존성 (순환/미정의)
+                    for name in list(pending):
+                        incomplete.add(name)
+                        record({"step": name, "status": "skip", "reason": "unresolvable dependency"})
+                    pending.clear()
+                continue
+            
+            next_deadline = min(deadline for _, deadline in running.values())
+            try:
+                name, success, details, error = results.get(timeout=max(0.0, next_deadline - time.monotonic()))
+            except queue.Empty:
+                now = time.monotonic()
+                for name, (check, deadline) in list(running.items()):
+                    if deadline <= now:
+                        del running[name]
+                        incomplete.add(name)
+                        record({"step": name, "status": "fail", "timed_out": True,
+                                "reason": f"check exceeded {check.timeout_sec:.1f}s deadline",
+                                "hint_ko": "응답 없는 점검 항목입니다. 해당 서비스를 확인하세요."})
+                continue
+            
+            if name not in running:
+                continue  # 데드라인 이후 도착한 결과는 무시
+            check, _ = running.pop(name)
+            
+            if error is not None:
+                incomplete.add(name)
+                record({"step": name, "status": "fail", "reason": str(error)})
+                continue
+            
+            details = details or {}
+            if check.cache_ttl_sec:
+                _store_cached_result(name, success, details)
+            record({"step": name, "status": "pass" if success else "fail", **details})
         
-        return all_passed
+        # 보고서는 선언 순서 유지
+        self.steps.sort(key=lambda step: order.get(step.get("step"), len(order)))
+        return all(step.get("status") == "pass" for step in self.steps)
+    
+    def _health_json(self) -> Dict[str, Any]:
+        """health.json (실행당 한 번 읽고 공유)"""
+        with self._health_lock:
+            if self._health_data is None:
+                self._health_data = read_json_atomic(self.paths["shared_data"] / "health.json", {}) or {}
+            return self._health_data
     
     def _get_step_message(self, step_name: str) -> str:
         """단계별 한국어 메시지"""
@@ -291,7 +406,7 @@ class DoctorRunner:
                 }
             
             # JSON 파싱 확인
-            health_data = read_json_atomic(health_file, {})
+            health_data = self._health_json()
             if not health_data:
                 return False, {
                     "reason": "health.json parse failed",
@@ -370,7 +485,7 @@ class DoctorRunner:
     def _check_uds(self) -> Tuple[bool, Dict[str, Any]]:
         """UDS 체크"""
         try:
-            health_data = read_json_atomic(self.paths["shared_data"] / "health.json", {})
+            health_data = self._health_json()
             uds_health = health_data.get("uds", {})
             
             if not uds_health:
@@ -458,7 +573,7 @@ class DoctorRunner:
     def _check_trader_guardrails(self) -> Tuple[bool, Dict[str, Any]]:
         """Trader 가드레일 체크"""
         try:
-            health_data = read_json_atomic(self.paths["shared_data"] / "health.json", {})
+            health_data = self._health_json()
             trader_health = health_data.get("trader", {})
             
             if not trader_health:
@@ -566,7 +681,7 @@ class DoctorRunner:
     def _check_autoheal(self) -> Tuple[bool, Dict[str, Any]]:
         """Auto-Heal 체크"""
         try:
-            health_data = read_json_atomic(self.paths["shared_data"] / "health.json", {})
+            health_data = self._health_json()
             autoheal_health = health_data.get("autoheal", {})
             
             if not autoheal_health:
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Egress Emitter - batched, change-detecting snapshot writes
+
+Writers stage (path, bytes) views and flush them together once per tick:
+
+- a view whose bytes hash the same as the last write to that path is
+  skipped (no open/write/rename at all); writers may pass a content key
+  instead (e.g. the view without its timestamp fields) so a fresh ts alone
+  does not force a rewrite, and refresh_interval bounds how long such a
+  view can go unwritten, keeping its ts and mtime fresh for age checks;
+- aliases of a view (e.g. health/uds.json for health.json) are hard links
+  to the freshly written file, swapped in with an atomic rename, instead
+  of a second copy of the same bytes; where linking is unsupported the
+  alias falls back to a normal write;
+- fsync is decided per durability class: "critical" syncs file and
+  directory on every write, "periodic" at most once per interval per path,
+  "volatile" never (the next tick rewrites it anyway).
+
+Every write goes through os.open/os.write/os.replace so the emitter can
+count the file syscalls and bytes it issues (stats()).
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Seconds between fsyncs per durability class (0: every write, None: never)
+DEFAULT_FSYNC_INTERVALS: Dict[str, Optional[float]] = {
+    "critical": 0.0,
+    "periodic": 5.0,
+    "volatile": None,
+}
+
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+
+class EgressEmitter:
+    """Batch writer for derived snapshot files"""
+
+    def __init__(self, fsync_intervals: Optional[Dict[str, Optional[float]]] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 refresh_interval: Optional[float] = None):
+        """
+        Args:
+            fsync_intervals: Durability class -> seconds between fsyncs (merged over the defaults)
+            clock: Time source for the periodic class and refreshes
+            refresh_interval: Rewrite an unchanged view once its last write is
+                this old (None: unchanged views are always skipped)
+        """
+        self.fsync_intervals = {**DEFAULT_FSYNC_INTERVALS, **(fsync_intervals or {})}
+        self.clock = clock
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._staged: Dict[Path, Tuple[bytes, str, Tuple[Path, ...], Optional[bytes]]] = {}
+        self._digests: Dict[Path, bytes] = {}
+        self._written_at: Dict[Path, float] = {}
+        self._last_fsync: Dict[Path, float] = {}
+        self._dirs: set = set()
+        self._links_supported = hasattr(os, "link")
+        self._stats = {"flushes": 0, "views": 0, "writes": 0, "links": 0, "skipped": 0,
+                       "fsyncs": 0, "syscalls": 0, "bytes": 0, "errors": 0}
+        self._started = clock()
+
+    def stage(self, path: Union[str, Path], payload: bytes, durability: str = "volatile",
+              aliases: Iterable[Union[str, Path]] = (), key: Optional[bytes] = None):
+        """
+        Queue one view for the next flush (a later stage of the same path replaces it).
+
+        key: bytes compared for change detection instead of the payload
+        """
+        if durability not in self.fsync_intervals:
+            raise ValueError(f"unknown durability class: {durability}")
+        with self._lock:
+            self._staged[Path(path)] = (payload, durability, tuple(Path(a) for a in aliases), key)
+
+    def flush(self) -> Dict[str, int]:
+        """Write every staged view; returns this flush's counts"""
+        with self._lock:
+            staged, self._staged = self._staged, {}
+            before = dict(self._stats)
+            for path, (payload, durability, aliases, key) in staged.items():
+                self._stats["views"] += 1
+                digest = hashlib.blake2b(payload if key is None else key, digest_size=16).digest()
+                if self._digests.get(path) == digest and not self._refresh_due(path):
+                    self._stats["skipped"] += 1
+                    continue
+                try:
+                    sync = self._should_fsync(path, durability)
+                    self._write(path, payload, sync, sync and durability == "critical")
+                    for alias in aliases:
+                        self._alias(path, alias, payload, sync)
+                    self._digests[path] = digest
+                    self._written_at[path] = self.clock()
+                except OSError as e:
+                    self._stats["errors"] += 1
+                    self._digests.pop(path, None)
+                    logger.error(f"Egress write failed for {path}: {e}")
+            self._stats["flushes"] += 1
+            return {key: self._stats[key] - before[key] for key in self._stats}
+
+    def emit(self, path: Union[str, Path], payload: bytes, durability: str = "volatile",
+             aliases: Iterable[Union[str, Path]] = (), key: Optional[bytes] = None) -> Dict[str, int]:
+        """Stage and flush a single view"""
+        self.stage(path, payload, durability, aliases, key)
+        return self.flush()
+
+    def stats(self) -> Dict[str, float]:
+        """Cumulative counts plus syscalls and bytes per second since creation"""
+        elapsed = max(self.clock() - self._started, 1e-9)
+        return {
+            **self._stats,
+            "syscalls_per_sec": self._stats["syscalls"] / elapsed,
+            "bytes_per_sec": self._stats["bytes"] / elapsed,
+        }
+
+    # ------------------------------------------------------------------
+
+    def _refresh_due(self, path: Path) -> bool:
+        if self.refresh_interval is None:
+            return False
+        return self.clock() - self._written_at.get(path, 0.0) >= self.refresh_interval
+
+    def _should_fsync(self, path: Path, durability: str) -> bool:
+        interval = self.fsync_intervals[durability]
+        if interval is None:
+            return False
+        now = self.clock()
+        last = self._last_fsync.get(path)
+        if last is not None and now - last < interval:
+            return False
+        self._last_fsync[path] = now
+        return True
+
+    def _ensure_dir(self, directory: Path):
+        if directory not in self._dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._stats["syscalls"] += 1
+            self._dirs.add(directory)
+
+    def _write(self, path: Path, payload: bytes, sync: bool, sync_dir: bool):
+        """Atomic replace: write temp file (fsync if asked), rename over path"""
+        self._ensure_dir(path.parent)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_BINARY, 0o644)
+        syscalls = 2  # open, close
+        try:
+            view = memoryview(payload)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+                syscalls += 1
+            if sync:
+                os.fsync(fd)
+                syscalls += 1
+                self._stats["fsyncs"] += 1
+        finally:
+            os.close(fd)
+        try:
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        syscalls += 1
+        if sync_dir and os.name == "posix":
+            dir_fd = os.open(path.parent, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+            syscalls += 3
+            self._stats["fsyncs"] += 1
+        self._stats["syscalls"] += syscalls
+        self._stats["bytes"] += len(payload)
+        self._stats["writes"] += 1
+
+    def _alias(self, path: Path, alias: Path, payload: bytes, sync: bool):
+        """Point alias at path's new contents: hard link + rename, or a copy if links fail"""
+        self._ensure_dir(alias.parent)
+        if self._links_supported:
+            tmp = alias.with_name(f".{alias.name}.{os.getpid()}.lnk")
+            try:
+                try:
+                    os.link(path, tmp)
+                except FileExistsError:
+                    os.unlink(tmp)
+                    os.link(path, tmp)
+                    self._stats["syscalls"] += 1
+                os.replace(tmp, alias)
+                self._stats["syscalls"] += 2
+                self._stats["links"] += 1
+                return
+            except OSError as e:
+                # e.g. FAT/exFAT, or alias on another device: copy from now on
+                logger.debug(f"Egress hard link unavailable ({e}); copying aliases")
+                self._links_supported = False
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+        self._write(alias, payload, sync, False)
+
@@ -218,44 +218,59 @@ class EnvironmentGuardrails:
             print(f"⚠️ {service_name} PID 락 제거 실패: {e}")
 
 
-# 전역 인스턴스
-guardrails = EnvironmentGuardrails()
+# 전역 인스턴스 (import 시점이 아니라 처음 사용할 때 검증/디렉토리 생성)
+_guardrails: Optional[EnvironmentGuardrails] = None
+
+
+def get_guardrails() -> EnvironmentGuardrails:
+    """전역 인스턴스 조회 (최초 호출 시 환경 검증)"""
+    global _guardrails
+    if _guardrails is None:
+        _guardrails = EnvironmentGuardrails()
+    return _guardrails
+
+
+def __getattr__(name: str):
+    # `guardrails`는 예전에 import 시 생성되던 전역 인스턴스
+    if name == "guardrails":
+        return get_guardrails()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def validate_environment():
-    """환경 검증 (다른 모듈에서 import 시 자동 실행)"""
-    return guardrails
+    """환경 검증 (최초 호출 시 실행)"""
+    return get_guardrails()
 
 
 def get_repo_paths() -> Dict[str, Path]:
     """중앙화된 경로들 조회"""
-    return guardrails.paths.copy()
+    return get_guardrails().paths.copy()
 
 
 def get_pid_file_path(service_name: str) -> Path:
     """서비스 PID 파일 경로 조회"""
-    return guardrails.get_pid_file_path(service_name)
+    return get_guardrails().get_pid_file_path(service_name)
 
 
 def check_service_pid_lock(service_name: str) -> Tuple[bool, Optional[int]]:
     """서비스 PID 락 확인"""
-    return guardrails.check_pid_lock(service_name)
+    return get_guardrails().check_pid_lock(service_name)
 
 
 def create_service_pid_lock(service_name: str) -> bool:
     """서비스 PID 락 생성"""
-    return guardrails.create_pid_lock(service_name)
+    return get_guardrails().create_pid_lock(service_name)
 
 
 def remove_service_pid_lock(service_name: str):
     """서비스 PID 락 제거"""
-    guardrails.remove_pid_lock(service_name)
+    get_guardrails().remove_pid_lock(service_name)
 
 
 if __name__ == "__main__":
     # 직접 실행 시 환경 검증만 수행
     print("🔒 Environment Guardrails - 독립 실행")
-    guardrails = EnvironmentGuardrails()
+    get_guardrails()
     
     # PID 락 테스트
     print("\n🔒 PID 락 테스트:")
@@ -2,20 +2,30 @@
 """
 Feeder Egress Writer
 Canonical timestamp enforcement (ts + timestamp) with schema validation
+
+Views are serialized once and written through a shared EgressEmitter:
+views whose content (everything but ts/timestamp) is unchanged are skipped
+until FEEDER_EGRESS_REFRESH_SEC has passed, health/uds.json is a link to
+health.json, and fsync follows each view's durability class.
+write_egress_tick() writes a whole tick (health, databus, every symbol) as
+one batch; the feeder calls it on every snapshot it saves.
 """
 
+import functools
 import json
 import logging
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 try:
-    from .atomic_io import atomic_write
+    from .egress_emitter import DEFAULT_FSYNC_INTERVALS, EgressEmitter
     from .path_registry import get_absolute_path
+    from .schema_registry import get_schema_registry
 except ImportError:
-    from atomic_io import atomic_write
+    from egress_emitter import DEFAULT_FSYNC_INTERVALS, EgressEmitter
     from path_registry import get_absolute_path
+    from schema_registry import get_schema_registry
 
 logger = logging.getLogger(__name__)
 
@@ -66,176 +76,289 @@ def normalize_timestamp(value: Any) -> Optional[int]:
     return ts
 
 
+# Egress schemas (compiled once by the schema registry)
+HEALTH_SCHEMA = {
+    "type": "object",
+    "required": ["service", "status", "ts", "stale"],
+    "properties": {
+        "service": {"const": "feeder"},
+        "status": {"enum": ["GREEN", "YELLOW", "RED"]},
+        "ts": {"type": "integer", "maximum": 10_000_000_000},  # larger: milliseconds
+        "stale": {"type": "boolean"},
+        "timestamp": {"type": "integer"},
+    },
+}
+
+DATABUS_SCHEMA = {
+    "type": "object",
+    "required": ["ts", "symbols", "stale", "source"],
+    "properties": {
+        "ts": {"type": "integer", "maximum": 10_000_000_000},
+        "symbols": {"type": "array", "items": {"type": "string", "pattern": "^[^a-z]*$"}},
+        "stale": {"type": "boolean"},
+        "source": {"const": "feeder"},
+    },
+}
+
+SYMBOL_SNAPSHOT_SCHEMA = {
+    "type": "object",
+    "required": ["symbol", "ts", "source"],
+    "properties": {
+        "symbol": {"type": "string", "pattern": "^[^a-z]*USDT$"},
+        "ts": {"type": "integer", "maximum": 10_000_000_000},
+        "source": {"const": "feeder"},
+        "orderbook": {
+            "type": "object",
+            "properties": {"bids": {"type": "array"}, "asks": {"type": "array"}},
+        },
+    },
+}
+
+_schemas = get_schema_registry()
+_schemas.register("feeder.health", HEALTH_SCHEMA)
+_schemas.register("feeder.databus", DATABUS_SCHEMA)
+_schemas.register("feeder.symbol_snapshot", SYMBOL_SNAPSHOT_SCHEMA)
+
+
 def validate_health_schema(data: Dict[str, Any]) -> tuple[bool, Optional[str]]:
     """
-    Validate health.json schema.
+    Validate health.json schema (HEALTH_SCHEMA, every call).
 
-    Required:
-    {
-        "service": "feeder",
-        "status": "GREEN" | "YELLOW" | "RED",
-        "ts": <int>,
-        "timestamp": <int>,
-        "stale": <bool>
-    }
+    Returns:
+        (is_valid, error_message)
+    """
+    return _schemas.validate("feeder.health", data)
+
+
+def validate_databus_schema(data: Dict[str, Any]) -> tuple[bool, Optional[str]]:
+    """
+    Validate databus_snapshot.json schema (DATABUS_SCHEMA, every call).
 
     Returns:
         (is_valid, error_message)
     """
-    if not isinstance(data, dict):
-        return False, f"Must be dict, got {type(data)}"
+    return _schemas.validate("feeder.databus", data)
 
-    # Check required fields
-    required = ["service", "status", "ts", "stale"]
-    for field in required:
-        if field not in data:
-            return False, f"Missing required field: {field}"
 
-    # Validate service
-    if data["service"] != "feeder":
-        return False, f"service must be 'feeder', got {data['service']}"
+def validate_symbol_snapshot_schema(data: Dict[str, Any]) -> tuple[bool, Optional[str]]:
+    """
+    Validate prices_{SYMBOL}.json schema (SYMBOL_SNAPSHOT_SCHEMA, every call).
 
-    # Validate status
-    if data["status"] not in ["GREEN", "YELLOW", "RED"]:
-        return False, f"status must be GREEN/YELLOW/RED, got {data['status']}"
+    Returns:
+        (is_valid, error_message)
+    """
+    return _schemas.validate("feeder.symbol_snapshot", data)
 
-    # Validate ts
-    ts = data["ts"]
-    if not isinstance(ts, int):
-        return False, f"ts must be int, got {type(ts)}"
 
-    if ts > 1e10:
-        return False, f"ts appears to be milliseconds: {ts}"
+def _fsync_intervals_from_env() -> Dict[str, Optional[float]]:
+    """FEEDER_FSYNC_<CLASS>=<seconds>|off overrides per durability class"""
+    intervals: Dict[str, Optional[float]] = {}
+    for durability in DEFAULT_FSYNC_INTERVALS:
+        value = os.getenv(f"FEEDER_FSYNC_{durability.upper()}")
+        if value is None:
+            continue
+        try:
+            intervals[durability] = None if value.lower() in ("off", "never", "") else float(value)
+        except ValueError:
+            logger.warning(f"Ignoring FEEDER_FSYNC_{durability.upper()}={value!r}")
+    return intervals
 
-    # Validate stale
-    if not isinstance(data["stale"], bool):
-        return False, f"stale must be bool, got {type(data['stale'])}"
 
-    # Validate timestamp (if present)
-    if "timestamp" in data:
-        timestamp = data["timestamp"]
-        if not isinstance(timestamp, int):
-            return False, f"timestamp must be int, got {type(timestamp)}"
+# Durability class per view (see egress_emitter): liveness files are rewritten
+# every tick, so only the databus snapshot is synced, and not on every write.
+EGRESS_DURABILITY = {
+    "health": "volatile",
+    "databus": "periodic",
+    "symbol_snapshot": "volatile",
+}
 
-    return True, None
+# Content unchanged apart from the timestamp is still rewritten this often,
+# so readers that judge staleness by ts or mtime (10s and up) see it live
+TIMESTAMP_FIELDS = ("ts", "timestamp")
+FEEDER_EGRESS_REFRESH_SEC = float(os.getenv("FEEDER_EGRESS_REFRESH_SEC", "5"))
 
+_emitter = EgressEmitter(_fsync_intervals_from_env(), refresh_interval=FEEDER_EGRESS_REFRESH_SEC)
 
-def validate_databus_schema(data: Dict[str, Any]) -> tuple[bool, Optional[str]]:
-    """
-    Validate databus_snapshot.json schema.
-
-    Required:
-    {
-        "ts": <int>,
-        "timestamp": <int>,
-        "symbols": ["BTCUSDT", ...],
-        "stale": <bool>,
-        "source": "feeder"
-    }
 
-    Returns:
-        (is_valid, error_message)
-    """
-    if not isinstance(data, dict):
-        return False, f"Must be dict, got {type(data)}"
+@functools.lru_cache(maxsize=None)
+def _egress_path(*segments: str) -> Path:
+    return get_absolute_path(*segments)
 
-    # Check required fields
-    required = ["ts", "symbols", "stale", "source"]
-    for field in required:
-        if field not in data:
-            return False, f"Missing required field: {field}"
 
-    # Validate ts
-    ts = data["ts"]
-    if not isinstance(ts, int):
-        return False, f"ts must be int, got {type(ts)}"
+def _dumps(data: Dict[str, Any]) -> bytes:
+    """Serialize a view once (compact; every consumer parses JSON)"""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
-    if ts > 1e10:
-        return False, f"ts appears to be milliseconds: {ts}"
 
-    # Validate symbols
-    symbols = data["symbols"]
-    if not isinstance(symbols, list):
-        return False, f"symbols must be list, got {type(symbols)}"
+def _serialize(data: Dict[str, Any]) -> Tuple[bytes, bytes]:
+    """(payload, content key): the key is the view serialized without its timestamp fields"""
+    stamp = {k: data[k] for k in TIMESTAMP_FIELDS if k in data}
+    body = _dumps({k: v for k, v in data.items() if k not in stamp})
+    if not stamp:
+        return body, body
+    # timestamp fields spliced in front of the body instead of a second dump
+    head = _dumps(stamp)[:-1]
+    return head + (b"," + body[1:] if body != b"{}" else b"}"), body
 
-    for sym in symbols:
-        if not isinstance(sym, str):
-            return False, f"Symbol must be string, got {type(sym)}"
-        if sym != sym.upper():
-            return False, f"Symbol must be UPPERCASE: {sym}"
 
-    # Validate stale
-    if not isinstance(data["stale"], bool):
-        return False, f"stale must be bool, got {type(data['stale'])}"
+def _build_health(
+    status: str = "GREEN",
+    stale: bool = False,
+    components: Optional[Dict] = None,
+    telemetry: Optional[Dict] = None,
+    ts: Optional[Dict[str, int]] = None,
+) -> Optional[Dict[str, Any]]:
+    """health.json payload, or None if it fails validation"""
+    data = {
+        "service": "feeder",
+        "status": status,
+        **(ts or canonical_timestamp()),
+        "stale": stale,
+    }
 
-    # Validate source
-    if data["source"] != "feeder":
-        return False, f"source must be 'feeder', got {data['source']}"
+    if components:
+        data["components"] = components
 
-    return True, None
+    if telemetry:
+        data["telemetry"] = telemetry
 
+    # Validate (per SCHEMA_VALIDATION_MODE)
+    if FEEDER_ENFORCE_TS:
+        is_valid, error = _schemas.check("feeder.health", data)
+        if not is_valid:
+            logger.error(f"WRITE_SKIPPED_BAD_SCHEMA(health.json): {error}")
+            return None
+    return data
 
-def validate_symbol_snapshot_schema(data: Dict[str, Any]) -> tuple[bool, Optional[str]]:
-    """
-    Validate prices_{SYMBOL}.json schema.
-
-    Required:
-    {
-        "symbol": "BTCUSDT",
-        "ts": <int>,
-        "timestamp": <int>,
-        "last_price": <number>,
-        "orderbook": {"bids": [...], "asks": [...]},
-        "source": "feeder"
+
+def _build_databus(
+    symbols: List[str],
+    stale: bool = False,
+    additional_data: Optional[Dict] = None,
+    ts: Optional[Dict[str, int]] = None,
+) -> Optional[Dict[str, Any]]:
+    """databus_snapshot.json payload, or None if it fails validation"""
+    # Normalize symbols
+    symbols = [s.upper() for s in symbols if s]
+    symbols = sorted(list(set(symbols)))  # Deduplicate and sort
+
+    data = {
+        **(ts or canonical_timestamp()),
+        "symbols": symbols,
+        "stale": stale,
+        "source": "feeder",
     }
 
-    Returns:
-        (is_valid, error_message)
-    """
-    if not isinstance(data, dict):
-        return False, f"Must be dict, got {type(data)}"
+    if additional_data:
+        for key, value in additional_data.items():
+            if key not in data:  # Don't overwrite core fields
+                data[key] = value
 
-    # Check required fields
-    required = ["symbol", "ts", "source"]
-    for field in required:
-        if field not in data:
-            return False, f"Missing required field: {field}"
+    # Validate (per SCHEMA_VALIDATION_MODE)
+    if FEEDER_ENFORCE_TS:
+        is_valid, error = _schemas.check("feeder.databus", data)
+        if not is_valid:
+            logger.error(
+                f"WRITE_SKIPPED_BAD_SCHEMA(databus_snapshot.json): {error}"
+            )
+            return None
+    return data
 
-    # Validate symbol
-    symbol = data["symbol"]
-    if not isinstance(symbol, str):
-        return False, f"symbol must be string, got {type(symbol)}"
 
-    if symbol != symbol.upper():
-        return False, f"symbol must be UPPERCASE: {symbol}"
+def _build_symbol_snapshot(
+    symbol: str,
+    last_price: Optional[float] = None,
+    orderbook: Optional[Dict[str, List]] = None,
+    last_kline_ts: Optional[int] = None,
+    additional_data: Optional[Dict] = None,
+    ts: Optional[Dict[str, int]] = None,
+) -> Optional[Dict[str, Any]]:
+    """prices_{SYMBOL}.json payload, or None if the symbol or schema is invalid"""
+    # Normalize symbol
+    symbol = symbol.upper().strip()
+    if not symbol or not symbol.endswith("USDT"):
+        logger.error(f"Invalid symbol: {symbol}")
+        return None
 
-    if not symbol.endswith("USDT"):
-        return False, f"symbol must end with USDT: {symbol}"
+    data = {
+        "symbol": symbol,
+        **(ts or canonical_timestamp()),
+        "source": "feeder",
+    }
 
-    # Validate ts
-    ts = data["ts"]
-    if not isinstance(ts, int):
-        return False, f"ts must be int, got {type(ts)}"
+    if last_price is not None:
+        data["last_price"] = last_price
 
-    if ts > 1e10:
-        return False, f"ts appears to be milliseconds: {ts}"
+    # Handle orderbook
+    if orderbook and isinstance(orderbook, dict):
+        bids = orderbook.get("bids", [])
+        asks = orderbook.get("asks", [])
 
-    # Validate source
-    if data["source"] != "feeder":
-        return False, f"source must be 'feeder', got {data['source']}"
+        data["orderbook"] = {
+            "bids": bids if isinstance(bids, list) else [],
+            "asks": asks if isinstance(asks, list) else [],
+        }
 
-    # Validate orderbook (if present)
-    if "orderbook" in data:
-        ob = data["orderbook"]
-        if not isinstance(ob, dict):
-            return False, f"orderbook must be dict, got {type(ob)}"
+        # Set state based on OB presence
+        has_bids = len(data["orderbook"]["bids"]) > 0
+        has_asks = len(data["orderbook"]["asks"]) > 0
 
-        for side in ["bids", "asks"]:
-            if side in ob:
-                if not isinstance(ob[side], list):
-                    return False, f"orderbook.{side} must be list, got {type(ob[side])}"
+        if not (has_bids and has_asks):
+            data["orderbook_state"] = "STALE_NO_OB"
+            logger.warning(
+                f"[{symbol}] Writing snapshot with empty OB (bids={has_bids}, asks={has_asks})"
+            )
+    else:
+        data["orderbook"] = {"bids": [], "asks": []}
+        data["orderbook_state"] = "STALE_NO_OB"
+
+    if last_kline_ts is not None:
+        data["last_kline_ts"] = normalize_timestamp(last_kline_ts) or data["ts"]
+
+    if additional_data:
+        for key, value in additional_data.items():
+            if key not in data:
+                data[key] = value
+
+    # Validate (per SCHEMA_VALIDATION_MODE)
+    if FEEDER_ENFORCE_TS:
+        is_valid, error = _schemas.check("feeder.symbol_snapshot", data)
+        if not is_valid:
+            logger.error(f"WRITE_SKIPPED_BAD_SCHEMA(prices_{symbol}.json): {error}")
+            return None
+    return data
+
+
+def _stage_health(data: Dict[str, Any]):
+    # health/uds.json carries the same bytes: linked to health.json, not rewritten
+    payload, key = _serialize(data)
+    _emitter.stage(
+        _egress_path("shared_data", "health.json"),
+        payload,
+        EGRESS_DURABILITY["health"],
+        aliases=(_egress_path("shared_data", "health", "uds.json"),),
+        key=key,
+    )
 
-    return True, None
+
+def _stage_databus(data: Dict[str, Any]):
+    payload, key = _serialize(data)
+    _emitter.stage(
+        _egress_path("shared_data", "databus_snapshot.json"),
+        payload,
+        EGRESS_DURABILITY["databus"],
+        key=key,
+    )
+
+
+def _stage_symbol_snapshot(data: Dict[str, Any]):
+    payload, key = _serialize(data)
+    _emitter.stage(
+        _egress_path("shared_data", "snapshots", f"prices_{data['symbol']}.json"),
+        payload,
+        EGRESS_DURABILITY["symbol_snapshot"],
+        key=key,
+    )
 
 
 def write_health_snapshot(
@@ -245,7 +368,7 @@ def write_health_snapshot(
     telemetry: Optional[Dict] = None,
 ) -> bool:
     """
-    Write health.json with canonical timestamp.
+    Write health.json (and health/uds.json) with canonical timestamp.
 
     Args:
         status: GREEN/YELLOW/RED
@@ -254,40 +377,15 @@ def write_health_snapshot(
         telemetry: Optional telemetry data
 
     Returns:
-        True if written successfully
+        True if written successfully (or unchanged)
     """
     try:
-        # Build data
-        data = {
-            "service": "feeder",
-            "status": status,
-            **canonical_timestamp(),
-            "stale": stale,
-        }
-
-        if components:
-            data["components"] = components
-
-        if telemetry:
-            data["telemetry"] = telemetry
-
-        # Validate
-        if FEEDER_ENFORCE_TS:
-            is_valid, error = validate_health_schema(data)
-            if not is_valid:
-                logger.error(f"WRITE_SKIPPED_BAD_SCHEMA(health.json): {error}")
-                return False
-
-        # Write
-        health_file = get_absolute_path("shared_data", "health.json")
-        json_str = json.dumps(data, indent=2, ensure_ascii=False)
-        atomic_write(health_file, json_str, make_backup=False)
-
-        # Also write uds.json
-        uds_dir = get_absolute_path("shared_data", "health")
-        uds_dir.mkdir(parents=True, exist_ok=True)
-        uds_file = uds_dir / "uds.json"
-        atomic_write(uds_file, json_str, make_backup=False)
+        data = _build_health(status, stale, components, telemetry)
+        if data is None:
+            return False
+        _stage_health(data)
+        if _emitter.flush()["errors"]:
+            return False
 
         logger.debug(f"Health snapshot written: status={status}, stale={stale}")
         return True
@@ -311,41 +409,17 @@ def write_databus_snapshot(
         additional_data: Optional additional fields
 
     Returns:
-        True if written successfully
+        True if written successfully (or unchanged)
     """
     try:
-        # Normalize symbols
-        symbols = [s.upper() for s in symbols if s]
-        symbols = sorted(list(set(symbols)))  # Deduplicate and sort
-
-        # Build data
-        data = {
-            **canonical_timestamp(),
-            "symbols": symbols,
-            "stale": stale,
-            "source": "feeder",
-        }
+        data = _build_databus(symbols, stale, additional_data)
+        if data is None:
+            return False
+        _stage_databus(data)
+        if _emitter.flush()["errors"]:
+            return False
 
-        if additional_data:
-            for key, value in additional_data.items():
-                if key not in data:  # Don't overwrite core fields
-                    data[key] = value
-
-        # Validate
-        if FEEDER_ENFORCE_TS:
-            is_valid, error = validate_databus_schema(data)
-            if not is_valid:
-                logger.error(
-                    f"WRITE_SKIPPED_BAD_SCHEMA(databus_snapshot.json): {error}"
-                )
-                return False
-
-        # Write
-        databus_file = get_absolute_path("shared_data", "databus_snapshot.json")
-        json_str = json.dumps(data, indent=2, ensure_ascii=False)
-        atomic_write(databus_file, json_str, make_backup=False)
-
-        logger.debug(f"Databus snapshot written: symbols={len(symbols)}, stale={stale}")
+        logger.debug(f"Databus snapshot written: symbols={len(data['symbols'])}, stale={stale}")
         return True
 
     except Exception as e:
@@ -371,77 +445,74 @@ def write_symbol_snapshot(
         additional_data: Optional additional fields
 
     Returns:
-        True if written successfully
+        True if written successfully (or unchanged)
     """
     try:
-        # Normalize symbol
-        symbol = symbol.upper().strip()
-        if not symbol or not symbol.endswith("USDT"):
-            logger.error(f"Invalid symbol: {symbol}")
+        data = _build_symbol_snapshot(symbol, last_price, orderbook, last_kline_ts, additional_data)
+        if data is None:
+            return False
+        _stage_symbol_snapshot(data)
+        if _emitter.flush()["errors"]:
             return False
 
-        # Build data
-        data = {
-            "symbol": symbol,
-            **canonical_timestamp(),
-            "source": "feeder",
-        }
-
-        if last_price is not None:
-            data["last_price"] = last_price
-
-        # Handle orderbook
-        if orderbook and isinstance(orderbook, dict):
-            bids = orderbook.get("bids", [])
-            asks = orderbook.get("asks", [])
-
-            data["orderbook"] = {
-                "bids": bids if isinstance(bids, list) else [],
-                "asks": asks if isinstance(asks, list) else [],
-            }
-
-            # Set state based on OB presence
-            has_bids = len(data["orderbook"]["bids"]) > 0
-            has_asks = len(data["orderbook"]["asks"]) > 0
-
-            if not (has_bids and has_asks):
-                data["orderbook_state"] = "STALE_NO_OB"
-                logger.warning(
-                    f"[{symbol}] Writing snapshot with empty OB (bids={has_bids}, asks={has_asks})"
-                )
-        else:
-            data["orderbook"] = {"bids": [], "asks": []}
-            data["orderbook_state"] = "STALE_NO_OB"
+        logger.debug(f"[{data['symbol']}] Snapshot written: ts={data['ts']}")
+        return True
 
-        if last_kline_ts is not None:
-            data["last_kline_ts"] = normalize_timestamp(last_kline_ts) or data["ts"]
+    except Exception as e:
+        logger.error(f"Failed to write snapshot for {symbol}: {e}")
+        return False
 
-        if additional_data:
-            for key, value in additional_data.items():
-                if key not in data:
-                    data[key] = value
 
-        # Validate
-        if FEEDER_ENFORCE_TS:
-            is_valid, error = validate_symbol_snapshot_schema(data)
-            if not is_valid:
-                logger.error(f"WRITE_SKIPPED_BAD_SCHEMA(prices_{symbol}.json): {error}")
-                return False
+def write_egress_tick(
+    health: Optional[Dict[str, Any]] = None,
+    databus: Optional[Dict[str, Any]] = None,
+    symbols: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, int]:
+    """
+    Write one feeder tick in a single batch: every view shares one canonical
+    timestamp, is serialized once and flushed together (unchanged views skipped).
 
-        # Write
-        snapshots_dir = get_absolute_path("shared_data", "snapshots")
-        snapshots_dir.mkdir(parents=True, exist_ok=True)
-        snapshot_file = snapshots_dir / f"prices_{symbol}.json"
+    Args:
+        health: write_health_snapshot keyword arguments (None: skip)
+        databus: write_databus_snapshot keyword arguments (None: skip)
+        symbols: {symbol: write_symbol_snapshot keyword arguments}
 
-        json_str = json.dumps(data, indent=2, ensure_ascii=False)
-        atomic_write(snapshot_file, json_str, make_backup=False)
+    Returns:
+        Flush counts (writes, links, skipped, fsyncs, syscalls, bytes, errors)
+        plus "invalid" for views dropped by validation
+    """
+    ts = canonical_timestamp()
+    invalid = 0
+    try:
+        if health is not None:
+            data = _build_health(ts=ts, **health)
+            if data is None:
+                invalid += 1
+            else:
+                _stage_health(data)
+        if databus is not None:
+            data = _build_databus(ts=ts, **databus)
+            if data is None:
+                invalid += 1
+            else:
+                _stage_databus(data)
+        for symbol, fields in (symbols or {}).items():
+            data = _build_symbol_snapshot(symbol, ts=ts, **fields)
+            if data is None:
+                invalid += 1
+            else:
+                _stage_symbol_snapshot(data)
+    except Exception as e:
+        logger.error(f"Failed to build egress tick: {e}")
+        invalid += 1
+    counts = _emitter.flush()
+    counts["invalid"] = invalid
+    return counts
 
-        logger.debug(f"[{symbol}] Snapshot written: ts={data['ts']}")
-        return True
 
-    except Exception as e:
-        logger.error(f"Failed to write snapshot for {symbol}: {e}")
-        return False
+def get_egress_stats() -> Dict[str, float]:
+    """Cumulative egress write counts, syscalls/s and bytes/s"""
+    return _emitter.stats()
 
 
 if __name__ == "__main__":
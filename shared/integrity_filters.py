@@ -3,10 +3,15 @@
 실시간으로 거래 무결성을 보장하는 7가지 필터
 """
 
+import json
 import logging
 import time
+from collections import Counter
 from dataclasses import dataclass
-from typing import Any, Dict, Set, Tuple
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+
+from shared.dedup_window import DedupWindow
 
 logger = logging.getLogger(__name__)
 
@@ -22,30 +27,98 @@ class FilterResult:
     mock_executable: bool = False  # 모의계좌에서 실행 가능한지 여부
 
 
-class IntegrityFilters:
-    """무결성 필터 시스템"""
+# 등록된 전략명
+STRATEGY_REGISTRY = frozenset({
+    "trend_multi_tf",
+    "bb_mean_revert_v2",
+    "volspike_scalper_v2",
+    "carry_funding",
+    "pairs_spread",
+    "ensemble",
+    "default",
+    "ARES",
+    "Manual",
+})
+
+# 잔고를 아직 모를 때 사용하는 자본 (기존 기본값)
+FALLBACK_CAPITAL = 10000.0
+
+
+class BalanceView:
+    """계좌 이벤트로 갱신되는 총 잔고 (거래마다 조회하지 않음)"""
+
+    def __init__(self, total_balance: float = 0.0):
+        self.total_balance = float(total_balance)
+        self.updated_at = time.monotonic() if total_balance > 0 else 0.0
+        self.updates = 0
+
+    def update(self, total_balance: float):
+        """총 잔고 갱신"""
+        self.total_balance = float(total_balance)
+        self.updated_at = time.monotonic()
+        self.updates += 1
+
+    def on_account_event(self, event: Dict[str, Any]) -> bool:
+        """계좌 스냅샷/이벤트 반영 (account_snapshot.json, BALANCE_UPDATE payload, 거래소 계좌 응답)"""
+        for key in ("total_balance", "totalWalletBalance", "balance_usdt", "balance"):
+            value = event.get(key)
+            if value is not None:
+                try:
+                    self.update(float(value))
+                except (TypeError, ValueError):
+                    return False
+                return True
+        return False
+
 
-    def __init__(self, config: Dict[str, Any] = None):
+class IntegrityFilters:
+    """무결성 필터 시스템
+
+    필터 체인과 의존성(잔고 뷰, 전략 레지스트리, PnL 검증기)은 생성 시 한 번
+    결정되고, 거래별 평가는 메모리 안에서만 수행되며 결과는 카운터로 집계됨.
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any] = None,
+        balance_view: Optional[BalanceView] = None,
+        verify_pnl: Optional[Callable[[Dict[str, Any]], Tuple[bool, str]]] = None,
+        strategy_registry: Optional[Iterable[str]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         self.config = config or {}
+        self.clock = clock
 
-        # 중복 거래 추적
-        self.duplicate_tracker: Set[str] = set()
+        # 중복 거래 추적 (시간순 윈도우, 재시작 후 유지하려면 duplicate_persist_path)
+        self.duplicate_tracker = DedupWindow(
+            self.config.get("duplicate_memory_sec", 600),
+            max_keys=self.config.get("duplicate_max_keys", 100_000),
+            persist_path=self.config.get("duplicate_persist_path"),
+        )
 
-        # 글로벌 쿨다운 추적
-        self.cooldown_tracker: Dict[str, float] = {}
+        # 글로벌 쿨다운 추적 ((전략, 심볼) -> 마지막 거래 시각, monotonic)
+        self.cooldown_tracker: Dict[Tuple[str, str], float] = {}
 
         # 전략 레지스트리
-        self.strategy_registry = {
-            "trend_multi_tf",
-            "bb_mean_revert_v2",
-            "volspike_scalper_v2",
-            "carry_funding",
-            "pairs_spread",
-            "ensemble",
-            "default",
-            "ARES",
-            "Manual",
-        }
+        self.strategy_registry = frozenset(
+            strategy_registry if strategy_registry is not None else STRATEGY_REGISTRY
+        )
+
+        # 잔고 뷰 (계좌 이벤트가 on_account_event로 갱신)
+        self.balance_view = balance_view or BalanceView()
+
+        # PnL 검증기 (한 번만 해석)
+        if verify_pnl is None:
+            try:
+                from shared.pnl_calculator import verify_trade_pnl as verify_pnl
+            except Exception as e:
+                logger.error(f"integrity_filters | pnl_verifier_unavailable | error={e}")
+        self.verify_pnl = verify_pnl
+
+        # 집계 카운터 ((필터명, 액션) -> 건수)
+        self.counters: Counter = Counter()
+        self.trades_evaluated = 0
+        self.counters_log_every = self.config.get("counters_log_every", 1000)
 
         # 설정값
         self.capital_limit_pct = self.config.get("capital_limit_pct", 30.0)  # 30%
@@ -61,6 +134,17 @@ class IntegrityFilters:
             "fail_close_mode", False
         )  # 기본값: FAIL-CLOSE 비활성화
 
+        # 필터 체인 (한 번 구성)
+        self.filter_chain = (
+            self.filter_1_strategy_unidentified,
+            self.filter_2_duplicate_prevention,
+            self.filter_3_capital_limit,
+            self.filter_4_replay_confusion,
+            self.filter_5_fee_unification,
+            self.filter_6_min_expected_return,
+            self.filter_7_global_cooldown,
+        )
+
     def filter_1_strategy_unidentified(
         self, trade_data: Dict[str, Any]
     ) -> FilterResult:
@@ -131,9 +215,6 @@ class IntegrityFilters:
                         False, "strategy_unidentified", "UNKNOWN 전략", "BLOCK", False
                     )
 
-            logger.info(
-                f"filter_1_pass | strategy_identified | strategy_id={strategy_id} | strategy_name={strategy_name}"
-            )
             return FilterResult(
                 True, "strategy_unidentified", "전략 식별 성공", "PASS", True
             )
@@ -173,7 +254,8 @@ class IntegrityFilters:
 
             duplicate_key = f"{exchange}_{order_id}_{trade_id}_{ts_rounded}"
 
-            if duplicate_key in self.duplicate_tracker:
+            # 검사 + 등록 (윈도우를 벗어난 키는 오래된 순으로 만료)
+            if self.duplicate_tracker.check_and_add(duplicate_key):
                 logger.warning(
                     f"filter_2_block | duplicate_detected | duplicate_key={duplicate_key}"
                 )
@@ -181,17 +263,6 @@ class IntegrityFilters:
                     False, "duplicate_prevention", "중복 거래 감지", "BLOCK"
                 )
 
-            # 중복키 등록
-            self.duplicate_tracker.add(duplicate_key)
-
-            # 메모리 관리 (1000개 이상 시 오래된 것 제거)
-            if len(self.duplicate_tracker) > 1000:
-                # 단순히 절반 제거 (실제로는 시간 기반 제거가 더 좋음)
-                old_keys = list(self.duplicate_tracker)[:500]
-                for key in old_keys:
-                    self.duplicate_tracker.discard(key)
-
-            logger.info(f"filter_2_pass | no_duplicate | duplicate_key={duplicate_key}")
             return FilterResult(True, "duplicate_prevention", "중복 없음", "PASS")
 
         except Exception as e:
@@ -207,14 +278,11 @@ class IntegrityFilters:
         try:
             notional = trade_data.get("notional", 0)
 
-            # 실제 계좌 잔고 조회
-            try:
-                from shared.balance_manager import get_total_balance
-                total_capital = get_total_balance()
-                if total_capital <= 0:
-                    total_capital = 10000.0  # 기본값
-            except Exception:
-                total_capital = 10000.0  # 기본값
+            # 계좌 이벤트로 갱신된 잔고 (아직 없으면 기본값)
+            total_capital = self.balance_view.total_balance
+            if total_capital <= 0:
+                total_capital = FALLBACK_CAPITAL
+                self.counters["capital_limit", "FALLBACK_BALANCE"] += 1
 
             capital_limit = total_capital * (self.capital_limit_pct / 100)
 
@@ -245,9 +313,6 @@ class IntegrityFilters:
                         "BLOCK",
                     )
 
-            logger.info(
-                f"filter_3_pass | capital_limit_ok | notional={notional} | limit={capital_limit}"
-            )
             return FilterResult(True, "capital_limit", "자본 한도 내", "PASS")
 
         except Exception as e:
@@ -285,9 +350,6 @@ class IntegrityFilters:
                     False, "replay_confusion", "리플레이 모드에서 실거래 데이터", "WARN"
                 )
 
-            logger.info(
-                f"filter_4_pass | no_replay_confusion | is_replay={is_replay} | source={source}"
-            )
             return FilterResult(True, "replay_confusion", "리플레이 혼선 없음", "PASS")
 
         except Exception as e:
@@ -302,9 +364,9 @@ class IntegrityFilters:
         """필터 5: 수수료/슬리피지 단일 적용 (SOT 검증)"""
         try:
             # SOT PnL 계산기로 검증
-            from shared.pnl_calculator import verify_trade_pnl
-
-            is_consistent, error_msg = verify_trade_pnl(trade_data)
+            if self.verify_pnl is None:
+                raise RuntimeError("PnL 검증기 없음")
+            is_consistent, error_msg = self.verify_pnl(trade_data)
 
             if not is_consistent:
                 logger.error(f"filter_5_block | pnl_inconsistency | error={error_msg}")
@@ -325,9 +387,6 @@ class IntegrityFilters:
                     "WARN",
                 )
 
-            logger.info(
-                f"filter_5_pass | sot_pnl_verified | source={calculation_source}"
-            )
             return FilterResult(True, "fee_unification", "SOT PnL 검증 통과", "PASS")
 
         except Exception as e:
@@ -369,9 +428,6 @@ class IntegrityFilters:
                     "BLOCK",
                 )
 
-            logger.info(
-                f"filter_6_pass | expected_return_ok | return_pct={max_return_pct}"
-            )
             return FilterResult(
                 True,
                 "min_expected_return",
@@ -392,15 +448,15 @@ class IntegrityFilters:
         try:
             strategy_name = trade_data.get("strategy_name", "")
             symbol = trade_data.get("symbol", "")
-            current_time = time.time()
+            current_time = self.clock()
 
             # 쿨다운 키: 전략×심볼
-            cooldown_key = f"{strategy_name}_{symbol}"
+            cooldown_key = (strategy_name, symbol)
 
             # 마지막 거래 시간 확인
-            last_trade_time = self.cooldown_tracker.get(cooldown_key, 0)
+            last_trade_time = self.cooldown_tracker.get(cooldown_key)
 
-            if last_trade_time > 0:
+            if last_trade_time is not None:
                 time_since_last = current_time - last_trade_time
 
                 if time_since_last < self.global_cooldown_sec:
@@ -418,9 +474,6 @@ class IntegrityFilters:
             # 쿨다운 업데이트
             self.cooldown_tracker[cooldown_key] = current_time
 
-            logger.info(
-                f"filter_7_pass | global_cooldown_ok | strategy={strategy_name} | symbol={symbol}"
-            )
             return FilterResult(True, "global_cooldown", "글로벌 쿨다운 통과", "PASS")
 
         except Exception as e:
@@ -432,51 +485,39 @@ class IntegrityFilters:
             )
 
     def apply_all_filters(self, trade_data: Dict[str, Any]) -> Tuple[bool, list]:
-        """모든 무결성 필터 적용"""
+        """모든 무결성 필터 적용 (차단/경고 사유는 각 필터가 기록, 나머지는 카운터로 집계)"""
         results = []
-
-        # 7가지 필터 순차 적용
-        filters = [
-            self.filter_1_strategy_unidentified,
-            self.filter_2_duplicate_prevention,
-            self.filter_3_capital_limit,
-            self.filter_4_replay_confusion,
-            self.filter_5_fee_unification,
-            self.filter_6_min_expected_return,
-            self.filter_7_global_cooldown,
-        ]
-
         overall_passed = True
+        counters = self.counters
 
-        for filter_func in filters:
+        # 7가지 필터 순차 적용
+        for filter_func in self.filter_chain:
             result = filter_func(trade_data)
             results.append(result)
+            counters[result.filter_name, result.action] += 1
 
-            # BLOCK 액션이면 전체 실패
+            # 첫 번째 BLOCK에서 중단 (FAIL-CLOSE)
             if result.action == "BLOCK":
                 overall_passed = False
                 logger.error(
-                    f"integrity_filter_failed | filter={result.filter_name} | reason={result.reason}"
+                    f"integrity_filters_failed | filter={result.filter_name} | trade_id={trade_data.get('trade_id', 'unknown')}"
                 )
-
-                # 첫 번째 BLOCK에서 중단 (FAIL-CLOSE)
                 break
-            elif result.action == "WARN":
-                logger.warning(
-                    f"integrity_filter_warning | filter={result.filter_name} | reason={result.reason}"
-                )
 
-        if overall_passed:
-            logger.info(
-                f"integrity_filters_passed | all_filters_ok | trade_id={trade_data.get('trade_id', 'unknown')}"
-            )
-        else:
-            logger.error(
-                f"integrity_filters_failed | trade_blocked | trade_id={trade_data.get('trade_id', 'unknown')}"
-            )
+        counters["all", "PASS" if overall_passed else "BLOCK"] += 1
+        self.trades_evaluated += 1
+        if self.counters_log_every and self.trades_evaluated % self.counters_log_every == 0:
+            logger.info(f"integrity_filters_summary | {self.get_counters()}")
 
         return overall_passed, results
 
+    def get_counters(self) -> Dict[str, Dict[str, int]]:
+        """필터별 액션 집계 ({필터명: {액션: 건수}})"""
+        summary: Dict[str, Dict[str, int]] = {}
+        for (filter_name, action), count in self.counters.items():
+            summary.setdefault(filter_name, {})[action] = count
+        return summary
+
 
 # 전역 인스턴스
 _integrity_filters = None
@@ -494,3 +535,27 @@ def apply_integrity_filters(trade_data: Dict[str, Any]) -> Tuple[bool, list]:
     """무결성 필터 적용 (편의 함수)"""
     filters = get_integrity_filters()
     return filters.apply_all_filters(trade_data)
+
+
+def seed_balance_view(snapshot_path: Union[str, Path]) -> bool:
+    """account_snapshot.json으로 싱글톤 잔고 뷰 초기화 (시작 시 1회, 이후는 이벤트로 갱신)"""
+    try:
+        with open(snapshot_path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"integrity_filters | balance_seed_unavailable | path={snapshot_path} | error={e}")
+        return False
+    if not isinstance(snapshot, dict):
+        return False
+    return get_integrity_filters().balance_view.on_account_event(snapshot)
+
+
+def attach_balance_events(subscriber) -> None:
+    """UIEventSubscriber의 BALANCE_UPDATE 이벤트로 싱글톤 잔고 뷰 갱신"""
+    from shared.ui_event_bus import UIEventType
+
+    balance_view = get_integrity_filters().balance_view
+    subscriber.subscribe(
+        UIEventType.BALANCE_UPDATE,
+        lambda event: balance_view.on_account_event(event.payload),
+    )
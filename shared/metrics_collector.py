@@ -6,6 +6,7 @@
 
 import json
 import logging
+import os
 import sys
 import threading
 import time
@@ -19,6 +20,12 @@ from typing import Any, Dict, List
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+# 통합 메트릭 레지스트리 (coin_quant 패키지가 있을 때만)
+try:
+    from coin_quant.shared.metrics import metrics_registry
+except ImportError:
+    metrics_registry = None
+
 
 @dataclass
 class ExecutionMetrics:
@@ -99,10 +106,45 @@ class MetricsCollector:
         self.metrics_dir = Path("logs/metrics")
         self.metrics_dir.mkdir(exist_ok=True)
 
+        # 롤업 파일 (분 단위 타임스탬프 파일 대신 단일 파일 덮어쓰기)
+        self.rollup_file = self.metrics_dir / "metrics_rollup.json"
+
         # 백그라운드 스레드
         self.running = False
         self.flush_thread = None
 
+        self._register_registry_metrics()
+
+    def _register_registry_metrics(self):
+        """통합 레지스트리에 카운터/히스토그램 등록"""
+        self._registry_enabled = metrics_registry is not None
+        if not self._registry_enabled:
+            return
+
+        r = metrics_registry
+        self._m_trades = r.counter(
+            "coin_quant_executions_total", "Executions recorded", ["success"]
+        )
+        self._m_exec_latency = r.histogram(
+            "coin_quant_execution_latency_seconds", "Order execution latency"
+        )
+        self._m_slippage = r.histogram(
+            "coin_quant_execution_slippage_bps",
+            "Execution slippage in basis points",
+            buckets=(0.5, 1, 2, 5, 10, 20, 50, 100),
+        )
+        self._m_file_io = r.counter(
+            "coin_quant_file_io_total", "File I/O operations", ["operation", "success"]
+        )
+        self._m_file_io_latency = r.histogram(
+            "coin_quant_file_io_seconds", "File I/O duration", ["operation"]
+        )
+        self._m_watchdog = r.counter(
+            "coin_quant_watchdog_actions_total",
+            "Watchdog actions",
+            ["action", "module", "success"],
+        )
+
     def _setup_logging(self) -> logging.Logger:
         """로깅 설정"""
         logger = logging.getLogger("metrics")
@@ -174,6 +216,11 @@ class MetricsCollector:
             self.execution_metrics.append(metric)
             self._update_execution_stats()
 
+            if self._registry_enabled:
+                self._m_trades.labels(success=success).inc()
+                self._m_exec_latency.observe(latency_ms / 1000.0)
+                self._m_slippage.observe(slippage_bps)
+
         except Exception as e:
             self.logger.error(f"체결 메트릭 기록 오류: {e}")
 
@@ -201,6 +248,12 @@ class MetricsCollector:
             self.file_io_metrics.append(metric)
             self._update_file_io_stats()
 
+            if self._registry_enabled:
+                self._m_file_io.labels(operation=operation, success=success).inc()
+                self._m_file_io_latency.labels(operation=operation).observe(
+                    duration_ms / 1000.0
+                )
+
         except Exception as e:
             self.logger.error(f"파일 I/O 메트릭 기록 오류: {e}")
 
@@ -228,6 +281,11 @@ class MetricsCollector:
             self.watchdog_metrics.append(metric)
             self._update_watchdog_stats()
 
+            if self._registry_enabled:
+                self._m_watchdog.labels(
+                    action=action, module=module, success=success
+                ).inc()
+
         except Exception as e:
             self.logger.error(f"Watchdog 메트릭 기록 오류: {e}")
 
@@ -328,58 +386,21 @@ class MetricsCollector:
                 self.logger.error(f"메트릭 플러시 루프 오류: {e}")
 
     def _flush_metrics(self):
-        """메트릭을 파일에 저장"""
+        """메트릭을 단일 롤업 파일에 저장 (원자적 덮어쓰기)"""
         try:
-            current_time = datetime.now()
-
-            # 체결 메트릭 저장
-            if self.execution_metrics:
-                execution_file = (
-                    self.metrics_dir
-                    / f"execution_{current_time.strftime('%Y%m%d_%H%M')}.json"
-                )
-                with open(execution_file, "w", encoding="utf-8") as f:
-                    json.dump(
-                        [asdict(m) for m in self.execution_metrics],
-                        f,
-                        ensure_ascii=False,
-                        indent=2,
-                    )
-
-            # 파일 I/O 메트릭 저장
-            if self.file_io_metrics:
-                file_io_file = (
-                    self.metrics_dir
-                    / f"file_io_{current_time.strftime('%Y%m%d_%H%M')}.json"
-                )
-                with open(file_io_file, "w", encoding="utf-8") as f:
-                    json.dump(
-                        [asdict(m) for m in self.file_io_metrics],
-                        f,
-                        ensure_ascii=False,
-                        indent=2,
-                    )
-
-            # Watchdog 메트릭 저장
-            if self.watchdog_metrics:
-                watchdog_file = (
-                    self.metrics_dir
-                    / f"watchdog_{current_time.strftime('%Y%m%d_%H%M')}.json"
-                )
-                with open(watchdog_file, "w", encoding="utf-8") as f:
-                    json.dump(
-                        [asdict(m) for m in self.watchdog_metrics],
-                        f,
-                        ensure_ascii=False,
-                        indent=2,
-                    )
-
-            # 통계 저장
-            stats_file = (
-                self.metrics_dir / f"stats_{current_time.strftime('%Y%m%d_%H%M')}.json"
-            )
-            with open(stats_file, "w", encoding="utf-8") as f:
-                json.dump(self.stats, f, ensure_ascii=False, indent=2)
+            rollup = {
+                "timestamp": time.time(),
+                "updated_at": datetime.now().isoformat(),
+                "stats": self.stats,
+                "execution": [asdict(m) for m in self.execution_metrics],
+                "file_io": [asdict(m) for m in self.file_io_metrics],
+                "watchdog": [asdict(m) for m in self.watchdog_metrics],
+            }
+
+            tmp_file = self.rollup_file.with_suffix(".json.tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(rollup, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_file, self.rollup_file)
 
             self.logger.info(
                 f"메트릭 플러시 완료: {len(self.execution_metrics)} 체결, {len(self.file_io_metrics)} 파일I/O, {len(self.watchdog_metrics)} Watchdog"
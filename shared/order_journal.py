@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Order Journal - indexed orders.ndjson with compacted checkpoints
+
+orders.ndjson stays an append-only log of order states (one JSON line per
+add/update). OrderJournal keeps, in memory:
+
+- order_id -> byte offset of the order's latest line (last write wins)
+- client_order_id -> order_id
+- latest state of every open (NEW / PARTIALLY_FILLED) order
+
+so idempotency checks are a dict lookup (plus one seek on a hit) instead of
+a scan of the whole file. Every checkpoint_every appends the index is
+written to a checkpoint file next to the journal; on open the checkpoint is
+loaded and only the journal tail after it is replayed. compact() rewrites
+the journal to one line (the latest) per order.
+
+Checkpoint layout: one JSON header line (journal offset, guard CRC, open
+orders, section sizes), then newline-joined order ids, newline-joined
+client order ids (aligned, "" if none) and the offsets as int64.
+
+Lines appended by another process are picked up before every lookup (one
+stat); a journal that shrank or whose bytes before the checkpoint offset
+changed is replayed from the start.
+"""
+
+import json
+import os
+import sys
+import threading
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+OPEN_STATUSES = frozenset({"NEW", "PARTIALLY_FILLED"})
+
+# Bytes before the checkpoint offset that must match for the checkpoint to be used
+_GUARD_BYTES = 256
+
+
+class OrderJournal:
+    """In-memory index over an append-only order state journal"""
+
+    def __init__(self, path: Union[str, Path], checkpoint_path: Optional[Union[str, Path]] = None,
+                 checkpoint_every: int = 50_000, fsync: bool = False):
+        """
+        Args:
+            path: Journal file (orders.ndjson)
+            checkpoint_path: Index checkpoint (default: <journal>.checkpoint)
+            checkpoint_every: Appends between automatic checkpoints (0: never)
+            fsync: fsync every append (otherwise flushed to the OS only)
+        """
+        self.path = Path(path)
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else \
+            self.path.with_name(self.path.stem + ".checkpoint")
+        self.checkpoint_every = checkpoint_every
+        self.fsync = fsync
+
+        self._lock = threading.RLock()
+        self._file = None
+        self._stats = {"appends": 0, "replayed_lines": 0, "checkpoints": 0,
+                       "checkpoint_loaded": False, "full_replays": 0, "compactions": 0}
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self._offsets: Dict[str, int] = {}
+        self._client_ids: Dict[str, str] = {}
+        self._open: Dict[str, Dict[str, Any]] = {}
+        self._end = 0
+        self._since_checkpoint = 0
+
+    # ------------------------------------------------------------------
+    # Loading
+
+    def _guard(self, offset: int) -> int:
+        """CRC of the journal bytes just before offset"""
+        with open(self.path, "rb") as f:
+            f.seek(max(0, offset - _GUARD_BYTES))
+            return zlib.crc32(f.read(min(offset, _GUARD_BYTES)))
+
+    def _load(self):
+        """Checkpoint (if it still matches the journal) + replay of the tail"""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.checkpoint_path, "rb") as f:
+                header = json.loads(f.readline())
+                offset = header["offset"]
+                if offset <= self.path.stat().st_size and header["guard"] == self._guard(offset):
+                    count = header["count"]
+                    order_ids = f.read(header["ids_bytes"]).decode("utf-8").split("\n") if count else []
+                    client_ids = f.read(header["client_ids_bytes"]).decode("utf-8").split("\n") if count else []
+                    offsets = array("q")
+                    offsets.frombytes(f.read(count * offsets.itemsize))
+                    if sys.byteorder != "little":
+                        offsets.byteswap()
+                    if len(order_ids) == len(client_ids) == len(offsets) == count:
+                        self._offsets = dict(zip(order_ids, offsets))
+                        self._client_ids = dict(zip(client_ids, order_ids))
+                        self._client_ids.pop("", None)
+                        self._open = header["open"]
+                        self._end = offset
+                        self._stats["checkpoint_loaded"] = True
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        if not self._stats["checkpoint_loaded"]:
+            self._stats["full_replays"] += 1
+        self._replay()
+
+    def _replay(self):
+        """Apply complete lines after the known end of the journal"""
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return
+        with f:
+            f.seek(self._end)
+            offset = self._end
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # a writer is mid-line: picked up next time
+                try:
+                    self._apply(json.loads(line), offset)
+                except (ValueError, AttributeError):
+                    pass
+                offset += len(line)
+                self._since_checkpoint += 1
+                self._stats["replayed_lines"] += 1
+            self._end = offset
+
+    def _apply(self, data: Dict[str, Any], offset: int):
+        order_id = data.get("order_id")
+        if not order_id:
+            return
+        self._offsets[order_id] = offset
+        client_order_id = data.get("client_order_id")
+        if client_order_id:
+            self._client_ids[client_order_id] = order_id
+        if data.get("status") in OPEN_STATUSES:
+            self._open[order_id] = data
+        else:
+            self._open.pop(order_id, None)
+
+    def _catch_up(self):
+        """Pick up lines appended by other writers; full replay if the file shrank"""
+        try:
+            size = os.stat(self.path).st_size
+        except OSError:
+            size = 0
+        if size < self._end:
+            self._reset()
+            self._stats["full_replays"] += 1
+        if size != self._end:
+            self._replay()
+
+    # ------------------------------------------------------------------
+    # Writes
+
+    def append(self, data: Dict[str, Any]) -> bool:
+        """Append one order state (it becomes the order's latest state)"""
+        line = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+        with self._lock:
+            try:
+                if self._file is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self._file = open(self.path, "ab")
+                self._file.write(line)
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+            except OSError as e:
+                print(f"[ERROR] OrderJournal.append: {e}")
+                self.close()
+                return False
+            self._stats["appends"] += 1
+            self._catch_up()
+            if self.checkpoint_every and self._since_checkpoint >= self.checkpoint_every:
+                self.checkpoint()
+            return True
+
+    def checkpoint(self) -> bool:
+        """Write the index at the current journal end"""
+        with self._lock:
+            self._catch_up()
+            if not self._end:
+                return False
+            client_of = {order_id: client_id for client_id, order_id in self._client_ids.items()}
+            order_ids = "\n".join(self._offsets).encode("utf-8")
+            client_ids = "\n".join(client_of.get(order_id, "") for order_id in self._offsets).encode("utf-8")
+            offsets = array("q", self._offsets.values())
+            if sys.byteorder != "little":
+                offsets.byteswap()
+            header = {
+                "version": 2,
+                "offset": self._end,
+                "guard": self._guard(self._end),
+                "count": len(self._offsets),
+                "ids_bytes": len(order_ids),
+                "client_ids_bytes": len(client_ids),
+                "open": self._open,
+            }
+            temp = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+            try:
+                with open(temp, "wb") as f:
+                    f.write(json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+                    f.write(b"\n")
+                    f.write(order_ids)
+                    f.write(client_ids)
+                    f.write(offsets.tobytes())
+                os.replace(temp, self.checkpoint_path)
+            except OSError as e:
+                print(f"[ERROR] OrderJournal.checkpoint: {e}")
+                return False
+            self._since_checkpoint = 0
+            self._stats["checkpoints"] += 1
+            return True
+
+    def compact(self) -> bool:
+        """Rewrite the journal with only the latest line of each order, then checkpoint"""
+        with self._lock:
+            self._catch_up()
+            self.close()
+            latest = set(self._offsets.values())
+            temp = self.path.with_name(self.path.name + ".compact.tmp")
+            try:
+                with open(self.path, "rb") as src, open(temp, "wb") as dst:
+                    offset = 0
+                    for line in src:
+                        if offset >= self._end:
+                            break
+                        if offset in latest:
+                            dst.write(line)
+                        offset += len(line)
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                os.replace(temp, self.path)
+            except OSError as e:
+                print(f"[ERROR] OrderJournal.compact: {e}")
+                return False
+            self._reset()
+            self._replay()
+            self._stats["compactions"] += 1
+            return self.checkpoint()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # ------------------------------------------------------------------
+    # Reads
+
+    def get(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """Latest state of an order, or None"""
+        with self._lock:
+            self._catch_up()
+            offset = self._offsets.get(order_id)
+            if offset is None:
+                return None
+            try:
+                with open(self.path, "rb") as f:
+                    f.seek(offset)
+                    return json.loads(f.readline())
+            except (OSError, ValueError):
+                return None
+
+    def get_by_client_id(self, client_order_id: str) -> Optional[Dict[str, Any]]:
+        """Latest state of the order placed with client_order_id, or None"""
+        with self._lock:
+            self._catch_up()
+            order_id = self._client_ids.get(client_order_id)
+            return self.get(order_id) if order_id is not None else None
+
+    def open_orders(self) -> Dict[str, Dict[str, Any]]:
+        """Latest state of every open order by order_id"""
+        with self._lock:
+            self._catch_up()
+            return dict(self._open)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "orders": len(self._offsets), "open_orders": len(self._open),
+                    "journal_bytes": self._end, "since_checkpoint": self._since_checkpoint}
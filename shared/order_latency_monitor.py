@@ -7,6 +7,7 @@ Tracks signal-to-order latency with stage-by-stage budget tracking
 import json
 import logging
 import time
+from collections import deque
 from dataclasses import asdict, dataclass
 from enum import Enum
 from pathlib import Path
@@ -14,6 +15,11 @@ from typing import Optional
 
 from .path_registry import get_absolute_path
 
+try:
+    from coin_quant.shared.metrics import metrics_registry
+except ImportError:
+    metrics_registry = None
+
 
 class LatencyStage(Enum):
     """Latency tracking stages"""
@@ -65,7 +71,7 @@ class OrderLatencyMonitor:
     Emits warnings when budget is exceeded
     """
     
-    def __init__(self):
+    def __init__(self, max_measurements: int = 1000):
         self.logger = logging.getLogger('OrderLatency')
         self.events_path = get_absolute_path('shared_data') / 'order_latency_events.jsonl'
         self.summary_path = get_absolute_path('shared_data') / 'order_latency_summary.json'
@@ -74,7 +80,15 @@ class OrderLatencyMonitor:
         self.summary_path.parent.mkdir(parents=True, exist_ok=True)
         
         self.budget = LatencyBudget()
-        self.measurements = []
+        # Bounded: only the most recent measurements feed get_summary()
+        self.measurements = deque(maxlen=max_measurements)
+
+        # Full-lifetime distribution goes to bounded histograms instead
+        self._stage_hist = None
+        if metrics_registry is not None:
+            self._stage_hist = metrics_registry.histogram(
+                "coin_quant_order_stage_seconds", "Trader-local order stage latency", ["stage"]
+            )
     
     def start_timer(self) -> float:
         """Start a timer and return start timestamp"""
@@ -124,6 +138,8 @@ class OrderLatencyMonitor:
         )
         
         self.measurements.append(measurement)
+        if self._stage_hist is not None:
+            self._stage_hist.labels(stage=stage.value).observe(latency_ms / 1000.0)
         
         # Log if exceeded
         if exceeded:
@@ -170,7 +186,7 @@ class OrderLatencyMonitor:
             }
         
         # Get last N measurements
-        recent = self.measurements[-last_n:] if len(self.measurements) > last_n else self.measurements
+        recent = list(self.measurements)[-last_n:]
         
         exceeded_count = sum(1 for m in recent if m.exceeded)
         
@@ -11,14 +11,13 @@ Key Features:
 - Idempotent order execution with clientOrderId
 - Exponential backoff retry logic
 - Rate limiting and latency monitoring
-- Paper trading simulation with realistic fills
+- Paper trading simulation against the feeder's book snapshots (paper_matching)
 - Live trading via python-binance with safety checks
 """
 
 import json
 import time
 import hashlib
-import random
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
@@ -33,6 +32,12 @@ from .io_canonical import (
     artifact, get_ssot_dir, append_ndjson_atomic, read_json_safe
 )
 from .state_store import Order, Fill, get_state_store
+from .paper_matching import PaperFill, PaperMatchingEngine, PaperOrder
+
+try:
+    from coin_quant.shared.price_board import PriceBoardReader
+except ImportError:
+    PriceBoardReader = None
 
 
 class OrderMode(Enum):
@@ -110,9 +115,14 @@ class OrderRouter:
         self.binance_client = None
         self._setup_binance_client()
         
-        # Paper trading state
-        self.paper_prices = {}
-        self._load_paper_prices()
+        # Paper trading state: matching engine fed from the feeder's snapshots
+        self.paper_engine = PaperMatchingEngine()
+        self._paper_market_stamps: Dict[Path, Tuple[int, int]] = {}
+        self._paper_orders: Dict[str, str] = {}  # client_order_id -> order_id (open only)
+        self._paper_fill_seq = 0
+        # Last prices of symbols without a depth snapshot: the feeder's price board
+        self._paper_board = PriceBoardReader(fallback=False) if PriceBoardReader is not None else None
+        self._paper_board_seqs: Dict[str, int] = {}
     
     def _setup_binance_client(self):
         """Setup Binance client for LIVE mode"""
@@ -141,18 +151,48 @@ class OrderRouter:
                 print(f"[ERROR] Binance client setup failed: {e}")
                 self.mode = OrderMode.PAPER
     
-    def _load_paper_prices(self):
-        """Load current prices for paper trading simulation"""
+    def _file_changed(self, path: Path) -> bool:
+        """True if path exists and its mtime/size differ from the last call"""
+        try:
+            st = path.stat()
+        except OSError:
+            return False
+        stamp = (st.st_mtime_ns, st.st_size)
+        if self._paper_market_stamps.get(path) == stamp:
+            return False
+        self._paper_market_stamps[path] = stamp
+        return True
+    
+    def _refresh_paper_market(self, symbol: str):
+        """Feed the paper engine the feeder's latest depth snapshot (price board, then health.json price as fallback)"""
         try:
+            snapshot_file = self.ssot_dir / "snapshots" / f"prices_{symbol}.json"
+            if snapshot_file.exists():
+                if self._file_changed(snapshot_file):
+                    data = read_json_safe(snapshot_file)
+                    if data and 'ts' in data:
+                        self._apply_paper_fills(self.paper_engine.on_event({**data, 'symbol': symbol}))
+                return
+            
+            if self._paper_board is not None and self._paper_board.alive():
+                tick = self._paper_board.get(symbol)
+                if tick and tick['seq'] != self._paper_board_seqs.get(symbol):
+                    self._paper_board_seqs[symbol] = tick['seq']
+                    self._apply_paper_fills(self.paper_engine.on_price(
+                        symbol, tick['received_at'], tick['price']))
+                return
+            
             health_file = self.ssot_dir / "health.json"
-            if health_file.exists():
+            if self._file_changed(health_file):
                 data = read_json_safe(health_file)
                 if data and 'symbols' in data:
-                    for symbol, symbol_data in data['symbols'].items():
+                    now = time.time()
+                    for health_symbol, symbol_data in data['symbols'].items():
                         if 'price' in symbol_data:
-                            self.paper_prices[symbol] = float(symbol_data['price'])
+                            self._apply_paper_fills(self.paper_engine.on_price(
+                                health_symbol, now, float(symbol_data['price'])))
         except Exception as e:
-            print(f"[ERROR] Failed to load paper prices: {e}")
+            print(f"[ERROR] Failed to refresh paper market data: {e}")
     
     def _generate_client_order_id(self, symbol: str, side: str, quantity: float) -> str:
         """Generate idempotent client order ID"""
@@ -161,57 +201,59 @@ class OrderRouter:
         return hashlib.md5(data.encode()).hexdigest()[:16]
     
     def _check_existing_order(self, client_order_id: str) -> Optional[Order]:
-        """Check if order with same client_order_id already exists"""
+        """Check if order with same client_order_id already exists (journal index lookup)"""
         try:
-            orders_file = self.ssot_dir / "orders.ndjson"
-            if not orders_file.exists():
-                return None
-            
-            with open(orders_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            order_data = json.loads(line)
-                            if order_data.get('client_order_id') == client_order_id:
-                                return Order(**order_data)
-                        except (json.JSONDecodeError, TypeError):
-                            continue
+            return self.state_store.get_order_by_client_id(client_order_id)
         except Exception as e:
             print(f"[ERROR] Failed to check existing order: {e}")
         
         return None
     
-    def _simulate_fill(self, order_request: OrderRequest) -> Tuple[bool, float, float]:
-        """Simulate fill for PAPER mode"""
-        try:
-            # Get current price
-            current_price = self.paper_prices.get(order_request.symbol, 50000.0)
-            
-            # Apply slippage (0.1% to 0.3% random)
-            slippage_bps = random.uniform(10, 30)
-            slippage_factor = 1 + (slippage_bps / 10000)
-            
-            if order_request.side == 'BUY':
-                fill_price = current_price * slippage_factor
-            else:
-                fill_price = current_price / slippage_factor
-            
-            # Simulate partial fills (90% chance of full fill)
-            fill_probability = 0.95 if order_request.order_type == "MARKET" else 0.9
-            
-            if random.random() < fill_probability:
-                filled_quantity = order_request.quantity
-            else:
-                # Partial fill (50% to 90% of quantity)
-                fill_ratio = random.uniform(0.5, 0.9)
-                filled_quantity = order_request.quantity * fill_ratio
-            
-            return True, filled_quantity, fill_price
-            
-        except Exception as e:
-            print(f"[ERROR] Fill simulation failed: {e}")
-            return False, 0.0, 0.0
+    def _simulate_fill(self, order_request: OrderRequest) -> Tuple[PaperOrder, List[PaperFill]]:
+        """Simulate fill for PAPER mode (the current snapshot stands in for the book at arrival)"""
+        self._refresh_paper_market(order_request.symbol)
+        paper_order = self.paper_engine.submit(PaperOrder(
+            client_order_id=order_request.client_order_id,
+            symbol=order_request.symbol,
+            side=order_request.side,
+            order_type=order_request.order_type,
+            quantity=order_request.quantity,
+            price=order_request.price,
+            time_in_force=order_request.time_in_force
+        ), ts=time.time())
+        return paper_order, self.paper_engine.advance(paper_order.arrival_ts)
+    
+    def _apply_paper_fills(self, fills: List[PaperFill]):
+        """Record engine fills for orders this router placed"""
+        for paper_fill in fills:
+            order_id = self._paper_orders.get(paper_fill.client_order_id)
+            if order_id is None:
+                continue
+            self._paper_fill_seq += 1
+            self.state_store.apply_fill(Fill(
+                fill_id=f"paper_fill_{int(time.time() * 1000)}_{self._paper_fill_seq}",
+                order_id=order_id,
+                symbol=paper_fill.symbol,
+                side=paper_fill.side,
+                quantity=paper_fill.qty,
+                price=paper_fill.price,
+                timestamp=time.time(),
+                commission=paper_fill.fee,
+                metadata={'paper_trading': True, 'liquidity': paper_fill.liquidity}
+            ))
+        for client_order_id in list(self._paper_orders):
+            paper_order = self.paper_engine.orders.get(client_order_id)
+            if paper_order and not paper_order.is_open:
+                del self._paper_orders[client_order_id]
+                del self.paper_engine.orders[client_order_id]
+    
+    def poll_paper_fills(self):
+        """Refresh market data for symbols with resting PAPER orders and record their fills"""
+        symbols = {o.symbol for o in self.paper_engine.open_orders()
+                   if o.client_order_id in self._paper_orders}
+        for symbol in symbols:
+            self._refresh_paper_market(symbol)
+        self._apply_paper_fills(self.paper_engine.advance(time.time()))
     
     def _place_binance_order(self, order_request: OrderRequest) -> OrderResult:
         """Place order on Binance"""
@@ -381,34 +423,36 @@ class OrderRouter:
                 error_message="Failed to add order to state store"
             )
         
-        # Simulate fill
-        fill_success, filled_quantity, filled_price = self._simulate_fill(order_request)
+        # Simulate fill against the matching engine
+        self._paper_orders[order_request.client_order_id] = order.order_id
+        try:
+            paper_order, fills = self._simulate_fill(order_request)
+            self._apply_paper_fills(fills)
+        except Exception as e:
+            print(f"[ERROR] Fill simulation failed: {e}")
+            self._paper_orders.pop(order_request.client_order_id, None)
+            paper_order = None
         
-        if fill_success and filled_quantity > 0:
-            # Create fill record
-            fill = Fill(
-                fill_id=f"paper_fill_{int(time.time() * 1000)}",
+        metadata = {'paper_trading': True}
+        if paper_order and paper_order.filled_qty > 0:
+            return OrderResult(
+                success=True,
                 order_id=order.order_id,
-                symbol=order_request.symbol,
-                side=order_request.side,
-                quantity=filled_quantity,
-                price=filled_price,
-                timestamp=time.time(),
-                metadata={'paper_trading': True}
+                client_order_id=order_request.client_order_id,
+                status="FILLED" if paper_order.status == "FILLED" else "PARTIALLY_FILLED",
+                filled_quantity=paper_order.filled_qty,
+                filled_price=paper_order.avg_price,
+                execution_time_ms=(time.time() - start_time) * 1000,
+                metadata={**metadata, 'fees': paper_order.fees, 'arrival_mid': paper_order.arrival_mid}
             )
-            
-            # Apply fill to state
-            self.state_store.apply_fill(fill)
-            
+        elif paper_order and paper_order.is_open:
             return OrderResult(
                 success=True,
                 order_id=order.order_id,
                 client_order_id=order_request.client_order_id,
-                status="FILLED" if filled_quantity >= order_request.quantity else "PARTIALLY_FILLED",
-                filled_quantity=filled_quantity,
-                filled_price=filled_price,
+                status="NEW",
                 execution_time_ms=(time.time() - start_time) * 1000,
-                metadata={'paper_trading': True}
+                metadata={**metadata, 'queue_ahead': paper_order.queue_ahead}
             )
         else:
             return OrderResult(
@@ -416,9 +460,9 @@ class OrderRouter:
                 order_id=order.order_id,
                 client_order_id=order_request.client_order_id,
                 status="REJECTED",
-                error_message="Simulated fill failed",
+                error_message=(paper_order and paper_order.reject_reason) or "Simulated fill failed",
                 execution_time_ms=(time.time() - start_time) * 1000,
-                metadata={'paper_trading': True}
+                metadata=metadata
             )
     
     def _place_live_order(self, order_request: OrderRequest, start_time: float) -> OrderResult:
@@ -502,6 +546,10 @@ class OrderRouter:
                 return self.state_store.update_order(order_id, {'status': 'CANCELLED'})
             
             elif self.mode == OrderMode.PAPER:
+                for client_order_id, paper_order_id in list(self._paper_orders.items()):
+                    if paper_order_id == order_id:
+                        self.paper_engine.cancel(client_order_id)
+                        self._apply_paper_fills([])
                 # Update order status in state store
                 return self.state_store.update_order(order_id, {'status': 'CANCELLED'})
             
@@ -528,6 +576,9 @@ class OrderRouter:
                 return self.state_store.cancel_all_orders()
             
             elif self.mode == OrderMode.PAPER:
+                for paper_order in self.paper_engine.open_orders(symbol):
+                    self.paper_engine.cancel(paper_order.client_order_id)
+                self._apply_paper_fills([])
                 return self.state_store.cancel_all_orders()
             
             elif self.mode == OrderMode.LIVE:
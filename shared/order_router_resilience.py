@@ -2,14 +2,23 @@
 """
 Order Router Resilience
 Production-grade order routing with retry logic and error handling
+
+Retries never sleep inline: a failed attempt is put on a timer heap and
+run by poll() from the caller's loop, so one order's backoff does not hold
+up the others. When the outcome of an attempt is unknown (timeout,
+connection drop, 5xx) the order is looked up by clientOrderId before it is
+resubmitted, and each endpoint has a retry budget so a degraded exchange
+is not hit with a retry storm.
 """
 
+import heapq
 import json
 import logging
+import threading
 import time
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import requests
 
@@ -40,6 +49,10 @@ class RetryConfig:
     max_delay: float = 30.0
     backoff_multiplier: float = 2.0
     jitter: bool = True
+    # 엔드포인트별 재시도 예산: 요청 1건당 budget_ratio 토큰 + 초당 budget_min_per_sec 토큰
+    budget_ratio: float = 0.2
+    budget_min_per_sec: float = 0.5
+    budget_max_tokens: float = 10.0
 
 
 @dataclass
@@ -75,12 +88,69 @@ class RetryAttempt:
     timestamp: float
 
 
+@dataclass
+class RoutedOrder:
+    """라우팅 중인 주문 (submit_order 반환값)"""
+    request: OrderRequest
+    client: Any
+    callback: Optional[Callable[["RoutedOrder"], None]] = None
+    response: Optional[OrderResponse] = None
+    attempts: List[RetryAttempt] = field(default_factory=list)
+    next_action: str = "submit"  # submit | query
+    submits: int = 0
+    retries: int = 0
+    retry_after: Optional[int] = None
+    done: bool = False
+    unknown: bool = False  # 종료 시점에 거래소 접수 여부 미확정 (대사 필요)
+
+
+class RetryBudget:
+    """엔드포인트별 재시도 예산 (토큰 버킷)"""
+    
+    def __init__(self, ratio: float, min_per_sec: float, max_tokens: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ratio = ratio
+        self.min_per_sec = min_per_sec
+        self.max_tokens = max_tokens
+        self.clock = clock
+        self.tokens = max_tokens
+        self._last = clock()
+        self.requests = 0
+        self.retries = 0
+        self.denied = 0
+    
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.max_tokens, self.tokens + (now - self._last) * self.min_per_sec)
+        self._last = now
+    
+    def record_request(self):
+        """요청 1건 기록 (재시도 토큰 적립)"""
+        self._refill()
+        self.requests += 1
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+    
+    def try_spend(self) -> bool:
+        """재시도 1회 허용 여부 (허용 시 토큰 1개 사용)"""
+        self._refill()
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            self.retries += 1
+            return True
+        self.denied += 1
+        return False
+
+
 class OrderRouterResilience:
     """주문 라우터 복원력 관리"""
     
-    def __init__(self, retry_config: Optional[RetryConfig] = None):
+    def __init__(self, retry_config: Optional[RetryConfig] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
         self.logger = logging.getLogger(__name__)
         self.retry_config = retry_config or RetryConfig()
+        self.clock = clock
+        self.sleep = sleep
         
         # 통계
         self.stats = {
@@ -89,84 +159,263 @@ class OrderRouterResilience:
             "orders_failed": 0,
             "retryable_errors": 0,
             "non_retryable_errors": 0,
-            "total_retries": 0
+            "total_retries": 0,
+            "status_queries": 0,
+            "resolved_by_query": 0,
+            "unknown_outcomes": 0,
+            "budget_exhausted": 0
         }
         
         # 재시도 히스토리
         self.retry_history: List[RetryAttempt] = []
         self.max_retry_history = 1000
         
+        # 재시도 스케줄 (due, seq, RoutedOrder) + 엔드포인트별 재시도 예산
+        self._lock = threading.RLock()
+        self._timers: List[Tuple[float, int, RoutedOrder]] = []
+        self._seq = 0
+        self.retry_budgets: Dict[str, RetryBudget] = {}
+        
         self.logger.info("OrderRouterResilience initialized")
     
     def route_order(self, order_request: OrderRequest, 
                    exchange_client: Any) -> Tuple[OrderResponse, List[RetryAttempt]]:
-        """주문 라우팅 (재시도 로직 포함)"""
+        """
+        주문 라우팅 (동기 호출용)
+        
+        이 주문이 끝날 때까지 기다리지만, 대기 중에도 poll()로 다른 주문의
+        예약된 재시도를 함께 처리함. 트레이더 루프에서는 submit_order + poll 사용.
+        """
+        routed = self.submit_order(order_request, exchange_client)
+        while not routed.done:
+            self.poll()
+            if routed.done:
+                break
+            next_due = self.next_due()
+            if next_due is not None:
+                self.sleep(max(0.0, next_due - self.clock()))
+        return routed.response, routed.attempts
+    
+    def submit_order(self, order_request: OrderRequest, exchange_client: Any,
+                     callback: Optional[Callable[["RoutedOrder"], None]] = None) -> "RoutedOrder":
+        """
+        주문 전송 (비블로킹)
+        
+        첫 시도는 즉시 실행하고, 재시도가 필요하면 타이머에 예약한 뒤 바로 반환.
+        예약된 재시도는 poll()이 실행하며, 끝나면 callback(routed) 호출.
+        """
         self.stats["orders_sent"] += 1
+        routed = RoutedOrder(order_request, exchange_client, callback)
+        self._run(routed)
+        return routed
+    
+    def poll(self, now: Optional[float] = None) -> int:
+        """예약 시각이 지난 재시도/상태 조회 실행 (대기 없음), 실행한 개수 반환"""
+        ran = 0
+        while True:
+            with self._lock:
+                now_ = self.clock() if now is None else now
+                if not self._timers or self._timers[0][0] > now_:
+                    return ran
+                _, _, routed = heapq.heappop(self._timers)
+            self._run(routed)
+            ran += 1
+    
+    def next_due(self) -> Optional[float]:
+        """다음 예약 실행 시각 (clock 기준), 없으면 None"""
+        with self._lock:
+            return self._timers[0][0] if self._timers else None
+    
+    def pending_count(self) -> int:
+        """재시도/상태 조회 대기 중인 주문 수"""
+        with self._lock:
+            return len(self._timers)
+    
+    def _schedule(self, routed: "RoutedOrder", delay: float):
+        with self._lock:
+            self._seq += 1
+            heapq.heappush(self._timers, (self.clock() + delay, self._seq, routed))
+    
+    def _budget(self, endpoint: str) -> "RetryBudget":
+        budget = self.retry_budgets.get(endpoint)
+        if budget is None:
+            budget = self.retry_budgets[endpoint] = RetryBudget(
+                self.retry_config.budget_ratio,
+                self.retry_config.budget_min_per_sec,
+                self.retry_config.budget_max_tokens,
+                self.clock
+            )
+        return budget
+    
+    def _run(self, routed: "RoutedOrder"):
+        """주문 한 단계 실행: (필요 시) 상태 조회 -> 전송 -> 성공/실패/재시도 예약"""
+        order_request = routed.request
+        try:
+            if routed.next_action == "query":
+                query_endpoint = self._query_method(routed.client)
+                self._budget(query_endpoint).record_request()
+                found, response = self._query_order(order_request, routed.client)
+                self.stats["status_queries"] += 1
+                if found:
+                    # 이전 전송이 실제로 접수됨: 재전송하지 않음
+                    self.stats["resolved_by_query"] += 1
+                    self.logger.info(f"ROUTE status=resolved trace_id={order_request.client_order_id} coid={order_request.client_order_id}")
+                    self._finish(routed, response, success=True)
+                    return
+                if found is None:
+                    # 조회도 실패: 결과 미확정 상태로 조회만 다시 예약
+                    routed.retry_after = self._analyze_error(response)[1]
+                    self._retry_or_finish(routed, response, query_endpoint, ambiguous=True)
+                    return
+                routed.next_action = "submit"
+            
+            endpoint = self._order_endpoint(routed.client)
+            self._budget(endpoint).record_request()
+            routed.submits += 1
+            response = self._execute_order(order_request, routed.client)
+            
+            if response.success:
+                self.logger.info(f"ROUTE status=sent code=200 trace_id={order_request.client_order_id} coid={order_request.client_order_id}")
+                self._finish(routed, response, success=True)
+                return
+            
+            # 오류 분석
+            is_retryable, retry_after = self._analyze_error(response)
+            if not is_retryable:
+                self.stats["non_retryable_errors"] += 1
+                self.logger.error(f"ROUTE status=drop code={response.error_code} trace_id={order_request.client_order_id} coid={order_request.client_order_id}")
+                self._finish(routed, response, success=False)
+                return
+            
+            routed.retry_after = retry_after
+            self._retry_or_finish(routed, response, endpoint,
+                                  ambiguous=self._is_ambiguous(response))
         
-        retry_attempts = []
-        last_error = None
+        except Exception as e:
+            self.logger.error(f"Order routing exception: {e}")
+            self._finish(routed, OrderResponse(
+                success=False,
+                error_code="EXCEPTION",
+                error_message=str(e)
+            ), success=False)
+    
+    def _retry_or_finish(self, routed: "RoutedOrder", response: OrderResponse,
+                         endpoint: str, ambiguous: bool):
+        """재시도 예약 (횟수/예산 허용 시), 아니면 실패 또는 결과 미확정으로 종료"""
+        order_request = routed.request
+        self.stats["retryable_errors"] += 1
+        can_query = ambiguous and self._query_method(routed.client) is not None
+        
+        if routed.retries >= self.retry_config.max_retries:
+            reason = "max_retries"
+        elif not self._budget(endpoint).try_spend():
+            self.stats["budget_exhausted"] += 1
+            reason = "budget"
+        else:
+            reason = None
         
-        for attempt in range(self.retry_config.max_retries + 1):
+        if reason:
+            if ambiguous:
+                # 접수 여부를 모름: 실패로 단정하지 않고 호출자가 대사하도록 표시
+                self.stats["unknown_outcomes"] += 1
+                routed.unknown = True
+            self.logger.error(f"ROUTE status={'unknown' if ambiguous else 'drop'} code={response.error_code} reason={reason} trace_id={order_request.client_order_id} coid={order_request.client_order_id}")
+            self._finish(routed, response, success=False)
+            return
+        
+        self.stats["total_retries"] += 1
+        delay = self._calculate_retry_delay(routed.retries, routed.retry_after)
+        routed.retries += 1
+        routed.next_action = "query" if can_query else "submit"
+        
+        # 재시도 기록
+        retry_attempt = RetryAttempt(
+            attempt=routed.retries,
+            delay=delay,
+            error=response.error_message or "Unknown error",
+            timestamp=time.time()
+        )
+        routed.attempts.append(retry_attempt)
+        self._add_retry_history(retry_attempt)
+        routed.response = response
+        
+        self.logger.warning(f"ROUTE status=retry code={response.error_code} trace_id={order_request.client_order_id} coid={order_request.client_order_id} attempt={routed.retries} next={routed.next_action} delay={delay:.1f}s")
+        self._schedule(routed, delay)
+    
+    def _finish(self, routed: "RoutedOrder", response: OrderResponse, success: bool):
+        if success:
+            self.stats["orders_success"] += 1
+        else:
+            self.stats["orders_failed"] += 1
+        routed.response = response
+        routed.done = True
+        if routed.callback:
             try:
-                # 주문 실행
-                response = self._execute_order(order_request, exchange_client)
-                
-                if response.success:
-                    self.stats["orders_success"] += 1
-                    self.logger.info(f"ROUTE status=sent code=200 trace_id={order_request.client_order_id} coid={order_request.client_order_id}")
-                    return response, retry_attempts
-                
-                # 오류 분석
-                is_retryable, retry_after = self._analyze_error(response)
-                
-                if not is_retryable or attempt >= self.retry_config.max_retries:
-                    # 재시도 불가능하거나 최대 재시도 횟수 초과
-                    if is_retryable:
-                        self.stats["retryable_errors"] += 1
-                    else:
-                        self.stats["non_retryable_errors"] += 1
-                    
-                    self.stats["orders_failed"] += 1
-                    self.logger.error(f"ROUTE status=drop code={response.error_code} trace_id={order_request.client_order_id} coid={order_request.client_order_id}")
-                    return response, retry_attempts
-                
-                # 재시도 가능한 오류
-                self.stats["retryable_errors"] += 1
-                self.stats["total_retries"] += 1
-                
-                # 재시도 지연 계산
-                delay = self._calculate_retry_delay(attempt, retry_after)
-                
-                # 재시도 기록
-                retry_attempt = RetryAttempt(
-                    attempt=attempt + 1,
-                    delay=delay,
-                    error=response.error_message or "Unknown error",
-                    timestamp=time.time()
-                )
-                retry_attempts.append(retry_attempt)
-                self._add_retry_history(retry_attempt)
-                
-                self.logger.warning(f"ROUTE status=retry code={response.error_code} trace_id={order_request.client_order_id} coid={order_request.client_order_id} attempt={attempt + 1} delay={delay:.1f}s")
-                
-                # 재시도 대기
-                time.sleep(delay)
-                last_error = response
-                
+                routed.callback(routed)
             except Exception as e:
-                self.logger.error(f"Order routing exception: {e}")
-                last_error = OrderResponse(
-                    success=False,
-                    error_code="EXCEPTION",
-                    error_message=str(e)
-                )
-                break
+                self.logger.error(f"Order routing callback failed: {e}")
+    
+    @staticmethod
+    def _order_endpoint(exchange_client: Any) -> str:
+        return "new_order" if hasattr(exchange_client, 'new_order') else "place_order"
+    
+    @staticmethod
+    def _query_method(exchange_client: Any) -> Optional[str]:
+        for name in ("get_order", "query_order"):
+            if hasattr(exchange_client, name):
+                return name
+        return None
+    
+    @staticmethod
+    def _is_ambiguous(response: OrderResponse) -> bool:
+        """거래소 접수 여부를 알 수 없는 오류 (타임아웃, 연결 끊김, 5xx)"""
+        error_code = (response.error_code or "").upper()
+        return error_code in ("TIMEOUT", "NETWORK_ERROR") or error_code.startswith("HTTP_5")
+    
+    def _query_order(self, order_request: OrderRequest,
+                     exchange_client: Any) -> Tuple[Optional[bool], OrderResponse]:
+        """
+        clientOrderId로 주문 조회
         
-        # 모든 재시도 실패
-        self.stats["orders_failed"] += 1
-        self.logger.error(f"ROUTE status=drop code={last_error.error_code if last_error else 'UNKNOWN'} trace_id={order_request.client_order_id} coid={order_request.client_order_id}")
+        Returns:
+            (True, 응답): 주문이 존재함 / (False, 응답): 주문 없음 (재전송 안전) /
+            (None, 응답): 조회 실패 (결과 미확정)
+        """
+        method = self._query_method(exchange_client)
+        try:
+            if method == "get_order":
+                result = exchange_client.get_order(
+                    symbol=order_request.symbol,
+                    origClientOrderId=order_request.client_order_id
+                )
+                order_id = result.get('orderId') if result else None
+            else:
+                result = exchange_client.query_order(
+                    symbol=order_request.symbol,
+                    client_order_id=order_request.client_order_id
+                )
+                order_id = result.get('order_id') if result else None
+            if not result:
+                return False, OrderResponse(success=False, error_code="ORDER_NOT_FOUND")
+            return True, OrderResponse(success=True, order_id=order_id, raw_response=result)
         
-        return last_error or OrderResponse(success=False, error_code="UNKNOWN"), retry_attempts
+        except Exception as e:
+            if self._is_order_not_found(e):
+                return False, OrderResponse(success=False, error_code="ORDER_NOT_FOUND",
+                                            error_message=str(e))
+            response = self._response_for_exception(e)
+            return None, response
+    
+    @staticmethod
+    def _is_order_not_found(error: Exception) -> bool:
+        """Binance -2013 (Order does not exist) 판별"""
+        code = getattr(error, 'code', None)
+        if code is None:
+            code = getattr(error, 'error_code', None)
+        if code in (-2013, "-2013"):
+            return True
+        message = str(error)
+        return "-2013" in message or "does not exist" in message.lower()
     
     def _execute_order(self, order_request: OrderRequest, exchange_client: Any) -> OrderResponse:
         """주문 실행"""
@@ -214,26 +463,33 @@ class OrderRouterResilience:
                     error_message="Exchange client does not support order placement"
                 )
                 
-        except requests.exceptions.Timeout as e:
+        except Exception as e:
+            return self._response_for_exception(e)
+    
+    @staticmethod
+    def _response_for_exception(e: Exception) -> OrderResponse:
+        """거래소 호출 예외 -> OrderResponse (주문 전송/조회 공통)"""
+        if isinstance(e, requests.exceptions.Timeout):
             return OrderResponse(
                 success=False,
                 error_code="TIMEOUT",
                 error_message=str(e)
             )
         
-        except requests.exceptions.ConnectionError as e:
+        if isinstance(e, requests.exceptions.ConnectionError):
             return OrderResponse(
                 success=False,
                 error_code="NETWORK_ERROR",
                 error_message=str(e)
             )
         
-        except requests.exceptions.HTTPError as e:
-            status_code = e.response.status_code if e.response else 0
+        if isinstance(e, requests.exceptions.HTTPError):
+            # Response는 4xx/5xx에서 False로 평가되므로 None 여부로 확인
+            status_code = e.response.status_code if e.response is not None else 0
             
             # Retry-After 헤더 확인
             retry_after = None
-            if e.response and 'Retry-After' in e.response.headers:
+            if e.response is not None and 'Retry-After' in e.response.headers:
                 try:
                     retry_after = int(e.response.headers['Retry-After'])
                 except ValueError:
@@ -247,12 +503,21 @@ class OrderRouterResilience:
                 retry_after=retry_after
             )
         
-        except Exception as e:
+        # python-binance BinanceAPIException 등 status_code를 가진 예외
+        status_code = getattr(e, 'status_code', None)
+        if isinstance(status_code, int) and status_code >= 400:
             return OrderResponse(
                 success=False,
-                error_code="UNKNOWN_ERROR",
-                error_message=str(e)
+                error_code=f"HTTP_{status_code}",
+                error_message=str(e),
+                http_status=status_code
             )
+        
+        return OrderResponse(
+            success=False,
+            error_code="UNKNOWN_ERROR",
+            error_message=str(e)
+        )
     
     def _analyze_error(self, response: OrderResponse) -> Tuple[bool, Optional[int]]:
         """오류 분석 (재시도 가능 여부 판단)"""
@@ -320,7 +585,17 @@ class OrderRouterResilience:
             ),
             "retry_rate": (
                 self.stats["total_retries"] / max(self.stats["orders_sent"], 1) * 100
-            )
+            ),
+            "pending_retries": self.pending_count(),
+            "retry_budgets": {
+                endpoint: {
+                    "tokens": round(budget.tokens, 2),
+                    "requests": budget.requests,
+                    "retries": budget.retries,
+                    "denied": budget.denied
+                }
+                for endpoint, budget in self.retry_budgets.items()
+            }
         }
     
     def get_recent_retry_attempts(self, limit: int = 10) -> List[RetryAttempt]:
@@ -328,6 +603,12 @@ class OrderRouterResilience:
         return self.retry_history[-limit:] if self.retry_history else []
 
 
+# 전역 인스턴스 (예약된 재시도와 예산은 인스턴스 단위라 공유해야 함)
+_order_router_resilience: Optional[OrderRouterResilience] = None
+
 def get_order_router_resilience(retry_config: Optional[RetryConfig] = None) -> OrderRouterResilience:
     """OrderRouterResilience 인스턴스 획득"""
-    return OrderRouterResilience(retry_config)
+    global _order_router_resilience
+    if _order_router_resilience is None:
+        _order_router_resilience = OrderRouterResilience(retry_config)
+    return _order_router_resilience
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+Paper Matching Engine - deterministic fill simulation from market data
+
+Fills PAPER orders against book-depth snapshots and trade ticks instead of
+a flat price plus random slippage. The same engine runs live (the order
+router feeds it the feeder's per-symbol snapshots) and offline (replay()
+over recorded events), so strategy capacity and slippage can be measured
+from the same code path that paper trades.
+
+Model:
+- Latency: an order reaches the book latency_ms (+ seeded jitter) after it
+  is submitted; until then it only sees market data, it cannot fill.
+- Taker fills walk the opposite side of the latest snapshot, level by
+  level up to the limit price. Depth taken is remembered until the next
+  snapshot for that symbol, so back-to-back orders do not refill from the
+  same liquidity.
+- Resting limit orders join the back of the queue: queue_ahead starts at
+  the displayed size at their price. Trades at that price drain the queue
+  first, then fill the order; trades through the price, or a snapshot whose
+  opposite side crosses it, fill it outright. A shrinking level only clips
+  queue_ahead to the new level size (cancels are assumed to be behind us).
+- Without depth (last price only) a marketable limit order takes at the
+  last price plus the no-depth slippage, capped at its limit; a resting
+  order fills at its limit once the last price reaches it.
+- Fees come from a volume tier table applied to the simulated 30-day volume.
+- Slippage is measured against the mid (or last price) when the order was
+  submitted.
+
+Everything except the latency jitter is deterministic, and the jitter comes
+from random.Random(seed), so a replay with the same seed is repeatable.
+"""
+
+import heapq
+import json
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Quantities below this are treated as zero (float fills)
+_EPS = 1e-12
+
+# (30-day volume in quote, maker bps, taker bps), ascending by volume.
+# Binance spot regular/VIP rates without the BNB discount; override per account.
+DEFAULT_FEE_TIERS: Tuple[Tuple[float, float, float], ...] = (
+    (0.0, 10.0, 10.0),
+    (1_000_000.0, 9.0, 10.0),
+    (5_000_000.0, 8.0, 10.0),
+    (20_000_000.0, 4.2, 6.0),
+    (100_000_000.0, 4.2, 5.4),
+)
+
+
+class FeeSchedule:
+    """Maker/taker rates by 30-day traded volume"""
+
+    def __init__(self, tiers: Iterable[Tuple[float, float, float]] = DEFAULT_FEE_TIERS):
+        self.tiers = tuple(sorted(tiers))
+        if not self.tiers:
+            raise ValueError("fee schedule needs at least one tier")
+
+    def rates(self, volume_30d: float) -> Tuple[float, float]:
+        """(maker_bps, taker_bps) for the given 30-day volume"""
+        maker, taker = self.tiers[0][1:]
+        for threshold, tier_maker, tier_taker in self.tiers:
+            if volume_30d < threshold:
+                break
+            maker, taker = tier_maker, tier_taker
+        return maker, taker
+
+
+@dataclass
+class PaperOrder:
+    """Order as the matching engine sees it"""
+    client_order_id: str
+    symbol: str
+    side: str  # 'BUY' or 'SELL'
+    order_type: str  # MARKET, LIMIT, LIMIT_IOC
+    quantity: float
+    price: Optional[float] = None
+    time_in_force: str = "GTC"  # GTC, IOC, FOK
+    submit_ts: float = 0.0
+    arrival_ts: float = 0.0
+    arrival_mid: Optional[float] = None
+    status: str = "PENDING"  # PENDING, NEW, PARTIALLY_FILLED, FILLED, EXPIRED, CANCELED, REJECTED
+    filled_qty: float = 0.0
+    filled_notional: float = 0.0
+    fees: float = 0.0
+    queue_ahead: float = 0.0
+    reject_reason: Optional[str] = None
+    seq: int = 0
+
+    @property
+    def remaining(self) -> float:
+        return self.quantity - self.filled_qty
+
+    @property
+    def avg_price(self) -> float:
+        return self.filled_notional / self.filled_qty if self.filled_qty > _EPS else 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return self.status in ("PENDING", "NEW", "PARTIALLY_FILLED")
+
+
+@dataclass
+class PaperFill:
+    """One simulated execution"""
+    client_order_id: str
+    symbol: str
+    side: str
+    qty: float
+    price: float
+    fee: float
+    liquidity: str  # 'MAKER' or 'TAKER'
+    ts: float
+
+
+@dataclass
+class _Book:
+    ts: float
+    bids: List[Tuple[float, float]]  # best first
+    asks: List[Tuple[float, float]]  # best first
+    taken: Dict[Tuple[str, float], float] = field(default_factory=dict)
+
+    @property
+    def mid(self) -> Optional[float]:
+        if self.bids and self.asks:
+            return (self.bids[0][0] + self.asks[0][0]) / 2
+        return None
+
+    def level_qty(self, side: str, price: float) -> Optional[float]:
+        """Displayed size at price on side ('BUY' = bids); None if price is outside the shown depth"""
+        levels = self.bids if side == "BUY" else self.asks
+        if not levels:
+            return None
+        worst = levels[-1][0]
+        if (side == "BUY" and price < worst) or (side == "SELL" and price > worst):
+            return None
+        for level_price, qty in levels:
+            if level_price == price:
+                return qty
+        return 0.0
+
+
+def _levels(raw: Iterable, reverse: bool) -> List[Tuple[float, float]]:
+    levels = [(float(p), float(q)) for p, q, *_ in raw if float(q) > 0]
+    levels.sort(reverse=reverse)
+    return levels
+
+
+class PaperMatchingEngine:
+    """Deterministic, seedable matching simulator for PAPER orders"""
+
+    def __init__(self, latency_ms: float = 50.0, latency_jitter_ms: float = 0.0,
+                 fee_schedule: Optional[FeeSchedule] = None, seed: int = 0,
+                 no_depth_slippage_bps: float = 10.0, volume_30d: float = 0.0):
+        """
+        Args:
+            latency_ms: Submit-to-book delay
+            latency_jitter_ms: Extra uniform delay in [0, jitter) drawn from the seeded RNG
+            fee_schedule: Maker/taker tiers (default DEFAULT_FEE_TIERS)
+            seed: RNG seed; the same seed and inputs give the same fills
+            no_depth_slippage_bps: Taker slippage used when only a last price is known
+            volume_30d: Starting 30-day volume for the fee tier
+        """
+        self.latency = latency_ms / 1000.0
+        self.latency_jitter = latency_jitter_ms / 1000.0
+        self.fee_schedule = fee_schedule or FeeSchedule()
+        self.no_depth_slippage_bps = no_depth_slippage_bps
+        self.volume_30d = volume_30d
+        self._rng = random.Random(seed)
+
+        self.now = 0.0
+        self.books: Dict[str, _Book] = {}
+        self.last_price: Dict[str, float] = {}
+        self.orders: Dict[str, PaperOrder] = {}
+        self._pending: List[Tuple[float, int, PaperOrder]] = []
+        self._resting: Dict[str, List[PaperOrder]] = {}
+        self._seq = 0
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    # ------------------------------------------------------------------
+    # Market data
+
+    def on_book(self, symbol: str, ts: float, bids: Iterable, asks: Iterable) -> List[PaperFill]:
+        """Depth snapshot: orders that arrived before ts match the previous book first"""
+        fills = self.advance(ts)
+        book = _Book(ts, _levels(bids, reverse=True), _levels(asks, reverse=False))
+        self.books[symbol] = book
+        for order in self._resting_orders(symbol):
+            opposite = book.asks if order.side == "BUY" else book.bids
+            if opposite:
+                fills.extend(self._take(order, book, opposite, order.price, "MAKER", at_own_price=True))
+            level = book.level_qty(order.side, order.price)
+            if level is not None:
+                order.queue_ahead = min(order.queue_ahead, level)
+        self._prune(symbol)
+        return fills
+
+    def on_trade(self, symbol: str, ts: float, price: float, qty: float, side: str) -> List[PaperFill]:
+        """Trade tick; side is the aggressor ('BUY' lifts asks, 'SELL' hits bids)"""
+        fills = self.advance(ts)
+        self.last_price[symbol] = price
+        for order in self._resting_orders(symbol):
+            if qty <= _EPS:
+                break
+            if order.side == side:
+                continue
+            through = price < order.price if order.side == "BUY" else price > order.price
+            if not through:
+                if price != order.price:
+                    continue
+                drained = min(order.queue_ahead, qty)
+                order.queue_ahead -= drained
+                qty -= drained
+                if order.queue_ahead > _EPS:
+                    continue
+            fill_qty = min(order.remaining, qty)
+            if fill_qty > _EPS:
+                qty -= fill_qty
+                fills.append(self._fill(order, fill_qty, order.price, "MAKER"))
+        self._prune(symbol)
+        return fills
+
+    def on_price(self, symbol: str, ts: float, price: float) -> List[PaperFill]:
+        """Last price only (no depth): used by orders on symbols without a book"""
+        fills = self.advance(ts)
+        self.last_price[symbol] = price
+        fills.extend(self._match_last_price(symbol))
+        return fills
+
+    def on_event(self, event: Dict[str, Any]) -> List[PaperFill]:
+        """
+        Dispatch one recorded or live event.
+
+        Accepts {"type": "book", "symbol", "ts", "bids", "asks"},
+        {"type": "trade", "symbol", "ts", "price", "qty", "side"},
+        {"type": "price", "symbol", "ts", "price"} and the feeder's
+        prices_{SYMBOL}.json snapshot ({"symbol", "ts", "last_price", "orderbook"}).
+        """
+        symbol = event["symbol"].upper()
+        ts = float(event["ts"])
+        kind = event.get("type")
+        if kind == "trade":
+            side = event.get("side")
+            if side is None:  # Binance trade stream: m = buyer is maker, so the seller aggressed
+                side = "SELL" if event.get("m") else "BUY"
+            return self.on_trade(symbol, ts, float(event["price"]), float(event["qty"]), side)
+        if kind == "price":
+            return self.on_price(symbol, ts, float(event["price"]))
+        fills = []
+        if event.get("last_price") is not None:
+            self.last_price[symbol] = float(event["last_price"])
+        orderbook = event.get("orderbook", event)
+        bids, asks = orderbook.get("bids") or [], orderbook.get("asks") or []
+        if bids or asks:
+            fills.extend(self.on_book(symbol, ts, bids, asks))
+        else:
+            fills.extend(self.advance(ts))
+            fills.extend(self._match_last_price(symbol))
+        return fills
+
+    # ------------------------------------------------------------------
+    # Orders
+
+    def submit(self, order: PaperOrder, ts: Optional[float] = None) -> PaperOrder:
+        """Queue an order; it reaches the book after the latency"""
+        ts = self.now if ts is None else ts
+        self._seq += 1
+        order.seq = self._seq
+        order.submit_ts = ts
+        delay = self.latency
+        if self.latency_jitter:
+            delay += self._rng.uniform(0.0, self.latency_jitter)
+        order.arrival_ts = ts + delay
+        book = self.books.get(order.symbol)
+        order.arrival_mid = (book.mid if book else None) or self.last_price.get(order.symbol)
+        order.status = "PENDING"
+        self.orders[order.client_order_id] = order
+        stats = self._symbol_stats(order.symbol)
+        stats["orders"] += 1
+        heapq.heappush(self._pending, (order.arrival_ts, order.seq, order))
+        return order
+
+    def cancel(self, client_order_id: str) -> bool:
+        """Cancel a pending or resting order (takes effect immediately)"""
+        order = self.orders.get(client_order_id)
+        if not order or not order.is_open:
+            return False
+        order.status = "CANCELED"
+        self._symbol_stats(order.symbol)["unfilled_qty"] += order.remaining
+        self._prune(order.symbol)
+        return True
+
+    def advance(self, ts: float) -> List[PaperFill]:
+        """Move the clock to ts, activating every order that has arrived by then"""
+        fills: List[PaperFill] = []
+        while self._pending and self._pending[0][0] <= ts:
+            arrival, _, order = heapq.heappop(self._pending)
+            self.now = max(self.now, arrival)
+            if order.status == "PENDING":
+                fills.extend(self._activate(order))
+        self.now = max(self.now, ts)
+        return fills
+
+    def open_orders(self, symbol: Optional[str] = None) -> List[PaperOrder]:
+        """Pending and resting orders"""
+        return [o for o in self.orders.values() if o.is_open and (symbol is None or o.symbol == symbol)]
+
+    # ------------------------------------------------------------------
+    # Matching
+
+    def _activate(self, order: PaperOrder) -> List[PaperFill]:
+        limit = None if order.order_type == "MARKET" else order.price
+        if limit is None and order.order_type != "MARKET":
+            return self._reject(order, "limit order without price")
+        immediate = order.order_type in ("MARKET", "LIMIT_IOC") or order.time_in_force in ("IOC", "FOK")
+        book = self.books.get(order.symbol)
+        opposite = (book.asks if order.side == "BUY" else book.bids) if book else []
+
+        if not opposite:
+            last = self.last_price.get(order.symbol)
+            if last is None:
+                return self._reject(order, f"no market data for {order.symbol}")
+            factor = 1 + self.no_depth_slippage_bps / 10000
+            price = last * factor if order.side == "BUY" else last / factor
+            if immediate:
+                if limit is not None and ((order.side == "BUY" and price > limit) or
+                                          (order.side == "SELL" and price < limit)):
+                    return self._close(order, [])
+                return self._close(order, [self._fill(order, order.remaining, price, "TAKER")])
+            if (order.side == "BUY" and limit >= last) or (order.side == "SELL" and limit <= last):
+                # marketable limit: takes at the last price, never worse than its limit
+                price = min(price, limit) if order.side == "BUY" else max(price, limit)
+                return [self._fill(order, order.remaining, price, "TAKER")]
+            order.status = "NEW"
+            order.queue_ahead = 0.0
+            self._resting.setdefault(order.symbol, []).append(order)
+            return []
+
+        if order.time_in_force == "FOK" and self._available(order, book, opposite, limit) < order.remaining - _EPS:
+            return self._close(order, [])
+        fills = self._take(order, book, opposite, limit, "TAKER")
+        if immediate or order.remaining <= _EPS:
+            return self._close(order, fills)
+
+        # the rest joins the back of the queue at its price
+        level = book.level_qty(order.side, order.price)
+        order.queue_ahead = level or 0.0
+        order.status = "PARTIALLY_FILLED" if order.filled_qty > _EPS else "NEW"
+        self._resting.setdefault(order.symbol, []).append(order)
+        return fills
+
+    def _match_last_price(self, symbol: str) -> List[PaperFill]:
+        """No-depth update: resting orders the last price has reached fill at their limit"""
+        last = self.last_price.get(symbol)
+        if last is None:
+            return []
+        fills = []
+        for order in self._resting_orders(symbol):
+            if order.side == "BUY":
+                reached = last < order.price or (last == order.price and order.queue_ahead <= _EPS)
+            else:
+                reached = last > order.price or (last == order.price and order.queue_ahead <= _EPS)
+            if reached:
+                fills.append(self._fill(order, order.remaining, order.price, "MAKER"))
+        self._prune(symbol)
+        return fills
+
+    def _available(self, order: PaperOrder, book: _Book, levels, limit: Optional[float]) -> float:
+        total = 0.0
+        for price, qty in levels:
+            if limit is not None and ((order.side == "BUY" and price > limit) or
+                                      (order.side == "SELL" and price < limit)):
+                break
+            total += qty - book.taken.get((order.side, price), 0.0)
+        return total
+
+    def _take(self, order: PaperOrder, book: _Book, levels, limit: Optional[float],
+              liquidity: str, at_own_price: bool = False) -> List[PaperFill]:
+        """Consume depth from levels up to limit (at_own_price: a resting order filled at its limit)"""
+        fills = []
+        for price, qty in levels:
+            if order.remaining <= _EPS:
+                break
+            if limit is not None and ((order.side == "BUY" and price > limit) or
+                                      (order.side == "SELL" and price < limit)):
+                break
+            key = (order.side, price)
+            available = qty - book.taken.get(key, 0.0)
+            take = min(available, order.remaining)
+            if take <= _EPS:
+                continue
+            book.taken[key] = book.taken.get(key, 0.0) + take
+            fills.append(self._fill(order, take, order.price if at_own_price else price, liquidity))
+        return fills
+
+    def _fill(self, order: PaperOrder, qty: float, price: float, liquidity: str) -> PaperFill:
+        maker_bps, taker_bps = self.fee_schedule.rates(self.volume_30d)
+        notional = qty * price
+        fee = notional * (maker_bps if liquidity == "MAKER" else taker_bps) / 10000
+        self.volume_30d += notional
+        order.filled_qty += qty
+        order.filled_notional += notional
+        order.fees += fee
+        order.status = "FILLED" if order.remaining <= _EPS else "PARTIALLY_FILLED"
+
+        stats = self._symbol_stats(order.symbol)
+        stats["filled_qty"] += qty
+        stats["notional"] += notional
+        stats["fees"] += fee
+        stats[f"{liquidity.lower()}_notional"] += notional
+        if order.arrival_mid:
+            sign = 1.0 if order.side == "BUY" else -1.0
+            stats["slippage_cost"] += sign * (price - order.arrival_mid) * qty
+            stats["mid_notional"] += order.arrival_mid * qty
+        return PaperFill(order.client_order_id, order.symbol, order.side, qty, price, fee,
+                         liquidity, self.now)
+
+    def _close(self, order: PaperOrder, fills: List[PaperFill]) -> List[PaperFill]:
+        """Immediate order done: FILLED, or EXPIRED with whatever filled (FOK/IOC remainder)"""
+        if order.remaining > _EPS:
+            order.status = "EXPIRED"
+            self._symbol_stats(order.symbol)["unfilled_qty"] += order.remaining
+        return fills
+
+    def _reject(self, order: PaperOrder, reason: str) -> List[PaperFill]:
+        order.status = "REJECTED"
+        order.reject_reason = reason
+        self._symbol_stats(order.symbol)["rejected"] += 1
+        return []
+
+    def _resting_orders(self, symbol: str) -> List[PaperOrder]:
+        """Resting orders in price-time priority (best price first)"""
+        orders = [o for o in self._resting.get(symbol, ()) if o.is_open]
+        orders.sort(key=lambda o: (-o.price if o.side == "BUY" else o.price, o.seq))
+        return orders
+
+    def _prune(self, symbol: str):
+        resting = self._resting.get(symbol)
+        if resting:
+            self._resting[symbol] = [o for o in resting if o.is_open]
+
+    def _symbol_stats(self, symbol: str) -> Dict[str, float]:
+        stats = self._stats.get(symbol)
+        if stats is None:
+            stats = self._stats[symbol] = dict.fromkeys(
+                ("orders", "rejected", "filled_qty", "unfilled_qty", "notional", "fees",
+                 "maker_notional", "taker_notional", "slippage_cost", "mid_notional"), 0.0)
+        return stats
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-symbol fill quality: notional, fees, maker share and slippage vs arrival mid"""
+        result = {}
+        for symbol, stats in self._stats.items():
+            row = dict(stats)
+            row["slippage_bps"] = (stats["slippage_cost"] / stats["mid_notional"] * 10000
+                                   if stats["mid_notional"] else 0.0)
+            row["maker_ratio"] = stats["maker_notional"] / stats["notional"] if stats["notional"] else 0.0
+            result[symbol] = row
+        return result
+
+    # ------------------------------------------------------------------
+    # Offline
+
+    def replay(self, events: Iterable[Dict[str, Any]],
+               orders: Iterable[Tuple[float, PaperOrder]] = ()) -> List[PaperFill]:
+        """
+        Run recorded events in order, submitting each (ts, order) once the
+        replay reaches ts. Returns every fill.
+        """
+        queued = sorted(orders, key=lambda item: item[0])
+        position = 0
+        fills: List[PaperFill] = []
+        for event in events:
+            ts = float(event["ts"])
+            while position < len(queued) and queued[position][0] <= ts:
+                submit_ts, order = queued[position]
+                fills.extend(self.advance(submit_ts))
+                self.submit(order, submit_ts)
+                position += 1
+            fills.extend(self.on_event(event))
+        for submit_ts, order in queued[position:]:
+            self.submit(order, submit_ts)
+        return fills
+
+
+def load_events(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Recorded market data: one event (see PaperMatchingEngine.on_event) per NDJSON line"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
@@ -6,10 +6,15 @@ PnL 계산 단일 소스 (SOT)
 import logging
 import pathlib
 from dataclasses import dataclass
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 import yaml
 
+try:
+    from coin_quant.feeder.orderbook import BookLevels
+except ImportError:
+    BookLevels = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,7 +27,7 @@ class PnLComponents:
     slippage_cost: float  # 슬리피지 비용 (USDT)
     net_pnl: float  # 순손익 (USDT)
     fee_rate_bps: int  # 적용된 수수료율 (bps)
-    slippage_bps: int  # 적용된 슬리피지 (bps)
+    slippage_bps: float  # 적용된 슬리피지 (bps)
     maker_taker: str  # "MAKER" or "TAKER"
     calculation_source: str  # 계산 소스 (SOT 추적용)
 
@@ -51,6 +56,15 @@ class PnLCalculator:
             logger.error(f"설정 로드 실패: {e}, 기본값 사용")
             return self._get_default_config()
 
+    @staticmethod
+    def _book_slippage_bps(book: Any, notional: float, side: str) -> Optional[float]:
+        """오더북 기반 예상 슬리피지 (오더북 없음/깊이 부족 시 None)"""
+        if book is None or BookLevels is None:
+            return None
+        if isinstance(book, dict):
+            book = BookLevels.from_dict(book)
+        return book.expected_slippage_bps(notional, side)
+
     def _get_default_config(self) -> Dict[str, Any]:
         """기본 설정값"""
         return {
@@ -68,6 +82,8 @@ class PnLCalculator:
         notional: float,
         maker_taker: str = "TAKER",
         custom_slippage_bps: int = None,
+        book: Optional[Any] = None,
+        side: str = "BUY",
     ) -> PnLComponents:
         """
         NetPnL 계산 (단일 소스, 중복 차감 방지)
@@ -76,7 +92,9 @@ class PnLCalculator:
             gross_pnl: 총손익 (USDT)
             notional: 거래 금액 (USDT)
             maker_taker: "MAKER" or "TAKER"
-            custom_slippage_bps: 커스텀 슬리피지 (없으면 기본값 사용)
+            custom_slippage_bps: 커스텀 슬리피지 (없으면 오더북 또는 기본값 사용)
+            book: 피더 로컬 오더북 (BookLevels 또는 스냅샷 dict) - 실측 슬리피지
+            side: "BUY" or "SELL" (오더북 슬리피지 방향)
 
         Returns:
             PnLComponents: PnL 구성 요소
@@ -94,8 +112,11 @@ class PnLCalculator:
                 fee_rate_bps = execution_config.get("taker_fee_bps", 4)
 
             # 슬리피지 결정
+            measured_bps = self._book_slippage_bps(book, notional, side)
             if custom_slippage_bps is not None:
                 slippage_bps = custom_slippage_bps
+            elif measured_bps is not None:
+                slippage_bps = measured_bps
             else:
                 slippage_bps = execution_config.get("slippage_limit_bps", 20)
 
@@ -108,8 +129,8 @@ class PnLCalculator:
             # Net PnL = Gross PnL - Fee - Slippage (단일 계산)
             net_pnl = gross_pnl - fee - slippage_cost
 
-            # 계산 로그
-            logger.info(
+            # 계산 로그 (거래마다 호출되므로 DEBUG)
+            logger.debug(
                 f"pnl_calculated | gross={gross_pnl:.4f} | fee={fee:.4f} | slippage={slippage_cost:.4f} | net={net_pnl:.4f} | count={self.calculation_count}"
             )
 
@@ -166,7 +187,7 @@ class PnLCalculator:
                 logger.warning(f"pnl_inconsistency | {error_msg}")
                 return False, error_msg
 
-            logger.info(
+            logger.debug(
                 f"pnl_consistency_ok | existing={existing_net_pnl:.4f} | calculated={calculated.net_pnl:.4f}"
             )
             return True, "PnL 일관성 확인"
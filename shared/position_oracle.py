@@ -1,14 +1,28 @@
 """
 PositionOracle - 통합 포지션 데이터 소스
 실제 거래소 포지션과 로컬 포지션 통합 관리
+
+거래소 포지션은 계좌 조회 한 번(reconcile) 또는 계좌 업데이트 이벤트
+(on_account_update)로 모든 심볼을 한꺼번에 갱신하고, 로컬 포지션 파일은
+디렉토리 스캔 한 번으로 읽어(변경된 파일만 다시 파싱) 둘 다 심볼별 맵에
+캐시함. 맵은 통째로 교체되고 버전이 올라가므로 조회(get_position,
+get_positions)는 딕셔너리 읽기이며, 두 맵의 차이는 드리프트 지표로 노출됨.
+현물 잔고 중 수수료 자산(BNB 등), 최소 주문 금액 미만의 먼지(dust), 로컬
+포지션도 체결 기록도 없어 가격을 모르는 자산(에어드랍 등 이 시스템이 거래하지
+않은 잔고)은 포지션으로 보지 않음.
 """
 
 import json
+import logging
+import os
+import threading
 import time
 from dataclasses import dataclass
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
-from typing import Dict, Literal, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Literal, Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -22,38 +36,109 @@ class PositionData:
     symbol: str
 
 
+def _to_decimal(value: Any) -> Optional[Decimal]:
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def _side(qty: Decimal) -> str:
+    return 'LONG' if qty > 0 else 'SHORT' if qty < 0 else 'FLAT'
+
+
+def _read_last_line(path: Path, block: int = 4096) -> Optional[bytes]:
+    """파일 끝에서부터 읽어 마지막 완전한 줄 반환 (전체를 읽지 않음)"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        data = b''
+        pos = end
+        while pos > 0:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+            stripped = data.rstrip(b'\r\n')
+            newline = stripped.rfind(b'\n')
+            if newline >= 0:
+                return stripped[newline + 1:]
+        stripped = data.rstrip(b'\r\n')
+        return stripped or None
+
+
 class PositionOracle:
     """통합 포지션 데이터 Oracle"""
-    
+
     # TTL 상수 (초)
     POS_TTL = 15  # 포지션 데이터 TTL
-    
-    def __init__(self, testnet: bool = False):
+    LOCAL_SCAN_INTERVAL = 1.0  # 로컬 포지션 디렉토리 재스캔 간격
+
+    def __init__(self, testnet: bool = False,
+                 fetch_account: Optional[Callable[[], Dict[str, Any]]] = None,
+                 quote_asset: str = 'USDT', data_dir: str = 'shared_data',
+                 drift_tolerance: Decimal = Decimal('0.00000001'),
+                 min_notional: Decimal = Decimal('5'), fee_assets: Iterable[str] = ('BNB',)):
+        """
+        Args:
+            testnet: 테스트넷 여부
+            fetch_account: 서명된 계좌 조회 함수 (기본: testnet에 맞춘 BinanceAPIClient().get_account)
+            quote_asset: 현물 잔고를 심볼로 바꿀 때 붙이는 견적 자산
+            data_dir: 로컬 포지션/체결 파일 루트
+            drift_tolerance: 이 값 이하의 수량 차이는 드리프트로 보지 않음
+            min_notional: 평가 금액(견적 자산)이 이보다 작은 현물 잔고는 먼지로 보고 제외
+            fee_assets: 수수료 차감용 자산 (로컬 포지션이 없으면 포지션으로 보지 않음)
+        """
         self.testnet = testnet
-        
+        self.fetch_account = fetch_account
+        self.quote_asset = quote_asset
+        self.min_notional = min_notional
+        self.fee_assets = frozenset(asset.upper() for asset in fee_assets)
+        self.data_dir = Path(data_dir)
+        self.drift_tolerance = drift_tolerance
+
+        self._lock = threading.RLock()
+        self._exchange: Dict[str, PositionData] = {}
+        self._local: Dict[str, PositionData] = {}
+        self._local_files: Dict[str, Tuple[Tuple[int, int], int, Optional[PositionData]]] = {}
+        self._local_scanned_at = 0.0
+        self._fill_prices: Dict[str, Tuple[Tuple[int, int], Optional[Decimal]]] = {}
+        self.version = 0
+        self._exchange_synced = False
+        self.drift: Dict[str, Decimal] = {}
+        self.metrics = {
+            "reconciles": 0,
+            "reconcile_errors": 0,
+            "account_updates": 0,
+            "last_reconcile_ts": 0.0,
+            "last_reconcile_ms": 0.0,
+            "drift_symbols": 0,
+            "max_abs_drift": 0.0,
+            "local_files_parsed": 0,
+        }
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
     def get_position(self, symbol: str) -> PositionData:
         """
-        포지션 데이터 조회
-        
+        포지션 데이터 조회 (캐시된 맵에서 딕셔너리 읽기)
+
         Returns:
             PositionData: 포지션 정보
         """
-        # 1. 로컬 포지션 파일 우선 조회
-        try:
-            local_pos = self._get_local_position(symbol)
-            if local_pos and self._is_fresh(local_pos.timestamp, self.POS_TTL):
-                return local_pos
-        except Exception:
-            pass
-            
-        # 2. 거래소 API 조회 (향후 구현)
-        try:
-            exchange_pos = self._get_exchange_position(symbol)
-            if exchange_pos:
-                return exchange_pos
-        except Exception:
-            pass
-            
+        key = symbol.upper()
+
+        # 1. 로컬 포지션 우선 (신선한 경우)
+        self._refresh_local()
+        local_pos = self._local.get(key)
+        if local_pos and self._is_fresh(local_pos.timestamp, self.POS_TTL):
+            return local_pos
+
+        # 2. 마지막 계좌 동기화 기준 거래소 포지션
+        exchange_pos = self._exchange.get(key)
+        if exchange_pos:
+            return exchange_pos
+
         # 3. 기본 FLAT 포지션 반환
         return PositionData(
             side='FLAT',
@@ -63,117 +148,324 @@ class PositionOracle:
             source='local',
             symbol=symbol
         )
-    
+
+    def get_positions(self) -> Tuple[int, Dict[str, PositionData]]:
+        """
+        전체 포지션 맵 조회 (get_position과 같은 우선순위)
+
+        Returns:
+            (버전, 심볼 -> PositionData): 버전이 같으면 내용도 같음 (로컬 TTL 경과 제외)
+        """
+        self._refresh_local()
+        with self._lock:
+            version, local, exchange = self.version, self._local, self._exchange
+        positions = dict(exchange)
+        for key, local_pos in local.items():
+            if self._is_fresh(local_pos.timestamp, self.POS_TTL) or key not in positions:
+                positions[key] = local_pos
+        return version, positions
+
     def get_last_fill_price(self, symbol: str) -> Optional[Decimal]:
         """
-        최근 체결가 조회 (UI 히스토리용)
-        
+        최근 체결가 조회 (UI 히스토리용, 파일이 바뀐 경우에만 마지막 줄을 읽음)
+
         Returns:
             Optional[Decimal]: 최근 체결가 또는 None
         """
         try:
-            trades_path = Path(f"shared_data/trades/{symbol.lower()}_trades.jsonl")
-            if not trades_path.exists():
-                return None
-                
-            with open(trades_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                
-            if not lines:
-                return None
-                
-            # 최근 거래 파싱
-            latest_trade = json.loads(lines[-1].strip())
-            price_value = latest_trade.get('price', 0)
-            
-            if not price_value:
-                return None
-                
-            # Decimal 변환
+            trades_path = self.data_dir / "trades" / f"{symbol.lower()}_trades.jsonl"
             try:
-                return Decimal(str(price_value))
-            except (InvalidOperation, ValueError):
+                st = os.stat(trades_path)
+            except OSError:
                 return None
-                
+            stamp = (st.st_mtime_ns, st.st_size)
+            cached = self._fill_prices.get(symbol)
+            if cached and cached[0] == stamp:
+                return cached[1]
+
+            # 최근 거래 파싱
+            price = None
+            line = _read_last_line(trades_path)
+            if line:
+                price_value = json.loads(line).get('price', 0)
+                if price_value:
+                    price = _to_decimal(price_value)
+            self._fill_prices[symbol] = (stamp, price)
+            return price
+
         except Exception as e:
-            print(f"[PositionOracle] Last fill price fetch failed for {symbol}: {e}")
+            logger.warning(f"Last fill price fetch failed for {symbol}: {e}")
             return None
-    
-    def _get_local_position(self, symbol: str) -> Optional[PositionData]:
-        """로컬 포지션 파일 조회"""
+
+    # ------------------------------------------------------------------
+    # 로컬 포지션
+
+    def _local_candidates(self):
+        """(우선순위, 심볼, 경로): 심볼당 positions/소문자 > positions/대문자 > 루트"""
+        suffix = "_position.json"
+        for directory, base_priority in ((self.data_dir, 0), (self.data_dir / "positions", 1)):
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                name = entry.name
+                if not name.endswith(suffix):
+                    continue
+                stem = name[:-len(suffix)]
+                if stem not in (stem.lower(), stem.upper()) or (base_priority == 0 and stem != stem.lower()):
+                    continue  # positions/는 소문자·대문자, 루트는 소문자 파일만 사용 (기존 규칙)
+                priority = base_priority * 2 + (1 if stem == stem.lower() else 0)
+                yield priority, stem.upper(), entry
+
+    def _refresh_local(self, force: bool = False):
+        """로컬 포지션 맵 갱신 (스캔 간격 내에는 생략, 바뀐 파일만 파싱)"""
+        now = time.monotonic()
+        if not force and now - self._local_scanned_at < self.LOCAL_SCAN_INTERVAL:
+            return
+        with self._lock:
+            if not force and now - self._local_scanned_at < self.LOCAL_SCAN_INTERVAL:
+                return
+            self._local_scanned_at = now
+            chosen: Dict[str, Tuple[int, Optional[PositionData]]] = {}
+            files = {}
+            for priority, key, entry in self._local_candidates():
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                stamp = (st.st_mtime_ns, st.st_size)
+                cached = self._local_files.get(entry.path)
+                if cached and cached[0] == stamp:
+                    position = cached[2]
+                else:
+                    position = self._parse_local_position(Path(entry.path), key)
+                    self.metrics["local_files_parsed"] += 1
+                files[entry.path] = (stamp, priority, position)
+                if key not in chosen or priority > chosen[key][0]:
+                    chosen[key] = (priority, position)
+            self._local_files = files
+            local = {key: position for key, (_, position) in chosen.items() if position is not None}
+            if local != self._local:
+                self._local = local
+                self._update_drift()
+                self.version += 1
+
+    def _parse_local_position(self, path: Path, symbol: str) -> Optional[PositionData]:
+        """로컬 포지션 파일 파싱"""
         try:
-            # 심볼 정규화
-            normalized_symbol = symbol.lower()
-            
-            # 포지션 파일 경로들 시도
-            position_paths = [
-                Path(f"shared_data/positions/{normalized_symbol}_position.json"),
-                Path(f"shared_data/positions/{symbol.upper()}_position.json"),
-                Path(f"shared_data/{normalized_symbol}_position.json"),
-            ]
-            
-            position_data = None
-            for path in position_paths:
-                if path.exists():
-                    with open(path, 'r', encoding='utf-8') as f:
-                        position_data = json.load(f)
-                    break
-                    
+            with open(path, 'r', encoding='utf-8') as f:
+                position_data = json.load(f)
+
             if not position_data:
                 return None
-                
+
             # 포지션 데이터 파싱
-            qty_value = position_data.get('qty', 0)
+            qty = _to_decimal(position_data.get('qty', 0))
             avg_price_value = position_data.get('avg_price', 0)
-            
-            # Decimal 변환
-            try:
-                qty = Decimal(str(qty_value))
-                avg_price = Decimal(str(avg_price_value)) if avg_price_value else None
-            except (InvalidOperation, ValueError):
+            avg_price = _to_decimal(avg_price_value) if avg_price_value else None
+            if qty is None:
                 return None
-                
-            # 포지션 사이드 결정
-            if qty > 0:
-                side = 'LONG'
-                entry = avg_price
-            elif qty < 0:
-                side = 'SHORT'
-                entry = avg_price
-            else:
-                side = 'FLAT'
-                entry = None
-                
+
             # 타임스탬프 추출
             timestamp = position_data.get('timestamp', position_data.get('last_update', int(time.time() * 1000)))
             if isinstance(timestamp, float):
                 timestamp = int(timestamp * 1000)
-                
+
             return PositionData(
-                side=side,
-                entry=entry,
+                side=_side(qty),
+                entry=avg_price if qty != 0 else None,
                 qty=qty,
                 timestamp=timestamp,
                 source='local',
                 symbol=symbol
             )
-            
+
         except Exception as e:
-            print(f"[PositionOracle] Local position fetch failed for {symbol}: {e}")
+            logger.warning(f"Local position fetch failed for {symbol}: {e}")
             return None
-    
-    def _get_exchange_position(self, symbol: str) -> Optional[PositionData]:
-        """거래소 API 포지션 조회 (향후 구현)"""
-        # TODO: Binance API 연동
-        # 현재는 로컬 포지션만 사용
-        return None
-    
+
+    # ------------------------------------------------------------------
+    # 거래소 동기화
+
+    def reconcile(self, account: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        거래소 계좌 한 번 조회로 전체 포지션 동기화 + 로컬과 드리프트 계산
+
+        Args:
+            account: 이미 받은 계좌 응답 (없으면 fetch_account 호출)
+        """
+        start = time.perf_counter()
+        self._refresh_local(force=True)  # 현물 잔고의 진입가는 로컬 포지션에서 가져옴
+        try:
+            if account is None:
+                if self.fetch_account is None:
+                    self.fetch_account = self._default_fetch_account()
+                account = self.fetch_account()
+            exchange = self._parse_account(account)
+        except Exception as e:
+            self.metrics["reconcile_errors"] += 1
+            logger.warning(f"Exchange reconcile failed: {e}")
+            return False
+
+        with self._lock:
+            self._exchange = exchange
+            self._exchange_synced = True
+            self._update_drift()
+            self.version += 1
+            self.metrics["reconciles"] += 1
+            self.metrics["last_reconcile_ts"] = time.time()
+            self.metrics["last_reconcile_ms"] = (time.perf_counter() - start) * 1000
+        return True
+
+    def has_credentials(self) -> bool:
+        """거래소 계좌를 조회할 수 있는지 (주입된 조회 함수 또는 API 키/시크릿 설정)"""
+        if self.fetch_account is not None:
+            return True
+        try:
+            from shared.binance_config import BinanceConfig
+            return BinanceConfig().validate()[0]
+        except Exception as e:
+            logger.debug(f"Binance config unavailable: {e}")
+            return False
+
+    def _default_fetch_account(self) -> Callable[[], Dict[str, Any]]:
+        """testnet 설정을 따르는 BinanceAPIClient 계좌 조회 함수"""
+        from shared.binance_api_client import BinanceAPIClient
+        from shared.binance_config import BinanceConfig
+
+        config = BinanceConfig()
+        if config.is_testnet != self.testnet:
+            config.is_testnet = self.testnet
+            config.base_url = BinanceConfig.URL_MAP[(config.mode, self.testnet)]
+        return BinanceAPIClient(config).get_account
+
+    def _parse_account(self, account: Dict[str, Any]) -> Dict[str, PositionData]:
+        """계좌 응답 -> 심볼별 포지션 (현물 balances 또는 선물 positions)"""
+        now_ms = int(account.get('updateTime') or time.time() * 1000)
+        exchange: Dict[str, PositionData] = {}
+        if 'positions' in account:
+            for item in account['positions']:
+                qty = _to_decimal(item.get('positionAmt', 0))
+                if not qty:
+                    continue
+                entry = _to_decimal(item.get('entryPrice', 0)) or None
+                key = item['symbol'].upper()
+                exchange[key] = PositionData(_side(qty), entry, qty,
+                                             int(item.get('updateTime') or now_ms), 'exchange', key)
+        for item in account.get('balances', ()):
+            self._apply_balance(exchange, item.get('asset', ''),
+                                item.get('free', 0), item.get('locked', 0), now_ms)
+        return exchange
+
+    def _apply_balance(self, exchange: Dict[str, PositionData], asset: str,
+                       free: Any, locked: Any, ts_ms: int):
+        """현물 잔고 하나를 <asset><quote> 포지션으로 반영 (0, 먼지, 수수료 자산, 가격 미상이면 제거)"""
+        if not asset or asset.upper() == self.quote_asset:
+            return
+        key = f"{asset.upper()}{self.quote_asset}"
+        qty = (_to_decimal(free) or Decimal('0')) + (_to_decimal(locked) or Decimal('0'))
+        local_pos = self._local.get(key)
+        if not qty or (local_pos is None and asset.upper() in self.fee_assets):
+            exchange.pop(key, None)
+            return
+        entry = local_pos.entry if local_pos else None
+        price = entry or self.get_last_fill_price(key)
+        if not price:
+            exchange.pop(key, None)  # 거래한 적 없는 자산: 진입가도 평가 금액도 알 수 없음
+            return
+        if qty * price < self.min_notional:
+            exchange.pop(key, None)  # 먼지: 주문 불가 금액
+            return
+        exchange[key] = PositionData(_side(qty), entry, qty, ts_ms, 'exchange', key)
+
+    def on_account_update(self, event: Dict[str, Any]) -> bool:
+        """
+        사용자 데이터 스트림 계좌 이벤트 반영 (계좌 재조회 없이)
+
+        outboundAccountPosition: {"e": ..., "u": ms, "B": [{"a", "f", "l"}]}
+        ACCOUNT_UPDATE (선물): {"E": ms, "a": {"P": [{"s", "pa", "ep"}]}}
+        """
+        try:
+            with self._lock:
+                exchange = dict(self._exchange)
+                ts_ms = int(event.get('u') or event.get('E') or time.time() * 1000)
+                for item in event.get('B', ()):
+                    self._apply_balance(exchange, item.get('a', ''), item.get('f', 0), item.get('l', 0), ts_ms)
+                for item in event.get('a', {}).get('P', ()):
+                    key = item['s'].upper()
+                    qty = _to_decimal(item.get('pa', 0)) or Decimal('0')
+                    if qty:
+                        entry = _to_decimal(item.get('ep', 0)) or None
+                        exchange[key] = PositionData(_side(qty), entry, qty, ts_ms, 'exchange', key)
+                    else:
+                        exchange.pop(key, None)
+                self._exchange = exchange
+                self._exchange_synced = True
+                self._update_drift()
+                self.version += 1
+                self.metrics["account_updates"] += 1
+            return True
+        except Exception as e:
+            logger.error(f"Account update failed: {e}")
+            return False
+
+    def _update_drift(self):
+        """전체 심볼에 대해 거래소 수량 - 로컬 수량 (락 보유 상태에서 호출)"""
+        if not self._exchange_synced:
+            return  # 아직 거래소 기준이 없음
+        zero = Decimal('0')
+        drift = {}
+        for key in self._exchange.keys() | self._local.keys():
+            exchange_pos = self._exchange.get(key)
+            local_pos = self._local.get(key)
+            delta = (exchange_pos.qty if exchange_pos else zero) - (local_pos.qty if local_pos else zero)
+            if abs(delta) > self.drift_tolerance:
+                drift[key] = delta
+        self.drift = drift
+        self.metrics["drift_symbols"] = len(drift)
+        self.metrics["max_abs_drift"] = float(max((abs(d) for d in drift.values()), default=0))
+
+    def get_drift_metrics(self) -> Dict[str, Any]:
+        """드리프트 지표 (심볼별 차이 포함)"""
+        with self._lock:
+            return {
+                **self.metrics,
+                "version": self.version,
+                "drift": {key: float(delta) for key, delta in self.drift.items()},
+            }
+
+    # ------------------------------------------------------------------
+    # 동기화 루프
+
+    def start(self, interval: Optional[float] = None):
+        """백그라운드 동기화 루프 시작 (기본 POS_TTL 간격)"""
+        if self._thread and self._thread.is_alive():
+            return
+        interval = interval or self.POS_TTL
+        self._stopped.clear()
+
+        def loop():
+            while not self._stopped.is_set():
+                self.reconcile()
+                self._stopped.wait(interval)
+
+        self._thread = threading.Thread(target=loop, name="PositionOracleReconcile", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """동기화 루프 중지"""
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
     def _is_fresh(self, timestamp: int, ttl_seconds: int) -> bool:
         """데이터 신선도 검증"""
         current_time = int(time.time() * 1000)
         age_ms = current_time - timestamp
         age_seconds = age_ms / 1000
-        
+
         return age_seconds <= ttl_seconds
 
 
@@ -181,8 +473,12 @@ class PositionOracle:
 _position_oracle = None
 
 def get_position_oracle(testnet: bool = False) -> PositionOracle:
-    """PositionOracle 인스턴스 가져오기"""
+    """PositionOracle 인스턴스 가져오기 (첫 호출 시, API 키가 있으면 거래소 동기화 루프 시작)"""
     global _position_oracle
     if _position_oracle is None:
         _position_oracle = PositionOracle(testnet=testnet)
+        if _position_oracle.has_credentials():
+            _position_oracle.start()
+        else:
+            logger.info("No Binance API credentials: exchange reconcile disabled, serving local positions only")
     return _position_oracle
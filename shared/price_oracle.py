@@ -12,6 +12,11 @@ from typing import Literal, Optional, Tuple
 
 import requests
 
+try:
+    from coin_quant.shared.price_board import PriceBoardReader
+except ImportError:
+    PriceBoardReader = None
+
 
 @dataclass
 class PriceData:
@@ -38,6 +43,8 @@ class PriceOracle:
     def __init__(self, testnet: bool = False):
         self.testnet = testnet
         self.base_url = "https://testnet.binance.vision" if testnet else "https://api.binance.com"
+        # 피더 공유 메모리 가격판 (피더가 죽으면 파일로 폴백)
+        self.board = PriceBoardReader(fallback=False) if PriceBoardReader is not None else None
         
     def get_last_price(self, symbol: str) -> PriceData:
         """
@@ -115,6 +122,17 @@ class PriceOracle:
     
     def _get_ws_price(self, symbol: str) -> Optional[PriceData]:
         """WebSocket 가격 데이터 조회"""
+        # 공유 메모리 가격판 우선 (파일 I/O 없음)
+        if self.board is not None and self.board.alive():
+            tick = self.board.get(symbol.upper())
+            if tick is not None and tick['price'] > 0:
+                return PriceData(
+                    price=Decimal(str(tick['price'])),
+                    timestamp=int(tick['received_at'] * 1000),
+                    source='ws',
+                    symbol=symbol
+                )
+        
         try:
             # 심볼 정규화
             normalized_symbol = symbol.lower()
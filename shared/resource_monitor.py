@@ -1,6 +1,11 @@
 """
 Resource Monitor
 Lightweight process monitoring with memory leak detection and controlled restarts
+
+Registered services (coin_quant.shared.process_registry) are sampled by the
+shared ProcessSampler; core processes that have not registered (e.g. health,
+ui) are still found by the process scan. Per-process history is a
+ResourceSeries ring buffer with an incrementally updated leak slope.
 """
 import json
 import logging
@@ -17,6 +22,13 @@ from .env_loader import get_env_hash
 from .path_registry import get_absolute_path
 from .io_safe import atomic_write
 
+# 프로세스 레지스트리/샘플러 (coin_quant 패키지)
+try:
+    from coin_quant.shared.process_registry import ResourceSeries, process_sampler
+except ImportError:
+    ResourceSeries = None
+    process_sampler = None
+
 
 @dataclass
 class ProcessMetrics:
@@ -68,7 +80,10 @@ class ResourceMonitor:
         self.thresholds = ResourceThresholds()
         self.monitoring_interval = 10.0  # 10 seconds
         self.running = False
-        self.process_history: Dict[int, List[ProcessMetrics]] = {}
+        # Ring buffer per PID sized to the leak detection window
+        self.history_capacity = int(self.thresholds.leak_detection_window / self.monitoring_interval) + 1
+        self.process_history: Dict[int, ResourceSeries] = {}
+        self.latest_metrics: Dict[int, ProcessMetrics] = {}
         self.active_alerts: Dict[str, ResourceAlert] = {}
         self.core_processes = ['feeder', 'trader', 'ares', 'health', 'ui']
         self.restart_attempts: Dict[str, int] = {}
@@ -111,17 +126,26 @@ class ResourceMonitor:
     def _collect_process_metrics(self):
         """Collect metrics for core processes"""
         try:
-            # Get process list
-            if sys.platform == 'win32':
-                processes = self._get_windows_processes()
-            else:
-                processes = self._get_unix_processes()
+            # Registered services: one targeted sample, no process table scan
+            registered = {}
+            if process_sampler is not None:
+                registered = process_sampler.sample(max_age=self.monitoring_interval / 2)
+            core_processes = list(registered.values())
             
-            # Filter for core processes
-            core_processes = []
-            for proc in processes:
-                if any(core_name in proc['name'].lower() for core_name in self.core_processes):
-                    core_processes.append(proc)
+            # Core services that have not registered: scan the process list
+            unregistered = [name for name in self.core_processes if name not in registered]
+            if unregistered:
+                if sys.platform == 'win32':
+                    processes = self._get_windows_processes()
+                else:
+                    processes = self._get_unix_processes()
+                
+                registered_pids = {proc['pid'] for proc in core_processes}
+                for proc in processes:
+                    if proc['pid'] in registered_pids:
+                        continue
+                    if any(core_name in proc['name'].lower() for core_name in unregistered):
+                        core_processes.append(proc)
             
             # Convert to ProcessMetrics
             for proc_data in core_processes:
@@ -138,15 +162,13 @@ class ResourceMonitor:
                     timestamp=time.time()
                 )
                 
-                # Store in history
-                if metrics.pid not in self.process_history:
-                    self.process_history[metrics.pid] = []
-                
-                self.process_history[metrics.pid].append(metrics)
-                
-                # Keep only recent history
-                if len(self.process_history[metrics.pid]) > 100:
-                    self.process_history[metrics.pid] = self.process_history[metrics.pid][-50:]
+                # Store in history (fixed-size ring buffer)
+                if ResourceSeries is not None:
+                    series = self.process_history.get(metrics.pid)
+                    if series is None:
+                        series = self.process_history[metrics.pid] = ResourceSeries(self.history_capacity)
+                    series.append(metrics.timestamp, metrics.rss_mb, metrics.cpu_percent, metrics.num_threads)
+                self.latest_metrics[metrics.pid] = metrics
             
         except Exception as e:
             self.logger.error(f"Failed to collect process metrics: {e}")
@@ -278,12 +300,7 @@ class ResourceMonitor:
         """Check resource usage against thresholds"""
         current_time = time.time()
         
-        for pid, history in self.process_history.items():
-            if not history:
-                continue
-            
-            latest = history[-1]
-            
+        for pid, latest in self.latest_metrics.items():
             # Check memory thresholds
             if latest.rss_mb > self.thresholds.memory_hard_mb:
                 self._handle_hard_alert(latest, ResourceAlert(
@@ -449,49 +466,28 @@ class ResourceMonitor:
             return False
     
     def _detect_memory_leaks(self):
-        """Detect memory leaks in processes"""
-        current_time = time.time()
-        
-        for pid, history in self.process_history.items():
-            if len(history) < 10:  # Need enough history
-                continue
-            
-            # Get recent history within detection window
-            recent_history = [
-                h for h in history 
-                if current_time - h.timestamp <= self.thresholds.leak_detection_window
-            ]
-            
-            if len(recent_history) < 5:
-                continue
-            
-            # Check for consistent memory growth
-            memory_values = [h.rss_mb for h in recent_history]
-            if len(memory_values) < 5:
+        """Detect memory leaks in processes (O(1) per process from the ring buffer)"""
+        for pid, series in self.process_history.items():
+            if len(series) < 5:  # Need enough history
                 continue
             
-            # Calculate growth rate
-            growth = memory_values[-1] - memory_values[0]
-            if growth > self.thresholds.leak_threshold_mb:
-                # Check if growth is consistent (not just a spike)
-                if all(memory_values[i] <= memory_values[i+1] for i in range(len(memory_values)-1)):
-                    self.logger.warning(f"Memory leak detected in PID {pid}: "
-                                      f"growth {growth:.1f}MB over {self.thresholds.leak_detection_window}s")
+            # Consistent growth over the window (not just a spike)
+            growth = series.growth_mb()
+            if growth > self.thresholds.leak_threshold_mb and series.is_monotonic():
+                self.logger.warning(f"Memory leak detected in PID {pid}: "
+                                  f"growth {growth:.1f}MB over {series.span_sec():.0f}s "
+                                  f"({series.slope_mb_per_min():.2f}MB/min)")
     
     def _cleanup_old_data(self):
         """Clean up old monitoring data"""
         current_time = time.time()
         cutoff_time = current_time - 3600  # 1 hour
         
-        # Clean up old process history
-        for pid in list(self.process_history.keys()):
-            self.process_history[pid] = [
-                h for h in self.process_history[pid] 
-                if h.timestamp > cutoff_time
-            ]
-            
-            if not self.process_history[pid]:
-                del self.process_history[pid]
+        # Clean up processes not seen for an hour
+        for pid in list(self.latest_metrics.keys()):
+            if self.latest_metrics[pid].timestamp <= cutoff_time:
+                del self.latest_metrics[pid]
+                self.process_history.pop(pid, None)
         
         # Clean up old alerts
         for alert_key in list(self.active_alerts.keys()):
@@ -503,10 +499,7 @@ class ResourceMonitor:
         current_time = time.time()
         
         # Get latest metrics for each process
-        latest_metrics = {}
-        for pid, history in self.process_history.items():
-            if history:
-                latest_metrics[pid] = history[-1]
+        latest_metrics = dict(self.latest_metrics)
         
         # Count alerts
         warning_count = sum(1 for alert in self.active_alerts.values() if alert.severity == "warning")
@@ -525,7 +518,9 @@ class ResourceMonitor:
                     "rss_mb": metrics.rss_mb,
                     "cpu_percent": metrics.cpu_percent,
                     "num_threads": metrics.num_threads,
-                    "status": metrics.status
+                    "status": metrics.status,
+                    "leak_slope_mb_per_min": (self.process_history[pid].slope_mb_per_min()
+                                              if pid in self.process_history else 0.0)
                 }
                 for pid, metrics in latest_metrics.items()
             },
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Schema Registry - schemas loaded once and compiled to validators
+
+A schema (a JSON Schema dict, or a JSON file) is compiled once into the
+source of a single Python function with the checks inlined; validating a
+record is then a few dict lookups and isinstance calls per field instead of
+reading the schema file and re-walking it per record. File-backed schemas
+are re-stat'ed at most every check_interval seconds and recompiled when
+they change.
+
+Supported keywords: type, enum, const, required, properties,
+additionalProperties, items, min/maxItems, minimum, maximum,
+exclusiveMinimum/Maximum, min/maxLength, pattern. A schema using anything
+else is handed to a jsonschema validator (built once) if jsonschema is
+installed. As in jsonschema, "integer" accepts an int or a float with no
+fractional part (1.0), and never a bool.
+
+check() follows the validation mode, validate() always validates:
+
+- strict:  every record (use in tests; slower than the hand-written checks
+           it replaced on the per-tick snapshot and state bus paths)
+- sampled: one record in sample_every per schema (default)
+- debug:   only while the shared.schema_registry logger is enabled for DEBUG
+- off:     never
+
+Mode and sample rate come from SCHEMA_VALIDATION_MODE / SCHEMA_SAMPLE_EVERY
+or set_mode().
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+MODES = ("strict", "sampled", "debug", "off")
+
+# A compiled validator returns None or the first error message
+Validator = Callable[[Any], Optional[str]]
+
+# Python test per JSON type, applied to the variable named {v}
+_TYPES = {
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "string": "isinstance({v}, str)",
+    "integer": "((isinstance({v}, int) and not isinstance({v}, bool))"
+               " or (isinstance({v}, float) and {v}.is_integer()))",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+}
+
+_KEYWORDS = frozenset({
+    "type", "enum", "const", "required", "properties", "additionalProperties", "items",
+    "minItems", "maxItems", "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum",
+    "minLength", "maxLength", "pattern",
+})
+
+# Keywords that carry no validation
+_ANNOTATIONS = frozenset({"$schema", "$id", "$comment", "title", "description", "default", "examples"})
+
+_MISSING = object()
+
+
+class SchemaError(ValueError):
+    """Schema that cannot be loaded or compiled"""
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _at(path: str, message: str) -> str:
+    return f"{path}: {message}" if path else message
+
+
+def _bad_type(path, expected, value):
+    return _at(path, f"must be {expected}, got {type(value).__name__}")
+
+
+def _bad_value(path, allowed, value):
+    return _at(path, f"must be {allowed!r}, got {value!r}")
+
+
+def _bad_enum(path, allowed, value):
+    return _at(path, f"must be one of {list(allowed)}, got {value!r}")
+
+
+def _out_of_range(path, word, bound, value):
+    return _at(path, f"{value!r} is {word} {bound!r}")
+
+
+class _Codegen:
+    """Emits one flat Python function body for a schema"""
+
+    def __init__(self):
+        self.lines = []
+        self.namespace = {"_MISSING": _MISSING, "_at": _at, "_bad_type": _bad_type,
+                          "_bad_value": _bad_value, "_bad_enum": _bad_enum,
+                          "_out_of_range": _out_of_range}
+        self._names = 0
+
+    def name(self, prefix: str, value: Any = _MISSING) -> str:
+        self._names += 1
+        name = f"_{prefix}{self._names}"
+        if value is not _MISSING:
+            self.namespace[name] = value
+        return name
+
+    def emit(self, indent: int, line: str):
+        self.lines.append("    " * indent + line)
+
+    def schema(self, schema: Dict[str, Any], v: str, path: str, indent: int):
+        """Emit the checks of schema against variable v"""
+        if not isinstance(schema, dict):
+            raise SchemaError(f"{path or 'schema'} must be an object")
+        unknown = set(schema) - _KEYWORDS - _ANNOTATIONS
+        if unknown:
+            raise _Unsupported(sorted(unknown))
+        p = self.name("p", path)
+
+        # a single declared type lets the keyword checks below drop their type guards
+        known = None
+        if "type" in schema:
+            names = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+            try:
+                test = " or ".join(_TYPES[n].format(v=v) for n in names)
+            except KeyError as e:
+                raise SchemaError(f"{path or 'schema'}: unknown type {e}") from None
+            self.emit(indent, f"if not ({test}): return _bad_type({p}, {'/'.join(names)!r}, {v})")
+            if len(names) == 1:
+                known = names[0]
+
+        def guarded(kind: str) -> int:
+            """Open an isinstance block unless the type is already known"""
+            if known == kind or (kind == "number" and known == "integer"):
+                return indent
+            self.emit(indent, f"if {_TYPES[kind].format(v=v)}:")
+            return indent + 1
+
+        if "const" in schema:
+            k = self.name("k", schema["const"])
+            self.emit(indent, f"if {v} != {k}: return _bad_value({p}, {k}, {v})")
+
+        if "enum" in schema:
+            k = self.name("k", tuple(schema["enum"]))
+            self.emit(indent, f"if {v} not in {k}: return _bad_enum({p}, {k}, {v})")
+
+        bounds = [(kw, op, word) for kw, op, word in (
+            ("minimum", "<", "less than the minimum"),
+            ("maximum", ">", "greater than the maximum"),
+            ("exclusiveMinimum", "<=", "not greater than"),
+            ("exclusiveMaximum", ">=", "not less than"),
+        ) if kw in schema]
+        if bounds:
+            inner = guarded("number")
+            for keyword, op, word in bounds:
+                bound = schema[keyword]
+                if isinstance(bound, bool) or not isinstance(bound, (int, float)):
+                    raise _Unsupported([keyword])  # draft 4 boolean form
+                self.emit(inner, f"if {v} {op} {bound!r}: return _out_of_range({p}, {word!r}, {bound!r}, {v})")
+
+        lengths = [(kw, op, word) for kw, op, word in (
+            ("minLength", "<", "shorter than"), ("maxLength", ">", "longer than")) if kw in schema]
+        if lengths or "pattern" in schema:
+            inner = guarded("string")
+            for keyword, op, word in lengths:
+                bound = int(schema[keyword])
+                self.emit(inner, f"if len({v}) {op} {bound}: "
+                                 f"return _at({p}, f'{{{v}!r}} is {word} {bound} characters')")
+            if "pattern" in schema:
+                k = self.name("re", re.compile(schema["pattern"]).search)
+                message = f" does not match {schema['pattern']!r}"
+                self.emit(inner, f"if not {k}({v}): return _at({p}, repr({v}) + {message!r})")
+
+        props = schema.get("properties", {})
+        extra = schema.get("additionalProperties", True)
+        if "required" in schema or props or extra is not True:
+            inner = guarded("object")
+            for field in schema.get("required", ()):
+                self.emit(inner, f"if {field!r} not in {v}: "
+                                 f"return _at({p}, {'missing required field: ' + field!r})")
+            for field, sub in props.items():
+                item = self.name("v")
+                self.emit(inner, f"{item} = {v}.get({field!r}, _MISSING)")
+                self.emit(inner, f"if {item} is not _MISSING:")
+                self.block(sub, item, f"{path}.{field}" if path else field, inner + 1)
+            if extra is not True:
+                declared = self.name("k", frozenset(props))
+                key, item = self.name("key"), self.name("v")
+                self.emit(inner, f"for {key}, {item} in {v}.items():")
+                self.emit(inner + 1, f"if {key} in {declared}: continue")
+                if extra is False:
+                    self.emit(inner + 1, f"return _at({p}, 'unexpected field: ' + str({key}))")
+                elif isinstance(extra, dict):
+                    self.block(extra, item, f"{path}.*" if path else "*", inner + 1)
+                else:
+                    raise SchemaError(f"{path or 'schema'}: additionalProperties must be bool or object")
+
+        if "items" in schema or "minItems" in schema or "maxItems" in schema:
+            inner = guarded("array")
+            for keyword, op, word in (("minItems", "<", "fewer than"), ("maxItems", ">", "more than")):
+                if keyword in schema:
+                    bound = int(schema[keyword])
+                    self.emit(inner, f"if len({v}) {op} {bound}: "
+                                     f"return _at({p}, 'has {word} {bound} items')")
+            if "items" in schema:
+                if not isinstance(schema["items"], dict):
+                    raise _Unsupported(["items (tuple form)"])
+                item = self.name("v")
+                self.emit(inner, f"for {item} in {v}:")
+                self.block(schema["items"], item, f"{path}[]", inner + 1)
+
+    def block(self, schema: Dict[str, Any], v: str, path: str, indent: int):
+        """schema() inside a compound statement (needs at least one statement)"""
+        start = len(self.lines)
+        self.schema(schema, v, path, indent)
+        if len(self.lines) == start:
+            self.emit(indent, "pass")
+
+    def build(self) -> Validator:
+        source = "def validate(value):\n" + "\n".join(self.lines + ["    return None"]) + "\n"
+        exec(compile(source, "<schema>", "exec"), self.namespace)
+        validate = self.namespace["validate"]
+        validate.source = source
+        return validate
+
+
+def compile_schema(schema: Dict[str, Any]) -> Validator:
+    """Compile a JSON Schema dict into a validator returning None or an error message
+
+    The schema is turned into the source of one Python function (inline
+    isinstance / comparison checks, no per-keyword calls) and exec'd once.
+
+    Raises:
+        SchemaError: malformed schema, or unsupported keywords without jsonschema
+    """
+    try:
+        codegen = _Codegen()
+        codegen.schema(schema, "value", "", 1)
+        return codegen.build()
+    except _Unsupported as e:
+        try:
+            from jsonschema.validators import validator_for
+        except ImportError:
+            raise SchemaError(f"unsupported keywords {e.args[0]} (install jsonschema)") from None
+        validator = validator_for(schema)(schema)
+
+        def check_jsonschema(v):
+            for error in validator.iter_errors(v):
+                location = ".".join(str(part) for part in error.absolute_path)
+                return _at(location, error.message)
+            return None
+        return check_jsonschema
+
+
+class _Entry:
+    __slots__ = ("schema", "path", "validator", "error", "stamp", "next_stat",
+                 "checked", "validated", "failures", "reloads")
+
+    def __init__(self, schema: Optional[Dict[str, Any]], path: Optional[Path]):
+        self.schema = schema
+        self.path = path
+        self.validator: Optional[Validator] = None
+        self.error: Optional[str] = None
+        self.stamp: Optional[Tuple[int, int]] = None
+        self.next_stat = 0.0
+        self.checked = 0
+        self.validated = 0
+        self.failures = 0
+        self.reloads = 0
+
+
+class SchemaRegistry:
+    """Named schemas compiled once; file-backed ones reloaded when the file changes"""
+
+    def __init__(self, mode: Optional[str] = None, sample_every: Optional[int] = None,
+                 check_interval: float = 1.0):
+        """
+        Args:
+            mode: strict / sampled / debug / off (default: SCHEMA_VALIDATION_MODE or sampled)
+            sample_every: Records per validation in sampled mode (default: SCHEMA_SAMPLE_EVERY or 100)
+            check_interval: Seconds between stats of a schema file
+        """
+        self.check_interval = check_interval
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self.set_mode(mode or os.getenv("SCHEMA_VALIDATION_MODE", "sampled"),
+                      sample_every or int(os.getenv("SCHEMA_SAMPLE_EVERY", "100")))
+
+    def set_mode(self, mode: str, sample_every: Optional[int] = None):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        self.mode = mode
+        if sample_every is not None:
+            self.sample_every = max(1, sample_every)
+
+    def register(self, name: str, schema: Optional[Dict[str, Any]] = None,
+                 path: Optional[Union[str, Path]] = None):
+        """Register a schema dict, or a JSON schema file watched for changes"""
+        if (schema is None) == (path is None):
+            raise ValueError("register() takes exactly one of schema or path")
+        entry = _Entry(schema, Path(path) if path is not None else None)
+        if schema is not None:
+            entry.validator = compile_schema(schema)
+        with self._lock:
+            self._entries[name] = entry
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def _refresh(self, entry: _Entry):
+        """Recompile a file-backed schema if the file changed since the last stat"""
+        now = time.monotonic()
+        if now < entry.next_stat:
+            return
+        with self._lock:
+            if now < entry.next_stat:
+                return
+            entry.next_stat = now + self.check_interval
+            try:
+                st = os.stat(entry.path)
+            except OSError:
+                entry.validator, entry.stamp = None, None
+                entry.error = f"schema file not found: {entry.path}"
+                return
+            stamp = (st.st_mtime_ns, st.st_size)
+            if stamp == entry.stamp:
+                return
+            try:
+                with open(entry.path, "r", encoding="utf-8") as f:
+                    schema = json.load(f)
+                validator = compile_schema(schema)
+            except (OSError, ValueError) as e:
+                # a schema being rewritten: keep the previous version, retry next stat
+                logger.error(f"Schema reload failed ({entry.path}): {e}")
+                if entry.validator is None:
+                    entry.error = f"schema file invalid: {e}"
+                return
+            entry.schema, entry.validator, entry.error, entry.stamp = schema, validator, None, stamp
+            entry.reloads += 1
+
+    def _entry(self, name: str) -> _Entry:
+        entry = self._entries.get(name)
+        if entry is None:
+            raise KeyError(f"schema not registered: {name}")
+        if entry.path is not None:
+            self._refresh(entry)
+        return entry
+
+    def validate(self, name: str, record: Any) -> Tuple[bool, Optional[str]]:
+        """Validate record against schema name regardless of mode"""
+        entry = self._entry(name)
+        entry.checked += 1
+        return self._run(entry, record)
+
+    def check(self, name: str, record: Any) -> Tuple[bool, Optional[str]]:
+        """Validate record if the mode selects it; skipped records pass"""
+        mode = self.mode
+        if mode == "strict":
+            return self.validate(name, record)
+        if mode == "off":
+            return True, None
+        entry = self._entry(name)
+        entry.checked += 1
+        if mode == "sampled":
+            if (entry.checked - 1) % self.sample_every:
+                return True, None
+        elif not logger.isEnabledFor(logging.DEBUG):
+            return True, None
+        return self._run(entry, record)
+
+    @staticmethod
+    def _run(entry: _Entry, record: Any) -> Tuple[bool, Optional[str]]:
+        validator = entry.validator
+        if validator is None:
+            entry.failures += 1
+            return False, entry.error
+        entry.validated += 1
+        error = validator(record)
+        if error:
+            entry.failures += 1
+            return False, error
+        return True, None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "sample_every": self.sample_every,
+                "schemas": {name: {"checked": e.checked, "validated": e.validated,
+                                   "failures": e.failures, "reloads": e.reloads,
+                                   "path": str(e.path) if e.path else None}
+                            for name, e in self._entries.items()},
+            }
+
+
+# 전역 인스턴스
+_schema_registry: Optional[SchemaRegistry] = None
+
+
+def get_schema_registry() -> SchemaRegistry:
+    """전역 스키마 레지스트리 반환"""
+    global _schema_registry
+    if _schema_registry is None:
+        _schema_registry = SchemaRegistry()
+    return _schema_registry
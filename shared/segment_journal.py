@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Segment Journal - append-only NDJSON journal with an offset index
+
+Records are appended as one line each to the active segment
+`<prefix>_<seq:08d>.ndjson`; when it grows past max_segment_bytes it is
+sealed (its offset index is written next to it as `.idx`) and a new
+segment is started. Nothing is ever rewritten:
+
+- append():   one write (+ optional fsync), O(1)
+- get(id):    latest record of an id via the in-memory index, one seek
+- recent(n):  newest-first, reads only the tail of the newest segment(s)
+- since(ts):  bisect on the per-segment time index
+
+Only the active segment is scanned on open (a partial trailing line from a
+crash is cut off); sealed segment indexes are loaded on first need.
+"""
+
+import bisect
+import itertools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+
+class _SegmentIndex:
+    """Line offsets, timestamps and record ids of one segment"""
+
+    __slots__ = ("offsets", "times", "ids", "size")
+
+    def __init__(self):
+        self.offsets: List[int] = []
+        self.times: List[float] = []
+        self.ids: List[str] = []
+        self.size = 0
+
+    def add(self, offset: int, ts: float, record_id: str, length: int):
+        self.offsets.append(offset)
+        self.times.append(ts)
+        self.ids.append(record_id)
+        self.size = offset + length
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"offsets": self.offsets, "times": self.times, "ids": self.ids, "size": self.size}
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "_SegmentIndex":
+        index = cls()
+        index.offsets = data["offsets"]
+        index.times = data["times"]
+        index.ids = data["ids"]
+        index.size = data["size"]
+        return index
+
+
+class SegmentJournal:
+    """Append-only, segment-rotated journal of (record_id, ts, record)"""
+
+    def __init__(self, directory: Union[str, Path], prefix: str = "journal",
+                 max_segment_bytes: int = 8 * 1024 * 1024, max_segments: Optional[int] = None,
+                 fsync: bool = False):
+        """
+        Args:
+            directory: Segment directory (created on first append)
+            prefix: Segment file name prefix
+            max_segment_bytes: Size at which the active segment is sealed
+            max_segments: Keep at most this many segments (None: keep all)
+            fsync: fsync every append (otherwise flushed to the OS only)
+        """
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segments = max_segments
+        self.fsync = fsync
+
+        self._lock = threading.RLock()
+        self._segments: List[int] = []
+        self._indexes: Dict[int, _SegmentIndex] = {}
+        self._unindexed: List[int] = []  # sealed, index not loaded yet (oldest first)
+        self._latest: Dict[str, Tuple[int, int]] = {}  # id -> (seq, offset)
+        self._file = None
+        self._opened = False
+        self._stats = {"appends": 0, "rotations": 0, "truncated_bytes": 0, "index_loads": 0}
+
+    # ------------------------------------------------------------------
+    # Segment files
+
+    def _segment_path(self, seq: int) -> Path:
+        return self.directory / f"{self.prefix}_{seq:08d}.ndjson"
+
+    def _index_path(self, seq: int) -> Path:
+        return self.directory / f"{self.prefix}_{seq:08d}.idx"
+
+    def _open(self):
+        """Find segments and index the active one (once)"""
+        if self._opened:
+            return
+        marker = f"{self.prefix}_"
+        if self.directory.exists():
+            for path in self.directory.glob(f"{self.prefix}_*.ndjson"):
+                digits = path.stem[len(marker):]
+                if digits.isdigit():
+                    self._segments.append(int(digits))
+        self._segments.sort()
+        if self._segments:
+            active = self._segments[-1]
+            self._indexes[active] = self._scan(active, repair=True)
+            for seq, record_id, offset in self._iter_index(active):
+                self._latest[record_id] = (seq, offset)
+            self._unindexed = self._segments[:-1]
+        self._opened = True
+
+    def _scan(self, seq: int, repair: bool = False) -> _SegmentIndex:
+        """Build a segment index by reading the segment; cut a partial last line if repair"""
+        index = _SegmentIndex()
+        path = self._segment_path(seq)
+        data = path.read_bytes() if path.exists() else b""
+        offset = 0
+        while offset < len(data):
+            end = data.find(b"\n", offset)
+            if end < 0:
+                break
+            try:
+                entry = json.loads(data[offset:end])
+                index.add(offset, float(entry["ts"]), str(entry["id"]), end + 1 - offset)
+            except (ValueError, KeyError, TypeError):
+                index.size = end + 1  # unreadable line: skipped, but kept on disk
+            offset = end + 1
+        if repair and offset < len(data):
+            with open(path, "r+b") as f:
+                f.truncate(offset)
+            self._stats["truncated_bytes"] += len(data) - offset
+        return index
+
+    def _load_index(self, seq: int) -> _SegmentIndex:
+        """Index of a segment: in memory, from its .idx file, or rebuilt"""
+        index = self._indexes.get(seq)
+        if index is not None:
+            return index
+        try:
+            with open(self._index_path(seq), "r", encoding="utf-8") as f:
+                index = _SegmentIndex.from_json(json.load(f))
+        except (OSError, ValueError, KeyError):
+            index = self._scan(seq)
+            self._write_index(seq, index)
+        self._indexes[seq] = index
+        self._stats["index_loads"] += 1
+        return index
+
+    def _write_index(self, seq: int, index: _SegmentIndex):
+        path = self._index_path(seq)
+        temp = path.with_suffix(".idx.tmp")
+        try:
+            with open(temp, "w", encoding="utf-8") as f:
+                json.dump(index.to_json(), f, separators=(",", ":"))
+            os.replace(temp, path)
+        except OSError:
+            pass  # the index is rebuilt from the segment on next use
+
+    def _iter_index(self, seq: int) -> Iterator[Tuple[int, str, int]]:
+        index = self._indexes[seq]
+        for record_id, offset in zip(index.ids, index.offsets):
+            yield seq, record_id, offset
+
+    def _load_next_sealed(self) -> bool:
+        """Index the newest sealed segment not indexed yet; False if none left"""
+        if not self._unindexed:
+            return False
+        seq = self._unindexed.pop()
+        self._load_index(seq)
+        latest = {record_id: offset for _, record_id, offset in self._iter_index(seq)}
+        for record_id, offset in latest.items():
+            # newer segments were indexed first and win
+            self._latest.setdefault(record_id, (seq, offset))
+        return True
+
+    def _rotate(self):
+        """Seal the active segment and start the next one"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        active = self._segments[-1]
+        self._write_index(active, self._indexes[active])
+        self._segments.append(active + 1)
+        self._indexes[active + 1] = _SegmentIndex()
+        self._stats["rotations"] += 1
+
+        if self.max_segments and len(self._segments) > self.max_segments:
+            for seq in self._segments[:-self.max_segments]:
+                for path in (self._segment_path(seq), self._index_path(seq)):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+                self._indexes.pop(seq, None)
+                if seq in self._unindexed:
+                    self._unindexed.remove(seq)
+            self._segments = self._segments[-self.max_segments:]
+            # ids pointing at dropped segments are cleaned up on lookup
+
+    # ------------------------------------------------------------------
+    # Writes
+
+    def append(self, record_id: str, record: Any, ts: Optional[float] = None) -> int:
+        """
+        Append one record.
+
+        Args:
+            record_id: Id for get(); a later append with the same id wins
+            record: JSON-serializable record
+            ts: Record time (default: now); expected to be non-decreasing
+
+        Returns:
+            Segment sequence number the record was written to
+        """
+        ts = time.time() if ts is None else float(ts)
+        line = json.dumps({"id": record_id, "ts": ts, "rec": record},
+                          ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+        with self._lock:
+            self._open()
+            if not self._segments:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._segments.append(1)
+                self._indexes[1] = _SegmentIndex()
+            elif self._indexes[self._segments[-1]].size and \
+                    self._indexes[self._segments[-1]].size + len(line) > self.max_segment_bytes:
+                self._rotate()
+            seq = self._segments[-1]
+            index = self._indexes[seq]
+            if self._file is None:
+                self._file = open(self._segment_path(seq), "ab")
+            offset = index.size
+            self._file.write(line)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            index.add(offset, ts, record_id, len(line))
+            self._latest[record_id] = (seq, offset)
+            self._stats["appends"] += 1
+            return seq
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # ------------------------------------------------------------------
+    # Reads
+
+    def _read_lines(self, seq: int, start: int, end: int) -> List[Dict[str, Any]]:
+        with open(self._segment_path(seq), "rb") as f:
+            f.seek(start)
+            data = f.read(end - start)
+        return [json.loads(line) for line in data.splitlines() if line]
+
+    def get(self, record_id: str) -> Optional[Any]:
+        """Latest record appended with record_id, or None"""
+        with self._lock:
+            self._open()
+            location = self._latest.get(record_id)
+            while location is None and self._load_next_sealed():
+                location = self._latest.get(record_id)
+            if location is None:
+                return None
+            seq, offset = location
+            if seq not in self._indexes:
+                # segment dropped by retention
+                del self._latest[record_id]
+                return None
+        try:
+            with open(self._segment_path(seq), "rb") as f:
+                f.seek(offset)
+                return json.loads(f.readline())["rec"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def iter_recent(self, batch: int = 256) -> Iterator[Tuple[str, float, Any]]:
+        """(record_id, ts, record) newest first, reading segments from the tail in batches"""
+        with self._lock:
+            self._open()
+            segments = list(self._segments)
+        for seq in reversed(segments):
+            with self._lock:
+                if seq not in self._segments:
+                    continue
+                index = self._load_index(seq)
+                # offsets are append-only: the first `count` stay valid unlocked
+                offsets = index.offsets
+                count = len(offsets)
+                size = index.size
+            end = count
+            while end > 0:
+                start = max(0, end - batch)
+                stop = offsets[end] if end < count else size
+                try:
+                    entries = self._read_lines(seq, offsets[start], stop)
+                except (OSError, ValueError):
+                    break
+                for entry in reversed(entries):
+                    yield entry["id"], entry["ts"], entry["rec"]
+                end = start
+
+    def recent(self, n: int) -> List[Tuple[str, float, Any]]:
+        """Last n appends, newest first"""
+        return list(itertools.islice(self.iter_recent(batch=max(1, min(n, 1024))), n))
+
+    def since(self, ts: float) -> Iterator[Tuple[str, float, Any]]:
+        """(record_id, ts, record) with record ts >= ts, oldest first"""
+        with self._lock:
+            self._open()
+            segments = list(self._segments)
+            # newest segment whose first record is not after ts
+            first = 0
+            for i in range(len(segments) - 1, -1, -1):
+                index = self._load_index(segments[i])
+                if index.times and index.times[0] <= ts:
+                    first = i
+                    break
+            plan = []
+            for seq in segments[first:]:
+                index = self._load_index(seq)
+                start = bisect.bisect_left(index.times, ts)
+                if start < len(index.offsets):
+                    plan.append((seq, index.offsets[start], index.size))
+        for seq, start, stop in plan:
+            try:
+                entries = self._read_lines(seq, start, stop)
+            except (OSError, ValueError):
+                continue
+            for entry in entries:
+                yield entry["id"], entry["ts"], entry["rec"]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._open()
+            active = self._indexes.get(self._segments[-1]) if self._segments else None
+            return {
+                **self._stats,
+                "segments": len(self._segments),
+                "active_records": len(active.offsets) if active else 0,
+                "active_bytes": active.size if active else 0,
+                "indexed_ids": len(self._latest),
+            }
@@ -14,6 +14,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
 
 from .centralized_path_registry import get_path_registry
+from .dedup_window import DedupWindow
 
 
 class DropCode(Enum):
@@ -95,7 +96,7 @@ class OrderEvidence:
 class SignalOrderAdmission:
     """신호→주문 승인 시스템"""
     
-    def __init__(self, repo_root: Path):
+    def __init__(self, repo_root: Path, dedup_persist_path: Optional[Path] = None):
         self.logger = logging.getLogger(__name__)
         self.repo_root = repo_root
         self.path_registry = get_path_registry(repo_root)
@@ -104,9 +105,11 @@ class SignalOrderAdmission:
         self.evidence_dir = self.repo_root / "logs" / "orders"
         self.evidence_dir.mkdir(parents=True, exist_ok=True)
         
-        # 중복 방지 저장소 (최근 1000개 주문)
-        self.recent_orders: Dict[str, float] = {}  # client_order_id -> timestamp
-        self.max_recent_orders = 1000
+        # 중복 방지 저장소 (5분 윈도우, client_order_id 시간순)
+        self.max_recent_orders = 100_000
+        self.recent_orders = DedupWindow(
+            300, max_keys=self.max_recent_orders, persist_path=dedup_persist_path
+        )
         
         # 통계
         self.stats = {
@@ -310,34 +313,13 @@ class SignalOrderAdmission:
     
     def _is_duplicate_order(self, client_order_id: str) -> bool:
         """중복 주문 검사"""
-        current_time = time.time()
-        
         # 최근 주문에서 검사 (5분 이내)
-        if client_order_id in self.recent_orders:
-            last_time = self.recent_orders[client_order_id]
-            if current_time - last_time < 300:  # 5분
-                return True
-        
-        return False
+        return self.recent_orders.seen(client_order_id)
     
     def _add_recent_order(self, client_order_id: str):
         """최근 주문에 추가"""
-        current_time = time.time()
-        
-        # 오래된 주문 정리 (5분 이상)
-        self.recent_orders = {
-            coid: timestamp for coid, timestamp in self.recent_orders.items()
-            if current_time - timestamp < 300
-        }
-        
-        # 새 주문 추가
-        self.recent_orders[client_order_id] = current_time
-        
-        # 최대 개수 제한
-        if len(self.recent_orders) > self.max_recent_orders:
-            # 가장 오래된 주문 제거
-            oldest_coid = min(self.recent_orders.keys(), key=lambda k: self.recent_orders[k])
-            del self.recent_orders[oldest_coid]
+        # 만료된 주문은 윈도우 앞쪽부터 정리, 최대 개수 초과 시 가장 오래된 주문 제거
+        self.recent_orders.add(client_order_id)
     
     def _create_drop_result(self, drop_code: DropCode, reason: str, 
                            start_time: float, trace_id: Optional[str] = None) -> AdmissionResult:
@@ -9,11 +9,12 @@ import logging
 import time
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 import threading
 from datetime import datetime
 
 from .guardrails import get_guardrails
+from .schema_registry import get_schema_registry
 
 
 @dataclass
@@ -104,6 +105,16 @@ class SystemState:
     schema_version: str = "1.0.0"
 
 
+STATE_SCHEMA = {
+    "type": "object",
+    "required": [
+        "env", "service_heartbeats", "symbols", "ares",
+        "risk", "orders", "circuit_breaker", "version",
+    ],
+}
+get_schema_registry().register("state_bus", STATE_SCHEMA)
+
+
 class StateBus:
     """상태 버스 - 중앙화된 상태 관리"""
     
@@ -116,8 +127,14 @@ class StateBus:
         self._state: Optional[SystemState] = None
         self._last_save_time = 0.0
         
+        # 갱신 리스너: "heartbeat" -> (service, ServiceHeartbeat), "risk" -> RiskState
+        self._listeners: Dict[str, List[Callable[..., None]]] = {}
+        
         # 가드레일 설정
         self.guardrails = get_guardrails()
+
+        # 상태 스키마 (컴파일된 검증기)
+        self._schemas = get_schema_registry()
         
         # 초기 상태 로드
         self.load_state()
@@ -176,19 +193,17 @@ class StateBus:
             last_updated=time.time(),
         )
     
-    def _validate_schema(self, data: Dict[str, Any]) -> bool:
-        """스키마 검증"""
+    def _validate_schema(self, data: Dict[str, Any], strict: bool = True) -> bool:
+        """스키마 검증 (strict=False: SCHEMA_VALIDATION_MODE에 따라 샘플링)"""
         try:
             # 필수 키 확인
-            required_keys = [
-                'env', 'service_heartbeats', 'symbols', 'ares', 
-                'risk', 'orders', 'circuit_breaker', 'version'
-            ]
-            
-            for key in required_keys:
-                if key not in data:
-                    self.logger.error(f"Missing required key: {key}")
-                    return False
+            if strict:
+                is_valid, error = self._schemas.validate("state_bus", data)
+            else:
+                is_valid, error = self._schemas.check("state_bus", data)
+            if not is_valid:
+                self.logger.error(f"State schema invalid: {error}")
+                return False
             
             # 버전 호환성 확인
             if data.get('version') != '1.0.0':
@@ -257,7 +272,7 @@ class StateBus:
                 state_dict = self._serialize_state()
 
                 # Schema validation before write
-                if not self._validate_schema(state_dict):
+                if not self._validate_schema(state_dict, strict=False):
                     self.logger.error("State schema validation failed - rejecting write")
                     # Alert on invalid write attempt
                     try:
@@ -305,6 +320,27 @@ class StateBus:
             self.logger.error(f"State serialization error: {e}")
             raise
     
+    def add_listener(self, kind: str, callback: Callable[..., None]):
+        """갱신 리스너 등록 (같은 프로세스의 갱신을 폴링 없이 즉시 전달)"""
+        with self._lock:
+            self._listeners.setdefault(kind, []).append(callback)
+    
+    def remove_listener(self, kind: str, callback: Callable[..., None]):
+        """갱신 리스너 해제"""
+        with self._lock:
+            if callback in self._listeners.get(kind, []):
+                self._listeners[kind].remove(callback)
+    
+    def _notify(self, kind: str, *args):
+        """리스너 호출 (락 밖에서, 리스너 오류는 기록만)"""
+        with self._lock:
+            listeners = list(self._listeners.get(kind, []))
+        for callback in listeners:
+            try:
+                callback(*args)
+            except Exception as e:
+                self.logger.error(f"State bus {kind} listener failed: {e}")
+    
     def get_state(self) -> SystemState:
         """현재 상태 반환"""
         with self._lock:
@@ -323,14 +359,18 @@ class StateBus:
                 if self._state.service_heartbeats is None:
                     self._state.service_heartbeats = {}
                 
-                self._state.service_heartbeats[service] = ServiceHeartbeat(
+                heartbeat = ServiceHeartbeat(
                     ts=time.time(),
                     status=status,
                     last_error=last_error,
                     metrics=metrics or {}
                 )
+                self._state.service_heartbeats[service] = heartbeat
                 
-                return self.save_state()
+                saved = self.save_state()
+            
+            self._notify("heartbeat", service, heartbeat)
+            return saved
                 
         except Exception as e:
             self.logger.error(f"Failed to update service heartbeat: {e}")
@@ -393,7 +433,11 @@ class StateBus:
                     if hasattr(self._state.risk, key):
                         setattr(self._state.risk, key, value)
                 
-                return self.save_state()
+                risk = self._state.risk
+                saved = self.save_state()
+            
+            self._notify("risk", risk)
+            return saved
                 
         except Exception as e:
             self.logger.error(f"Failed to update risk state: {e}")
@@ -19,13 +19,14 @@ import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 from decimal import Decimal, ROUND_HALF_UP
 
 from .io_canonical import (
     artifact, get_ssot_dir, write_json_atomic, read_json_safe,
     append_ndjson_atomic
 )
+from .order_journal import OrderJournal
 
 
 @dataclass
@@ -73,6 +74,11 @@ class Order:
             self.timestamp = time.time()
         if self.update_time == 0.0:
             self.update_time = time.time()
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Order':
+        """Create from a journal line (ignores extra keys such as _metadata)"""
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
 
 
 @dataclass
@@ -109,6 +115,9 @@ class StateStore:
         self.open_orders: Dict[str, Order] = {}
         self.daily_pnl: Dict[str, float] = {}
         
+        # Order journal index: checkpoint + tail replay, last write wins
+        self.order_journal = OrderJournal(self.orders_file)
+        
         # Load initial state
         self._load_state()
     
@@ -122,19 +131,14 @@ class StateStore:
                     for symbol, pos_data in data['positions'].items():
                         self.positions[symbol] = Position(**pos_data)
             
-            # Load open orders
-            if self.orders_file.exists():
-                with open(self.orders_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line:
-                            try:
-                                order_data = json.loads(line)
-                                if order_data.get('status') in ['NEW', 'PARTIALLY_FILLED']:
-                                    order = Order(**order_data)
-                                    self.open_orders[order.order_id] = order
-                            except (json.JSONDecodeError, TypeError):
-                                continue
+            # Load open orders (latest state per order from the journal index)
+            open_orders = {}
+            for order_id, order_data in self.order_journal.open_orders().items():
+                try:
+                    open_orders[order_id] = Order.from_dict(order_data)
+                except TypeError:
+                    continue
+            self.open_orders = open_orders
             
             # Load daily PnL
             if self.pnl_daily_file.exists():
@@ -174,6 +178,16 @@ class StateStore:
         """Get specific order"""
         return self.open_orders.get(order_id)
     
+    def get_order_by_client_id(self, client_order_id: str) -> Optional[Order]:
+        """Get latest state of any order (open or closed) by client order id"""
+        order_data = self.order_journal.get_by_client_id(client_order_id)
+        if order_data is None:
+            return None
+        try:
+            return Order.from_dict(order_data)
+        except TypeError:
+            return None
+    
     def add_order(self, order: Order) -> bool:
         """Add new order to state"""
         try:
@@ -181,8 +195,7 @@ class StateStore:
             self.open_orders[order.order_id] = order
             
             # Persist to SSOT
-            order_data = asdict(order)
-            success = append_ndjson_atomic("orders.ndjson", order_data)
+            success = self.order_journal.append(asdict(order))
             
             if not success:
                 # Rollback on failure
@@ -211,8 +224,7 @@ class StateStore:
             order.update_time = time.time()
             
             # Persist update
-            order_data = asdict(order)
-            success = append_ndjson_atomic("orders.ndjson", order_data)
+            success = self.order_journal.append(asdict(order))
             
             if not success:
                 # Rollback - reload from SSOT
@@ -436,8 +448,7 @@ class StateStore:
                 order.status = 'CANCELLED'
                 order.update_time = time.time()
                 
-                order_data = asdict(order)
-                success = append_ndjson_atomic("orders.ndjson", order_data)
+                success = self.order_journal.append(asdict(order))
                 
                 if success:
                     cancelled_orders.append(order_id)
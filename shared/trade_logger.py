@@ -2,7 +2,10 @@ import json
 import pathlib
 import time
 
-from jsonschema import ValidationError, validate
+from shared.integrity_filters import apply_integrity_filters
+from shared.schema_registry import get_schema_registry
+
+TRADE_SCHEMA_PATH = "shared_data/reports/trade_schema.json"
 
 
 def validate_trade_schema(trade_data):
@@ -16,16 +19,15 @@ def validate_trade_schema(trade_data):
         Tuple[bool, str]: (검증 통과 여부, 오류 메시지)
     """
     try:
-        # 통합 거래 스키마 로드
-        schema_path = pathlib.Path("shared_data/reports/trade_schema.json")
-        if not schema_path.exists():
-            return False, "스키마 파일이 존재하지 않음"
-
-        with open(schema_path, "r", encoding="utf-8") as f:
-            schema = json.load(f)
+        # 통합 거래 스키마 (한 번 컴파일, 파일 변경 시 재컴파일)
+        schemas = get_schema_registry()
+        if "trade" not in schemas:
+            schemas.register("trade", path=TRADE_SCHEMA_PATH)
 
-        # 스키마 검증
-        validate(instance=trade_data, schema=schema)
+        # 스키마 검증 (체결 게이트이므로 샘플링 없이 항상 검증)
+        is_valid, error = schemas.validate("trade", trade_data)
+        if not is_valid:
+            return False, f"스키마 검증 실패: {error}"
 
         # 추가 비즈니스 로직 검증
         if trade_data.get("strategy_id") == "UNKNOWN":
@@ -39,8 +41,6 @@ def validate_trade_schema(trade_data):
 
         return True, "검증 통과"
 
-    except ValidationError as e:
-        return False, f"스키마 검증 실패: {e.message}"
     except Exception as e:
         return False, f"검증 오류: {str(e)}"
 
@@ -121,8 +121,6 @@ def log_trade_to_file(trade_data):
         normalized_data = normalize_trade_data(trade_data)
 
         # 무결성 필터 적용 (FAIL-CLOSE)
-        from shared.integrity_filters import apply_integrity_filters
-
         filters_passed, filter_results = apply_integrity_filters(normalized_data)
 
         if not filters_passed:
@@ -19,12 +19,7 @@ import sys
 if sys.version_info < (3, 11):
     raise RuntimeError("Coin Quant R11 requires Python 3.11 or higher")
 
-# Core service modules
-from . import shared
-from . import feeder
-from . import ares
-from . import trader
-from . import memory
+from .shared.lazy import lazy_submodules
 
 __all__ = [
     "shared",
@@ -33,3 +28,6 @@ __all__ = [
     "trader",
     "memory",
 ]
+
+# Submodules are imported on first access: importing the package stays cheap
+__getattr__, __dir__ = lazy_submodules(__name__, __all__)
@@ -5,8 +5,12 @@ Signal generation with health gating.
 Blocks on stale/missing Feeder health, no default signals.
 """
 
-from . import service
+from coin_quant.shared.lazy import lazy_submodules
 
 __all__ = [
     "service",
+    "strategies",
 ]
+
+# Submodules are imported on first access: importing the package stays cheap
+__getattr__, __dir__ = lazy_submodules(__name__, __all__)
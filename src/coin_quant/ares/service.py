@@ -18,7 +18,12 @@ from coin_quant.shared.config import config_manager
 from coin_quant.shared.singleton import create_singleton_guard
 from coin_quant.shared.paths import get_data_dir
 from coin_quant.shared.time import utc_now_seconds, age_seconds, is_fresh
-from coin_quant.shared.io import atomic_write_json, safe_read_json
+from coin_quant.shared.codec import read_payload, write_payload
+from coin_quant.shared.price_board import PriceBoardReader
+from coin_quant.shared.profiling import ServiceProfiler
+from coin_quant.shared.tracing import Tracer, child_trace, get_trace
+from coin_quant.ares.strategies import SimpleMAParams, simple_ma_signal
+from coin_quant.feeder.orderbook import book_from_symbol_data
 from coin_quant.memory.client import MemoryClient
 
 
@@ -38,12 +43,22 @@ class ARESService:
         self.heartbeat_interval = config_manager.get_float("ARES_HEARTBEAT_INTERVAL", 30.0)
         self.signal_interval = self.config.get("signal_interval", 30)
         self.allow_default_signals = self.config.get("allow_default_signals", False)
+        self.strategy_params = SimpleMAParams.from_dict(self.config.get("strategy_params"))
         
         # Data storage
         self.data_dir = get_data_dir()
         self.feeder_snapshot_file = self.data_dir / "feeder_snapshot.json"
         self.signals_file = self.data_dir / "ares_signals.json"
+        self.ipc_encoding = config_manager.get("IPC_ENCODING", "json")
         self.memory_client = MemoryClient(self.data_dir)
+        self.tracer = Tracer("ares")
+        self.profiler = ServiceProfiler("ares")
+        
+        # Latest ticks from the feeder's shared-memory price board; the
+        # snapshot file is read when the board is down, or for the book and
+        # trace of a symbol that produced a signal
+        self.price_board = PriceBoardReader(fallback=False) if config_manager.get_bool("PRICE_BOARD_ENABLED", True) else None
+        self._snapshot_entries: Optional[Dict[str, Any]] = None
         
         # Signal generation state
         self.last_feeder_data = {}
@@ -98,6 +113,9 @@ class ARESService:
         """Stop ARES service"""
         self.logger.info("Stopping ARES service...")
         self.running = False
+        self.profiler.stop()
+        if self.price_board is not None:
+            self.price_board.close()
         
         # Update health status
         health_manager.set_ares_health("RED", {
@@ -207,17 +225,29 @@ class ARESService:
             self.logger.error(f"Failed to generate signals: {e}")
     
     def _load_feeder_data(self) -> Optional[Dict[str, Any]]:
-        """Load feeder data from snapshot"""
+        """Load the latest ticks (price board, else the feeder snapshot)"""
         try:
-            if self.feeder_snapshot_file.exists():
-                data = safe_read_json(self.feeder_snapshot_file)
-                if data and 'symbol_data' in data:
-                    return data['symbol_data']
+            if self.price_board is not None and self.price_board.alive():
+                ticks = self.price_board.snapshot()
+                if ticks:
+                    self._snapshot_entries = None
+                    return ticks
+            data = read_payload(self.feeder_snapshot_file)
+            if data and 'symbol_data' in data:
+                self._snapshot_entries = data['symbol_data']
+                return data['symbol_data']
             return None
         except Exception as e:
             self.logger.error(f"Failed to load feeder data: {e}")
             return None
     
+    def _snapshot_entry(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Feeder snapshot entry of a symbol (book, trace), read at most once per pass"""
+        if self._snapshot_entries is None:
+            data = read_payload(self.feeder_snapshot_file) or {}
+            self._snapshot_entries = data.get('symbol_data') or {}
+        return self._snapshot_entries.get(symbol)
+    
     def _analyze_and_generate_signals(self, feeder_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Analyze feeder data and generate trading signals"""
         signals = []
@@ -244,36 +274,27 @@ class ARESService:
             return []
     
     def _simple_ma_strategy(self, symbol: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Simple moving average strategy"""
+        """Simple moving average strategy (see coin_quant.ares.strategies)"""
         try:
-            price = data.get('price', 0)
-            change = data.get('change', 0)
-            
-            if price <= 0:
-                return None
+            trading_signal = simple_ma_signal(
+                symbol, data.get('price', 0), data.get('change', 0), self.strategy_params
+            )
             
-            # Simple strategy: buy on positive change, sell on negative change
-            # Only generate signals if change is significant (> 1%)
-            if abs(change) > 1.0:
-                side = "BUY" if change > 0 else "SELL"
+            if trading_signal:
+                # Board ticks carry no book or trace: take them from the snapshot entry
+                entry = self._snapshot_entry(symbol) if data.get('source') == 'shm' else data
                 
-                # Calculate position size based on volatility
-                size = min(1.0, max(0.1, abs(change) / 10.0))
+                # Measured spread/slippage from the feeder's local book
+                book = book_from_symbol_data(entry)
+                if book is not None:
+                    notional = trading_signal['size'] * trading_signal['price']
+                    trading_signal['market'] = book.execution_estimate(notional, trading_signal['side'])
                 
-                trading_signal = {
-                    'symbol': symbol,
-                    'side': side,
-                    'price': price,
-                    'size': size,
-                    'confidence': min(0.9, abs(change) / 5.0),  # Higher confidence for larger moves
-                    'strategy': 'simple_ma',
-                    'timestamp': utc_now_seconds(),
-                    'reason': f"Price change: {change:.2f}%"
-                }
-                
-                return trading_signal
+                trace = child_trace(get_trace(entry))
+                if trace is not None:
+                    trading_signal['trace'] = self.tracer.stamp(trace, 'signal')
             
-            return None
+            return trading_signal
             
         except Exception as e:
             self.logger.error(f"Failed to generate signal for {symbol}: {e}")
@@ -288,7 +309,7 @@ class ARESService:
                 'count': len(trading_signals)
             }
             
-            atomic_write_json(self.signals_file, signal_data)
+            write_payload(self.signals_file, "ares_signals", signal_data, self.ipc_encoding)
             
         except Exception as e:
             self.logger.error(f"Failed to save signals: {e}")
@@ -324,6 +345,9 @@ class ARESService:
                 "status": "running"
             })
             
+            self.tracer.flush()
+            self.profiler.poll()
+            
             # Log status periodically
             if int(current_time) % 30 == 0:  # Every 30 seconds
                 self.logger.info(f"ARES status: {status}, signals: {self.signal_count}, feeder_ok: {feeder_health_ok}")
@@ -0,0 +1,100 @@
+"""
+ARES strategy functions for Coin Quant R11
+
+Pure signal functions shared by the live ARES service and the backtester.
+Each strategy has a scalar form (one symbol, one tick - used live) and a
+vectorized NumPy form (whole price series - used offline) that must
+produce identical decisions.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from coin_quant.shared.time import utc_now_seconds
+
+
+@dataclass(frozen=True)
+class SimpleMAParams:
+    """Parameters of the simple_ma (price change momentum) strategy"""
+    change_threshold_pct: float = 1.0   # |change| must exceed this to signal
+    size_divisor: float = 10.0          # size = |change| / size_divisor
+    min_size: float = 0.1
+    max_size: float = 1.0
+    confidence_divisor: float = 5.0     # confidence = |change| / confidence_divisor
+    max_confidence: float = 0.9
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "SimpleMAParams":
+        if not data:
+            return cls()
+        fields = cls.__dataclass_fields__
+        return cls(**{k: float(v) for k, v in data.items() if k in fields})
+
+
+DEFAULT_SIMPLE_MA_PARAMS = SimpleMAParams()
+
+
+def simple_ma_signal(symbol: str, price: float, change: float,
+                     params: SimpleMAParams = DEFAULT_SIMPLE_MA_PARAMS,
+                     timestamp: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    Simple momentum strategy: buy on positive change, sell on negative change.
+
+    Only signals when the price change percent is significant.
+
+    Args:
+        symbol: Trading symbol
+        price: Last price
+        change: Price change percent (24h ticker change live)
+        params: Strategy parameters
+        timestamp: Signal timestamp (defaults to now)
+
+    Returns:
+        Signal dict or None
+    """
+    if price <= 0 or abs(change) <= params.change_threshold_pct:
+        return None
+
+    side = "BUY" if change > 0 else "SELL"
+
+    # Calculate position size based on volatility
+    size = min(params.max_size, max(params.min_size, abs(change) / params.size_divisor))
+
+    return {
+        'symbol': symbol,
+        'side': side,
+        'price': price,
+        'size': size,
+        'confidence': min(params.max_confidence, abs(change) / params.confidence_divisor),
+        'strategy': 'simple_ma',
+        'timestamp': timestamp if timestamp is not None else utc_now_seconds(),
+        'reason': f"Price change: {change:.2f}%"
+    }
+
+
+def simple_ma_vectorized(price: np.ndarray, change: np.ndarray,
+                         params: SimpleMAParams = DEFAULT_SIMPLE_MA_PARAMS
+                         ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized simple_ma over a whole series.
+
+    Args:
+        price: Price per bar
+        change: Price change percent per bar (NaN where unknown)
+
+    Returns:
+        (side, size, confidence) arrays; side is +1 BUY, -1 SELL, 0 none
+    """
+    abs_change = np.abs(change)
+    active = (price > 0) & (abs_change > params.change_threshold_pct)  # NaN compares False
+    side = np.where(active, np.sign(change), 0).astype(np.int8)
+    size = np.clip(abs_change / params.size_divisor, params.min_size, params.max_size)
+    confidence = np.minimum(params.max_confidence, abs_change / params.confidence_divisor)
+    size = np.where(active, size, 0.0)
+    confidence = np.where(active, confidence, 0.0)
+    return side, size, confidence
@@ -0,0 +1,18 @@
+"""
+Backtesting for Coin Quant R11
+
+Replays kline history and memory layer ticker events through the ARES
+strategy code with the PnLCalculator fee/slippage model, and sweeps or
+walk-forward optimizes strategy params over the replay.
+"""
+
+from coin_quant.shared.lazy import lazy_submodules
+
+__all__ = [
+    "data",
+    "engine",
+    "optimizer",
+]
+
+# Submodules are imported on first access: importing the package stays cheap
+__getattr__, __dir__ = lazy_submodules(__name__, __all__)
@@ -0,0 +1,7 @@
+"""Entry point for python -m coin_quant.backtest"""
+
+import sys
+
+from coin_quant.backtest.engine import main
+
+sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+Backtest data loading for Coin Quant R11
+
+Streams recorded market data into per-symbol NumPy arrays:
+
+- Kline history: `shared_data/history/<symbol>_1m.jsonl` (one candle per line,
+  either the backfill format `{"timestamp", "close", ...}` or raw Binance
+  kline keys `{"t", "c", ...}`)
+- Memory layer: `ticker_update` events from `events.jsonl`
+
+Parsed klines are cached next to the history file as `.npz` keyed by the
+source file's size and mtime, so repeated runs (parameter sweeps) skip
+JSON parsing entirely.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from coin_quant.shared.paths import get_data_dir, get_history_dir
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - optional speedup
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_NAME = ".cache"
+CACHE_VERSION = 1
+
+
+@dataclass
+class PriceSeries:
+    """Time-ordered price series for one symbol"""
+    symbol: str
+    timestamps: np.ndarray            # int64 epoch milliseconds
+    prices: np.ndarray                # float64
+    changes: Optional[np.ndarray] = None  # float64 recorded change percent (ticker replay)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def slice_time(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> "PriceSeries":
+        """Return the sub-series with start_ms <= timestamp < end_ms (views, no copy)"""
+        lo = 0 if start_ms is None else int(np.searchsorted(self.timestamps, start_ms, "left"))
+        hi = len(self) if end_ms is None else int(np.searchsorted(self.timestamps, end_ms, "left"))
+        changes = self.changes[lo:hi] if self.changes is not None else None
+        return PriceSeries(self.symbol, self.timestamps[lo:hi], self.prices[lo:hi], changes)
+
+
+def _finalize(symbol: str, ts: np.ndarray, px: np.ndarray,
+              ch: Optional[np.ndarray] = None) -> PriceSeries:
+    """Sort by time and drop duplicate timestamps (last write wins)"""
+    if len(ts) and np.any(np.diff(ts) <= 0):
+        order = np.argsort(ts, kind="stable")
+        ts, px = ts[order], px[order]
+        ch = ch[order] if ch is not None else None
+        keep = np.append(ts[1:] != ts[:-1], True)
+        ts, px = ts[keep], px[keep]
+        ch = ch[keep] if ch is not None else None
+    return PriceSeries(symbol, ts, px, ch)
+
+
+def find_history_file(symbol: str, history_dir: Optional[Path] = None) -> Optional[Path]:
+    """Locate a symbol's 1m history file (upper- or lower-case naming)"""
+    history_dir = history_dir or get_history_dir()
+    for name in (f"{symbol.upper()}_1m.jsonl", f"{symbol.lower()}_1m.jsonl"):
+        path = history_dir / name
+        if path.exists():
+            return path
+    return None
+
+
+def list_history_symbols(history_dir: Optional[Path] = None) -> List[str]:
+    """Symbols with a 1m history file"""
+    history_dir = history_dir or get_history_dir()
+    if not history_dir.exists():
+        return []
+    return sorted({p.name[:-len("_1m.jsonl")].upper() for p in history_dir.glob("*_1m.jsonl")})
+
+
+def _parse_kline_lines(lines: Iterable[bytes]) -> tuple:
+    timestamps: List[int] = []
+    closes: List[float] = []
+    ts_append, px_append = timestamps.append, closes.append
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            row = _loads(line)
+        except ValueError:
+            continue
+        if isinstance(row, list):  # raw REST kline array
+            ts, close = row[0], row[4]
+        else:
+            ts = row.get("timestamp", row.get("t"))
+            close = row.get("close", row.get("c"))
+        if ts is None or close is None:
+            continue
+        ts_append(int(ts))
+        px_append(float(close))
+    return np.asarray(timestamps, dtype=np.int64), np.asarray(closes, dtype=np.float64)
+
+
+def load_klines(symbol: str, history_dir: Optional[Path] = None,
+                use_cache: bool = True) -> Optional[PriceSeries]:
+    """
+    Load a symbol's 1m close series from history.
+
+    Args:
+        symbol: Trading symbol
+        history_dir: History directory (defaults to shared_data/history)
+        use_cache: Read/write the parsed .npz cache
+
+    Returns:
+        PriceSeries or None if no history exists
+    """
+    path = find_history_file(symbol, history_dir)
+    if path is None:
+        return None
+
+    stat = path.stat()
+    cache_file = path.parent / CACHE_DIR_NAME / f"{path.stem}.npz"
+    if use_cache and cache_file.exists():
+        try:
+            with np.load(cache_file) as cached:
+                if (int(cached["version"]) == CACHE_VERSION
+                        and int(cached["size"]) == stat.st_size
+                        and int(cached["mtime_ns"]) == stat.st_mtime_ns):
+                    return PriceSeries(symbol.upper(), cached["timestamps"], cached["prices"])
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable kline cache {cache_file}: {e}")
+
+    with open(path, "rb") as f:
+        ts, px = _parse_kline_lines(f)
+    series = _finalize(symbol.upper(), ts, px)
+
+    if use_cache:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(".tmp.npz")
+            np.savez(tmp_file, timestamps=series.timestamps, prices=series.prices,
+                     version=CACHE_VERSION, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            tmp_file.replace(cache_file)
+        except OSError as e:
+            logger.debug(f"Failed to write kline cache {cache_file}: {e}")
+    return series
+
+
+def iter_ticker_events(events_file: Path) -> Iterator[Dict]:
+    """Stream ticker_update event payloads from a memory layer events file"""
+    with open(events_file, "rb") as f:
+        for line in f:
+            if b"ticker_update" not in line:
+                continue
+            try:
+                event = _loads(line)
+            except ValueError:
+                continue
+            if event.get("event_type") == "ticker_update":
+                data = event.get("data") or {}
+                if "timestamp" not in data and "timestamp" in event:
+                    data = dict(data, timestamp=event["timestamp"] * 1000)
+                yield data
+
+
+def load_ticker_events(symbols: Optional[Iterable[str]] = None,
+                       events_file: Optional[Path] = None) -> Dict[str, PriceSeries]:
+    """
+    Load recorded ticker updates from the memory layer.
+
+    Recorded `change` (24h percent) is kept when present so the replay
+    sees exactly what ARES saw live.
+
+    Returns:
+        Dict of symbol -> PriceSeries
+    """
+    events_file = events_file or get_data_dir() / "events.jsonl"
+    if not events_file.exists():
+        return {}
+    wanted = {s.upper() for s in symbols} if symbols else None
+
+    columns: Dict[str, tuple] = {}
+    for data in iter_ticker_events(events_file):
+        symbol = str(data.get("symbol", "")).upper()
+        if not symbol or (wanted is not None and symbol not in wanted):
+            continue
+        try:
+            ts = int(data["timestamp"])
+            price = float(data["price"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        change = data.get("change")
+        ts_list, px_list, ch_list = columns.setdefault(symbol, ([], [], []))
+        ts_list.append(ts)
+        px_list.append(price)
+        ch_list.append(float(change) if change is not None else np.nan)
+
+    result = {}
+    for symbol, (ts_list, px_list, ch_list) in columns.items():
+        changes = np.asarray(ch_list, dtype=np.float64)
+        result[symbol] = _finalize(
+            symbol,
+            np.asarray(ts_list, dtype=np.int64),
+            np.asarray(px_list, dtype=np.float64),
+            None if np.all(np.isnan(changes)) else changes,
+        )
+    return result
+
+
+def rolling_change_pct(series: PriceSeries, window_ms: int) -> np.ndarray:
+    """
+    Percent change versus the last price at least `window_ms` earlier.
+
+    Mirrors the 24h ticker change ARES consumes live. Bars without a full
+    window of history are NaN (no signal). Where the series carries a
+    recorded change, that value wins.
+    """
+    ts, px = series.timestamps, series.prices
+    change = np.full(len(ts), np.nan)
+    if len(ts):
+        # index of the last bar with timestamp <= ts - window
+        ref = np.searchsorted(ts, ts - window_ms, side="right") - 1
+        valid = ref >= 0
+        ref_px = px[np.where(valid, ref, 0)]
+        valid &= ref_px > 0
+        np.divide(px - ref_px, ref_px, out=change, where=valid)
+        change[valid] *= 100.0
+    if series.changes is not None:
+        recorded = ~np.isnan(series.changes)
+        change[recorded] = series.changes[recorded]
+    return change
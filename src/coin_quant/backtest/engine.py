@@ -0,0 +1,389 @@
+"""
+Backtest engine for Coin Quant R11
+
+Replays recorded prices through the same ARES strategy code that runs live
+(`coin_quant.ares.strategies`) and books fills with the PnLCalculator
+fee/slippage model.
+
+The engine is vectorized per symbol: signals, position state, fills and the
+mark-to-market equity curve are all computed with NumPy array passes, and
+only the resulting round-trip trades are materialized as Python objects.
+A year of 1m bars for 40 symbols (~21M bars) runs in well under a minute
+once the history is parsed.
+
+Execution model (spot, long-only - matches the trader's balance checks):
+
+- BUY while flat opens a position worth `size` x the symbol's allocation
+- SELL while long closes the whole position; repeats are ignored
+- Fills happen at the signal bar's price; each fill pays
+  `notional x (fee_bps + slippage_bps) / 10000`, as in PnLCalculator
+- A position still open at the end is marked to the last price
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from coin_quant.ares.strategies import SimpleMAParams, simple_ma_vectorized
+from coin_quant.backtest.data import (PriceSeries, list_history_symbols, load_klines,
+                                      load_ticker_events, rolling_change_pct)
+from coin_quant.shared.io import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+@dataclass(frozen=True)
+class CostModel:
+    """Per-fill fee and slippage in basis points of notional"""
+    fee_bps: float = 4.0        # PnLCalculator taker_fee_bps default
+    slippage_bps: float = 20.0  # PnLCalculator slippage_limit_bps default
+    maker_taker: str = "TAKER"
+    source: str = "defaults"
+
+    @property
+    def cost_rate(self) -> float:
+        return (self.fee_bps + self.slippage_bps) / 10000.0
+
+    @classmethod
+    def from_pnl_calculator(cls, maker_taker: str = "TAKER") -> "CostModel":
+        """
+        Take rates from the PnL single source of truth (config/policy.yaml).
+
+        Falls back to the calculator's own defaults when the legacy module
+        (or its yaml dependency) is not importable.
+        """
+        try:
+            from shared.pnl_calculator import get_pnl_config
+            config = get_pnl_config()
+        except Exception as e:
+            logger.debug(f"PnLCalculator unavailable, using default costs: {e}")
+            return cls(fee_bps=2.0 if maker_taker.upper() == "MAKER" else 4.0,
+                       maker_taker=maker_taker.upper())
+        fee_key = "maker_fee_bps" if maker_taker.upper() == "MAKER" else "taker_fee_bps"
+        return cls(
+            fee_bps=float(config[fee_key]),
+            slippage_bps=float(config["slippage_limit_bps"]),
+            maker_taker=maker_taker.upper(),
+            source=config.get("source_file", "PnLCalculator"),
+        )
+
+
+@dataclass
+class BacktestConfig:
+    """Backtest run settings"""
+    initial_capital: float = 10000.0
+    change_window_ms: int = DAY_MS  # window of the ticker change ARES reacts to
+    params: SimpleMAParams = field(default_factory=SimpleMAParams)
+    costs: CostModel = field(default_factory=CostModel)
+
+
+@dataclass
+class Trade:
+    """Round-trip trade"""
+    symbol: str
+    entry_ts: int
+    entry_price: float
+    exit_ts: int
+    exit_price: float
+    quantity: float
+    notional: float
+    gross_pnl: float
+    fee: float
+    slippage_cost: float
+    net_pnl: float
+    is_open: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class SymbolResult:
+    """Per-symbol backtest output"""
+    symbol: str
+    bars: int
+    trades: List[Trade]
+    timestamps: np.ndarray
+    pnl_increments: np.ndarray  # net PnL change per bar (mark-to-market)
+
+    @property
+    def net_pnl(self) -> float:
+        return float(self.pnl_increments.sum())
+
+
+@dataclass
+class BacktestResult:
+    """Portfolio backtest output"""
+    config: BacktestConfig
+    symbols: Dict[str, SymbolResult]
+    timestamps: np.ndarray
+    equity: np.ndarray
+    elapsed_sec: float = 0.0
+
+    @property
+    def trades(self) -> List[Trade]:
+        trades = [t for r in self.symbols.values() for t in r.trades]
+        trades.sort(key=lambda t: (t.entry_ts, t.symbol))
+        return trades
+
+    def max_drawdown(self) -> Dict[str, float]:
+        """Largest peak-to-trough equity decline (absolute and percent)"""
+        if len(self.equity) == 0:
+            return {"max_drawdown": 0.0, "max_drawdown_pct": 0.0}
+        peaks = np.maximum.accumulate(np.maximum(self.equity, self.config.initial_capital))
+        drawdown = peaks - self.equity
+        i = int(np.argmax(drawdown))
+        return {
+            "max_drawdown": float(drawdown[i]),
+            "max_drawdown_pct": float(drawdown[i] / peaks[i] * 100.0) if peaks[i] > 0 else 0.0,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        trades = self.trades
+        closed = [t for t in trades if not t.is_open]
+        net_pnl = float(self.equity[-1] - self.config.initial_capital) if len(self.equity) else 0.0
+        wins = sum(1 for t in closed if t.net_pnl > 0)
+        return {
+            "symbols": len(self.symbols),
+            "bars": int(sum(r.bars for r in self.symbols.values())),
+            "start_ts": int(self.timestamps[0]) if len(self.timestamps) else None,
+            "end_ts": int(self.timestamps[-1]) if len(self.timestamps) else None,
+            "initial_capital": self.config.initial_capital,
+            "final_equity": self.config.initial_capital + net_pnl,
+            "net_pnl": net_pnl,
+            "return_pct": net_pnl / self.config.initial_capital * 100.0,
+            **self.max_drawdown(),
+            "trades": len(trades),
+            "open_trades": len(trades) - len(closed),
+            "win_rate": wins / len(closed) if closed else 0.0,
+            "gross_pnl": float(sum(t.gross_pnl for t in trades)),
+            "fees": float(sum(t.fee for t in trades)),
+            "slippage_cost": float(sum(t.slippage_cost for t in trades)),
+            "elapsed_sec": round(self.elapsed_sec, 3),
+            "params": self.config.params.to_dict(),
+            "costs": asdict(self.config.costs),
+        }
+
+    def to_dict(self, include_trades: bool = True, equity_points: int = 1000) -> Dict[str, Any]:
+        """JSON-ready report; the equity curve is downsampled to `equity_points`"""
+        step = max(1, len(self.equity) // equity_points) if equity_points else 1
+        report = {
+            "summary": self.summary(),
+            "per_symbol": {
+                symbol: {"bars": r.bars, "trades": len(r.trades), "net_pnl": r.net_pnl}
+                for symbol, r in self.symbols.items()
+            },
+            "equity_curve": {
+                "timestamps": self.timestamps[::step].tolist(),
+                "equity": self.equity[::step].round(6).tolist(),
+            },
+        }
+        if include_trades:
+            report["trades"] = [t.to_dict() for t in self.trades]
+        return report
+
+    def save(self, path: Path, include_trades: bool = True) -> bool:
+        return atomic_write_json(path, self.to_dict(include_trades=include_trades))
+
+
+def _positions(side: np.ndarray) -> np.ndarray:
+    """Long/flat state per bar: the last non-zero signal decides"""
+    idx = np.where(side != 0, np.arange(len(side)), 0)
+    np.maximum.accumulate(idx, out=idx)
+    return side[idx] > 0  # bars before the first signal index side[0] == 0
+
+
+def run_symbol(series: PriceSeries, allocation: float, config: BacktestConfig,
+               change: Optional[np.ndarray] = None) -> SymbolResult:
+    """
+    Backtest one symbol with `allocation` capital.
+
+    `change` may be passed precomputed (aligned with the series) so sweeps
+    over strategy params do not redo the rolling window per run.
+    """
+    ts, px = series.timestamps, series.prices
+    n = len(ts)
+    if n == 0:
+        return SymbolResult(series.symbol, 0, [], ts, np.zeros(0))
+
+    if change is None:
+        change = rolling_change_pct(series, config.change_window_ms)
+    side, size, _ = simple_ma_vectorized(px, change, config.params)
+
+    long = _positions(side)
+    edges = np.diff(long.astype(np.int8), prepend=0)
+    entries = np.flatnonzero(edges == 1)
+    exits = np.flatnonzero(edges == -1)
+    open_at_end = len(exits) < len(entries)
+
+    entry_px = px[entries]
+    entry_notional = allocation * size[entries]
+    qty = entry_notional / entry_px
+    exit_idx = np.append(exits, n - 1) if open_at_end else exits
+    exit_px = px[exit_idx]
+    exit_notional = qty * exit_px
+
+    rate = config.costs.cost_rate
+    fee_rate = config.costs.fee_bps / 10000.0
+    slip_rate = config.costs.slippage_bps / 10000.0
+    # an open position has paid its entry costs only
+    exit_cost_notional = exit_notional.copy()
+    if open_at_end:
+        exit_cost_notional[-1] = 0.0
+
+    # Mark-to-market PnL per bar: held quantity x price move, minus fill costs
+    held = np.zeros(n)
+    np.add.at(held, entries, qty)
+    np.subtract.at(held, exits, qty[:len(exits)])
+    np.cumsum(held, out=held)
+    increments = np.zeros(n)
+    increments[1:] = held[:-1] * np.diff(px)
+    np.subtract.at(increments, entries, entry_notional * rate)
+    np.subtract.at(increments, exits, exit_cost_notional[:len(exits)] * rate)
+
+    gross = qty * (exit_px - entry_px)
+    fees = (entry_notional + exit_cost_notional) * fee_rate
+    slippage = (entry_notional + exit_cost_notional) * slip_rate
+    net = gross - fees - slippage
+
+    trades = [
+        Trade(
+            symbol=series.symbol,
+            entry_ts=int(ts[e]), entry_price=float(entry_px[i]),
+            exit_ts=int(ts[exit_idx[i]]), exit_price=float(exit_px[i]),
+            quantity=float(qty[i]), notional=float(entry_notional[i]),
+            gross_pnl=float(gross[i]), fee=float(fees[i]),
+            slippage_cost=float(slippage[i]), net_pnl=float(net[i]),
+            is_open=open_at_end and i == len(entries) - 1,
+        )
+        for i, e in enumerate(entries)
+    ]
+    return SymbolResult(series.symbol, n, trades, ts, increments)
+
+
+def run_backtest(series_map: Dict[str, PriceSeries],
+                 config: Optional[BacktestConfig] = None,
+                 changes: Optional[Dict[str, np.ndarray]] = None) -> BacktestResult:
+    """
+    Backtest a portfolio, splitting initial capital evenly across symbols.
+
+    Args:
+        series_map: Symbol -> price series
+        config: Backtest settings
+        changes: Optional precomputed change percent per symbol
+
+    Returns:
+        BacktestResult with trades, per-symbol results and the equity curve
+    """
+    config = config or BacktestConfig()
+    started = time.perf_counter()
+    series_map = {s: v for s, v in series_map.items() if len(v)}
+    allocation = config.initial_capital / max(1, len(series_map))
+
+    changes = changes or {}
+    results = {symbol: run_symbol(series, allocation, config, changes.get(symbol))
+               for symbol, series in sorted(series_map.items())}
+
+    # Portfolio equity on the union timeline
+    if results:
+        first = next(iter(results.values())).timestamps
+        if all(np.array_equal(r.timestamps, first) for r in results.values()):
+            # Aligned bars (the usual kline case) need no union/merge pass
+            timeline = first
+            portfolio = np.sum([r.pnl_increments for r in results.values()], axis=0)
+        else:
+            timeline = np.unique(np.concatenate([r.timestamps for r in results.values()]))
+            portfolio = np.zeros(len(timeline))
+            for r in results.values():
+                portfolio[np.searchsorted(timeline, r.timestamps)] += r.pnl_increments  # unique per symbol
+        equity = config.initial_capital + np.cumsum(portfolio)
+    else:
+        timeline = np.zeros(0, dtype=np.int64)
+        equity = np.zeros(0)
+
+    return BacktestResult(config, results, timeline, equity, time.perf_counter() - started)
+
+
+def load_series(symbols: Optional[List[str]] = None, source: str = "klines",
+                history_dir: Optional[Path] = None, events_file: Optional[Path] = None,
+                start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> Dict[str, PriceSeries]:
+    """Load replay data from kline history or memory layer ticker events"""
+    if source == "events":
+        series_map = load_ticker_events(symbols, events_file)
+    else:
+        symbols = symbols or list_history_symbols(history_dir)
+        series_map = {}
+        for symbol in symbols:
+            series = load_klines(symbol, history_dir)
+            if series is None:
+                logger.warning(f"No kline history for {symbol}")
+                continue
+            series_map[symbol.upper()] = series
+    if start_ms is not None or end_ms is not None:
+        series_map = {s: v.slice_time(start_ms, end_ms) for s, v in series_map.items()}
+    return series_map
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI: python -m coin_quant.backtest"""
+    parser = argparse.ArgumentParser(description="Replay recorded data through ARES strategies")
+    parser.add_argument("symbols", nargs="*", help="Symbols (default: all with history)")
+    parser.add_argument("--source", choices=("klines", "events"), default="klines")
+    parser.add_argument("--history-dir", type=Path, help="Kline history directory")
+    parser.add_argument("--events-file", type=Path, help="Memory layer events.jsonl")
+    parser.add_argument("--start-ms", type=int, help="Start timestamp (epoch ms)")
+    parser.add_argument("--end-ms", type=int, help="End timestamp (epoch ms, exclusive)")
+    parser.add_argument("--capital", type=float, default=10000.0)
+    parser.add_argument("--window-hours", type=float, default=24.0, help="Change window")
+    parser.add_argument("--params", help="Strategy params as JSON")
+    parser.add_argument("--fee-bps", type=float, help="Override fee (bps per fill)")
+    parser.add_argument("--slippage-bps", type=float, help="Override slippage (bps per fill)")
+    parser.add_argument("--maker", action="store_true", help="Use maker fee rate")
+    parser.add_argument("--output", type=Path, help="Write full JSON report here")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    costs = CostModel.from_pnl_calculator("MAKER" if args.maker else "TAKER")
+    if args.fee_bps is not None or args.slippage_bps is not None:
+        costs = CostModel(
+            fee_bps=costs.fee_bps if args.fee_bps is None else args.fee_bps,
+            slippage_bps=costs.slippage_bps if args.slippage_bps is None else args.slippage_bps,
+            maker_taker=costs.maker_taker, source="cli",
+        )
+    config = BacktestConfig(
+        initial_capital=args.capital,
+        change_window_ms=int(args.window_hours * 60 * 60 * 1000),
+        params=SimpleMAParams.from_dict(json.loads(args.params) if args.params else None),
+        costs=costs,
+    )
+
+    load_started = time.perf_counter()
+    series_map = load_series(args.symbols, args.source, args.history_dir, args.events_file,
+                             args.start_ms, args.end_ms)
+    if not series_map:
+        print("No data to replay", file=sys.stderr)
+        return 1
+    load_sec = time.perf_counter() - load_started
+
+    result = run_backtest(series_map, config)
+    summary = result.summary()
+    summary["load_sec"] = round(load_sec, 3)
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        result.save(args.output)
+        print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
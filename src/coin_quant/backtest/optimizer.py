@@ -0,0 +1,462 @@
+"""
+Parameter sweep and walk-forward optimizer for Coin Quant R11
+
+Evaluates a grid of ARES strategy parameters (change trigger, size scaling,
+confidence mapping) with the vectorized backtest engine:
+
+- Cells run across a ProcessPoolExecutor. Timestamps, prices and the
+  precomputed change series live in shared memory; workers attach to them
+  by name and build zero-copy views instead of unpickling arrays per task.
+- Walk-forward splits pick the best train-window params and score them on
+  the following test window.
+- Each (params, window) result is appended to a JSONL cache keyed by the
+  params, window, cost model and a fingerprint of the data. Re-runs only
+  compute new cells.
+
+CLI:
+    python -m coin_quant.backtest.optimizer BTCUSDT ETHUSDT \\
+        --grid '{"change_threshold_pct": [0.5, 1, 2], "size_divisor": [5, 10]}' \\
+        --train-days 30 --test-days 7 --workers 4
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from coin_quant.ares.strategies import SimpleMAParams
+from coin_quant.backtest.data import PriceSeries, rolling_change_pct
+from coin_quant.backtest.engine import BacktestConfig, CostModel, load_series, run_backtest
+from coin_quant.shared.io import atomic_write_json
+from coin_quant.shared.paths import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+# Metrics kept per cell (cache records and reports)
+RESULT_FIELDS = ("net_pnl", "return_pct", "max_drawdown", "max_drawdown_pct",
+                 "trades", "win_rate", "fees", "slippage_cost")
+
+
+def get_sweep_cache_path() -> Path:
+    """Get sweep result cache path."""
+    return get_data_dir() / "backtest" / "sweep_cache.jsonl"
+
+
+def expand_grid(grid: Dict[str, Iterable[float]],
+                base: Optional[SimpleMAParams] = None) -> List[SimpleMAParams]:
+    """
+    Cartesian product of parameter values over a base parameter set.
+
+    Raises:
+        ValueError: On names that are not SimpleMAParams fields
+    """
+    base = base or SimpleMAParams()
+    known = {f.name for f in fields(SimpleMAParams)}
+    unknown = set(grid) - known
+    if unknown:
+        raise ValueError(f"Unknown strategy params: {sorted(unknown)}")
+    names = sorted(grid)
+    values = [list(grid[name]) for name in names]
+    base_dict = base.to_dict()
+    return [SimpleMAParams.from_dict({**base_dict, **dict(zip(names, combo))})
+            for combo in itertools.product(*values)]
+
+
+@dataclass(frozen=True)
+class Window:
+    """Half-open time window [start_ms, end_ms)"""
+    start_ms: int
+    end_ms: int
+
+    def to_list(self) -> List[int]:
+        return [self.start_ms, self.end_ms]
+
+
+@dataclass(frozen=True)
+class WalkForwardSplit:
+    train: Window
+    test: Window
+
+
+def walk_forward_splits(start_ms: int, end_ms: int, train_ms: int, test_ms: int,
+                        step_ms: Optional[int] = None, anchored: bool = False) -> List[WalkForwardSplit]:
+    """
+    Consecutive train/test splits covering [start_ms, end_ms).
+
+    Args:
+        train_ms: Train window length
+        test_ms: Test window length (directly follows train)
+        step_ms: Advance between splits (defaults to test_ms)
+        anchored: Train windows all start at start_ms (expanding)
+    """
+    if train_ms <= 0 or test_ms <= 0:
+        raise ValueError("train and test windows must be positive")
+    step_ms = step_ms or test_ms
+    splits = []
+    train_start = start_ms
+    while train_start + train_ms + test_ms <= end_ms:
+        train_end = train_start + train_ms
+        splits.append(WalkForwardSplit(
+            Window(start_ms if anchored else train_start, train_end),
+            Window(train_end, train_end + test_ms),
+        ))
+        train_start += step_ms
+    return splits
+
+
+def data_fingerprint(series_map: Dict[str, PriceSeries]) -> str:
+    """Cheap identity of the replay data (symbols, extents and checksums)"""
+    digest = hashlib.sha1()
+    for symbol in sorted(series_map):
+        s = series_map[symbol]
+        digest.update(symbol.encode())
+        digest.update(np.int64(len(s)).tobytes())
+        if len(s):
+            digest.update(s.timestamps[[0, -1]].tobytes())
+            digest.update(np.float64(s.prices.sum()).tobytes())
+    return digest.hexdigest()[:16]
+
+
+class SharedPriceStore:
+    """
+    Read-only replay arrays in shared memory.
+
+    One block each for timestamps, prices and change percent; all symbols
+    are concatenated and located via an (offset, length) index that is the
+    only thing sent to workers.
+    """
+
+    ARRAYS = (("timestamps", np.int64), ("prices", np.float64), ("changes", np.float64))
+
+    def __init__(self, series_map: Dict[str, PriceSeries], changes: Dict[str, np.ndarray]):
+        symbols = sorted(series_map)
+        index, offset = {}, 0
+        for symbol in symbols:
+            index[symbol] = (offset, len(series_map[symbol]))
+            offset += len(series_map[symbol])
+        total = max(offset, 1)
+
+        self.blocks: Dict[str, shared_memory.SharedMemory] = {}
+        try:
+            for name, dtype in self.ARRAYS:
+                block = shared_memory.SharedMemory(create=True, size=total * np.dtype(dtype).itemsize)
+                self.blocks[name] = block
+                target = np.ndarray((total,), dtype=dtype, buffer=block.buf)
+                for symbol in symbols:
+                    start, length = index[symbol]
+                    source = changes[symbol] if name == "changes" else getattr(series_map[symbol], name)
+                    target[start:start + length] = source
+                del target
+        except Exception:
+            self.close()
+            raise
+
+        self.descriptor = {
+            "blocks": {name: block.name for name, block in self.blocks.items()},
+            "total": total,
+            "index": index,
+        }
+
+    @staticmethod
+    def attach(descriptor: Dict[str, Any]) -> Tuple[List[shared_memory.SharedMemory],
+                                                     Dict[str, PriceSeries], Dict[str, np.ndarray]]:
+        """Attach to a store from another process; returns (handles, series, changes)"""
+        handles, arrays = [], {}
+        for name, dtype in SharedPriceStore.ARRAYS:
+            block = shared_memory.SharedMemory(name=descriptor["blocks"][name])
+            handles.append(block)
+            arrays[name] = np.ndarray((descriptor["total"],), dtype=dtype, buffer=block.buf)
+            arrays[name].flags.writeable = False
+        series_map, changes = {}, {}
+        for symbol, (start, length) in descriptor["index"].items():
+            view = slice(start, start + length)
+            series_map[symbol] = PriceSeries(symbol, arrays["timestamps"][view], arrays["prices"][view])
+            changes[symbol] = arrays["changes"][view]
+        return handles, series_map, changes
+
+    def close(self) -> None:
+        for block in self.blocks.values():
+            try:
+                block.close()
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self.blocks = {}
+
+
+class ResultCache:
+    """Append-only JSONL cache of cell results"""
+
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+        self.records: Dict[str, Dict[str, Any]] = {}
+        if path is not None and path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        self.records[record["key"]] = record
+                    except (ValueError, KeyError):
+                        continue
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.records.get(key)
+
+    def put_many(self, records: List[Dict[str, Any]]) -> None:
+        for record in records:
+            self.records[record["key"]] = record
+        if self.path is None or not records:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+def _slice(series: PriceSeries, change: np.ndarray, window: Window) -> Tuple[PriceSeries, np.ndarray]:
+    lo = int(np.searchsorted(series.timestamps, window.start_ms, "left"))
+    hi = int(np.searchsorted(series.timestamps, window.end_ms, "left"))
+    return PriceSeries(series.symbol, series.timestamps[lo:hi], series.prices[lo:hi]), change[lo:hi]
+
+
+def evaluate_cell(series_map: Dict[str, PriceSeries], changes: Dict[str, np.ndarray],
+                  params: SimpleMAParams, window: Window, config: BacktestConfig) -> Dict[str, Any]:
+    """Backtest one (params, window) cell and return its metrics"""
+    sliced, sliced_changes = {}, {}
+    for symbol, series in series_map.items():
+        sliced[symbol], sliced_changes[symbol] = _slice(series, changes[symbol], window)
+    cell_config = BacktestConfig(config.initial_capital, config.change_window_ms, params, config.costs)
+    summary = run_backtest(sliced, cell_config, sliced_changes).summary()
+    metrics = {name: summary[name] for name in RESULT_FIELDS}
+    dd = metrics["max_drawdown_pct"]
+    metrics["calmar"] = metrics["return_pct"] / dd if dd > 0 else metrics["return_pct"]
+    return metrics
+
+
+# Worker process state (set once by the pool initializer)
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(descriptor: Dict[str, Any], config: BacktestConfig) -> None:
+    handles, series_map, changes = SharedPriceStore.attach(descriptor)
+    _worker.update(handles=handles, series_map=series_map, changes=changes, config=config)
+
+
+def _evaluate_task(task: Tuple[Dict[str, float], Tuple[int, int]]) -> Dict[str, Any]:
+    params, window = task
+    return evaluate_cell(_worker["series_map"], _worker["changes"],
+                         SimpleMAParams.from_dict(params), Window(*window), _worker["config"])
+
+
+class ParameterOptimizer:
+    """
+    Grid sweep / walk-forward runner over a fixed replay data set.
+
+    Use as a context manager (or call close()) so the worker pool and the
+    shared memory blocks are released.
+    """
+
+    def __init__(self, series_map: Dict[str, PriceSeries], config: Optional[BacktestConfig] = None,
+                 workers: Optional[int] = None, cache_path: Optional[Path] = None,
+                 use_cache: bool = True, objective: str = "return_pct"):
+        if objective not in RESULT_FIELDS + ("calmar",):
+            raise ValueError(f"Unknown objective: {objective}")
+        self.series_map = {s: v for s, v in series_map.items() if len(v)}
+        self.config = config or BacktestConfig()
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.objective = objective
+        self.cache = ResultCache((cache_path or get_sweep_cache_path()) if use_cache else None)
+        # The change series depends only on the data and window length, not on params
+        self.changes = {s: rolling_change_pct(v, self.config.change_window_ms)
+                        for s, v in self.series_map.items()}
+        self.fingerprint = data_fingerprint(self.series_map)
+        self.computed = 0
+        self.cache_hits = 0
+        self._store: Optional[SharedPriceStore] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ParameterOptimizer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+    def full_window(self) -> Window:
+        starts = [int(s.timestamps[0]) for s in self.series_map.values()]
+        ends = [int(s.timestamps[-1]) for s in self.series_map.values()]
+        return Window(min(starts), max(ends) + 1) if starts else Window(0, 0)
+
+    def cell_key(self, params: SimpleMAParams, window: Window) -> str:
+        payload = {
+            "params": params.to_dict(),
+            "window": window.to_list(),
+            "data": self.fingerprint,
+            "capital": self.config.initial_capital,
+            "change_window_ms": self.config.change_window_ms,
+            "costs": [self.config.costs.fee_bps, self.config.costs.slippage_bps],
+        }
+        return hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._store = SharedPriceStore(self.series_map, self.changes)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self._store.descriptor, self.config),
+            )
+        return self._pool
+
+    def evaluate(self, cells: List[Tuple[SimpleMAParams, Window]]) -> List[Dict[str, Any]]:
+        """Evaluate cells (cache first), returning records in input order"""
+        keys = [self.cell_key(params, window) for params, window in cells]
+        pending = {}
+        for key, cell in zip(keys, cells):
+            if self.cache.get(key) is None:
+                pending.setdefault(key, cell)
+        self.cache_hits += len(cells) - len(pending)
+
+        if pending:
+            tasks = [(params.to_dict(), (window.start_ms, window.end_ms))
+                     for params, window in pending.values()]
+            if self.workers <= 1:
+                metrics = [evaluate_cell(self.series_map, self.changes, params, window, self.config)
+                           for params, window in pending.values()]
+            else:
+                chunksize = max(1, len(tasks) // (self.workers * 4))
+                metrics = list(self._ensure_pool().map(_evaluate_task, tasks, chunksize=chunksize))
+            records = [
+                {"key": key, "params": task[0], "window": list(task[1]), **result}
+                for key, task, result in zip(pending, tasks, metrics)
+            ]
+            self.cache.put_many(records)
+            self.computed += len(records)
+
+        return [self.cache.get(key) for key in keys]
+
+    def sweep(self, grid: Dict[str, Iterable[float]], window: Optional[Window] = None) -> List[Dict[str, Any]]:
+        """Evaluate the whole grid on one window, best objective first"""
+        window = window or self.full_window()
+        results = self.evaluate([(params, window) for params in expand_grid(grid, self.config.params)])
+        return sorted(results, key=lambda r: r[self.objective], reverse=True)
+
+    def walk_forward(self, grid: Dict[str, Iterable[float]],
+                     splits: List[WalkForwardSplit]) -> Dict[str, Any]:
+        """
+        Optimize on each train window, then score the winner out of sample.
+
+        Returns:
+            Per-split winners with train/test metrics plus aggregate
+            out-of-sample results
+        """
+        grid_params = expand_grid(grid, self.config.params)
+        train_results = self.evaluate([(p, split.train) for split in splits for p in grid_params])
+
+        winners = []
+        for i, split in enumerate(splits):
+            chunk = train_results[i * len(grid_params):(i + 1) * len(grid_params)]
+            winners.append(max(chunk, key=lambda r: r[self.objective]))
+        test_results = self.evaluate([
+            (SimpleMAParams.from_dict(best["params"]), split.test)
+            for best, split in zip(winners, splits)
+        ])
+
+        rows = [
+            {
+                "train_window": split.train.to_list(),
+                "test_window": split.test.to_list(),
+                "params": best["params"],
+                "train_score": best[self.objective],
+                "test": {name: result[name] for name in RESULT_FIELDS + ("calmar",)},
+            }
+            for split, best, result in zip(splits, winners, test_results)
+        ]
+        return {
+            "objective": self.objective,
+            "grid_size": len(grid_params),
+            "splits": rows,
+            "oos_net_pnl": float(sum(r["net_pnl"] for r in test_results)),
+            "oos_return_pct": float(sum(r["return_pct"] for r in test_results)),
+            "oos_trades": int(sum(r["trades"] for r in test_results)),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {"computed": self.computed, "cache_hits": self.cache_hits, "workers": self.workers}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI: python -m coin_quant.backtest.optimizer"""
+    parser = argparse.ArgumentParser(description="Sweep ARES strategy params over recorded data")
+    parser.add_argument("symbols", nargs="*", help="Symbols (default: all with history)")
+    parser.add_argument("--grid", required=True, help='JSON, e.g. {"change_threshold_pct": [0.5, 1, 2]}')
+    parser.add_argument("--source", choices=("klines", "events"), default="klines")
+    parser.add_argument("--history-dir", type=Path)
+    parser.add_argument("--events-file", type=Path)
+    parser.add_argument("--capital", type=float, default=10000.0)
+    parser.add_argument("--train-days", type=float, help="Walk-forward train window (omit for a plain sweep)")
+    parser.add_argument("--test-days", type=float, default=7.0)
+    parser.add_argument("--step-days", type=float)
+    parser.add_argument("--anchored", action="store_true", help="Expanding train windows")
+    parser.add_argument("--objective", default="return_pct")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--top", type=int, default=10, help="Sweep rows to print")
+    parser.add_argument("--output", type=Path, help="Write full JSON report here")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    grid = json.loads(args.grid)
+    series_map = load_series(args.symbols, args.source, args.history_dir, args.events_file)
+    if not series_map:
+        print("No data to replay", file=sys.stderr)
+        return 1
+    config = BacktestConfig(initial_capital=args.capital, costs=CostModel.from_pnl_calculator())
+
+    started = time.perf_counter()
+    with ParameterOptimizer(series_map, config, workers=args.workers,
+                            use_cache=not args.no_cache, objective=args.objective) as optimizer:
+        if args.train_days:
+            window = optimizer.full_window()
+            splits = walk_forward_splits(
+                window.start_ms, window.end_ms, int(args.train_days * DAY_MS), int(args.test_days * DAY_MS),
+                int(args.step_days * DAY_MS) if args.step_days else None, args.anchored)
+            report = optimizer.walk_forward(grid, splits)
+            printed = {k: v for k, v in report.items() if k != "splits"}
+            printed["splits"] = len(report["splits"])
+        else:
+            rows = optimizer.sweep(grid)
+            report = {"objective": args.objective, "results": rows}
+            printed = {"objective": args.objective, "top": rows[:args.top]}
+        report["stats"] = printed["stats"] = {**optimizer.stats(),
+                                              "elapsed_sec": round(time.perf_counter() - started, 3)}
+
+    print(json.dumps(printed, indent=2))
+    if args.output:
+        atomic_write_json(args.output, report)
+        print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,8 +5,11 @@ Multi-symbol data ingestion with self-healing capabilities.
 Publishes health status and maintains data freshness.
 """
 
-from . import service
+from coin_quant.shared.lazy import lazy_submodules
 
 __all__ = [
     "service",
 ]
+
+# Submodules are imported on first access: importing the package stays cheap
+__getattr__, __dir__ = lazy_submodules(__name__, __all__)
@@ -0,0 +1,366 @@
+"""
+Local order books for the Coin Quant R11 feeder
+
+Per-symbol books maintained from `<symbol>@depth@100ms` diff streams,
+following the exchange's sync procedure: diffs are buffered until a REST
+depth snapshot arrives, diffs older than the snapshot are dropped, and a
+gap in update ids (`U != previous u + 1`) marks the book unsynced until
+the next snapshot.
+
+Each side is a pair of NumPy arrays (price, quantity) holding the best
+`capacity` levels in priority order. Consumers (ARES, the trader, PnL)
+read the exported top levels back as `BookLevels`; spread, imbalance and
+expected slippage for a notional are O(levels) on either.
+
+Snapshot fetches are paced by `RestWeightLimiter` (one request-weight budget
+for the whole feeder, held back by Retry-After) and `ResyncBackoff`
+(per-symbol exponential backoff between failed attempts).
+"""
+
+import random
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+
+DEPTH_STREAM_SUFFIX = "depth@100ms"
+
+# Book states for OrderBook.apply_diff
+APPLIED = "applied"
+BUFFERED = "buffered"
+STALE = "stale"
+GAP = "gap"
+
+
+def depth_stream(symbol: str) -> str:
+    """Diff depth stream name (BTCUSDT -> btcusdt@depth@100ms)"""
+    return f"{symbol.lower()}@{DEPTH_STREAM_SUFFIX}"
+
+
+def snapshot_weight(limit: int) -> int:
+    """Request weight of GET /api/v3/depth for `limit` levels"""
+    if limit <= 100:
+        return 5
+    if limit <= 500:
+        return 25
+    if limit <= 1000:
+        return 50
+    return 250
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """Retry-After of a 429/418 response in seconds, if present and numeric"""
+    try:
+        value = float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
+
+
+class RestWeightLimiter:
+    """
+    Token bucket of REST request weight per minute, shared by every fetch.
+
+    reserve() takes the weight immediately and returns how long the caller
+    has to wait before sending; pause() holds all callers until a server
+    Retry-After has passed.
+    """
+
+    def __init__(self, weight_per_minute: float = 1200, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(weight_per_minute)
+        self.rate = self.capacity / 60.0
+        self.clock = clock
+        self.tokens = self.capacity
+        self.paused_until = 0.0
+        self._last = clock()
+
+    def reserve(self, weight: float) -> float:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+        self.tokens -= weight
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.paused_until - now)
+
+    def pause(self, seconds: float):
+        self.paused_until = max(self.paused_until, self.clock() + seconds)
+
+
+class ResyncBackoff:
+    """Per-symbol delay between failed snapshot resyncs (doubling, capped, jittered)"""
+
+    def __init__(self, base: float = 1.0, maximum: float = 60.0, jitter: float = 0.2,
+                 rng: Callable[[], float] = random.random):
+        self.base = base
+        self.maximum = maximum
+        self.jitter = jitter
+        self.rng = rng
+        self.failures: Dict[str, int] = {}
+
+    def next_delay(self, symbol: str, retry_after: Optional[float] = None) -> float:
+        """Record a failure; the wait before the next attempt (at least `retry_after`)"""
+        failures = self.failures.get(symbol, 0)
+        self.failures[symbol] = failures + 1
+        delay = min(self.maximum, self.base * 2 ** failures) * (1.0 + self.jitter * self.rng())
+        return max(delay, retry_after or 0.0)
+
+    def reset(self, symbol: str):
+        self.failures.pop(symbol, None)
+
+
+def _levels(rows: Sequence[Sequence[Any]]) -> np.ndarray:
+    """[[price, qty], ...] (strings or numbers) -> (2, n) float array"""
+    if not rows:
+        return np.empty((2, 0))
+    return np.asarray(rows, dtype=float).reshape(-1, 2).T
+
+
+class BookLevels:
+    """Price levels of both sides with O(levels) execution estimates"""
+
+    def __init__(self, symbol: str, capacity: int = 100):
+        self.symbol = symbol
+        self.capacity = max(1, int(capacity))
+        # row 0: price, row 1: quantity; bids descending, asks ascending
+        self.bids = np.zeros((2, self.capacity))
+        self.asks = np.zeros((2, self.capacity))
+        self.n_bids = 0
+        self.n_asks = 0
+        self.last_update_id = 0
+        self.updated_at = 0.0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BookLevels":
+        """Rebuild an exported book (see OrderBook.to_dict)"""
+        bids, asks = _levels(data.get("bids", [])), _levels(data.get("asks", []))
+        book = cls(data.get("symbol", ""), max(bids.shape[1], asks.shape[1], 1))
+        book.n_bids, book.n_asks = bids.shape[1], asks.shape[1]
+        book.bids[:, :book.n_bids] = bids
+        book.asks[:, :book.n_asks] = asks
+        book.last_update_id = int(data.get("last_update_id", 0))
+        book.updated_at = float(data.get("updated_at", 0.0))
+        return book
+
+    @property
+    def best_bid(self) -> Optional[float]:
+        return float(self.bids[0, 0]) if self.n_bids else None
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        return float(self.asks[0, 0]) if self.n_asks else None
+
+    def mid(self) -> Optional[float]:
+        if not (self.n_bids and self.n_asks):
+            return None
+        return float(self.bids[0, 0] + self.asks[0, 0]) / 2.0
+
+    def spread_bps(self) -> Optional[float]:
+        mid = self.mid()
+        if not mid:
+            return None
+        return float(self.asks[0, 0] - self.bids[0, 0]) / mid * 1e4
+
+    def imbalance(self, levels: int = 10) -> Optional[float]:
+        """(bid qty - ask qty) / (bid qty + ask qty) over the top `levels`, in [-1, 1]"""
+        bid_qty = float(self.bids[1, :min(levels, self.n_bids)].sum())
+        ask_qty = float(self.asks[1, :min(levels, self.n_asks)].sum())
+        total = bid_qty + ask_qty
+        return (bid_qty - ask_qty) / total if total > 0 else None
+
+    def expected_slippage_bps(self, notional: float, side: str) -> Optional[float]:
+        """
+        Cost of a market order of `notional` (quote currency) walking the book.
+
+        Args:
+            notional: Order size in quote currency
+            side: "BUY" consumes asks, "SELL" consumes bids
+
+        Returns:
+            Distance of the fill VWAP from mid in bps (includes the half
+            spread), or None if the known depth cannot fill the order
+        """
+        mid = self.mid()
+        if not mid or notional <= 0:
+            return None
+        levels, n = (self.asks, self.n_asks) if side.upper() == "BUY" else (self.bids, self.n_bids)
+        price, qty = levels[0, :n], levels[1, :n]
+        cumulative = np.cumsum(price * qty)
+        k = int(np.searchsorted(cumulative, notional))
+        if k >= n:
+            return None
+        filled_before = float(cumulative[k - 1]) if k else 0.0
+        base_qty = float(qty[:k].sum()) + (notional - filled_before) / float(price[k])
+        vwap = notional / base_qty
+        return abs(vwap - mid) / mid * 1e4
+
+    def depth_notional(self, side: str, levels: int = 10) -> float:
+        book, n = (self.asks, self.n_asks) if side.upper() == "BUY" else (self.bids, self.n_bids)
+        k = min(levels, n)
+        return float(np.dot(book[0, :k], book[1, :k]))
+
+    def execution_estimate(self, notional: float, side: str, levels: int = 10) -> Dict[str, Any]:
+        """Market conditions for an order: spread, imbalance and walk-the-book slippage"""
+        return {
+            "mid": self.mid(),
+            "spread_bps": self.spread_bps(),
+            "imbalance": self.imbalance(levels),
+            "expected_slippage_bps": self.expected_slippage_bps(notional, side),
+            "notional": notional,
+            "book_updated_at": self.updated_at,
+        }
+
+    def to_dict(self, depth: int = 20) -> Dict[str, Any]:
+        """Top `depth` levels plus summary metrics, for the feeder snapshot"""
+        return {
+            "symbol": self.symbol,
+            "bids": self.bids[:, :min(depth, self.n_bids)].T.tolist(),
+            "asks": self.asks[:, :min(depth, self.n_asks)].T.tolist(),
+            "mid": self.mid(),
+            "spread_bps": self.spread_bps(),
+            "imbalance": self.imbalance(depth),
+            "last_update_id": self.last_update_id,
+            "updated_at": self.updated_at,
+        }
+
+
+class OrderBook(BookLevels):
+    """Local book kept in sync with diff depth events"""
+
+    def __init__(self, symbol: str, capacity: int = 100, max_buffer: int = 1000):
+        super().__init__(symbol, capacity)
+        self.synced = False
+        self.buffer: deque = deque(maxlen=max_buffer)
+        self.gaps = 0
+        self.snapshots = 0
+
+    def _merge(self, book: np.ndarray, n: int, updates: np.ndarray, descending: bool) -> int:
+        """Apply level updates (qty 0 deletes) to one side; returns the new level count"""
+        if updates.shape[1] == 0:
+            return n
+        current = book[:, :n]
+        keep = ~np.isin(current[0], updates[0])
+        added = updates[:, updates[1] > 0]
+        merged = np.concatenate((current[:, keep], added), axis=1)
+        order = np.argsort(-merged[0] if descending else merged[0], kind="stable")[: self.capacity]
+        m = order.shape[0]
+        book[:, :m] = merged[:, order]
+        return m
+
+    def _apply(self, event: Dict[str, Any]):
+        self.n_bids = self._merge(self.bids, self.n_bids, _levels(event.get("b", [])), True)
+        self.n_asks = self._merge(self.asks, self.n_asks, _levels(event.get("a", [])), False)
+        self.last_update_id = int(event["u"])
+        self.updated_at = time.time()
+
+    def load_snapshot(self, snapshot: Dict[str, Any]) -> bool:
+        """
+        Reset from a REST depth snapshot and replay buffered diffs.
+
+        Returns:
+            True if the book is synced; False if the snapshot is older than
+            the buffered diffs (fetch another one)
+        """
+        last_update_id = int(snapshot["lastUpdateId"])
+        if self.buffer and int(self.buffer[0]["U"]) > last_update_id + 1:
+            return False
+        bids, asks = _levels(snapshot.get("bids", [])), _levels(snapshot.get("asks", []))
+        self.n_bids = self._merge(self.bids, 0, bids, True)
+        self.n_asks = self._merge(self.asks, 0, asks, False)
+        self.last_update_id = last_update_id
+        self.updated_at = time.time()
+        self.snapshots += 1
+
+        pending = [e for e in self.buffer if int(e["u"]) > last_update_id]
+        self.buffer.clear()
+        self.synced = True
+        for event in pending:
+            if self.apply_diff(event) == GAP:
+                return False
+        return True
+
+    def apply_diff(self, event: Dict[str, Any]) -> str:
+        """
+        Apply one depthUpdate event.
+
+        Returns:
+            APPLIED, BUFFERED (waiting for a snapshot), STALE (already
+            covered) or GAP (update ids skipped: a snapshot is needed)
+        """
+        if not self.synced:
+            self.buffer.append(event)
+            return BUFFERED
+        first_id, final_id = int(event["U"]), int(event["u"])
+        if final_id <= self.last_update_id:
+            return STALE
+        if first_id > self.last_update_id + 1:
+            self.synced = False
+            self.gaps += 1
+            self.buffer.clear()
+            self.buffer.append(event)
+            return GAP
+        self._apply(event)
+        return APPLIED
+
+
+class OrderBookManager:
+    """Books of the feeder universe"""
+
+    def __init__(self, capacity: int = 100, depth: int = 20):
+        self.capacity = capacity
+        self.depth = depth
+        self.books: Dict[str, OrderBook] = {}
+
+    def get(self, symbol: str) -> OrderBook:
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = OrderBook(symbol, self.capacity)
+        return book
+
+    def on_diff(self, event: Dict[str, Any]) -> Optional[str]:
+        """
+        Route a depthUpdate event.
+
+        Returns:
+            The symbol if its book needs a snapshot, else None
+        """
+        symbol = event.get("s")
+        if not symbol:
+            return None
+        book = self.get(symbol)
+        state = book.apply_diff(event)
+        return symbol if state in (BUFFERED, GAP) else None
+
+    def on_snapshot(self, symbol: str, snapshot: Dict[str, Any]) -> bool:
+        return self.get(symbol).load_snapshot(snapshot)
+
+    def reset(self):
+        """Drop all books (e.g. after a reconnect: diffs were missed)"""
+        self.books.clear()
+
+    def remove(self, symbols: Iterable[str]):
+        for symbol in symbols:
+            self.books.pop(symbol, None)
+
+    def export(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Exported top levels of a synced book, else None"""
+        book = self.books.get(symbol)
+        if book is None or not book.synced:
+            return None
+        return book.to_dict(self.depth)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "books": len(self.books),
+            "synced": sum(1 for b in self.books.values() if b.synced),
+            "gaps": sum(b.gaps for b in self.books.values()),
+            "snapshots": sum(b.snapshots for b in self.books.values()),
+        }
+
+
+def book_from_symbol_data(entry: Optional[Dict[str, Any]]) -> Optional[BookLevels]:
+    """Book of one feeder snapshot `symbol_data` entry, if the feeder exported one"""
+    if not entry or not entry.get("book"):
+        return None
+    return BookLevels.from_dict(entry["book"])
+
@@ -10,16 +10,29 @@ import signal
 import sys
 import json
 import asyncio
-import websockets
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+from coin_quant.shared.lazy import lazy_import
 from coin_quant.shared.logging import get_service_logger
 from coin_quant.shared.health import health_manager
 from coin_quant.shared.config import config_manager
 from coin_quant.shared.singleton import create_singleton_guard
-from coin_quant.shared.paths import get_data_dir
+from coin_quant.shared.paths import get_data_dir, get_universe_cache_path
 from coin_quant.shared.time import utc_now_seconds, age_seconds
-from coin_quant.shared.io import atomic_write_json
+from coin_quant.shared.io import atomic_write_json, safe_read_json
+from coin_quant.shared.codec import write_payload
+from coin_quant.shared.price_board import PriceBoardWriter, board_name
+from coin_quant.shared.profiling import ServiceProfiler
+from coin_quant.shared.tracing import Tracer, new_trace
 from coin_quant.memory.client import MemoryClient
+from coin_quant.feeder.universe import (ALL_MARKET_TICKER_STREAM, UniverseChange, UniverseRanker,
+                                        subscription_messages, ticker_stream)
+from coin_quant.feeder.orderbook import (DEPTH_STREAM_SUFFIX, OrderBookManager, ResyncBackoff,
+                                         RestWeightLimiter, depth_stream, retry_after_seconds,
+                                         snapshot_weight)
+
+# Imported when the service connects, not when the module is imported
+requests = lazy_import("requests")
+websockets = lazy_import("websockets")
 
 
 class FeederService:
@@ -39,20 +52,71 @@ class FeederService:
         self.freshness_threshold = config_manager.get_float("FEEDER_FRESHNESS_THRESHOLD", 30.0)
         self.heartbeat_interval = config_manager.get_float("FEEDER_HEARTBEAT_INTERVAL", 5.0)
         self.use_testnet = config_manager.get_bool("BINANCE_USE_TESTNET", True)
+        # Opt-in: the ranked universe subscribes FEEDER_TOP_N symbols plus the
+        # all-market ticker stream instead of the configured/default symbols
+        self.dynamic_universe = config_manager.get_bool("FEEDER_DYNAMIC_UNIVERSE", False)
         
-        # WebSocket configuration
+        # WebSocket configuration (combined streams endpoint: {ws_url}/stream?streams=...)
         if self.use_testnet:
             self.ws_url = "wss://testnet.binance.vision"
             self.rest_url = "https://testnet.binance.vision"
         else:
-            self.ws_url = "wss://stream.binance.com:9443/ws"
+            self.ws_url = "wss://stream.binance.com:9443"
             self.rest_url = "https://api.binance.com"
         
+        # Universe ranked from the all-market ticker stream; rotations are
+        # applied with SUBSCRIBE/UNSUBSCRIBE on the live connection
+        self.universe = UniverseRanker(
+            top_n=self.config.get("top_n", 40),
+            quote=self.config.get("quote", "USDT"),
+            pinned=self.config.get("symbols") or [],
+            min_quote_volume=config_manager.get_float("FEEDER_UNIVERSE_MIN_QUOTE_VOLUME", 1_000_000.0),
+            hysteresis=config_manager.get_float("FEEDER_UNIVERSE_HYSTERESIS", 0.2),
+            rank_interval=config_manager.get_float("FEEDER_UNIVERSE_RANK_SEC", 60.0),
+        )
+        self._symbol_set = set()
+        self._request_id = 0
+        self._pending_requests: Dict[int, Dict[str, Any]] = {}
+        self.universe_cache_file = get_universe_cache_path()
+        self.watchlist_file = get_data_dir() / "coin_watchlist.json"
+        
+        # Local order books from diff depth streams (top levels exported in
+        # the snapshot for ARES and the trader)
+        self.order_books_enabled = config_manager.get_bool("FEEDER_ORDER_BOOKS", True)
+        self.books = OrderBookManager(
+            capacity=config_manager.get_int("FEEDER_BOOK_SNAPSHOT_LEVELS", 100),
+            depth=config_manager.get_int("FEEDER_BOOK_DEPTH", 20),
+        )
+        self.stream_builders = (ticker_stream, depth_stream) if self.order_books_enabled else (ticker_stream,)
+        self._book_resyncs = set()
+        # Snapshot fetches: one weight budget for the feeder's IP, backoff per symbol
+        self.rest_limiter = RestWeightLimiter(config_manager.get_float("FEEDER_REST_WEIGHT_PER_MIN", 1200.0))
+        self.book_backoff = ResyncBackoff(
+            base=config_manager.get_float("FEEDER_BOOK_RESYNC_BASE_SEC", 1.0),
+            maximum=config_manager.get_float("FEEDER_BOOK_RESYNC_MAX_SEC", 60.0),
+        )
+        
         # Data storage
         self.data_dir = get_data_dir()
         self.snapshot_file = self.data_dir / "feeder_snapshot.json"
+        # Ticks of all symbols coalesce into at most one snapshot (and its
+        # exported books) per interval instead of one per tick
+        self.snapshot_min_interval = config_manager.get_float("FEEDER_SNAPSHOT_MIN_INTERVAL_SEC", 0.25)
+        self._snapshot_written = 0.0
+        self._snapshot_pending = False
+        self.ipc_encoding = config_manager.get("IPC_ENCODING", "json")
         self.symbol_data = {}
         self.memory_client = MemoryClient(self.data_dir)
+        self.tracer = Tracer("feeder")
+        self.profiler = ServiceProfiler("feeder")
+        
+        # Latest tick per symbol in shared memory for same-host readers
+        self.price_board_enabled = config_manager.get_bool("PRICE_BOARD_ENABLED", True)
+        self.price_board: Optional[PriceBoardWriter] = None
+        
+        # Legacy shared_data views (health.json, databus, prices_{SYMBOL}.json)
+        self._egress_writer = None
+        self._egress_writer_failed = False
         
         # Signal handlers
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -91,6 +155,7 @@ class FeederService:
             
             # Initialize symbols
             self._initialize_symbols()
+            self._open_price_board()
             
             # Start main loop
             self.running = True
@@ -102,6 +167,9 @@ class FeederService:
             self.logger.error(f"Failed to start feeder service: {e}")
             return False
         finally:
+            if self.price_board is not None:
+                self.price_board.close()
+                self.price_board = None
             self.singleton_guard.release()
     
     def stop(self):
@@ -109,28 +177,52 @@ class FeederService:
         self.logger.info("Stopping feeder service...")
         self.running = False
         self.ws_connected = False
+        self.profiler.stop()
         
         # Update health status
-        health_manager.set_component_status("feeder", "RED", {
-            "last_update_ts": utc_now_seconds(),
-            "updated_within_sec": 0,
-            "symbols_count": 0,
-            "ws_connected": False,
-            "rest_api_ok": False,
-            "status": "stopped"
-        })
+        health_manager.set_feeder_health(
+            "RED", [],
+            symbols_count=0,
+            ws_connected=False,
+            rest_api_ok=False,
+            state="stopped",
+        )
     
     def _initialize_symbols(self):
         """Initialize symbol list"""
         # Default symbols for testing
         default_symbols = ["BTCUSDT", "ETHUSDT", "ADAUSDT", "SOLUSDT", "XRPUSDT"]
         
-        # Load from configuration if available
-        universe_top_n = self.config.get("top_n", 5)
-        self.symbols = default_symbols[:universe_top_n]
+        # Configured symbols, else the universe of the previous run; the
+        # ranker takes over once the all-market stream delivers
+        configured = self.config.get("symbols") or []
+        cached = (safe_read_json(self.universe_cache_file) or {}) if self.dynamic_universe else {}
+        seed = configured or cached.get("symbols") or default_symbols
+        
+        if self.dynamic_universe:
+            self.universe.seed(seed)
+            self.symbols = list(self.universe.symbols)
+        else:
+            universe_top_n = self.config.get("top_n", 5)
+            self.symbols = seed[:universe_top_n]
+        self._symbol_set = set(self.symbols)
         
         self.logger.info(f"Initialized {len(self.symbols)} symbols: {self.symbols}")
     
+    def _open_price_board(self):
+        """Create the shared-memory price board (readers fall back to files without it)"""
+        if not self.price_board_enabled:
+            return
+        try:
+            self.price_board = PriceBoardWriter(
+                board_name(),
+                config_manager.get_int("PRICE_BOARD_CAPACITY", 256),
+            )
+            self.logger.info(f"Price board: {self.price_board.name} ({self.price_board.capacity} slots)")
+        except Exception as e:
+            self.price_board = None
+            self.logger.warning(f"Price board unavailable, files only: {e}")
+    
     def _main_loop(self):
         """Main service loop with WebSocket connection"""
         self.logger.info("Feeder service main loop started")
@@ -150,9 +242,15 @@ class FeederService:
         
         while self.running and retry_count < max_retries:
             try:
-                # Build WebSocket URL for single symbol (test with BTCUSDT first)
-                symbol = self.symbols[0].lower() if self.symbols else "btcusdt"
-                ws_url = f"{self.ws_url}/stream?streams={symbol}@ticker"
+                # Combined stream for the current universe (reconnects resume
+                # with the latest rotation) plus the all-market ticker array
+                streams = [stream(s) for s in self.symbols for stream in self.stream_builders]
+                if self.dynamic_universe:
+                    streams.append(ALL_MARKET_TICKER_STREAM)
+                ws_url = f"{self.ws_url}/stream?streams={'/'.join(streams)}"
+                self._pending_requests.clear()
+                # diffs missed while disconnected: every book resyncs
+                self.books.reset()
                 
                 self.logger.info(f"Connecting to WebSocket: {ws_url}")
                 
@@ -169,12 +267,13 @@ class FeederService:
                     try:
                         # Process messages
                         async for message in websocket:
+                            received_ns = time.monotonic_ns()
                             if not self.running:
                                 break
                             
                             try:
                                 data = json.loads(message)
-                                await self._process_ticker_data(data)
+                                await self._process_message(websocket, data, received_ns)
                             except json.JSONDecodeError as e:
                                 self.logger.error(f"Failed to parse WebSocket message: {e}")
                             except Exception as e:
@@ -214,7 +313,176 @@ class FeederService:
                 self.logger.error(f"Health update error: {e}")
                 await asyncio.sleep(5.0)
     
-    async def _process_ticker_data(self, data: Dict[str, Any]):
+    async def _process_message(self, websocket, data: Dict[str, Any], received_ns: Optional[int] = None):
+        """Route a WebSocket message: stream data or a SUBSCRIBE/UNSUBSCRIBE response"""
+        if 'id' in data and 'stream' not in data:
+            self._handle_request_response(data)
+        elif data.get('stream') == ALL_MARKET_TICKER_STREAM:
+            await self._process_market_tickers(websocket, data.get('data') or [])
+        elif data.get('stream', '').endswith(DEPTH_STREAM_SUFFIX):
+            self._process_depth_diff(data.get('data') or {})
+        else:
+            await self._process_ticker_data(data, received_ns)
+    
+    async def _process_market_tickers(self, websocket, tickers):
+        """Feed the all-market ticker array to the ranker and apply any rotation"""
+        self.universe.update(tickers)
+        change = self.universe.maybe_rotate()
+        if change is not None:
+            await self._apply_universe_change(websocket, change)
+    
+    async def _apply_universe_change(self, websocket, change: UniverseChange):
+        """Swap stream subscriptions on the live connection"""
+        messages = subscription_messages(change, self._request_id + 1, self.stream_builders)
+        for message in messages:
+            self._request_id = message['id']
+            self._pending_requests[message['id']] = message
+            await websocket.send(json.dumps(message))
+        
+        self.symbols = list(change.symbols)
+        self._symbol_set = set(self.symbols)
+        for symbol in change.removed:
+            self.symbol_data.pop(symbol, None)
+        self.books.remove(change.removed)
+        for symbol in change.removed:
+            self.book_backoff.reset(symbol)
+        if self.price_board is not None:
+            self.price_board.remove(change.removed)
+        self._save_snapshot()
+        self._save_universe(change)
+        
+        self.memory_client.append_event('universe_change', change.to_dict(), source='feeder')
+        self.logger.info(f"Universe rotated: +{change.added} -{change.removed} ({len(self.symbols)} symbols)")
+    
+    def _process_depth_diff(self, event: Dict[str, Any]):
+        """Apply a depth diff; schedule a snapshot resync if the book is not in sync"""
+        symbol = event.get('s')
+        if symbol not in self._symbol_set:
+            return
+        if self.books.on_diff(event) and symbol not in self._book_resyncs:
+            self._book_resyncs.add(symbol)
+            asyncio.create_task(self._resync_book(symbol))
+    
+    async def _resync_book(self, symbol: str):
+        """
+        Load a REST depth snapshot into the book (diffs buffer meanwhile).
+        
+        Retries until the book syncs or the symbol leaves the universe:
+        failures back off per symbol (FEEDER_BOOK_RESYNC_BASE_SEC doubling up
+        to FEEDER_BOOK_RESYNC_MAX_SEC, or the server's Retry-After), and every
+        fetch draws on the shared REST weight budget.
+        """
+        loop = asyncio.get_running_loop()
+        weight = snapshot_weight(self.books.capacity)
+        try:
+            while self.running and symbol in self._symbol_set:
+                await asyncio.sleep(self.rest_limiter.reserve(weight))
+                snapshot, retry_after = await loop.run_in_executor(None, self._fetch_depth_snapshot, symbol)
+                if symbol not in self._symbol_set:
+                    return
+                if snapshot and self.books.on_snapshot(symbol, snapshot):
+                    self.book_backoff.reset(symbol)
+                    self.logger.debug(f"Order book synced: {symbol} @ {snapshot['lastUpdateId']}")
+                    return
+                if retry_after:
+                    self.rest_limiter.pause(retry_after)
+                delay = self.book_backoff.next_delay(symbol, retry_after)
+                if snapshot is None:
+                    self.logger.warning(f"Order book resync failed for {symbol}, retrying in {delay:.1f}s")
+                else:
+                    self.logger.debug(f"Snapshot for {symbol} predates buffered diffs, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+        finally:
+            self._book_resyncs.discard(symbol)
+    
+    def _fetch_depth_snapshot(self, symbol: str) -> Tuple[Optional[Dict[str, Any]], Optional[float]]:
+        """REST depth snapshot; (snapshot or None, Retry-After seconds of a 429/418)"""
+        try:
+            response = requests.get(f"{self.rest_url}/api/v3/depth",
+                                    params={"symbol": symbol, "limit": self.books.capacity},
+                                    timeout=5)
+            self.rest_api_ok = response.status_code == 200
+            if response.status_code in (418, 429):
+                retry_after = retry_after_seconds(response.headers)
+                self.logger.error(f"Depth snapshot rate limited for {symbol}: {response.status_code}, Retry-After {retry_after}")
+                return None, retry_after
+            if response.status_code != 200:
+                self.logger.error(f"Depth snapshot failed for {symbol}: {response.status_code}")
+                return None, None
+            return response.json(), None
+        except Exception as e:
+            self.rest_api_ok = False
+            self.logger.error(f"Depth snapshot failed for {symbol}: {e}")
+            return None, None
+    
+    def _handle_request_response(self, data: Dict[str, Any]):
+        """Match a SUBSCRIBE/UNSUBSCRIBE response to its request"""
+        request = self._pending_requests.pop(data.get('id'), None)
+        if 'error' in data:
+            self.logger.error(f"Stream request {request or data.get('id')} failed: {data['error']}")
+            if request is not None:
+                self._rollback_request(request)
+        elif request is not None:
+            self.logger.debug(f"{request['method']} acknowledged: {len(request['params'])} streams")
+    
+    def _rollback_request(self, request: Dict[str, Any]):
+        """
+        Undo the local side of a rejected SUBSCRIBE/UNSUBSCRIBE.
+        
+        _apply_universe_change updates the universe when it sends the
+        requests, but the connection keeps its old streams on an error:
+        symbols that failed to subscribe leave the universe again (a later
+        rotation retries them), symbols that failed to unsubscribe return
+        to it (they are still streaming).
+        """
+        symbols = list(dict.fromkeys(param.split('@', 1)[0].upper() for param in request.get('params', ())))
+        if request.get('method') == 'SUBSCRIBE':
+            added, removed = [], [s for s in symbols if s in self._symbol_set]
+            self.symbols = [s for s in self.symbols if s not in removed]
+        else:
+            added, removed = [s for s in symbols if s not in self._symbol_set], []
+            self.symbols = self.symbols + added
+        if not added and not removed:
+            return
+        
+        self._symbol_set = set(self.symbols)
+        self.universe.symbols = list(self.symbols)
+        for symbol in removed:
+            self.symbol_data.pop(symbol, None)
+            self.book_backoff.reset(symbol)
+        self.books.remove(removed)
+        if self.price_board is not None:
+            self.price_board.remove(removed)
+        change = UniverseChange(added, removed, list(self.symbols))
+        self._save_snapshot()
+        self._save_universe(change)
+        
+        self.memory_client.append_event('universe_rollback', {**change.to_dict(), 'method': request.get('method')},
+                                        source='feeder')
+        self.logger.warning(f"{request.get('method')} rejected, universe rolled back: "
+                            f"+{added} -{removed} ({len(self.symbols)} symbols)")
+    
+    def _save_universe(self, change: UniverseChange):
+        """Export the universe in the REST universe manager's formats"""
+        try:
+            atomic_write_json(self.universe_cache_file, {
+                "timestamp": change.timestamp,
+                "symbols": change.symbols,
+                "source": ALL_MARKET_TICKER_STREAM,
+                "added": change.added,
+                "removed": change.removed,
+                "config": {
+                    "top_n": self.universe.top_n,
+                    "quote": self.universe.quote,
+                    "min_volume": self.universe.min_quote_volume,
+                    "hysteresis": self.universe.hysteresis,
+                },
+            })
+            atomic_write_json(self.watchlist_file, [s.lower() for s in change.symbols])
+        except Exception as e:
+            self.logger.error(f"Failed to save universe: {e}")
+    
+    async def _process_ticker_data(self, data: Dict[str, Any], received_ns: Optional[int] = None):
         """Process ticker data from WebSocket"""
         try:
             if 'stream' in data and 'data' in data:
@@ -224,6 +492,10 @@ class FeederService:
                 # Extract symbol from stream name (e.g., "btcusdt@ticker" -> "BTCUSDT")
                 symbol = stream_name.split('@')[0].upper()
                 
+                # In-flight ticks of a symbol being unsubscribed
+                if symbol not in self._symbol_set:
+                    return
+                
                 # Process ticker data
                 processed_data = {
                     'symbol': symbol,
@@ -231,22 +503,36 @@ class FeederService:
                     'volume': float(ticker_data.get('v', 0)),  # Volume
                     'change': float(ticker_data.get('P', 0)),  # Price change percent
                     'timestamp': int(ticker_data.get('E', 0)),  # Event time
-                    'received_at': utc_now_seconds()
+                    'received_at': utc_now_seconds(),
+                    'trace': new_trace(received_ns)
                 }
+                if self.order_books_enabled:
+                    processed_data['book'] = self.books.export(symbol)
                 
                 # Store data
                 self.symbol_data[symbol] = processed_data
                 self.last_update = utc_now_seconds()
+                if self.price_board is not None:
+                    self.price_board.publish(
+                        symbol, processed_data['price'],
+                        bid=float(ticker_data['b']) if ticker_data.get('b') else None,
+                        ask=float(ticker_data['a']) if ticker_data.get('a') else None,
+                        volume=processed_data['volume'], change=processed_data['change'],
+                        event_time=processed_data['timestamp'], received_at=processed_data['received_at'],
+                    )
                 
-                # Save snapshot
-                self._save_snapshot()
+                # Save snapshot (stamped before the write so ARES sees the stage)
+                self.tracer.stamp(processed_data['trace'], 'snapshot')
+                self._schedule_snapshot()
                 
                 # Log to memory layer
                 self.memory_client.append_event('ticker_update', {
                     'symbol': symbol,
                     'price': processed_data['price'],
                     'volume': processed_data['volume'],
-                    'timestamp': processed_data['timestamp']
+                    'change': processed_data['change'],
+                    'timestamp': processed_data['timestamp'],
+                    'trace_id': processed_data['trace']['trace_id']
                 }, source='feeder')
                 
                 self.logger.debug(f"Updated {symbol}: ${processed_data['price']:.4f}")
@@ -254,8 +540,21 @@ class FeederService:
         except Exception as e:
             self.logger.error(f"Failed to process ticker data: {e}")
     
+    def _schedule_snapshot(self):
+        """Save the snapshot now, or once FEEDER_SNAPSHOT_MIN_INTERVAL_SEC has passed since the last save"""
+        if self._snapshot_pending:
+            return
+        delay = self._snapshot_written + self.snapshot_min_interval - time.monotonic()
+        if delay <= 0:
+            self._save_snapshot()
+            return
+        self._snapshot_pending = True
+        asyncio.get_running_loop().call_later(delay, self._save_snapshot)
+    
     def _save_snapshot(self):
         """Save current data snapshot"""
+        self._snapshot_pending = False
+        self._snapshot_written = time.monotonic()
         try:
             snapshot = {
                 'timestamp': utc_now_seconds(),
@@ -266,35 +565,84 @@ class FeederService:
                 'last_update': self.last_update
             }
             
-            atomic_write_json(self.snapshot_file, snapshot)
+            write_payload(self.snapshot_file, "feeder_snapshot", snapshot, self.ipc_encoding)
+            self._emit_egress(with_symbols=True)
             
         except Exception as e:
             self.logger.error(f"Failed to save snapshot: {e}")
     
+    def _get_egress_writer(self):
+        """
+        write_egress_tick of the legacy feeder egress writer, which batches
+        the shared_data views and skips the ones whose content is unchanged.
+        
+        Returns None when the legacy module or its path registry is not
+        importable (the feeder snapshot is written either way).
+        """
+        if self._egress_writer is None and not self._egress_writer_failed:
+            try:
+                from shared.feeder_egress_writer import write_egress_tick
+                self._egress_writer = write_egress_tick
+            except Exception as e:
+                self._egress_writer_failed = True
+                self.logger.debug(f"Legacy egress writer unavailable, skipping shared_data views: {e}")
+        return self._egress_writer
+    
+    def _emit_egress(self, with_symbols: bool):
+        """Write the legacy views for this tick (health only from the health loop)"""
+        write_egress_tick = self._get_egress_writer()
+        if write_egress_tick is None:
+            return
+        status, age = self._feeder_status()
+        symbols = None
+        if with_symbols:
+            symbols = {}
+            for symbol, data in self.symbol_data.items():
+                # prices_{SYMBOL}.json is defined for USDT pairs only
+                if not symbol.endswith("USDT"):
+                    continue
+                book = data.get('book')
+                symbols[symbol] = {
+                    "last_price": data['price'],
+                    "orderbook": {"bids": book['bids'], "asks": book['asks']} if book else None,
+                }
+        counts = write_egress_tick(
+            health={"status": status, "stale": age > self.freshness_threshold},
+            databus={"symbols": self.symbols, "stale": age > self.freshness_threshold} if with_symbols else None,
+            symbols=symbols,
+        )
+        if counts.get("errors") or counts.get("invalid"):
+            self.logger.warning(f"Egress tick incomplete: {counts.get('errors', 0)} errors, {counts.get('invalid', 0)} invalid views")
+    
+    def _feeder_status(self) -> Tuple[str, float]:
+        """(GREEN/YELLOW/RED, seconds since the last tick) from freshness and connection"""
+        age = age_seconds(self.last_update) or 0
+        if self.ws_connected and age <= self.freshness_threshold:
+            return "GREEN", age
+        if self.ws_connected and age <= self.freshness_threshold * 2:
+            return "YELLOW", age
+        return "RED", age
+    
     def _update_health(self):
         """Update health status"""
         try:
+            # Board liveness first: readers fall back to files without it
+            if self.price_board is not None:
+                self.price_board.heartbeat()
             current_time = utc_now_seconds()
-            age = age_seconds(self.last_update) or 0
-            
-            # Determine status based on freshness and connection
-            if self.ws_connected and age <= self.freshness_threshold:
-                status = "GREEN"
-            elif self.ws_connected and age <= self.freshness_threshold * 2:
-                status = "YELLOW"
-            else:
-                status = "RED"
+            status, age = self._feeder_status()
             
             # Update health
-            health_manager.set_component_status("feeder", status, {
-                "last_update_ts": self.last_update,
-                "updated_within_sec": age,
-                "symbols_count": len(self.symbols),
-                "ws_connected": self.ws_connected,
-                "rest_api_ok": self.rest_api_ok,
-                "freshness_threshold": self.freshness_threshold,
-                "status": "running"
-            })
+            health_manager.set_feeder_health(
+                status, self.symbols,
+                last_tick_ts=self.last_update,
+                tick_age_sec=age,
+                symbols_count=len(self.symbols),
+                ws_connected=self.ws_connected,
+                rest_api_ok=self.rest_api_ok,
+                freshness_threshold=self.freshness_threshold,
+                state="running",
+            )
             
             # Log status periodically
             if int(current_time) % 30 == 0:  # Every 30 seconds
@@ -302,6 +650,16 @@ class FeederService:
                 
         except Exception as e:
             self.logger.error(f"Failed to update health: {e}")
+        
+        # Stage latencies and profiler dumps run on every pass, whatever happened above
+        self.tracer.flush()
+        self.profiler.poll()
+        
+        # health.json keeps its ts while ticks stop, whatever happened above
+        try:
+            self._emit_egress(with_symbols=False)
+        except Exception as e:
+            self.logger.error(f"Failed to write egress health: {e}")
 
 
 def main():
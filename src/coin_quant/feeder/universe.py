@@ -0,0 +1,223 @@
+"""
+Dynamic universe for the Coin Quant R11 feeder
+
+The top-N universe is ranked continuously from the all-market ticker
+stream (`!ticker@arr`) the feeder is already connected to, instead of
+REST exchangeInfo/24hr polling:
+
+- `UniverseRanker.update()` merges each ticker array into the latest
+  quote volume/price per symbol (O(tickers), no ranking).
+- `UniverseRanker.maybe_rotate()` re-ranks at most every `rank_interval`
+  seconds and returns the added/removed symbols. An incumbent is only
+  replaced by a challenger whose 24h quote volume beats it by
+  `hysteresis`, so symbols near the cut-off do not flap.
+- `subscription_messages()` turns a change into SUBSCRIBE/UNSUBSCRIBE
+  requests for the live connection: rotation costs no REST weight and no
+  reconnect.
+"""
+
+import heapq
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+ALL_MARKET_TICKER_STREAM = "!ticker@arr"
+
+# Same exclusions as shared/universe_manager.py (REST universe)
+LEVERAGED_SUFFIXES = ("UP", "DOWN", "BULL", "BEAR")
+STABLECOIN_BASES = ("USDC", "BUSD", "TUSD", "USDP")
+
+
+@dataclass
+class UniverseChange:
+    """Result of a rotation"""
+    added: List[str]
+    removed: List[str]
+    symbols: List[str]
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "added": self.added,
+            "removed": self.removed,
+            "symbols": self.symbols,
+            "timestamp": self.timestamp,
+        }
+
+
+def ticker_stream(symbol: str) -> str:
+    """Per-symbol ticker stream name (BTCUSDT -> btcusdt@ticker)"""
+    return f"{symbol.lower()}@ticker"
+
+
+def subscription_messages(change: UniverseChange, next_id: int,
+                          streams: Sequence[Callable[[str], str]] = (ticker_stream,)) -> List[Dict[str, Any]]:
+    """
+    SUBSCRIBE/UNSUBSCRIBE requests for a universe change.
+
+    Removals are sent first so the connection never exceeds its stream
+    budget; each direction is one request regardless of the number of
+    symbols (the exchange limits requests per second, not streams per
+    request).
+
+    Args:
+        change: Universe change to apply
+        next_id: Request id of the first message (ids increase by one)
+        streams: Stream name builders subscribed per symbol
+    """
+    messages = []
+    for method, symbols in (("UNSUBSCRIBE", change.removed), ("SUBSCRIBE", change.added)):
+        if symbols:
+            messages.append({
+                "method": method,
+                "params": [stream(s) for s in symbols for stream in streams],
+                "id": next_id + len(messages),
+            })
+    return messages
+
+
+class UniverseRanker:
+    """Incremental top-N universe ranked by 24h quote volume"""
+
+    def __init__(self, top_n: int = 40, quote: str = "USDT", pinned: Sequence[str] = (),
+                 min_quote_volume: float = 1_000_000.0, min_price: float = 0.0,
+                 max_price: float = 0.0, hysteresis: float = 0.2, rank_interval: float = 60.0,
+                 exclude_leveraged: bool = True, exclude_stablecoins: bool = True):
+        self.top_n = max(1, int(top_n))
+        self.quote = quote.upper()
+        self.pinned = [s.upper() for s in pinned][: self.top_n]
+        self.min_quote_volume = min_quote_volume
+        self.min_price = min_price
+        self.max_price = max_price
+        self.hysteresis = max(0.0, hysteresis)
+        self.rank_interval = rank_interval
+        self.exclude_leveraged = exclude_leveraged
+        self.exclude_stablecoins = exclude_stablecoins
+
+        # symbol -> (quote_volume, last_price); symbols missing from a ticker
+        # array simply had no update in that second, so values are kept
+        self.market: Dict[str, Tuple[float, float]] = {}
+        self.symbols: List[str] = []
+        self.last_rank_ts = 0.0
+        self.updates = 0
+        self.rotations = 0
+
+    def seed(self, symbols: Iterable[str]):
+        """Start from a known universe (config or the previous run)"""
+        seeded = list(dict.fromkeys(self.pinned + [s.upper() for s in symbols]))
+        self.symbols = seeded[: self.top_n]
+
+    def _eligible_name(self, symbol: str) -> bool:
+        if not symbol.endswith(self.quote):
+            return False
+        base = symbol[: -len(self.quote)]
+        if not base:
+            return False
+        if self.exclude_leveraged and base.endswith(LEVERAGED_SUFFIXES):
+            return False
+        if self.exclude_stablecoins and base in STABLECOIN_BASES:
+            return False
+        return True
+
+    def update(self, tickers: Iterable[Dict[str, Any]]) -> int:
+        """
+        Merge one `!ticker@arr` payload.
+
+        Returns:
+            Number of tickers kept (quote/name filters only; volume and
+            price are checked at ranking time, as they change)
+        """
+        kept = 0
+        market = self.market
+        for ticker in tickers:
+            symbol = ticker.get("s")
+            if not symbol or not self._eligible_name(symbol):
+                continue
+            try:
+                market[symbol] = (float(ticker.get("q", 0)), float(ticker.get("c", 0)))
+            except (TypeError, ValueError):
+                continue
+            kept += 1
+        self.updates += 1
+        return kept
+
+    def _qualifies(self, symbol: str) -> bool:
+        entry = self.market.get(symbol)
+        if entry is None:
+            return False
+        volume, price = entry
+        if volume < self.min_quote_volume or price < self.min_price:
+            return False
+        return not self.max_price or price <= self.max_price
+
+    def _volume(self, symbol: str) -> float:
+        entry = self.market.get(symbol)
+        return entry[0] if entry else 0.0
+
+    def rank(self) -> List[str]:
+        """Unsmoothed top-N: pinned symbols first, then by quote volume"""
+        pinned = set(self.pinned)
+        ranked = heapq.nlargest(
+            self.top_n,
+            (s for s in self.market if s not in pinned and self._qualifies(s)),
+            key=self._volume,
+        )
+        return (self.pinned + ranked)[: self.top_n]
+
+    def maybe_rotate(self, now: Optional[float] = None, force: bool = False) -> Optional[UniverseChange]:
+        """
+        Re-rank if `rank_interval` has passed.
+
+        Returns:
+            The change, or None if not due or the universe is unchanged
+        """
+        now = time.time() if now is None else now
+        if not self.market or (not force and now - self.last_rank_ts < self.rank_interval):
+            return None
+        self.last_rank_ts = now
+
+        target = self.rank()
+        target_set = set(target)
+        pinned = set(self.pinned)
+        # incumbents that no longer qualify leave unconditionally; symbols
+        # without market data yet (seeded) are kept until data arrives
+        current = [s for s in self.symbols
+                   if s in pinned or s not in self.market or self._qualifies(s)]
+
+        challengers = [s for s in target if s not in current]
+        vulnerable = sorted((s for s in current if s not in target_set and s not in pinned),
+                            key=self._volume)
+        keep = set(current)
+        # fill free slots first, then swap weakest incumbent vs strongest challenger
+        for challenger in challengers:
+            if len(keep) < self.top_n:
+                keep.add(challenger)
+            elif vulnerable and self._volume(challenger) > \
+                    self._volume(vulnerable[0]) * (1.0 + self.hysteresis):
+                keep.discard(vulnerable.pop(0))
+                keep.add(challenger)
+            else:
+                break
+        # a shrunk top_n (or too many pinned) drops the weakest
+        while len(keep) > self.top_n and vulnerable:
+            keep.discard(vulnerable.pop(0))
+
+        new_symbols = [s for s in target if s in keep] + \
+            sorted((s for s in keep if s not in target_set), key=self._volume, reverse=True)
+        old = set(self.symbols)
+        added = [s for s in new_symbols if s not in old]
+        removed = [s for s in self.symbols if s not in keep]
+        self.symbols = new_symbols
+        if not added and not removed:
+            return None
+        self.rotations += 1
+        return UniverseChange(added, removed, list(new_symbols), now)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "symbols": len(self.symbols),
+            "market_symbols": len(self.market),
+            "updates": self.updates,
+            "rotations": self.rotations,
+            "last_rank_ts": self.last_rank_ts,
+        }
@@ -5,10 +5,7 @@ Immutable audit trail and integrity verification system.
 Provides event chain, snapshot store, hash chain, and client capabilities.
 """
 
-from . import event_chain
-from . import snapshot_store
-from . import hash_chain
-from . import client
+from coin_quant.shared.lazy import lazy_submodules
 
 __all__ = [
     "event_chain",
@@ -16,3 +13,6 @@ __all__ = [
     "hash_chain",
     "client",
 ]
+
+# Submodules are imported on first access: importing the package stays cheap
+__getattr__, __dir__ = lazy_submodules(__name__, __all__)
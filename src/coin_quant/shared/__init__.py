@@ -5,22 +5,19 @@ Core utilities for I/O, health management, configuration, logging,
 path resolution, singleton management, symbol utilities, and time operations.
 """
 
-from . import io
-from . import health
-from . import config
-from . import logging
-from . import paths
-from . import singleton
-from . import symbols
-from . import time
+from .lazy import lazy_submodules
 
 __all__ = [
     "io",
     "health", 
     "config",
     "logging",
+    "metrics",
     "paths",
     "singleton",
     "symbols",
     "time",
 ]
+
+# Submodules are imported on first access: importing the package stays cheap
+__getattr__, __dir__ = lazy_submodules(__name__, __all__)
@@ -0,0 +1,513 @@
+"""
+Binary payload codec for Coin Quant R11
+
+Schema-defined, struct-packed encoding for the hot inter-service payloads
+(feeder snapshot, ARES signals), written next to the JSON file as
+`<name>.bin` when IPC_ENCODING is "binary" or "both". Readers take the
+`.bin` file whenever it exists; JSON-only writes remove a stale one.
+
+Layout (little endian):
+
+    file   := magic "CQBN" | schema id u16 | schema version u16 | record
+    record := length u32 | field count u16 | presence bitmap | extra | fields
+
+- Each schema generates its record encoder/decoder on first use: runs of
+  fixed-width fields become one precompiled `struct.Struct`, strings are
+  inlined, nested records call the nested schema's generated functions.
+- Schemas are append-only: a reader decodes the first
+  min(field count, known fields) fields and skips the rest of the record
+  by its length, so old readers accept newer files and vice versa (the
+  generated decoder handles the current field count, other counts go
+  through the generic decoder). Bump the schema version when appending.
+- A field is present in the bitmap only if the value has the schema type;
+  missing fields are omitted on decode. None, mistyped values and keys
+  outside the schema travel in `extra` (compact JSON), so JSON payloads
+  round-trip (numbers inside `pairs` are stored as f64).
+
+    python -m coin_quant.shared.codec shared_data/feeder_snapshot.bin
+"""
+
+import argparse
+import json
+import struct
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple, Union
+
+from .io import atomic_write_json, atomic_writer, safe_read_json
+
+MAGIC = b"CQBN"
+HEADER = struct.Struct("<4sHH")
+_RECORD = struct.Struct("<IH")
+_U32 = struct.Struct("<I")
+_NONE32 = 0xFFFFFFFF
+_NO_EXTRA = _U32.pack(_NONE32)
+
+_MISSING = object()
+
+# fixed-width kinds: struct code, accepted types (exact), zero value
+_FIXED = {
+    "f64": ("d", (float, int), 0.0),
+    "i64": ("q", (int,), 0),
+    "bool": ("?", (bool,), False),
+}
+_I64_MIN, _I64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+class CodecError(Exception):
+    """Payload cannot be encoded or decoded"""
+    pass
+
+
+@dataclass(frozen=True)
+class Field:
+    """Schema field: kind is a fixed kind, str/strs/pairs/json, or record/list/map of a schema"""
+    name: str
+    kind: str
+    schema: Optional["Schema"] = None
+    key: Optional[str] = None   # map: field of the nested record used as dict key
+
+
+@dataclass(eq=False)
+class Schema:
+    """Record layout; `fields` may only be appended to (bump `version`)"""
+    name: str
+    fields: Sequence[Field]
+    schema_id: int = 0
+    version: int = 1
+    names: FrozenSet[str] = field(init=False, repr=False)
+    _pack: Optional[Callable] = field(default=None, repr=False)
+    _unpack: Optional[Callable] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        self.names = frozenset(f.name for f in self.fields)
+
+    def pack(self, out: bytearray, data: Dict[str, Any]):
+        """Append `data` as one record"""
+        if self._pack is None:
+            self._pack, self._unpack = _generate(self)
+        self._pack(out, data)
+
+    def unpack(self, buf: memoryview, pos: int) -> Tuple[Dict[str, Any], int]:
+        """Decode the record at `pos`; returns (data, end position)"""
+        if self._unpack is None:
+            self._pack, self._unpack = _generate(self)
+        return self._unpack(buf, pos)
+
+
+# -- variable-width kinds -------------------------------------------------
+
+def _is_valid(f: Field, value: Any) -> bool:
+    kind = f.kind
+    if kind == "strs":
+        return isinstance(value, list) and all(isinstance(v, str) for v in value)
+    if kind == "pairs":
+        # element types are checked by struct.pack
+        return isinstance(value, list) and all(type(p) is list and len(p) == 2 for p in value)
+    if kind == "json":
+        return value is not None
+    if kind == "record":
+        return isinstance(value, dict)
+    if kind == "list":
+        return isinstance(value, list) and all(isinstance(v, dict) for v in value)
+    if kind == "map":
+        return isinstance(value, dict) and all(
+            isinstance(v, dict) and v.get(f.key, _MISSING) == k for k, v in value.items())
+    raise CodecError(f"Unknown field kind: {kind}")
+
+
+def _pack_str(out: bytearray, value: str):
+    data = value.encode("utf-8")
+    out += _U32.pack(len(data))
+    out += data
+
+
+def _unpack_str(buf: memoryview, pos: int) -> Tuple[str, int]:
+    (n,) = _U32.unpack_from(buf, pos)
+    pos += 4
+    return str(buf[pos:pos + n], "utf-8"), pos + n
+
+
+def _pack_var(out: bytearray, f: Field, value: Any) -> bool:
+    """Append a variable-width value; False (nothing appended) if it does not fit the kind"""
+    try:
+        if not _is_valid(f, value):
+            return False
+        kind = f.kind
+        if kind == "strs":
+            items = [item.encode("utf-8") for item in value]
+            out += _U32.pack(len(items))
+            for item in items:
+                out += _U32.pack(len(item))
+                out += item
+        elif kind == "pairs":
+            packed = struct.pack(f"<{2 * len(value)}d", *[x for pair in value for x in pair])
+            out += _U32.pack(len(value))
+            out += packed
+        elif kind == "json":
+            _pack_str(out, json.dumps(value, separators=(",", ":"), ensure_ascii=False))
+        elif kind == "record":
+            f.schema.pack(out, value)
+        else:  # list / map
+            items = value if kind == "list" else value.values()
+            out += _U32.pack(len(items))
+            pack = f.schema.pack
+            for item in items:
+                pack(out, item)
+        return True
+    except (struct.error, TypeError, ValueError, UnicodeEncodeError):
+        return False
+
+
+def _unpack_var(buf: memoryview, pos: int, f: Field) -> Tuple[Any, int]:
+    kind = f.kind
+    if kind == "str":
+        return _unpack_str(buf, pos)
+    if kind == "strs":
+        (n,) = _U32.unpack_from(buf, pos)
+        pos += 4
+        items = []
+        for _ in range(n):
+            item, pos = _unpack_str(buf, pos)
+            items.append(item)
+        return items, pos
+    if kind == "pairs":
+        (n,) = _U32.unpack_from(buf, pos)
+        pos += 4
+        flat = iter(struct.unpack_from(f"<{2 * n}d", buf, pos))
+        return [[a, b] for a, b in zip(flat, flat)], pos + 16 * n
+    if kind == "json":
+        text, pos = _unpack_str(buf, pos)
+        return json.loads(text), pos
+    if kind == "record":
+        return f.schema.unpack(buf, pos)
+    if kind in ("list", "map"):
+        (n,) = _U32.unpack_from(buf, pos)
+        pos += 4
+        items = []
+        unpack = f.schema.unpack
+        for _ in range(n):
+            item, pos = unpack(buf, pos)
+            items.append(item)
+        if kind == "map":
+            return {item[f.key]: item for item in items}, pos
+        return items, pos
+    raise CodecError(f"Unknown field kind: {kind}")
+
+
+# -- records --------------------------------------------------------------
+
+def _runs(fields: Sequence[Field]) -> List[Tuple[str, List[Tuple[int, Field]]]]:
+    """Group fields into ("fixed", run of fixed-width fields) / ("var", [field]) steps"""
+    steps: List[Tuple[str, List[Tuple[int, Field]]]] = []
+    for index, f in enumerate(fields):
+        kind = "fixed" if f.kind in _FIXED else "var"
+        if kind == "fixed" and steps and steps[-1][0] == "fixed":
+            steps[-1][1].append((index, f))
+        else:
+            steps.append((kind, [(index, f)]))
+    return steps
+
+
+def _unpack_generic(buf: memoryview, pos: int, schema: Schema) -> Tuple[Dict[str, Any], int]:
+    """Decode a record written with a different field count (older/newer schema version)"""
+    length, count = _RECORD.unpack_from(buf, pos)
+    end = pos + length
+    nbytes = (count + 7) // 8
+    bits = int.from_bytes(buf[pos + 6:pos + 6 + nbytes], "little")
+    pos += 6 + nbytes
+    (extra_len,) = _U32.unpack_from(buf, pos)
+    extra = None
+    if extra_len == _NONE32:
+        pos += 4
+    else:
+        text, pos = _unpack_str(buf, pos)
+        extra = json.loads(text)
+
+    data: Dict[str, Any] = {}
+    for kind, run in _runs(schema.fields[:count]):
+        if kind == "fixed":
+            layout = struct.Struct("<" + "".join(_FIXED[f.kind][0] for _, f in run))
+            values = layout.unpack_from(buf, pos)
+            pos += layout.size
+            for (index, f), value in zip(run, values):
+                if bits >> index & 1:
+                    data[f.name] = value
+        else:
+            index, f = run[0]
+            if bits >> index & 1:
+                data[f.name], pos = _unpack_var(buf, pos, f)
+    if extra:
+        data.update(extra)
+    # fields appended by a newer writer are skipped
+    return data, end
+
+
+def _add_extra(extra: Optional[Dict[str, Any]], name: str, value: Any) -> Dict[str, Any]:
+    if extra is None:
+        extra = {}
+    extra[name] = value
+    return extra
+
+
+def _generate(schema: Schema) -> Tuple[Callable, Callable]:
+    """Generate the record encoder and decoder of a schema"""
+    fields = schema.fields
+    count = len(fields)
+    nbytes = (count + 7) // 8
+    env: Dict[str, Any] = {
+        "MISSING": _MISSING, "U32": _U32, "RECORD": _RECORD, "NONE32": _NONE32, "NO_EXTRA": _NO_EXTRA,
+        "I64_MIN": _I64_MIN, "I64_MAX": _I64_MAX, "NAMES": schema.names, "SCHEMA": schema,
+        "json": json, "pack_var": _pack_var, "unpack_var": _unpack_var,
+        "unpack_generic": _unpack_generic, "add_extra": _add_extra,
+    }
+    enc = ["def pack(out, data):",
+           "    get = data.get",
+           "    bits = 0",
+           "    extra = None",
+           "    body = bytearray()"]
+    dec = ["def unpack(buf, pos):",
+           "    length, count = RECORD.unpack_from(buf, pos)",
+           f"    if count != {count}:",
+           "        return unpack_generic(buf, pos, SCHEMA)",
+           "    end = pos + length",
+           f"    bits = int.from_bytes(buf[pos + 6:pos + {6 + nbytes}], 'little')",
+           f"    pos += {6 + nbytes}",
+           "    (n,) = U32.unpack_from(buf, pos)",
+           "    pos += 4",
+           "    extra = None",
+           "    if n != NONE32:",
+           "        extra = json.loads(str(buf[pos:pos + n], 'utf-8'))",
+           "        pos += n",
+           "    data = {}"]
+
+    for step, (kind, run) in enumerate(_runs(fields)):
+        if kind == "fixed":
+            layout = struct.Struct("<" + "".join(_FIXED[f.kind][0] for _, f in run))
+            env[f"S{step}"] = layout
+            names = []
+            for index, f in run:
+                v, bit = f"v{index}", 1 << index
+                check = f"type({v}) is bool" if f.kind == "bool" else \
+                    f"type({v}) is int and I64_MIN <= {v} <= I64_MAX" if f.kind == "i64" else \
+                    f"(type({v}) is float or type({v}) is int)"
+                enc += [f"    {v} = get({f.name!r}, MISSING)",
+                        f"    if {check}:",
+                        f"        bits |= {bit}",
+                        "    else:",
+                        f"        if {v} is not MISSING:",
+                        f"            extra = add_extra(extra, {f.name!r}, {v})",
+                        f"        {v} = {_FIXED[f.kind][2]!r}"]
+                names.append(v)
+            enc.append(f"    body += S{step}.pack({', '.join(names)})")
+            dec += [f"    {', '.join(names)}, = S{step}.unpack_from(buf, pos)",
+                    f"    pos += {layout.size}"]
+            dec += [line for index, f in run for line in (
+                f"    if bits & {1 << index}:",
+                f"        data[{f.name!r}] = v{index}")]
+            continue
+
+        index, f = run[0]
+        bit = 1 << index
+        env[f"F{index}"] = f
+        enc.append(f"    v = get({f.name!r}, MISSING)")
+        if f.kind == "str":
+            enc += ["    if type(v) is str:",
+                    "        try:",
+                    "            b = v.encode('utf-8')",
+                    "        except UnicodeEncodeError:",
+                    f"            extra = add_extra(extra, {f.name!r}, v)",
+                    "        else:",
+                    "            body += U32.pack(len(b))",
+                    "            body += b",
+                    f"            bits |= {bit}",
+                    "    elif v is not MISSING:",
+                    f"        extra = add_extra(extra, {f.name!r}, v)"]
+            dec += [f"    if bits & {bit}:",
+                    "        (n,) = U32.unpack_from(buf, pos)",
+                    "        pos += 4",
+                    f"        data[{f.name!r}] = str(buf[pos:pos + n], 'utf-8')",
+                    "        pos += n"]
+        else:
+            enc += ["    if v is not MISSING:",
+                    f"        if pack_var(body, F{index}, v):",
+                    f"            bits |= {bit}",
+                    "        else:",
+                    f"            extra = add_extra(extra, {f.name!r}, v)"]
+            dec.append(f"    if bits & {bit}:")
+            if f.kind == "json":
+                dec += ["        (n,) = U32.unpack_from(buf, pos)",
+                        "        pos += 4",
+                        f"        data[{f.name!r}] = json.loads(str(buf[pos:pos + n], 'utf-8'))",
+                        "        pos += n"]
+            elif f.kind == "record":
+                env[f"R{index}"] = f.schema.unpack
+                dec.append(f"        data[{f.name!r}], pos = R{index}(buf, pos)")
+            else:
+                dec.append(f"        data[{f.name!r}], pos = unpack_var(buf, pos, F{index})")
+
+    enc += ["    if not NAMES.issuperset(data):",
+            "        for key in data.keys() - NAMES:",
+            "            extra = add_extra(extra, key, data[key])",
+            "    if extra is None:",
+            "        tail = NO_EXTRA",
+            "    else:",
+            "        tail = json.dumps(extra, separators=(',', ':'), ensure_ascii=False).encode('utf-8')",
+            "        tail = U32.pack(len(tail)) + tail",
+            f"    out += RECORD.pack({6 + nbytes} + len(tail) + len(body), {count})",
+            f"    out += bits.to_bytes({nbytes}, 'little')",
+            "    out += tail",
+            "    out += body"]
+    dec += ["    if extra:",
+            "        data.update(extra)",
+            "    return data, end"]
+
+    exec(compile("\n".join(enc + [""] + dec), f"<codec:{schema.name}>", "exec"), env)
+    return env["pack"], env["unpack"]
+
+
+# -- payload schemas ------------------------------------------------------
+
+BOOK = Schema("book", [
+    Field("symbol", "str"), Field("bids", "pairs"), Field("asks", "pairs"),
+    Field("mid", "f64"), Field("spread_bps", "f64"), Field("imbalance", "f64"),
+    Field("last_update_id", "i64"), Field("updated_at", "f64"),
+])
+
+TICKER = Schema("ticker", [
+    Field("symbol", "str"), Field("price", "f64"), Field("volume", "f64"), Field("change", "f64"),
+    Field("timestamp", "i64"), Field("received_at", "f64"), Field("trace", "json"),
+    Field("book", "record", BOOK),
+])
+
+FEEDER_SNAPSHOT = Schema("feeder_snapshot", [
+    Field("timestamp", "f64"), Field("symbols", "strs"),
+    Field("symbol_data", "map", TICKER, key="symbol"),
+    Field("ws_connected", "bool"), Field("rest_api_ok", "bool"), Field("last_update", "f64"),
+], schema_id=1, version=1)
+
+MARKET = Schema("market", [
+    Field("mid", "f64"), Field("spread_bps", "f64"), Field("imbalance", "f64"),
+    Field("expected_slippage_bps", "f64"), Field("notional", "f64"), Field("book_updated_at", "f64"),
+])
+
+SIGNAL = Schema("signal", [
+    Field("symbol", "str"), Field("side", "str"), Field("price", "f64"), Field("size", "f64"),
+    Field("confidence", "f64"), Field("strategy", "str"), Field("timestamp", "f64"),
+    Field("reason", "str"), Field("market", "record", MARKET), Field("trace", "json"),
+])
+
+ARES_SIGNALS = Schema("ares_signals", [
+    Field("timestamp", "f64"), Field("signals", "list", SIGNAL), Field("count", "i64"),
+], schema_id=2, version=1)
+
+SCHEMAS: Dict[str, Schema] = {s.name: s for s in (FEEDER_SNAPSHOT, ARES_SIGNALS)}
+_BY_ID: Dict[int, Schema] = {s.schema_id: s for s in SCHEMAS.values()}
+
+
+def encode(schema: Union[str, Schema], data: Dict[str, Any]) -> bytes:
+    """Encode a payload dict with a registered schema"""
+    schema = SCHEMAS[schema] if isinstance(schema, str) else schema
+    out = bytearray(HEADER.pack(MAGIC, schema.schema_id, schema.version))
+    try:
+        schema.pack(out, data)
+    except (struct.error, TypeError, ValueError) as e:
+        raise CodecError(f"Cannot encode {schema.name}: {e}")
+    return bytes(out)
+
+
+def decode(payload: bytes) -> Tuple[str, int, Dict[str, Any]]:
+    """
+    Decode a payload.
+
+    Returns:
+        (schema name, writer's schema version, data)
+    """
+    buf = memoryview(payload)
+    try:
+        magic, schema_id, version = HEADER.unpack_from(buf, 0)
+    except struct.error:
+        raise CodecError("Truncated payload header")
+    if magic != MAGIC:
+        raise CodecError("Not a binary payload (bad magic)")
+    schema = _BY_ID.get(schema_id)
+    if schema is None:
+        raise CodecError(f"Unknown schema id {schema_id}")
+    try:
+        data, end = schema.unpack(buf, HEADER.size)
+    except (struct.error, UnicodeDecodeError, ValueError) as e:
+        raise CodecError(f"Corrupt {schema.name} payload: {e}")
+    if end != len(payload):
+        raise CodecError(f"Corrupt {schema.name} payload: {len(payload) - end} trailing bytes")
+    return schema.name, version, data
+
+
+def binary_path(json_path: Union[str, Path]) -> Path:
+    """feeder_snapshot.json -> feeder_snapshot.bin"""
+    return Path(json_path).with_suffix(".bin")
+
+
+def write_payload(json_path: Union[str, Path], schema: str, data: Dict[str, Any],
+                  encoding: str = "json") -> bool:
+    """
+    Write a payload as JSON, binary (`.bin` sibling) or both.
+
+    Args:
+        json_path: Path of the JSON payload file
+        schema: Registered schema name
+        data: Payload
+        encoding: "json", "binary" or "both" (IPC_ENCODING)
+    """
+    ok = True
+    if encoding in ("binary", "both"):
+        ok = atomic_writer.write_bytes(binary_path(json_path), encode(schema, data))
+    else:
+        # IPC_ENCODING switched back to json: a leftover .bin would shadow the JSON file
+        try:
+            binary_path(json_path).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError:
+            ok = False
+    if encoding != "binary":
+        ok = atomic_write_json(json_path, data) and ok
+    return ok
+
+
+def read_payload(json_path: Union[str, Path], default: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Read a payload, preferring the `.bin` file when it exists.
+
+    The binary file is authoritative (in "both" mode the JSON copy is
+    written after it and would otherwise always look newer). Missing,
+    corrupt or unreadable binary files fall back to the JSON file.
+    """
+    try:
+        return decode(binary_path(json_path).read_bytes())[2]
+    except (OSError, CodecError):
+        return safe_read_json(json_path, default)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Dump binary Coin Quant payloads as JSON")
+    parser.add_argument("files", nargs="+", help="Payload files (.bin)")
+    parser.add_argument("--header", action="store_true", help="Include schema name and version")
+    args = parser.parse_args(argv)
+
+    status = 0
+    for path in args.files:
+        try:
+            name, version, data = decode(Path(path).read_bytes())
+        except (OSError, CodecError) as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            status = 1
+            continue
+        if args.header:
+            data = {"schema": name, "version": version, "data": data}
+        print(json.dumps(data, ensure_ascii=False, indent=2))
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -21,9 +21,6 @@ class ConfigManager:
         self.ssot_file = self.data_dir / "ssot" / "env.json"
         self._config_cache: Optional[Dict[str, Any]] = None
         self._validation_errors: list[str] = []
-        
-        # Ensure SSOT directory exists
-        self.ssot_file.parent.mkdir(parents=True, exist_ok=True)
     
     def _load_defaults(self) -> Dict[str, Any]:
         """Load default configuration values"""
@@ -46,6 +43,21 @@ class ConfigManager:
             
             # Service Configuration
             "FEEDER_HEARTBEAT_INTERVAL": 5.0,
+            "FEEDER_DYNAMIC_UNIVERSE": False,  # opt-in: ranks FEEDER_TOP_N symbols from !ticker@arr
+            "FEEDER_UNIVERSE_RANK_SEC": 60.0,
+            "FEEDER_UNIVERSE_HYSTERESIS": 0.2,
+            "FEEDER_UNIVERSE_MIN_QUOTE_VOLUME": 1000000.0,
+            "FEEDER_ORDER_BOOKS": True,
+            "FEEDER_BOOK_DEPTH": 20,
+            "FEEDER_BOOK_SNAPSHOT_LEVELS": 100,
+            "FEEDER_BOOK_RESYNC_BASE_SEC": 1.0,
+            "FEEDER_BOOK_RESYNC_MAX_SEC": 60.0,
+            "FEEDER_REST_WEIGHT_PER_MIN": 1200.0,  # share of the exchange's 6000/min IP limit
+            "FEEDER_SNAPSHOT_MIN_INTERVAL_SEC": 0.25,
+            "TRADER_MARKET_GATE": False,  # opt-in: spread/slippage caps on the feeder's books
+            "TRADER_MAX_SPREAD_BPS": 8.0,
+            "TRADER_MAX_SLIPPAGE_BPS": 20.0,
+            "TRADER_BOOK_MAX_AGE_SEC": 5.0,
             "TRADER_ORDER_COOLDOWN": 1.0,
             "TRADER_BALANCE_CHECK_INTERVAL": 30.0,
             
@@ -60,6 +72,37 @@ class ConfigManager:
             "DISABLE_HEALTH_CHECKS": False,
             "ENABLE_DEBUG_TRACING": False,
             
+            # Profiling (runtime override: shared_data/controls/profiling.json)
+            "PROFILING_ENABLED": False,
+            "PROFILING_INTERVAL_MS": 10.0,
+            "PROFILING_MAX_OVERHEAD_PCT": 2.0,
+            
+            # Read API (MONITORING_BACKEND=http)
+            "READ_API_HOST": "127.0.0.1",
+            "READ_API_PORT": 8765,
+            "READ_API_REFRESH_SEC": 1.0,
+            
+            # Health registry (push-based health, files exported from it)
+            "HEALTH_REGISTRY_ENABLED": True,
+            "HEALTH_REGISTRY_HOST": "127.0.0.1",
+            "HEALTH_REGISTRY_PORT": 8766,
+            "HEALTH_REGISTRY_TIMEOUT_SEC": 0.05,
+            "HEALTH_REGISTRY_PROBE_SEC": 5.0,
+            "HEALTH_FILE_WRITES": "auto",
+            "HEALTH_STALE_SEC": 30.0,
+            "HEALTH_EXPORT_INTERVAL_SEC": 1.0,
+            "HEALTH_SNAPSHOT_TTL_SEC": 0.5,
+            
+            # Inter-service payload encoding: json | binary | both
+            # (binary writes <name>.bin; dump with coin-quant-dump)
+            "IPC_ENCODING": "json",
+            
+            # Shared-memory price board (feeder -> same-host readers)
+            "PRICE_BOARD_ENABLED": True,
+            "PRICE_BOARD_NAME": "coin_quant_prices",
+            "PRICE_BOARD_CAPACITY": 256,
+            "PRICE_BOARD_STALE_SEC": 15.0,
+            
             # Memory Layer
             "MEMORY_INTEGRITY_CHECK_INTERVAL": 300.0,
             "MEMORY_SNAPSHOT_INTERVAL": 60.0,
@@ -234,6 +277,7 @@ class ConfigManager:
     def save_ssot_config(self, config: Dict[str, Any]) -> bool:
         """Save configuration to SSOT file"""
         try:
+            self.ssot_file.parent.mkdir(parents=True, exist_ok=True)
             with open(self.ssot_file, 'w', encoding='utf-8') as f:
                 json.dump(config, f, indent=2, ensure_ascii=False)
             return True
@@ -34,7 +34,6 @@ class ConfigSSOT:
     
     def __init__(self, config_file: Optional[Path] = None):
         self.config_file = config_file or get_data_dir() / "ssot" / "env.json"
-        self.config_file.parent.mkdir(parents=True, exist_ok=True)
         self.writer = AtomicWriter()
         self.reader = AtomicReader()
         
@@ -374,9 +373,19 @@ def print_startup_banner(service_name: str, config: ConfigSSOT) -> None:
 
 
 # Global configuration instance
-config_ssot = ConfigSSOT()
+_config_ssot: Optional[ConfigSSOT] = None
 
 
 def get_config() -> ConfigSSOT:
-    """Get global configuration instance"""
-    return config_ssot
+    """Get global configuration instance (created on first use, not at import)"""
+    global _config_ssot
+    if _config_ssot is None:
+        _config_ssot = ConfigSSOT()
+    return _config_ssot
+
+
+def __getattr__(name: str):
+    # `config_ssot` used to be created at import time
+    if name == "config_ssot":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
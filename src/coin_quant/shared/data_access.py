@@ -9,13 +9,16 @@ Handles missing data gracefully and normalizes data formats.
 import json
 import logging
 import os
+import threading
 import time
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Protocol
+from typing import Any, Dict, List, Optional, Protocol, Tuple
 from datetime import datetime, timedelta
 
 from .pathing import get_paths
+from .price_board import PriceBoardReader
 
 logger = logging.getLogger(__name__)
 
@@ -76,15 +79,72 @@ class MetricsRepo(Protocol):
         ...
 
 
+class FileCache:
+    """
+    Parsed JSON file memo validated by file identity.
+    
+    A file is re-parsed only when its (mtime, size, inode) changes, so a
+    dashboard refresh costs one stat per source file instead of one parse
+    per lookup. Atomic writes (os.replace) always change the inode.
+    """
+    
+    def __init__(self):
+        self._entries: Dict[Path, Tuple[Tuple[int, int, int], Any, float]] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def read(self, file_path: Path) -> Optional[Tuple[Any, float]]:
+        """
+        Read and parse a JSON file through the memo.
+        
+        Returns:
+            (data, mtime) or None if the file is missing or unreadable
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            self._entries.pop(file_path, None)
+            return None
+        
+        key = (st.st_mtime_ns, st.st_size, st.st_ino)
+        entry = self._entries.get(file_path)
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1], entry[2]
+        
+        self.misses += 1
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError, OSError) as e:
+            logger.warning(f"Failed to read {file_path}: {e}")
+            self._entries.pop(file_path, None)
+            return None
+        
+        self._entries[file_path] = (key, data, st.st_mtime)
+        return data, st.st_mtime
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
 class FileBackend:
     """File-based data backend"""
     
-    def __init__(self):
+    def __init__(self, cache: Optional[FileCache] = None):
         self.paths = get_paths()
         self.paths.ensure_directories()
+        self.cache = cache
     
     def _safe_read_json(self, file_path: Path, default: Any = None) -> Any:
         """Safely read JSON file with error handling"""
+        if self.cache is not None:
+            entry = self.cache.read(file_path)
+            return entry[0] if entry is not None else default
+        
         try:
             if not file_path.exists():
                 return default
@@ -95,6 +155,19 @@ class FileBackend:
             logger.warning(f"Failed to read {file_path}: {e}")
             return default
     
+    def _read_json_with_mtime(self, file_path: Path) -> Tuple[Any, Optional[float]]:
+        """Read JSON file and its mtime with a single stat"""
+        if self.cache is not None:
+            entry = self.cache.read(file_path)
+            if entry is None:
+                return None, None
+            return entry
+        try:
+            mtime = file_path.stat().st_mtime
+        except OSError:
+            return None, None
+        return self._safe_read_json(file_path), mtime
+    
     def _get_file_age_seconds(self, file_path: Path) -> Optional[float]:
         """Get file age in seconds"""
         try:
@@ -108,13 +181,27 @@ class FileBackend:
 
 
 class FilePriceSnapshotRepo(FileBackend, PriceSnapshotRepo):
-    """File-based price snapshot repository"""
+    """File-based price snapshot repository, served from the price board while the feeder is alive"""
     
-    def get_latest(self, symbol: str) -> Optional[Dict[str, Any]]:
-        """Get latest price snapshot for symbol"""
-        snapshot_path = self.paths.get_symbol_snapshot_path(symbol)
-        data = self._safe_read_json(snapshot_path)
-        
+    def __init__(self, cache: Optional[FileCache] = None, board: Optional[PriceBoardReader] = None):
+        super().__init__(cache)
+        self.board = board
+    
+    def _board_alive(self) -> bool:
+        return self.board is not None and self.board.alive()
+    
+    @staticmethod
+    def _from_tick(tick: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "symbol": tick["symbol"],
+            "price": tick["price"],
+            "timestamp": tick["timestamp"],
+            "volume": tick["volume"],
+            "change_24h": tick["change"]
+        }
+    
+    @staticmethod
+    def _normalize(symbol: str, data: Any) -> Optional[Dict[str, Any]]:
         if data and isinstance(data, dict):
             # Normalize data structure
             return {
@@ -126,15 +213,163 @@ class FilePriceSnapshotRepo(FileBackend, PriceSnapshotRepo):
             }
         return None
     
+    def get_latest(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Get latest price snapshot for symbol"""
+        if self._board_alive():
+            tick = self.board.get(symbol)
+            if tick is not None:
+                return self._from_tick(tick)
+        snapshot_path = self.paths.get_symbol_snapshot_path(symbol)
+        return self._normalize(symbol, self._safe_read_json(snapshot_path))
+    
     def get_age_seconds(self, symbol: str) -> Optional[float]:
         """Get age of latest snapshot in seconds"""
+        if self._board_alive():
+            tick = self.board.get(symbol)
+            if tick is not None:
+                return time.time() - tick["received_at"]
         snapshot_path = self.paths.get_symbol_snapshot_path(symbol)
         return self._get_file_age_seconds(snapshot_path)
+    
+    def list_symbols(self) -> List[str]:
+        """Symbols with a snapshot file or a board slot"""
+        board = set(self.board.snapshot()) if self._board_alive() else set()
+        try:
+            files = {entry.name[len("prices_"):-len(".json")].upper()
+                     for entry in os.scandir(self.paths.snapshots_dir)
+                     if entry.name.startswith("prices_") and entry.name.endswith(".json")}
+        except OSError:
+            files = set()
+        return sorted(board | files)
+    
+    def get_many_with_refs(self, symbols: List[str]) -> Dict[str, Tuple[Optional[Dict[str, Any]], Optional[float]]]:
+        """
+        Get (snapshot, reference time) per symbol.
+        
+        Board symbols are read in one pass with their receive time as the
+        reference; the rest cost one stat + at most one parse per file
+        (reference: file mtime).
+        """
+        ticks = self.board.snapshot() if self._board_alive() else {}
+        result = {}
+        for symbol in symbols:
+            tick = ticks.get(symbol)
+            if tick is not None:
+                result[symbol] = (self._from_tick(tick), tick["received_at"])
+                continue
+            data, mtime = self._read_json_with_mtime(self.paths.get_symbol_snapshot_path(symbol))
+            result[symbol] = (self._normalize(symbol, data), mtime)
+        return result
+    
+    def get_many(self, symbols: List[str]) -> Dict[str, Tuple[Optional[Dict[str, Any]], Optional[float]]]:
+        """Get (snapshot, age_seconds) per symbol"""
+        now = time.time()
+        return {symbol: (data, now - mtime if mtime is not None else None)
+                for symbol, (data, mtime) in self.get_many_with_refs(symbols).items()}
 
 
 class FileSignalRepo(FileBackend, SignalRepo):
     """File-based signal repository"""
     
+    def __init__(self, cache: Optional[FileCache] = None):
+        super().__init__(cache)
+        self._ares_index_key: Optional[Tuple] = None
+        self._ares_index: Dict[str, Tuple[Dict[str, Any], float]] = {}
+    
+    @staticmethod
+    def _normalize(symbol: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "symbol": symbol,
+            "signal": data.get("signal", "HOLD"),
+            "confidence": data.get("confidence", 0.0),
+            "timestamp": data.get("timestamp", 0),
+            "reason": data.get("reason", "")
+        }
+    
+    def _ares_file_index(self) -> Dict[str, Tuple[Dict[str, Any], float]]:
+        """
+        Symbol -> (first matching ARES file record, latest timestamp).
+        
+        One directory scan per call; the index is rebuilt only when a file
+        in the directory changes. "First match" follows glob order, as the
+        per-symbol lookup does.
+        """
+        try:
+            entries = []
+            for entry in os.scandir(self.paths.ares_dir):
+                if entry.name.endswith(".json") and entry.is_file():
+                    st = entry.stat()
+                    entries.append((entry.name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            entries = []
+        
+        key = tuple(entries)
+        if key == self._ares_index_key:
+            return self._ares_index
+        
+        index: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        for signal_file in self.paths.ares_dir.glob("*.json"):
+            data = self._safe_read_json(signal_file)
+            if not (data and isinstance(data, dict)) or "symbol" not in data:
+                continue
+            symbol = data["symbol"]
+            timestamp = data.get("timestamp", 0)
+            if symbol in index:
+                first, latest = index[symbol]
+                index[symbol] = (first, max(latest, timestamp))
+            else:
+                index[symbol] = (data, timestamp)
+        
+        self._ares_index_key = key
+        self._ares_index = index
+        return index
+    
+    def list_symbols(self) -> List[str]:
+        """Symbols with a signal in ares_signals.json or an ARES file"""
+        signals_data = self._safe_read_json(self.paths.ares_signals)
+        symbols = set(signals_data) if isinstance(signals_data, dict) else set()
+        symbols.update(s for s in self._ares_file_index() if isinstance(s, str))
+        return sorted(symbols)
+    
+    def get_many_with_refs(self, symbols: List[str]) -> Dict[str, Tuple[Optional[Dict[str, Any]], Optional[float]]]:
+        """
+        Get (signal, age reference timestamp) per symbol in one pass.
+        
+        Same resolution as get_latest/get_age_seconds: ares_signals.json
+        first, then the individual ARES files.
+        """
+        signals_data = self._safe_read_json(self.paths.ares_signals)
+        if not isinstance(signals_data, dict):
+            signals_data = {}
+        ares_index = None
+        
+        result = {}
+        for symbol in symbols:
+            signal = ref = None
+            symbol_signals = signals_data.get(symbol, {})
+            if symbol_signals:
+                signal = self._normalize(symbol, symbol_signals)
+                if "timestamp" in symbol_signals:
+                    ref = symbol_signals["timestamp"]
+            if signal is None or ref is None:
+                if ares_index is None:
+                    ares_index = self._ares_file_index()
+                indexed = ares_index.get(symbol)
+                if indexed is not None:
+                    first, latest_time = indexed
+                    if signal is None:
+                        signal = self._normalize(symbol, first)
+                    if ref is None and latest_time > 0:
+                        ref = latest_time
+            result[symbol] = (signal, ref)
+        return result
+    
+    def get_many(self, symbols: List[str]) -> Dict[str, Tuple[Optional[Dict[str, Any]], Optional[float]]]:
+        """Get (signal, age_seconds) per symbol"""
+        now = time.time()
+        return {symbol: (signal, now - ref if ref is not None else None)
+                for symbol, (signal, ref) in self.get_many_with_refs(symbols).items()}
+    
     def get_latest(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get latest signal for symbol"""
         # Check ARES signals file first
@@ -142,26 +377,14 @@ class FileSignalRepo(FileBackend, SignalRepo):
         if signals_data and isinstance(signals_data, dict):
             symbol_signals = signals_data.get(symbol, {})
             if symbol_signals:
-                return {
-                    "symbol": symbol,
-                    "signal": symbol_signals.get("signal", "HOLD"),
-                    "confidence": symbol_signals.get("confidence", 0.0),
-                    "timestamp": symbol_signals.get("timestamp", 0),
-                    "reason": symbol_signals.get("reason", "")
-                }
+                return self._normalize(symbol, symbol_signals)
         
         # Fallback to individual ARES files
         ares_files = list(self.paths.ares_dir.glob("*.json"))
         for signal_file in ares_files:
             data = self._safe_read_json(signal_file)
             if data and isinstance(data, dict) and data.get("symbol") == symbol:
-                return {
-                    "symbol": symbol,
-                    "signal": data.get("signal", "HOLD"),
-                    "confidence": data.get("confidence", 0.0),
-                    "timestamp": data.get("timestamp", 0),
-                    "reason": data.get("reason", "")
-                }
+                return self._normalize(symbol, data)
         
         return None
     
@@ -274,38 +497,227 @@ class FileMetricsRepo(FileBackend, MetricsRepo):
         }
 
 
+@dataclass
+class _ResourceMirror:
+    """Client-side copy of one read API resource"""
+    epoch: str
+    version: int
+    etag: str
+    items: Dict[str, Any] = field(default_factory=dict)
+    clock_offset: float = 0.0  # server time - local time
+    synced_at: float = 0.0     # local monotonic time of the last sync attempt
+
+
 class HTTPBackend:
-    """HTTP-based data backend (placeholder for future implementation)"""
+    """
+    Read API client (see coin_quant.shared.read_api).
+    
+    Keeps a local mirror per resource and syncs it with conditional,
+    delta-since-version requests over a keep-alive session. Syncs are
+    rate-limited to `min_sync_interval`, so per-symbol lookups within one
+    render share a request. On errors the last mirror keeps serving.
+    """
+    
+    def __init__(self, endpoint: str, timeout: float = 2.0, min_sync_interval: float = 0.5):
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        self.endpoint = endpoint.rstrip("/")
+        self.timeout = (min(1.0, timeout), timeout)  # (connect, read)
+        self.min_sync_interval = min_sync_interval
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._request_errors = (requests.RequestException, ValueError, KeyError)
+        self._mirrors: Dict[str, _ResourceMirror] = {}
+        self._lock = threading.Lock()
+        self._failing = False
+        self.requests = 0
+        self.not_modified = 0
+        self.failures = 0
+    
+    def sync(self, resource: str) -> Optional[_ResourceMirror]:
+        """Bring the local mirror of a resource up to date"""
+        mirror = self._mirrors.get(resource)
+        if mirror is not None and time.monotonic() - mirror.synced_at < self.min_sync_interval:
+            return mirror
+        
+        with self._lock:
+            mirror = self._mirrors.get(resource)
+            now = time.monotonic()
+            if mirror is not None and now - mirror.synced_at < self.min_sync_interval:
+                return mirror
+            
+            headers, params = {}, {}
+            if mirror is not None:
+                headers["If-None-Match"] = mirror.etag
+                params = {"since": mirror.version, "epoch": mirror.epoch}
+            
+            try:
+                self.requests += 1
+                response = self.session.get(f"{self.endpoint}/v1/{resource}", params=params,
+                                            headers=headers, timeout=self.timeout)
+                if response.status_code == 304 and mirror is not None:
+                    self.not_modified += 1
+                    mirror.synced_at = now
+                else:
+                    response.raise_for_status()
+                    mirror = self._apply(mirror, response.json(), response.headers.get("ETag", ""))
+                    mirror.synced_at = now
+                    self._mirrors[resource] = mirror
+                if self._failing:
+                    logger.info(f"Read API reachable again at {self.endpoint}")
+                    self._failing = False
+            except self._request_errors as e:
+                self.failures += 1
+                if not self._failing:
+                    logger.warning(f"Read API request failed ({self.endpoint}/v1/{resource}): {e}")
+                    self._failing = True
+                if mirror is not None:
+                    mirror.synced_at = now  # back off; keep serving the last copy
+            return mirror
+    
+    @staticmethod
+    def _apply(mirror: Optional[_ResourceMirror], payload: Dict[str, Any], etag: str) -> _ResourceMirror:
+        if payload["full"] or mirror is None or mirror.epoch != payload["epoch"]:
+            items = dict(payload["items"])
+        else:
+            items = dict(mirror.items)  # copy-on-write: readers may hold the old dict
+            items.update(payload["items"])
+            for key in payload["deleted"]:
+                items.pop(key, None)
+        return _ResourceMirror(
+            epoch=payload["epoch"],
+            version=payload["version"],
+            etag=etag,
+            items=items,
+            clock_offset=payload["server_time"] - time.time(),
+        )
     
-    def __init__(self, endpoint: str):
-        self.endpoint = endpoint
-        self.file_backend = FileBackend()
+    def items(self, resource: str) -> Dict[str, Any]:
+        mirror = self.sync(resource)
+        return mirror.items if mirror is not None else {}
+    
+    def server_now(self, resource: str) -> float:
+        mirror = self._mirrors.get(resource)
+        return time.time() + (mirror.clock_offset if mirror is not None else 0.0)
     
     def get_data(self, endpoint: str) -> Optional[Dict[str, Any]]:
-        """Get data from HTTP endpoint with fallback to file backend"""
-        # TODO: Implement HTTP client with timeout and error handling
-        # For now, fall back to file backend
-        logger.warning(f"HTTP backend not implemented, falling back to file backend for {endpoint}")
-        return None
+        """Get a resource's items by name (e.g. "prices" or "/prices")"""
+        mirror = self.sync(endpoint.strip("/"))
+        return dict(mirror.items) if mirror is not None else None
+    
+    def stats(self) -> Dict[str, int]:
+        return {"requests": self.requests, "not_modified": self.not_modified, "failures": self.failures}
+
+
+class HTTPPriceSnapshotRepo(PriceSnapshotRepo):
+    """Read API price snapshot repository"""
+    
+    def __init__(self, backend: HTTPBackend):
+        self.backend = backend
+    
+    def get_latest(self, symbol: str) -> Optional[Dict[str, Any]]:
+        item = self.backend.items("prices").get(symbol)
+        return dict(item["data"]) if item else None
+    
+    def get_age_seconds(self, symbol: str) -> Optional[float]:
+        item = self.backend.items("prices").get(symbol)
+        return self.backend.server_now("prices") - item["mtime"] if item else None
+    
+    def get_many(self, symbols: List[str]) -> Dict[str, Tuple[Optional[Dict[str, Any]], Optional[float]]]:
+        items = self.backend.items("prices")
+        now = self.backend.server_now("prices")
+        result = {}
+        for symbol in symbols:
+            item = items.get(symbol)
+            result[symbol] = (dict(item["data"]), now - item["mtime"]) if item else (None, None)
+        return result
+
+
+class HTTPSignalRepo(SignalRepo):
+    """Read API signal repository"""
+    
+    def __init__(self, backend: HTTPBackend):
+        self.backend = backend
+    
+    def get_latest(self, symbol: str) -> Optional[Dict[str, Any]]:
+        item = self.backend.items("signals").get(symbol)
+        return dict(item["data"]) if item else None
+    
+    def get_age_seconds(self, symbol: str) -> Optional[float]:
+        item = self.backend.items("signals").get(symbol)
+        if not item or item["age_ref"] is None:
+            return None
+        return self.backend.server_now("signals") - item["age_ref"]
+    
+    def get_many(self, symbols: List[str]) -> Dict[str, Tuple[Optional[Dict[str, Any]], Optional[float]]]:
+        items = self.backend.items("signals")
+        now = self.backend.server_now("signals")
+        result = {}
+        for symbol in symbols:
+            item = items.get(symbol)
+            if not item:
+                result[symbol] = (None, None)
+            else:
+                age = now - item["age_ref"] if item["age_ref"] is not None else None
+                result[symbol] = (dict(item["data"]), age)
+        return result
+
+
+class HTTPPositionRepo(PositionRepo):
+    """Read API position repository"""
+    
+    def __init__(self, backend: HTTPBackend):
+        self.backend = backend
+    
+    def get_all(self) -> Dict[str, Dict[str, Any]]:
+        return dict(self.backend.items("positions"))
+    
+    def get_by_symbol(self, symbol: str) -> Optional[Dict[str, Any]]:
+        return self.backend.items("positions").get(symbol)
+
+
+class HTTPHealthRepo(HealthRepo):
+    """Read API health repository"""
+    
+    def __init__(self, backend: HTTPBackend):
+        self.backend = backend
+    
+    def get_component_status(self, name: str) -> Optional[Dict[str, Any]]:
+        return self.backend.items("health").get(name)
+    
+    def get_all(self) -> Dict[str, Any]:
+        return {
+            "timestamp": time.time(),
+            "components": dict(self.backend.items("health"))
+        }
 
 
 class DataBus:
     """Unified data access interface"""
     
-    def __init__(self, backend_type: str = "file", endpoint: Optional[str] = None):
+    def __init__(self, backend_type: str = "file", endpoint: Optional[str] = None,
+                 file_cache: bool = True, timeout: float = 2.0, price_board: bool = True):
         self.backend_type = backend_type
+        # Shared by all file repositories: each file is parsed once until it changes
+        self.file_cache = FileCache() if file_cache else None
         
         if backend_type == "http" and endpoint:
-            self.backend = HTTPBackend(endpoint)
+            self.backend = HTTPBackend(endpoint, timeout=timeout)
+            self.prices = HTTPPriceSnapshotRepo(self.backend)
+            self.signals = HTTPSignalRepo(self.backend)
+            self.positions = HTTPPositionRepo(self.backend)
+            self.health = HTTPHealthRepo(self.backend)
         else:
-            self.backend = FileBackend()
-        
-        # Initialize repositories
-        self.prices = FilePriceSnapshotRepo()
-        self.signals = FileSignalRepo()
-        self.positions = FilePositionRepo()
-        self.health = FileHealthRepo()
-        self.metrics = FileMetricsRepo()
+            self.backend = FileBackend(self.file_cache)
+            board = PriceBoardReader(fallback=False) if price_board else None
+            self.prices = FilePriceSnapshotRepo(self.file_cache, board)
+            self.signals = FileSignalRepo(self.file_cache)
+            self.positions = FilePositionRepo(self.file_cache)
+            self.health = FileHealthRepo(self.file_cache)
+        self.metrics = FileMetricsRepo(self.file_cache)
     
     def get_symbol_data(self, symbol: str) -> Dict[str, Any]:
         """Get comprehensive data for a symbol"""
@@ -328,10 +740,33 @@ class DataBus:
         }
     
     def get_all_symbols_data(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
-        """Get data for multiple symbols"""
+        """
+        Get data for multiple symbols in one pass.
+        
+        Reads ares_signals.json, the ARES directory and the positions file
+        once for all symbols (instead of once or twice per symbol) and each
+        price snapshot once; cards match get_symbol_data().
+        """
+        prices = self.prices.get_many(symbols)
+        signals = self.signals.get_many(symbols)
+        positions = self.positions.get_all()
+        
         result = {}
         for symbol in symbols:
-            result[symbol] = self.get_symbol_data(symbol)
+            price_data, price_age = prices[symbol]
+            signal_data, signal_age = signals[symbol]
+            position_data = positions.get(symbol)
+            result[symbol] = {
+                "symbol": symbol,
+                "price": price_data,
+                "signal": signal_data,
+                "position": position_data,
+                "price_age_seconds": price_age,
+                "signal_age_seconds": signal_age,
+                "has_price_data": price_data is not None,
+                "has_signal_data": signal_data is not None,
+                "has_position_data": position_data is not None
+            }
         return result
     
     def get_health_summary(self) -> Dict[str, Any]:
@@ -351,8 +786,9 @@ def create_data_bus() -> DataBus:
     """Create DataBus instance with configuration from environment"""
     backend_type = os.getenv("MONITORING_BACKEND", "file")
     endpoint = os.getenv("MONITORING_ENDPOINT")
+    timeout = float(os.getenv("READ_API_TIMEOUT_SEC", "2.0"))
     
-    return DataBus(backend_type=backend_type, endpoint=endpoint)
+    return DataBus(backend_type=backend_type, endpoint=endpoint, timeout=timeout)
 
 
 # Global data bus instance
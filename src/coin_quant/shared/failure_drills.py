@@ -19,6 +19,7 @@ from enum import Enum
 
 from coin_quant.shared.io import AtomicWriter, AtomicReader
 from coin_quant.shared.paths import get_data_dir
+from coin_quant.shared.process_registry import process_registry
 from coin_quant.shared.time import utc_now_seconds
 
 logger = logging.getLogger(__name__)
@@ -392,7 +393,10 @@ class FailureDrillManager:
         return health_data.get("components", {}).get(component)
     
     def _find_service_pid(self, service_name: str) -> Optional[int]:
-        """Find service process ID"""
+        """Find service process ID (registry lookup, full scan for unregistered services)"""
+        pid = process_registry.get_pid(service_name)
+        if pid is not None:
+            return pid
         for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
             try:
                 cmdline = proc.info['cmdline']
@@ -3,12 +3,18 @@ Health Contracts & Readiness Gates for Coin Quant R11
 
 Centralized health status management with readiness gates.
 Enforces health contracts across all services.
+
+When a health registry is running (coin_quant.shared.health_registry),
+status updates are pushed to it and reads come from one registry snapshot;
+the health files are then regenerated by the registry as an export.
+Without a registry everything falls back to the health files.
 """
 
 import json
 import time
 from pathlib import Path
 from typing import Any, Dict, Optional, List
+from coin_quant.shared.config import config_manager
 from coin_quant.shared.io import atomic_write_json, safe_read_json
 from coin_quant.shared.paths import get_health_dir, get_feeder_health_path, get_ares_health_path, get_trader_health_path, get_memory_health_path
 from coin_quant.shared.time import utc_now_seconds, age_seconds
@@ -18,8 +24,8 @@ class HealthManager:
     """Centralized health status manager with readiness gates"""
     
     def __init__(self):
+        # created by the first health write (atomic_write_json), not at import
         self.health_dir = get_health_dir()
-        self.health_dir.mkdir(parents=True, exist_ok=True)
         
         # Health file paths
         self.feeder_health_path = get_feeder_health_path()
@@ -30,17 +36,67 @@ class HealthManager:
         # Health thresholds
         self.freshness_threshold = 10.0  # seconds
         self.stale_threshold = 30.0  # seconds
+        
+        # Health registry (push + snapshot reads); files remain the fallback
+        self.registry_enabled = config_manager.get_bool("HEALTH_REGISTRY_ENABLED", True)
+        # always: keep writing files too | auto: write files only while no registry answers
+        self.file_writes = str(config_manager.get("HEALTH_FILE_WRITES", "auto")).lower()
+        self.snapshot_ttl = config_manager.get_float("HEALTH_SNAPSHOT_TTL_SEC", 0.5)
+        self._registry = None
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._snapshot_at = 0.0
+    
+    @property
+    def registry(self):
+        """Registry client, created on first use"""
+        if self._registry is None and self.registry_enabled:
+            from coin_quant.shared.health_registry import HealthRegistryClient
+            self._registry = HealthRegistryClient()
+        return self._registry
     
     def _write_health_file(self, file_path: Path, health_data: Dict[str, Any]) -> bool:
-        """Write health data to file atomically"""
+        """Push health data to the registry and/or write it to file atomically"""
         try:
             health_data["last_update_ts"] = utc_now_seconds()
             health_data["updated_within_sec"] = 0
+            pushed = False
+            registry = self.registry
+            if registry is not None and registry.push(health_data.get("service") or file_path.stem, health_data):
+                pushed = registry.is_available()
+                self._snapshot = None
+            if pushed and self.file_writes != "always":
+                return True
             return atomic_write_json(file_path, health_data)
         except Exception as e:
             print(f"Failed to write health file {file_path}: {e}")
             return False
     
+    def registry_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Registry snapshot reused for snapshot_ttl so one check cycle reads one view"""
+        registry = self.registry
+        if registry is None:
+            return None
+        now = time.monotonic()
+        if self._snapshot is None or now - self._snapshot_at > self.snapshot_ttl:
+            if self._snapshot_at and not registry.is_available():
+                self._snapshot = None
+            else:
+                self._snapshot = registry.snapshot()
+            self._snapshot_at = now
+        return self._snapshot
+    
+    def _get_component_health(self, component: str, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Component health from the registry snapshot, else from its file"""
+        snapshot = self.registry_snapshot()
+        if snapshot:
+            health = snapshot.get("components", {}).get(component)
+            if health is not None:
+                health = dict(health)
+                age = health["updated_within_sec"] + time.time() - snapshot["timestamp"]
+                health["updated_within_sec"] = max(0.0, age)
+                return health
+        return self._read_health_file(file_path)
+    
     def _read_health_file(self, file_path: Path) -> Optional[Dict[str, Any]]:
         """Read health data from file"""
         try:
@@ -124,19 +180,19 @@ class HealthManager:
     
     def get_feeder_health(self) -> Optional[Dict[str, Any]]:
         """Get feeder health status"""
-        return self._read_health_file(self.feeder_health_path)
+        return self._get_component_health("feeder", self.feeder_health_path)
     
     def get_ares_health(self) -> Optional[Dict[str, Any]]:
         """Get ARES health status"""
-        return self._read_health_file(self.ares_health_path)
+        return self._get_component_health("ares", self.ares_health_path)
     
     def get_trader_health(self) -> Optional[Dict[str, Any]]:
         """Get trader health status"""
-        return self._read_health_file(self.trader_health_path)
+        return self._get_component_health("trader", self.trader_health_path)
     
     def get_memory_health(self) -> Optional[Dict[str, Any]]:
         """Get memory layer health status"""
-        return self._read_health_file(self.memory_health_path)
+        return self._get_component_health("memory", self.memory_health_path)
     
     def is_feeder_healthy(self) -> bool:
         """Check if feeder is healthy and fresh"""
@@ -110,7 +110,6 @@ class HealthManager:
     
     def __init__(self, health_file: Optional[Path] = None):
         self.health_file = health_file if health_file else get_health_dir() / "health.json"
-        self.health_file.parent.mkdir(parents=True, exist_ok=True)
         self.writer = AtomicWriter()
         self.reader = AtomicReader()
         self.thresholds = HealthThresholds()
@@ -482,14 +481,24 @@ class ReadinessGate:
 
 
 # Global health manager instance
-health_manager = HealthManager()
+_health_manager: Optional[HealthManager] = None
 
 
 def get_health_manager() -> HealthManager:
-    """Get global health manager instance"""
-    return health_manager
+    """Get global health manager instance (created on first use, not at import)"""
+    global _health_manager
+    if _health_manager is None:
+        _health_manager = HealthManager()
+    return _health_manager
+
+
+def __getattr__(name: str):
+    # `health_manager` used to be created at import time
+    if name == "health_manager":
+        return get_health_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def create_readiness_gate(service_name: str) -> ReadinessGate:
     """Create readiness gate for service"""
-    return ReadinessGate(health_manager, service_name)
+    return ReadinessGate(get_health_manager(), service_name)
@@ -0,0 +1,541 @@
+"""
+Push-based Health Registry for Coin Quant R11
+
+Services push their component status to one registry process over a local
+UDP socket instead of every consumer re-reading `health/*.json` on its own
+timer. Consumers either read one consistent in-memory snapshot or
+subscribe and are told about changes as they happen.
+
+- `HealthRegistry`: versioned in-memory table. A deadline-driven watchdog
+  marks a component stale exactly `stale_after` seconds after its last
+  push (no polling) and notifies subscribers.
+- The component JSON files are only an export: rewritten when a component
+  changed, at most once per `export_interval`, for legacy file readers.
+- `HealthRegistryServer`: datagram front end on 127.0.0.1.
+- `HealthRegistryClient`: fire-and-forget `push()` plus `snapshot()` with
+  a short timeout; returns None when no registry is running so callers can
+  fall back to the files.
+- `HealthSubscriber`: remote change stream (leased, renewed automatically).
+
+Wire format: one JSON object per datagram.
+    {"op": "push", "component": "feeder", "health": {...}}
+    {"op": "snapshot", "id": 7}      -> {"op": "snapshot", "id": 7, "snapshot": {...}}
+    {"op": "subscribe"}              -> snapshot reply, then {"op": "event", ...}
+    {"op": "unsubscribe"}
+
+Run: python -m coin_quant.shared.health_registry [--port 8766] [--no-export]
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from coin_quant.shared.config import config_manager
+from coin_quant.shared.io import atomic_write_json
+from coin_quant.shared.paths import get_health_dir
+
+logger = logging.getLogger(__name__)
+
+MAX_DATAGRAM = 65507
+SUBSCRIPTION_LEASE_SEC = 30.0
+
+Subscriber = Callable[[Dict[str, Any]], None]
+
+
+class _Entry:
+    """Latest pushed health of one component"""
+
+    __slots__ = ("health", "last_update_ts", "deadline", "stale", "version")
+
+    def __init__(self, health: Dict[str, Any], last_update_ts: float, deadline: float, version: int):
+        self.health = health
+        self.last_update_ts = last_update_ts
+        self.deadline = deadline
+        self.stale = False
+        self.version = version
+
+    def view(self, now: float) -> Dict[str, Any]:
+        data = dict(self.health)
+        data["last_update_ts"] = self.last_update_ts
+        data["updated_within_sec"] = max(0.0, now - self.last_update_ts)
+        data["stale"] = self.stale
+        return data
+
+
+class HealthRegistry:
+    """In-memory component health table with staleness watchdog and file export"""
+
+    def __init__(self, stale_after: Optional[float] = None,
+                 export_dir: Optional[Path] = None,
+                 export_interval: Optional[float] = None):
+        self.stale_after = stale_after or config_manager.get_float("HEALTH_STALE_SEC", 30.0)
+        self.export_dir = Path(export_dir) if export_dir else None
+        self.export_interval = export_interval if export_interval is not None else \
+            config_manager.get_float("HEALTH_EXPORT_INTERVAL_SEC", 1.0)
+        self.version = 0
+        self.pushes = 0
+        self.exports = 0
+        self._cond = threading.Condition()
+        self._entries: Dict[str, _Entry] = {}
+        self._dirty: Dict[str, None] = {}
+        self._subscribers: List[Subscriber] = []
+        self._threads: List[threading.Thread] = []
+        self._running = False
+
+    # --- writes ---
+
+    def update(self, component: str, health: Dict[str, Any]) -> int:
+        """Record a component's health; returns the new registry version"""
+        now_mono = time.monotonic()
+        health = dict(health)
+        last_update_ts = float(health.pop("last_update_ts", 0) or time.time())
+        health.pop("updated_within_sec", None)
+        health.pop("stale", None)
+        with self._cond:
+            self.pushes += 1
+            self.version += 1
+            entry = self._entries.get(component)
+            was_stale = entry is not None and entry.stale
+            self._entries[component] = entry = _Entry(
+                health, last_update_ts, now_mono + self.stale_after, self.version)
+            self._dirty[component] = None
+            event = self._event("update", component, entry, time.time())
+            event["recovered"] = was_stale
+            self._cond.notify_all()
+            subscribers = list(self._subscribers)
+        self._dispatch(subscribers, [event])
+        return event["version"]
+
+    def remove(self, component: str) -> bool:
+        with self._cond:
+            if self._entries.pop(component, None) is None:
+                return False
+            self.version += 1
+            event = {"type": "removed", "component": component, "version": self.version}
+            self._cond.notify_all()
+            subscribers = list(self._subscribers)
+        self._dispatch(subscribers, [event])
+        return True
+
+    # --- reads ---
+
+    def get(self, component: str) -> Optional[Dict[str, Any]]:
+        with self._cond:
+            entry = self._entries.get(component)
+            return entry.view(time.time()) if entry else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Consistent view of every component at one registry version"""
+        with self._cond:
+            now = time.time()
+            return {
+                "version": self.version,
+                "timestamp": now,
+                "stale_after": self.stale_after,
+                "components": {name: entry.view(now) for name, entry in self._entries.items()},
+            }
+
+    def wait_for_change(self, since: int, timeout: Optional[float] = None) -> int:
+        """Block until the version moves past `since` (or timeout); returns the version"""
+        with self._cond:
+            self._cond.wait_for(lambda: self.version > since, timeout)
+            return self.version
+
+    def subscribe(self, callback: Subscriber) -> None:
+        """Call `callback(event)` on every update, stale transition and removal"""
+        with self._cond:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Subscriber) -> None:
+        with self._cond:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    # --- lifecycle ---
+
+    def start(self):
+        """Start the staleness watchdog and, with an export dir, the exporter"""
+        if self._running:
+            return
+        self._running = True
+        self._threads = [threading.Thread(target=self._watchdog_loop, name="health-watchdog", daemon=True)]
+        if self.export_dir is not None:
+            self._threads.append(threading.Thread(target=self._export_loop, name="health-export", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+        if self.export_dir is not None:
+            self.export()
+
+    def expire(self, now_mono: Optional[float] = None) -> float:
+        """Mark components past their deadline stale; returns seconds to the next deadline"""
+        now_mono = time.monotonic() if now_mono is None else now_mono
+        events = []
+        with self._cond:
+            next_deadline = float("inf")
+            for name, entry in self._entries.items():
+                if entry.stale:
+                    continue
+                if entry.deadline <= now_mono:
+                    entry.stale = True
+                    self.version += 1
+                    entry.version = self.version
+                    events.append(self._event("stale", name, entry, time.time()))
+                else:
+                    next_deadline = min(next_deadline, entry.deadline)
+            if events:
+                self._cond.notify_all()
+            subscribers = list(self._subscribers)
+        self._dispatch(subscribers, events)
+        return next_deadline - now_mono
+
+    def export(self) -> int:
+        """Write changed components to `<export_dir>/<component>.json`"""
+        with self._cond:
+            dirty = [(name, self._entries[name]) for name in self._dirty if name in self._entries]
+            self._dirty.clear()
+            payloads = [(name, dict(entry.health, last_update_ts=entry.last_update_ts, updated_within_sec=0))
+                        for name, entry in dirty]
+        for name, payload in payloads:
+            if atomic_write_json(self.export_dir / f"{name}.json", payload):
+                self.exports += 1
+        return len(payloads)
+
+    def _watchdog_loop(self):
+        while True:
+            wait = self.expire()
+            with self._cond:
+                if not self._running:
+                    return
+                # woken early by update() when a new (possibly earlier) deadline appears
+                self._cond.wait(None if wait == float("inf") else max(wait, 0.001))
+                if not self._running:
+                    return
+
+    def _export_loop(self):
+        self.export_dir.mkdir(parents=True, exist_ok=True)
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._dirty or not self._running)
+                if not self._running:
+                    return
+            try:
+                self.export()
+            except Exception as e:
+                logger.error(f"Health export failed: {e}")
+            time.sleep(self.export_interval)
+
+    def _event(self, kind: str, component: str, entry: _Entry, now: float) -> Dict[str, Any]:
+        return {"type": kind, "component": component, "version": self.version, "health": entry.view(now)}
+
+    @staticmethod
+    def _dispatch(subscribers: List[Subscriber], events: List[Dict[str, Any]]):
+        for event in events:
+            for callback in subscribers:
+                try:
+                    callback(event)
+                except Exception as e:
+                    logger.error(f"Health subscriber failed: {e}")
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class HealthRegistryServer:
+    """Local datagram front end for a HealthRegistry"""
+
+    def __init__(self, registry: Optional[HealthRegistry] = None,
+                 host: Optional[str] = None, port: Optional[int] = None):
+        self.registry = registry or HealthRegistry(export_dir=get_health_dir())
+        self.host = host or config_manager.get("HEALTH_REGISTRY_HOST", "127.0.0.1")
+        self.port = port if port is not None else config_manager.get_int("HEALTH_REGISTRY_PORT", 8766)
+        self.sock: Optional[socket.socket] = None
+        self.thread: Optional[threading.Thread] = None
+        self.running = False
+        self._leases: Dict[Tuple[str, int], float] = {}
+        self._leases_lock = threading.Lock()
+
+    def start(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((self.host, self.port))
+        self.sock.settimeout(0.5)
+        self.port = self.sock.getsockname()[1]
+        self.running = True
+        self.registry.subscribe(self._forward)
+        self.registry.start()
+        self.thread = threading.Thread(target=self._serve, name="health-registry", daemon=True)
+        self.thread.start()
+        logger.info(f"Health registry listening on udp://{self.host}:{self.port}")
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=5)
+            self.thread = None
+        self.registry.unsubscribe(self._forward)
+        self.registry.stop()
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+        logger.info("Health registry stopped")
+
+    def _serve(self):
+        while self.running:
+            try:
+                payload, addr = self.sock.recvfrom(MAX_DATAGRAM)
+            except socket.timeout:
+                continue
+            except OSError:
+                # ICMP errors from a departed subscriber surface here
+                continue
+            try:
+                self._handle(json.loads(payload), addr)
+            except Exception as e:
+                logger.debug(f"Dropping health datagram from {addr}: {e}")
+
+    def _handle(self, message: Dict[str, Any], addr: Tuple[str, int]):
+        op = message.get("op")
+        if op == "push":
+            self.registry.update(str(message["component"]), message.get("health") or {})
+        elif op == "snapshot":
+            self._send({"op": "snapshot", "id": message.get("id"), "snapshot": self.registry.snapshot()}, addr)
+        elif op == "subscribe":
+            with self._leases_lock:
+                self._leases[addr] = time.monotonic() + SUBSCRIPTION_LEASE_SEC
+            self._send({"op": "snapshot", "id": message.get("id"), "snapshot": self.registry.snapshot()}, addr)
+        elif op == "unsubscribe":
+            with self._leases_lock:
+                self._leases.pop(addr, None)
+
+    def _forward(self, event: Dict[str, Any]):
+        now = time.monotonic()
+        with self._leases_lock:
+            for addr in [a for a, expiry in self._leases.items() if expiry < now]:
+                del self._leases[addr]
+            subscribers = list(self._leases)
+        if subscribers:
+            message = {"op": "event", **event}
+            for addr in subscribers:
+                self._send(message, addr)
+
+    def _send(self, message: Dict[str, Any], addr: Tuple[str, int]):
+        sock = self.sock
+        if sock is None:
+            return
+        try:
+            sock.sendto(_encode(message), addr)
+        except OSError as e:
+            logger.debug(f"Health registry send to {addr} failed: {e}")
+
+
+class HealthRegistryClient:
+    """Publisher/reader side of the registry; never raises on a missing registry"""
+
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None,
+                 timeout: Optional[float] = None):
+        self.host = host or config_manager.get("HEALTH_REGISTRY_HOST", "127.0.0.1")
+        self.port = port if port is not None else config_manager.get_int("HEALTH_REGISTRY_PORT", 8766)
+        self.timeout = timeout if timeout is not None else \
+            config_manager.get_float("HEALTH_REGISTRY_TIMEOUT_SEC", 0.05)
+        self.probe_interval = config_manager.get_float("HEALTH_REGISTRY_PROBE_SEC", 5.0)
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._available: Optional[bool] = None
+        self._checked_at = 0.0
+
+    def _socket(self) -> socket.socket:
+        if self._sock is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            # connected: a closed port is reported (ECONNREFUSED) instead of timing out
+            sock.connect((self.host, self.port))
+            self._sock = sock
+        return self._sock
+
+    def push(self, component: str, health: Dict[str, Any]) -> bool:
+        """Send a component's health; fire and forget"""
+        try:
+            payload = _encode({"op": "push", "component": component, "health": health})
+            with self._lock:
+                self._socket().send(payload)
+            return True
+        except OSError:
+            return False
+
+    def snapshot(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Registry snapshot, or None when no registry answered in time"""
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            try:
+                sock = self._socket()
+                self._drain(sock)
+                request_id = next(self._ids)
+                sock.send(_encode({"op": "snapshot", "id": request_id}))
+                deadline = time.monotonic() + timeout
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise socket.timeout()
+                    sock.settimeout(remaining)
+                    reply = json.loads(sock.recv(MAX_DATAGRAM))
+                    if reply.get("op") == "snapshot" and reply.get("id") == request_id:
+                        self._mark(True)
+                        return reply["snapshot"]
+            except (OSError, ValueError):
+                self._mark(False)
+                return None
+
+    def is_available(self) -> bool:
+        """Whether a registry answered recently (probes at most every probe interval)"""
+        if self._available is None or time.monotonic() - self._checked_at >= self.probe_interval:
+            self.snapshot()
+        return bool(self._available)
+
+    def close(self):
+        with self._lock:
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
+
+    def _mark(self, available: bool):
+        self._available = available
+        self._checked_at = time.monotonic()
+
+    @staticmethod
+    def _drain(sock: socket.socket):
+        """Discard late replies and queued ICMP errors from earlier sends"""
+        sock.setblocking(False)
+        try:
+            while True:
+                sock.recv(MAX_DATAGRAM)
+        except (BlockingIOError, OSError):
+            pass
+        finally:
+            sock.setblocking(True)
+
+
+class HealthSubscriber:
+    """Receives registry events in a background thread and keeps a local mirror"""
+
+    def __init__(self, callback: Optional[Subscriber] = None,
+                 host: Optional[str] = None, port: Optional[int] = None):
+        self.callback = callback
+        self.host = host or config_manager.get("HEALTH_REGISTRY_HOST", "127.0.0.1")
+        self.port = port if port is not None else config_manager.get_int("HEALTH_REGISTRY_PORT", 8766)
+        self.components: Dict[str, Dict[str, Any]] = {}
+        self.version = 0
+        self.connected = False
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def start(self):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.connect((self.host, self.port))
+        self._sock.settimeout(0.5)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="health-subscriber", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._sock is not None:
+            try:
+                self._sock.send(_encode({"op": "unsubscribe"}))
+            except OSError:
+                pass
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _run(self):
+        renew_at = 0.0
+        while self._running:
+            now = time.monotonic()
+            if now >= renew_at:
+                try:
+                    self._sock.send(_encode({"op": "subscribe"}))
+                except OSError:
+                    pass
+                # renew well inside the lease; retry quickly while disconnected
+                renew_at = now + (SUBSCRIPTION_LEASE_SEC / 3 if self.connected else 1.0)
+            try:
+                message = json.loads(self._sock.recv(MAX_DATAGRAM))
+            except socket.timeout:
+                continue
+            except (OSError, ValueError):
+                self.connected = False
+                continue
+            self._apply(message)
+
+    def _apply(self, message: Dict[str, Any]):
+        op = message.get("op")
+        if op == "snapshot":
+            snapshot = message.get("snapshot") or {}
+            self.connected = True
+            self.components = dict(snapshot.get("components", {}))
+            self.version = snapshot.get("version", 0)
+            event = {"type": "snapshot", "version": self.version, "components": self.components}
+        elif op == "event":
+            event = {k: v for k, v in message.items() if k != "op"}
+            components = dict(self.components)
+            if event.get("type") == "removed":
+                components.pop(event.get("component"), None)
+            else:
+                components[event.get("component")] = event.get("health")
+            self.components = components
+            self.version = event.get("version", self.version)
+        else:
+            return
+        if self.callback:
+            try:
+                self.callback(event)
+            except Exception as e:
+                logger.error(f"Health subscriber callback failed: {e}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Coin Quant health registry")
+    parser.add_argument("--host", help="Bind address (default HEALTH_REGISTRY_HOST or 127.0.0.1)")
+    parser.add_argument("--port", type=int, help="UDP port (default HEALTH_REGISTRY_PORT or 8766)")
+    parser.add_argument("--stale-after", type=float, help="Seconds without a push before a component is stale")
+    parser.add_argument("--no-export", action="store_true", help="Do not regenerate health/*.json")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    registry = HealthRegistry(stale_after=args.stale_after,
+                              export_dir=None if args.no_export else get_health_dir())
+    registry.subscribe(lambda e: e["type"] == "stale" and logger.warning(
+        f"Health component {e['component']} is stale"))
+    server = HealthRegistryServer(registry, args.host, args.port)
+    server.start()
+    print(f"Health registry running on udp://{server.host}:{server.port}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
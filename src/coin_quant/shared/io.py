@@ -56,6 +56,31 @@ class AtomicWriter:
         except Exception as e:
             raise AtomicIOError(f"JSON write failed for {file_path}: {e}")
     
+    def write_bytes(self, file_path: Union[str, Path], content: bytes,
+                    ensure_dirs: bool = True) -> bool:
+        """
+        Atomic binary file write.
+        
+        Args:
+            file_path: Target file path
+            content: Bytes to write
+            ensure_dirs: Whether to ensure parent directories exist
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            file_path = Path(file_path)
+            
+            if ensure_dirs:
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            temp_file = file_path.parent / f".tmp_{os.getpid()}_{uuid.uuid4().hex[:8]}.bin"
+            return self._atomic_write_with_retry(temp_file, content, file_path)
+            
+        except Exception as e:
+            raise AtomicIOError(f"Binary write failed for {file_path}: {e}")
+    
     def write_text(self, file_path: Union[str, Path], content: str, 
                    encoding: str = 'utf-8', ensure_dirs: bool = True) -> bool:
         """
@@ -118,7 +143,7 @@ class AtomicWriter:
         except Exception as e:
             raise AtomicIOError(f"NDJSON append failed for {file_path}: {e}")
     
-    def _atomic_write_with_retry(self, temp_file: Path, content: str, 
+    def _atomic_write_with_retry(self, temp_file: Path, content: Union[str, bytes],
                                 target_file: Path, encoding: str = 'utf-8') -> bool:
         """
         Atomic write with retry logic.
@@ -126,7 +151,7 @@ class AtomicWriter:
         Args:
             temp_file: Temporary file path
             target_file: Target file path
-            content: Content to write
+            content: Content to write (bytes are written as-is)
             encoding: Text encoding
             
         Returns:
@@ -135,7 +160,11 @@ class AtomicWriter:
         for attempt in range(self.max_retries):
             try:
                 # Write to temporary file
-                with open(temp_file, 'w', encoding=encoding) as f:
+                if isinstance(content, bytes):
+                    f = open(temp_file, 'wb')
+                else:
+                    f = open(temp_file, 'w', encoding=encoding)
+                with f:
                     f.write(content)
                     f.flush()
                     os.fsync(f.fileno())  # Force write to disk
@@ -0,0 +1,67 @@
+"""
+Deferred imports for Coin Quant R11
+
+Service cold start should only pay for the code paths it runs:
+
+- `lazy_import("requests")` returns a module whose import runs on first
+  attribute access (importlib.util.LazyLoader). Use it for heavy
+  dependencies that only a few functions of a module touch; with
+  `optional=True` a missing package yields None instead of ImportError.
+- `lazy_submodules(__name__, [...])` returns PEP 562 `__getattr__` and
+  `__dir__` for a package `__init__`: `coin_quant.shared.config` still
+  resolves as an attribute, but `import coin_quant` imports nothing else.
+
+Module-level singletons that touch the filesystem are created by their
+`get_*()` accessor on first use instead of at import.
+"""
+
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+
+def lazy_import(name: str, optional: bool = False) -> Optional[ModuleType]:
+    """
+    Module that is executed on first attribute access.
+
+    Args:
+        name: Absolute module name
+        optional: Return None (instead of raising ImportError) if the
+            module is not installed
+
+    Returns:
+        The module (already imported modules are returned as is)
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        if optional:
+            return None
+        raise ImportError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def lazy_submodules(package: str, submodules: Iterable[str]) -> Tuple[Callable[[str], Any],
+                                                                       Callable[[], List[str]]]:
+    """PEP 562 `__getattr__`/`__dir__` importing `package.<name>` on first access"""
+    names = frozenset(submodules)
+
+    def __getattr__(name: str) -> Any:
+        if name in names:
+            return importlib.import_module(f"{package}.{name}")
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+    def __dir__() -> List[str]:
+        return sorted(names | set(vars(sys.modules[package])))
+
+    return __getattr__, __dir__
+
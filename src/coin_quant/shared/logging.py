@@ -18,7 +18,6 @@ class LoggingManager:
     
     def __init__(self):
         self.logs_dir = get_logs_dir()
-        self.logs_dir.mkdir(parents=True, exist_ok=True)
         self._configured_loggers = set()
     
     def setup_logging(self, service_name: str, level: str = "INFO", 
@@ -61,6 +60,7 @@ class LoggingManager:
         
         # File handler
         if log_to_file:
+            self.logs_dir.mkdir(parents=True, exist_ok=True)
             log_file = self.logs_dir / f"{service_name}.log"
             file_handler = logging.FileHandler(log_file, encoding='utf-8')
             file_handler.setFormatter(formatter)
@@ -49,7 +49,6 @@ class MemoryValidator:
     
     def __init__(self, data_dir: Optional[Path] = None):
         self.data_dir = data_dir or get_data_dir() / "memory"
-        self.data_dir.mkdir(parents=True, exist_ok=True)
         self.writer = AtomicWriter()
         self.reader = AtomicReader()
         
@@ -518,9 +517,19 @@ class MemoryValidator:
 
 
 # Global memory validator instance
-memory_validator = MemoryValidator()
+_memory_validator: Optional[MemoryValidator] = None
 
 
 def get_memory_validator() -> MemoryValidator:
-    """Get global memory validator instance"""
-    return memory_validator
+    """Get global memory validator instance (created on first use, not at import)"""
+    global _memory_validator
+    if _memory_validator is None:
+        _memory_validator = MemoryValidator()
+    return _memory_validator
+
+
+def __getattr__(name: str):
+    # `memory_validator` used to be created at import time
+    if name == "memory_validator":
+        return get_memory_validator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
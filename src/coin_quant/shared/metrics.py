@@ -0,0 +1,530 @@
+"""
+Unified metrics registry for Coin Quant R11
+
+In-process counters, gauges and fixed-bucket latency histograms with
+label support, Prometheus text exposition and a compact on-disk rollup.
+
+Hot-path recording is lock-free: every thread writes into its own shard
+and readers merge the shards when rendering, so `inc()`/`observe()` never
+contend with each other or with the exporter.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from coin_quant.shared.io import atomic_write_json
+from coin_quant.shared.paths import get_data_dir
+from coin_quant.shared.time import utc_now_seconds
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds: 100us .. 30s, roughly 2.5x apart
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+class MetricsError(Exception):
+    """Metrics registry related error"""
+    pass
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Sequence[str],
+                   extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{k}="{_escape_label_value(v)}"' for k, v in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def quantile_from_buckets(bounds: Sequence[float], buckets: Sequence[int],
+                          q: float) -> Optional[float]:
+    """
+    Estimate a quantile from per-bucket (non-cumulative) counts.
+
+    Interpolates linearly inside the bucket holding the target rank; values
+    in the overflow bucket are reported as the largest finite bound.
+
+    Args:
+        bounds: Sorted finite upper bounds
+        buckets: len(bounds) + 1 counts, the last one being the +Inf bucket
+        q: Quantile in [0, 1]
+
+    Returns:
+        Estimated value or None when the histogram is empty
+    """
+    count = sum(buckets)
+    if count == 0:
+        return None
+    rank = q * count
+    seen = 0
+    for i, bucket_count in enumerate(buckets):
+        if bucket_count and seen + bucket_count >= rank:
+            if i >= len(bounds):
+                return bounds[-1]
+            lower = bounds[i - 1] if i > 0 else 0.0
+            upper = bounds[i]
+            return lower + (upper - lower) * ((rank - seen) / bucket_count)
+        seen += bucket_count
+    return bounds[-1]
+
+
+class _CounterChild:
+    """Single labelled counter series with per-thread shards"""
+
+    __slots__ = ("_shards",)
+
+    def __init__(self):
+        self._shards: Dict[int, List[float]] = {}
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise MetricsError("Counters can only increase")
+        shard = self._shards.get(threading.get_ident())
+        if shard is None:
+            shard = self._shards.setdefault(threading.get_ident(), [0.0])
+        shard[0] += amount
+
+    def get(self) -> float:
+        return sum(shard[0] for shard in list(self._shards.values()))
+
+
+class _GaugeChild:
+    """Single labelled gauge series (last write wins)"""
+
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def get(self) -> float:
+        return self._value
+
+
+class _HistogramChild:
+    """Single labelled histogram series with per-thread bucket shards"""
+
+    __slots__ = ("_bounds", "_shards")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        # shard layout: [bucket_0 .. bucket_n (+Inf), sum, count]
+        self._shards: Dict[int, List[float]] = {}
+
+    def _shard(self) -> List[float]:
+        shard = self._shards.get(threading.get_ident())
+        if shard is None:
+            shard = self._shards.setdefault(
+                threading.get_ident(), [0] * (len(self._bounds) + 1) + [0.0, 0]
+            )
+        return shard
+
+    def observe(self, value: float) -> None:
+        shard = self._shard()
+        shard[bisect_left(self._bounds, value)] += 1
+        shard[-2] += value
+        shard[-1] += 1
+
+    def time(self) -> "_Timer":
+        """Context manager observing the elapsed monotonic time in seconds"""
+        return _Timer(self)
+
+    def merged(self) -> Tuple[List[int], float, int]:
+        """Return (per-bucket counts, sum, count) merged across shards"""
+        n = len(self._bounds) + 1
+        buckets = [0] * n
+        total = 0.0
+        count = 0
+        for shard in list(self._shards.values()):
+            for i in range(n):
+                buckets[i] += shard[i]
+            total += shard[-2]
+            count += shard[-1]
+        return buckets, total, count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile (None when nothing has been observed)"""
+        buckets, _, _ = self.merged()
+        return quantile_from_buckets(self._bounds, buckets, q)
+
+    def summary(self) -> Dict[str, Any]:
+        buckets, total, count = self.merged()
+        return {
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else 0.0,
+            "p50": self.quantile(0.50),
+            "p90": self.quantile(0.90),
+            "p99": self.quantile(0.99),
+        }
+
+
+class _Timer:
+    __slots__ = ("_child", "_start")
+
+    def __init__(self, child: _HistogramChild):
+        self._child = child
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._child.observe(time.perf_counter() - self._start)
+        return False
+
+
+class MetricFamily(ABC):
+    """A named metric with a fixed label schema and one child per label set"""
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str = "",
+                 labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _new_child(self):
+        """Create the child series for a new label set"""
+
+    def labels(self, *values: Any, **kwargs: Any):
+        """Return the child series for a label set (created on first use)"""
+        if kwargs:
+            try:
+                values = tuple(str(kwargs[name]) for name in self.labelnames)
+            except KeyError as e:
+                raise MetricsError(f"{self.name}: missing label {e}")
+        else:
+            values = tuple(str(v) for v in values)
+        if len(values) != len(self.labelnames):
+            raise MetricsError(
+                f"{self.name}: expected labels {self.labelnames}, got {values}"
+            )
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._new_child()
+                    self._children[values] = child
+        return child
+
+    def _default(self):
+        if self.labelnames:
+            raise MetricsError(f"{self.name}: labelled metric requires labels()")
+        return self.labels()
+
+    def children(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        return list(self._children.items())
+
+    @abstractmethod
+    def render(self) -> List[str]:
+        """Prometheus text exposition lines for all children"""
+
+    @abstractmethod
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serialisable view of all children for the rollup"""
+
+    def _series_key(self, values: Tuple[str, ...]) -> str:
+        return ",".join(f"{k}={v}" for k, v in zip(self.labelnames, values))
+
+
+class Counter(MetricFamily):
+    """Monotonically increasing counter"""
+
+    metric_type = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def get(self) -> float:
+        return self._default().get()
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.get())}"
+            for values, child in self.children()
+        ]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {self._series_key(v): c.get() for v, c in self.children()}
+
+
+class Gauge(MetricFamily):
+    """Point-in-time value"""
+
+    metric_type = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default().dec(amount)
+
+    def get(self) -> float:
+        return self._default().get()
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.get())}"
+            for values, child in self.children()
+        ]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {self._series_key(v): c.get() for v, c in self.children()}
+
+
+class Histogram(MetricFamily):
+    """Fixed-bucket histogram (bucket bounds are upper-inclusive)"""
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str = "",
+                 labelnames: Iterable[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        bounds = tuple(sorted(float(b) for b in buckets if not math.isinf(b)))
+        if not bounds:
+            raise MetricsError(f"{name}: histogram needs at least one bucket")
+        self.buckets = bounds
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def time(self) -> _Timer:
+        return self._default().time()
+
+    def quantile(self, q: float) -> Optional[float]:
+        return self._default().quantile(q)
+
+    def render(self) -> List[str]:
+        lines = []
+        for values, child in self.children():
+            buckets, total, count = child.merged()
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), buckets):
+                cumulative += bucket_count
+                le = _format_value(bound)
+                lines.append(
+                    f"{self.name}_bucket"
+                    f"{_format_labels(self.labelnames, values, ('le', le))} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {self._series_key(v): c.summary() for v, c in self.children()}
+
+
+class MetricsRegistry:
+    """Process-wide registry of metric families"""
+
+    def __init__(self):
+        self._metrics: Dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str,
+                       labelnames: Iterable[str], **kwargs) -> MetricFamily:
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = cls(name, documentation, labelnames, **kwargs)
+                    self._metrics[name] = metric
+        if not isinstance(metric, cls):
+            raise MetricsError(
+                f"Metric {name} already registered as {metric.metric_type}"
+            )
+        if metric.labelnames != tuple(labelnames):
+            raise MetricsError(
+                f"Metric {name} already registered with labels {metric.labelnames}"
+            )
+        return metric
+
+    def counter(self, name: str, documentation: str = "",
+                labelnames: Iterable[str] = ()) -> Counter:
+        """Get or create a counter"""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str = "",
+              labelnames: Iterable[str] = ()) -> Gauge:
+        """Get or create a gauge"""
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str = "",
+                  labelnames: Iterable[str] = (),
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        """Get or create a histogram"""
+        return self._get_or_create(Histogram, name, documentation, labelnames,
+                                   buckets=buckets)
+
+    def get(self, name: str) -> Optional[MetricFamily]:
+        return self._metrics.get(name)
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format (0.0.4)"""
+        lines: List[str] = []
+        for name, metric in sorted(self._metrics.items()):
+            if metric.documentation:
+                doc = metric.documentation.replace("\\", "\\\\").replace("\n", "\\n")
+                lines.append(f"# HELP {name} {doc}")
+            lines.append(f"# TYPE {name} {metric.metric_type}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Compact JSON-serializable view of every series"""
+        return {
+            name: {"type": metric.metric_type, "series": metric.snapshot()}
+            for name, metric in sorted(self._metrics.items())
+        }
+
+
+class MetricsRollup:
+    """
+    Periodic compact on-disk rollup of a registry.
+
+    Writes a single `metrics/rollup_latest.json` (overwritten atomically) and
+    appends one compact line per interval to `metrics/rollup.ndjson`, which is
+    rotated to `rollup.ndjson.1` once it exceeds `max_bytes`. Disk usage is
+    therefore bounded at roughly 2 x max_bytes.
+    """
+
+    def __init__(self, registry: Optional["MetricsRegistry"] = None,
+                 data_dir: Optional[Path] = None, interval: float = 60.0,
+                 max_bytes: int = 5 * 1024 * 1024):
+        self.registry = registry or metrics_registry
+        self.metrics_dir = (data_dir or get_data_dir()) / "metrics"
+        self.latest_file = self.metrics_dir / "rollup_latest.json"
+        self.history_file = self.metrics_dir / "rollup.ndjson"
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.running = False
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="metrics-rollup",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.running = False
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def _loop(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.flush()
+
+    def flush(self) -> bool:
+        """Write one rollup record"""
+        try:
+            record = {"timestamp": utc_now_seconds(), "metrics": self.registry.snapshot()}
+            self.metrics_dir.mkdir(parents=True, exist_ok=True)
+            atomic_write_json(self.latest_file, record)
+
+            if (self.history_file.exists()
+                    and self.history_file.stat().st_size > self.max_bytes):
+                os.replace(self.history_file, self.history_file.with_suffix(".ndjson.1"))
+            with open(self.history_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to write metrics rollup: {e}")
+            return False
+
+    def read_history(self, since_ts: float = 0.0) -> List[Dict[str, Any]]:
+        """Read rollup records newer than `since_ts` (oldest first)"""
+        records: List[Dict[str, Any]] = []
+        for path in (self.history_file.with_suffix(".ndjson.1"), self.history_file):
+            if not path.exists():
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        if record.get("timestamp", 0) >= since_ts:
+                            records.append(record)
+            except OSError as e:
+                logger.error(f"Failed to read metrics rollup {path}: {e}")
+        return records
+
+
+# Global metrics registry instance
+metrics_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry"""
+    return metrics_registry
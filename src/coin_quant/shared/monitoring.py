@@ -25,9 +25,47 @@ from coin_quant.shared.io import AtomicWriter, AtomicReader
 from coin_quant.shared.paths import get_data_dir
 from coin_quant.shared.time import utc_now_seconds
 from coin_quant.shared.health import health_manager
+from coin_quant.shared.metrics import MetricsRegistry, MetricsRollup, metrics_registry
+from coin_quant.shared.process_registry import process_sampler
+from coin_quant.shared.tracing import load_stage_breakdown
 
 logger = logging.getLogger(__name__)
 
+_PROMETHEUS_TYPES = ("application/openmetrics-text", "text/plain")
+
+
+def _accept_q(accept: str) -> Dict[str, float]:
+    """Media range -> q-value from an Accept header (q defaults to 1)"""
+    ranges = {}
+    for part in accept.lower().split(','):
+        media_type, *params = [p.strip() for p in part.split(';')]
+        if not media_type:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        ranges[media_type] = max(q, ranges.get(media_type, 0.0))
+    return ranges
+
+
+def _prefers_prometheus(accept: str) -> bool:
+    """
+    True if the Accept header prefers the Prometheus text formats over JSON.
+
+    Only explicit text/plain or OpenMetrics ranges count for Prometheus;
+    JSON is matched by its most specific range (application/json, then
+    application/*, then */*), so browsers and `*/*` clients keep JSON.
+    """
+    ranges = _accept_q(accept)
+    prometheus_q = max((ranges.get(t, 0.0) for t in _PROMETHEUS_TYPES), default=0.0)
+    json_q = next((ranges[t] for t in ("application/json", "application/*", "*/*") if t in ranges), 0.0)
+    return prometheus_q > 0 and prometheus_q > json_q
+
 @dataclass
 class MetricPoint:
     """Individual metric data point"""
@@ -65,7 +103,8 @@ class SystemMetrics:
 class MetricsCollector:
     """Centralized metrics collection system"""
     
-    def __init__(self, data_dir: Optional[Path] = None):
+    def __init__(self, data_dir: Optional[Path] = None,
+                 registry: Optional[MetricsRegistry] = None):
         self.data_dir = data_dir or get_data_dir()
         self.metrics_dir = self.data_dir / "metrics"
         self.metrics_dir.mkdir(parents=True, exist_ok=True)
@@ -73,7 +112,12 @@ class MetricsCollector:
         self.writer = AtomicWriter()
         self.reader = AtomicReader()
         
-        # Metrics storage
+        # Unified registry + compact rollup (replaces per-interval JSON files)
+        self.registry = registry or metrics_registry
+        self.rollup = MetricsRollup(self.registry, self.data_dir)
+        self._register_metrics()
+        
+        # Metrics storage (in-memory summary history, one entry per collection)
         self.metrics_history: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
         self.service_metrics: Dict[str, ServiceMetrics] = {}
         self.system_metrics: Optional[SystemMetrics] = None
@@ -86,6 +130,19 @@ class MetricsCollector:
         
         logger.info(f"MetricsCollector initialized: {self.metrics_dir}")
     
+    def _register_metrics(self):
+        """Register system and service gauges on the unified registry"""
+        r = self.registry
+        self.g_system_cpu = r.gauge("coin_quant_system_cpu_percent", "System CPU usage percent")
+        self.g_system_mem = r.gauge("coin_quant_system_memory_percent", "System memory usage percent")
+        self.g_system_disk = r.gauge("coin_quant_system_disk_percent", "Data directory disk usage percent")
+        self.g_process_count = r.gauge("coin_quant_system_process_count", "Number of OS processes")
+        self.g_service_up = r.gauge("coin_quant_service_up", "1 if the service health is GREEN", ["service"])
+        self.g_service_mem = r.gauge("coin_quant_service_memory_mb", "Service resident memory in MB", ["service"])
+        self.g_service_cpu = r.gauge("coin_quant_service_cpu_percent", "Service CPU usage percent", ["service"])
+        self.g_service_age = r.gauge("coin_quant_service_freshness_seconds", "Seconds since last service health update", ["service"])
+        self.c_collection_errors = r.counter("coin_quant_metrics_collection_errors_total", "Metrics collection loop errors")
+    
     def start_collection(self):
         """Start metrics collection"""
         if self.running:
@@ -94,6 +151,7 @@ class MetricsCollector:
         self.running = True
         self.collection_thread = threading.Thread(target=self._collection_loop, daemon=True)
         self.collection_thread.start()
+        self.rollup.start()
         
         logger.info("Metrics collection started")
     
@@ -102,6 +160,7 @@ class MetricsCollector:
         self.running = False
         if self.collection_thread:
             self.collection_thread.join(timeout=5)
+        self.rollup.stop()
         
         logger.info("Metrics collection stopped")
     
@@ -115,15 +174,16 @@ class MetricsCollector:
                 # Collect service metrics
                 self._collect_service_metrics()
                 
-                # Save metrics
+                # Record into registry and in-memory history
                 self._save_metrics()
                 
-                # Clean up old metrics
+                # Clean up legacy per-interval metrics files
                 self._cleanup_old_metrics()
                 
                 time.sleep(self.collection_interval)
                 
             except Exception as e:
+                self.c_collection_errors.inc()
                 logger.error(f"Metrics collection error: {e}")
                 time.sleep(5)
     
@@ -178,20 +238,14 @@ class MetricsCollector:
             health_data = health_manager.get_overall_health()
             components = health_data.get("components", {})
             
+            # One sample of the registered service processes per interval
+            processes = process_sampler.sample(max_age=self.collection_interval / 2)
+            
             for service_name, health_info in components.items():
                 # Get process info if available
-                memory_mb = 0.0
-                cpu_percent = 0.0
-                
-                # Try to find process by name
-                try:
-                    for proc in psutil.process_iter(['pid', 'name', 'memory_info', 'cpu_percent']):
-                        if service_name in proc.info['name'].lower():
-                            memory_mb = proc.info['memory_info'].rss / (1024 * 1024)
-                            cpu_percent = proc.info['cpu_percent']
-                            break
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
+                process = processes.get(service_name) or {}
+                memory_mb = process.get("rss_mb", 0.0)
+                cpu_percent = process.get("cpu_percent", 0.0)
                 
                 # Calculate uptime
                 last_update = health_info.get("last_update_ts", 0)
@@ -241,39 +295,41 @@ class MetricsCollector:
             logger.error(f"Failed to collect service metrics: {e}")
     
     def _save_metrics(self):
-        """Save metrics to files"""
+        """Publish collected metrics to the registry and the in-memory history"""
         try:
-            timestamp = int(utc_now_seconds())
+            timestamp = utc_now_seconds()
             
-            # Save system metrics
             if self.system_metrics:
-                system_file = self.metrics_dir / f"system_{timestamp}.json"
-                self.writer.write_json(system_file, asdict(self.system_metrics))
+                self.g_system_cpu.set(self.system_metrics.cpu_percent)
+                self.g_system_mem.set(self.system_metrics.memory_percent)
+                self.g_system_disk.set(self.system_metrics.disk_usage_percent)
+                self.g_process_count.set(self.system_metrics.process_count)
             
-            # Save service metrics
             for service_name, metrics in self.service_metrics.items():
-                service_file = self.metrics_dir / f"{service_name}_{timestamp}.json"
-                self.writer.write_json(service_file, asdict(metrics))
-            
-            # Save aggregated metrics
-            aggregated = {
+                status = metrics.custom_metrics.get("status", "UNKNOWN")
+                self.g_service_up.labels(service=service_name).set(1 if status == "GREEN" else 0)
+                self.g_service_mem.labels(service=service_name).set(metrics.memory_mb)
+                self.g_service_cpu.labels(service=service_name).set(metrics.cpu_percent)
+                self.g_service_age.labels(service=service_name).set(
+                    metrics.custom_metrics.get("freshness_sec", 0) or 0)
+            
+            self.metrics_history["aggregated"].append({
                 "timestamp": timestamp,
                 "system": asdict(self.system_metrics) if self.system_metrics else None,
                 "services": {name: asdict(metrics) for name, metrics in self.service_metrics.items()}
-            }
-            
-            aggregated_file = self.metrics_dir / f"aggregated_{timestamp}.json"
-            self.writer.write_json(aggregated_file, aggregated)
+            })
             
         except Exception as e:
             logger.error(f"Failed to save metrics: {e}")
     
     def _cleanup_old_metrics(self):
-        """Clean up old metrics files"""
+        """Clean up legacy timestamped metrics files (system_*/<service>_*/aggregated_*)"""
         try:
             cutoff_time = time.time() - (self.retention_hours * 3600)
             
-            for metrics_file in self.metrics_dir.glob("*.json"):
+            for metrics_file in self.metrics_dir.glob("*_*.json"):
+                if metrics_file.name == self.rollup.latest_file.name:
+                    continue
                 if metrics_file.stat().st_mtime < cutoff_time:
                     metrics_file.unlink()
                     logger.debug(f"Removed old metrics file: {metrics_file.name}")
@@ -286,22 +342,18 @@ class MetricsCollector:
         try:
             cutoff_time = time.time() - (hours_back * 3600)
             
-            # Find relevant metrics files
-            metrics_files = []
-            for metrics_file in self.metrics_dir.glob("aggregated_*.json"):
-                if metrics_file.stat().st_mtime >= cutoff_time:
-                    metrics_files.append(metrics_file)
+            # Recent collections from the in-memory history
+            history = [entry for entry in self.metrics_history["aggregated"]
+                       if entry.get("timestamp", 0) >= cutoff_time]
             
-            metrics_files.sort(key=lambda f: f.stat().st_mtime)
-            
-            if not metrics_files:
+            if not history:
                 return {"error": "No metrics data available"}
             
             # Load and aggregate metrics
             summary = {
                 "timestamp": utc_now_seconds(),
                 "hours_back": hours_back,
-                "data_points": len(metrics_files),
+                "data_points": len(history),
                 "system": {
                     "avg_cpu_percent": 0.0,
                     "avg_memory_percent": 0.0,
@@ -316,12 +368,8 @@ class MetricsCollector:
             memory_values = []
             disk_values = []
             
-            for metrics_file in metrics_files:
+            for data in history:
                 try:
-                    data = self.reader.read_json(metrics_file)
-                    if not data:
-                        continue
-                    
                     # System metrics
                     system_data = data.get("system")
                     if system_data:
@@ -349,7 +397,7 @@ class MetricsCollector:
                         service_summary["data_points"] += 1
                         
                 except Exception as e:
-                    logger.error(f"Failed to process metrics file {metrics_file}: {e}")
+                    logger.error(f"Failed to process metrics entry: {e}")
                     continue
             
             # Calculate averages
@@ -395,6 +443,7 @@ class MonitoringEndpoint:
             self.metrics_collector.start_collection()
             
             self.server = HTTPServer(('localhost', self.port), MonitoringHandler)
+            self.server.metrics_collector = self.metrics_collector
             self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
             self.server_thread.start()
             
@@ -430,8 +479,16 @@ class MonitoringHandler(BaseHTTPRequestHandler):
             
             if path == "/health":
                 self._handle_health()
+            elif path == "/metrics/prometheus":
+                self._handle_prometheus()
             elif path == "/metrics":
-                self._handle_metrics(query_params)
+                # JSON summary unless a Prometheus scraper asks for the text format
+                if self._wants_prometheus():
+                    self._handle_prometheus()
+                else:
+                    self._handle_metrics(query_params)
+            elif path == "/traces":
+                self._handle_traces()
             elif path == "/status":
                 self._handle_status()
             elif path == "/debug":
@@ -468,8 +525,25 @@ class MonitoringHandler(BaseHTTPRequestHandler):
         except Exception as e:
             self._handle_500(f"Health check failed: {e}")
     
+    def _wants_prometheus(self) -> bool:
+        """Accept header of a Prometheus scrape (text/plain or OpenMetrics preferred over JSON)"""
+        return _prefers_prometheus(self.headers.get('Accept', ''))
+    
+    def _handle_prometheus(self):
+        """Handle Prometheus scrape endpoint"""
+        try:
+            body = self.server.metrics_collector.registry.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            
+        except Exception as e:
+            self._handle_500(f"Metrics exposition failed: {e}")
+    
     def _handle_metrics(self, query_params):
-        """Handle metrics endpoint"""
+        """Handle JSON metrics summary endpoint"""
         try:
             hours_back = int(query_params.get("hours", ["1"])[0])
             
@@ -481,6 +555,15 @@ class MonitoringHandler(BaseHTTPRequestHandler):
         except Exception as e:
             self._handle_500(f"Metrics retrieval failed: {e}")
     
+    def _handle_traces(self):
+        """Handle pipeline stage latency breakdown endpoint"""
+        try:
+            traces_dir = self.server.metrics_collector.data_dir / "traces"
+            self._send_json_response(load_stage_breakdown(traces_dir))
+            
+        except Exception as e:
+            self._handle_500(f"Trace breakdown failed: {e}")
+    
     def _handle_status(self):
         """Handle status endpoint"""
         try:
@@ -518,6 +601,8 @@ class MonitoringHandler(BaseHTTPRequestHandler):
                 "platform": os.name,
                 "data_directory": str(self.server.metrics_collector.data_dir),
                 "metrics_directory": str(self.server.metrics_collector.metrics_dir),
+                "rollup_file": str(self.server.metrics_collector.rollup.history_file),
+                "registered_metrics": len(self.server.metrics_collector.registry.snapshot()),
                 "collection_running": self.server.metrics_collector.running,
                 "collection_interval": self.server.metrics_collector.collection_interval,
                 "retention_hours": self.server.metrics_collector.retention_hours
@@ -533,7 +618,7 @@ class MonitoringHandler(BaseHTTPRequestHandler):
         response = {
             "error": "Not Found",
             "message": f"Endpoint {self.path} not found",
-            "available_endpoints": ["/health", "/metrics", "/status", "/debug"]
+            "available_endpoints": ["/health", "/metrics", "/metrics/prometheus", "/traces", "/status", "/debug"]
         }
         self._send_json_response(response, 404)
     
@@ -588,7 +673,9 @@ if __name__ == "__main__":
         print(f"Monitoring server running on http://localhost:{server.port}")
         print("Available endpoints:")
         print("  GET /health - Health check")
-        print("  GET /metrics?hours=1 - Metrics summary")
+        print("  GET /metrics?hours=1 - Metrics summary (Prometheus text for Accept: text/plain)")
+        print("  GET /metrics/prometheus - Prometheus text exposition")
+        print("  GET /traces - Pipeline stage latency (p50/p90/p99)")
         print("  GET /status - System status")
         print("  GET /debug - Debug information")
         print("\nPress Ctrl+C to stop...")
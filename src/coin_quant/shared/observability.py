@@ -354,6 +354,9 @@ class DebugBundleExporter:
         # Create incident timeline
         self._create_incident_timeline(output_dir, minutes_back)
         
+        # Export sampling profiler dumps
+        self._export_profiles(output_dir)
+        
         logger.info(f"Debug bundle exported to: {output_dir}")
         return output_dir
     
@@ -450,6 +453,16 @@ class DebugBundleExporter:
         except Exception as e:
             logger.error(f"Failed to export system state: {str(e)}")
     
+    def _export_profiles(self, output_dir: Path) -> None:
+        """Export collapsed stacks and hot functions from the sampling profiler"""
+        try:
+            from coin_quant.shared.profiling import export_profiles
+            copied = export_profiles(output_dir, self.data_dir / "profiles")
+            if copied:
+                logger.info(f"Exported {len(copied)} profile files")
+        except Exception as e:
+            logger.error(f"Failed to export profiles: {str(e)}")
+    
     def _create_incident_timeline(self, output_dir: Path, minutes_back: int) -> None:
         """Create incident timeline from logs"""
         try:
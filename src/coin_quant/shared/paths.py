@@ -53,6 +53,16 @@ def get_logs_dir() -> Path:
     return get_data_dir() / "logs"
 
 
+def get_history_dir() -> Path:
+    """
+    Get kline history directory path.
+    
+    Returns:
+        Path: History directory path
+    """
+    return get_data_dir() / "history"
+
+
 def ensure_directories() -> None:
     """
     Ensure all required directories exist.
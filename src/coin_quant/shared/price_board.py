@@ -0,0 +1,417 @@
+"""
+Shared-memory price board for Coin Quant R11
+
+The feeder publishes the latest tick of every symbol into a fixed-layout
+`multiprocessing.shared_memory` segment; ARES, the trader, PriceOracle and
+the UI on the same host read it without opening, stat-ing or parsing a
+file.
+
+Layout (little endian, 8-byte aligned):
+
+- header (64 bytes): magic, layout version, slot size, capacity, writer
+  pid, heartbeat (wall clock seconds) and heartbeat count
+- `capacity` slots of `slot_dtype()`: a seqlock counter followed by symbol,
+  price, bid, ask, volume, 24h change, receive time, event time (ms) and
+  the board-wide tick sequence
+
+Each slot has one writer (the feeder). The counter is odd while a write
+is in progress and advances by two per update. A reader copies the
+counters, the slots and the counters again; slots whose counter changed
+or is odd were torn by a concurrent write and are re-read. A snapshot of
+all symbols is three vectorized copies of mapped memory.
+
+The writer refreshes the heartbeat from its health loop and zeroes it on
+close. Readers treat a heartbeat older than `stale_after` (or a missing
+segment) as a dead writer and fall back to the feeder snapshot file.
+"""
+
+import functools
+import logging
+import math
+import os
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .codec import read_payload
+from .config import config_manager
+from .lazy import lazy_import
+from .paths import get_data_dir
+
+# Only readers need NumPy; the feeder's writer path and importers of the
+# DataBus do not pay for it
+np = lazy_import("numpy")
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NAME = "coin_quant_prices"
+DEFAULT_CAPACITY = 256
+DEFAULT_STALE_SEC = 15.0
+
+MAGIC = b"CQPB"
+LAYOUT_VERSION = 1
+
+# magic, version, slot size, capacity, writer pid, heartbeat, heartbeat count
+_HEADER = struct.Struct("<4sHHIIdQ")
+_HEARTBEAT = struct.Struct("<dQ")
+_HEARTBEAT_OFFSET = 16
+HEADER_SIZE = 64
+
+_SEQ = struct.Struct("<Q")
+# everything after the counter, in slot_dtype() order
+_PAYLOAD = struct.Struct("<16sddddddqQ")
+SLOT_SIZE = _SEQ.size + _PAYLOAD.size
+
+
+@functools.lru_cache(maxsize=None)
+def slot_dtype() -> "np.dtype":
+    """Structured dtype of one slot (the _SEQ + _PAYLOAD layout)"""
+    return np.dtype([
+        ("seq", "<u8"),
+        ("symbol", "S16"),
+        ("price", "<f8"),
+        ("bid", "<f8"),
+        ("ask", "<f8"),
+        ("volume", "<f8"),
+        ("change", "<f8"),
+        ("received_at", "<f8"),
+        ("event_time", "<i8"),
+        ("tick_seq", "<u8"),
+    ])
+
+
+def board_name() -> str:
+    """Segment name shared by the feeder and its readers (PRICE_BOARD_NAME via config_manager)"""
+    return str(config_manager.get("PRICE_BOARD_NAME", DEFAULT_NAME))
+
+
+def stale_after_sec() -> float:
+    """Writer heartbeat age after which readers fall back to files (PRICE_BOARD_STALE_SEC)"""
+    return config_manager.get_float("PRICE_BOARD_STALE_SEC", DEFAULT_STALE_SEC)
+
+
+def segment_size(capacity: int) -> int:
+    return HEADER_SIZE + capacity * SLOT_SIZE
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+class PriceBoardWriter:
+    """Single writer of the board (the feeder)"""
+
+    def __init__(self, name: Optional[str] = None, capacity: int = DEFAULT_CAPACITY):
+        self.name = name or board_name()
+        self.capacity = max(1, int(capacity))
+        self.shm = self._create()
+        self.buf = self.shm.buf
+        self.index: Dict[str, int] = {}
+        self._free: List[int] = list(range(self.capacity - 1, -1, -1))
+        self._seqs = [0] * self.capacity
+        self.tick_seq = 0
+        self.beats = 0
+        self.full_drops = 0
+
+        self.buf[:segment_size(self.capacity)] = bytes(segment_size(self.capacity))
+        _HEADER.pack_into(self.buf, 0, MAGIC, LAYOUT_VERSION, SLOT_SIZE, self.capacity,
+                          os.getpid(), 0.0, 0)
+        self.heartbeat()
+
+    def _create(self) -> shared_memory.SharedMemory:
+        size = segment_size(self.capacity)
+        try:
+            return shared_memory.SharedMemory(self.name, create=True, size=size)
+        except FileExistsError:
+            pass
+        # left behind by a writer that did not exit cleanly: reuse it if the
+        # size fits, otherwise replace it (attached readers see the old
+        # segment's heartbeat stop and re-attach)
+        shm = shared_memory.SharedMemory(self.name)
+        if shm.size >= size:
+            return shm
+        shm.close()
+        shm.unlink()
+        return shared_memory.SharedMemory(self.name, create=True, size=size)
+
+    def _slot_offset(self, slot: int) -> int:
+        return HEADER_SIZE + slot * SLOT_SIZE
+
+    def _write(self, slot: int, symbol: bytes, price: float, bid: float, ask: float,
+               volume: float, change: float, received_at: float, event_time: int):
+        offset = self._slot_offset(slot)
+        seq = self._seqs[slot]
+        self.tick_seq += 1
+        _SEQ.pack_into(self.buf, offset, seq + 1)
+        _PAYLOAD.pack_into(self.buf, offset + 8, symbol, price, bid, ask, volume, change,
+                           received_at, event_time, self.tick_seq)
+        _SEQ.pack_into(self.buf, offset, seq + 2)
+        self._seqs[slot] = seq + 2
+
+    def publish(self, symbol: str, price: float, bid: Optional[float] = None,
+                ask: Optional[float] = None, volume: float = 0.0, change: float = 0.0,
+                event_time: int = 0, received_at: Optional[float] = None) -> bool:
+        """
+        Publish the latest tick of a symbol.
+
+        Returns:
+            False if the board is full and the symbol has no slot yet
+        """
+        slot = self.index.get(symbol)
+        if slot is None:
+            if not self._free:
+                self.full_drops += 1
+                return False
+            slot = self.index[symbol] = self._free.pop()
+        self._write(slot, symbol.encode("ascii")[:16], price,
+                    math.nan if bid is None else bid, math.nan if ask is None else ask,
+                    volume, change, time.time() if received_at is None else received_at,
+                    int(event_time))
+        return True
+
+    def remove(self, symbols: Iterable[str]):
+        """Clear the slots of symbols that left the universe"""
+        for symbol in symbols:
+            slot = self.index.pop(symbol, None)
+            if slot is not None:
+                self._write(slot, b"", math.nan, math.nan, math.nan, 0.0, 0.0, 0.0, 0)
+                self._free.append(slot)
+
+    def heartbeat(self, now: Optional[float] = None):
+        self.beats += 1
+        _HEARTBEAT.pack_into(self.buf, _HEARTBEAT_OFFSET,
+                             time.time() if now is None else now, self.beats)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "capacity": self.capacity,
+            "symbols": len(self.index),
+            "ticks": self.tick_seq,
+            "full_drops": self.full_drops,
+        }
+
+    def close(self, unlink: bool = True):
+        """Mark the writer dead (heartbeat 0) and release the segment"""
+        if self.shm is None:
+            return
+        _HEARTBEAT.pack_into(self.buf, _HEARTBEAT_OFFSET, 0.0, self.beats)
+        self.buf = None
+        self.shm.close()
+        if unlink:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+        self.shm = None
+
+
+class PriceBoardReader:
+    """Lock-free reader with heartbeat liveness and a file fallback"""
+
+    def __init__(self, name: Optional[str] = None, stale_after: Optional[float] = None,
+                 data_dir: Optional[Path] = None, fallback: bool = True,
+                 attach_interval: float = 1.0, retries: int = 3):
+        self.name = name or board_name()
+        if stale_after is None:
+            stale_after = stale_after_sec()
+        self.stale_after = stale_after
+        self.snapshot_file = Path(data_dir or get_data_dir()) / "feeder_snapshot.json"
+        self.fallback = fallback
+        self.attach_interval = attach_interval
+        self.retries = retries
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        self._slots: Optional["np.ndarray"] = None
+        self._index: Dict[str, int] = {}
+        self._last_attach = 0.0
+        self.torn_retries = 0
+        self.torn_dropped = 0
+        self.fallbacks = 0
+
+    def _attach(self) -> bool:
+        now = time.monotonic()
+        if now - self._last_attach < self.attach_interval:
+            return False
+        self._last_attach = now
+        self.close()
+        try:
+            shm = shared_memory.SharedMemory(self.name)
+        except (FileNotFoundError, OSError):
+            return False
+        if shm.size < HEADER_SIZE:
+            shm.close()
+            return False
+        magic, version, slot_size, capacity, pid, _, _ = _HEADER.unpack_from(shm.buf, 0)
+        # Python < 3.13 registers attached segments with the resource
+        # tracker, which would unlink the feeder's segment when this
+        # process exits
+        if pid != os.getpid():
+            try:
+                resource_tracker.unregister(shm._name, "shared_memory")
+            except Exception:
+                pass
+        if (magic != MAGIC or version != LAYOUT_VERSION or slot_size != SLOT_SIZE
+                or shm.size < segment_size(capacity)):
+            logger.warning(f"Price board {self.name}: incompatible layout {magic!r} v{version}")
+            shm.close()
+            return False
+        self.shm = shm
+        self._slots = np.ndarray((capacity,), dtype=slot_dtype(), buffer=shm.buf, offset=HEADER_SIZE)
+        self._index = {}
+        return True
+
+    def heartbeat_age(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds since the writer's last heartbeat (None if not attached)"""
+        if self.shm is None:
+            return None
+        heartbeat, _ = _HEARTBEAT.unpack_from(self.shm.buf, _HEARTBEAT_OFFSET)
+        if heartbeat <= 0:
+            return None
+        return (time.time() if now is None else now) - heartbeat
+
+    def alive(self, now: Optional[float] = None) -> bool:
+        """True if the writer's heartbeat is fresh; (re-)attaches as needed"""
+        age = self.heartbeat_age(now)
+        if age is None or age > self.stale_after:
+            # missing segment or dead writer: a restarted feeder creates a
+            # new segment under the same name
+            if not self._attach():
+                return False
+            age = self.heartbeat_age(now)
+        return age is not None and age <= self.stale_after
+
+    def _read_all(self) -> "np.ndarray":
+        """Consistent copy of all slots (torn slots re-read, then dropped)"""
+        slots = self._slots
+        seqs = slots["seq"]
+        before = seqs.copy()
+        data = np.frombuffer(bytearray(self.shm.buf[HEADER_SIZE:HEADER_SIZE + slots.nbytes]),
+                             dtype=slot_dtype())
+        after = seqs.copy()
+        torn = (before != after) | (before & 1 == 1)
+        if not torn.any():
+            return data
+        rows = np.flatnonzero(torn)
+        for _ in range(self.retries):
+            self.torn_retries += 1
+            before = seqs[rows]
+            data[rows] = slots[rows]
+            after = seqs[rows]
+            torn[rows] = (before != after) | (before & 1 == 1)
+            rows = rows[torn[rows]]
+            if not rows.size:
+                break
+        self.torn_dropped += int(rows.size)
+        return data[~torn]
+
+    def _read_slot(self, slot: int) -> Optional[tuple]:
+        """Consistent payload of one slot, or None if every attempt was torn"""
+        buf = self.shm.buf
+        offset = HEADER_SIZE + slot * SLOT_SIZE
+        for _ in range(self.retries):
+            before, = _SEQ.unpack_from(buf, offset)
+            payload = _PAYLOAD.unpack_from(buf, offset + 8)
+            after, = _SEQ.unpack_from(buf, offset)
+            if before == after and not before & 1:
+                return (before,) + payload
+            self.torn_retries += 1
+        self.torn_dropped += 1
+        return None
+
+    @staticmethod
+    def _tick(row) -> Dict[str, Any]:
+        _, symbol, price, bid, ask, volume, change, received_at, event_time, tick_seq = row
+        return {
+            "symbol": symbol.rstrip(b"\0").decode("ascii"),
+            "price": price,
+            "bid": _optional(bid),
+            "ask": _optional(ask),
+            "volume": volume,
+            "change": change,
+            "timestamp": event_time,
+            "received_at": received_at,
+            "seq": tick_seq,
+            "source": "shm",
+        }
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Latest tick of every symbol (board, else the feeder snapshot file)"""
+        if not self.alive():
+            return self._file_snapshot()
+        data = self._read_all()
+        data = data[data["symbol"] != b""]
+        ticks = {}
+        for row in data.tolist():
+            tick = self._tick(row)
+            ticks[tick["symbol"]] = tick
+        return ticks
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Latest tick of one symbol"""
+        if not self.alive():
+            return self._file_snapshot().get(symbol)
+        key = symbol.encode("ascii")
+        slot = self._index.get(symbol)
+        row = self._read_slot(slot) if slot is not None else None
+        if row is None or row[1].rstrip(b"\0") != key:
+            # symbols keep their slot until removed: re-locate after a rotation
+            matches = np.flatnonzero(self._slots["symbol"] == key)
+            if not matches.size:
+                self._index.pop(symbol, None)
+                return None
+            slot = self._index[symbol] = int(matches[0])
+            row = self._read_slot(slot)
+            if row is None or row[1].rstrip(b"\0") != key:
+                return None
+        return self._tick(row)
+
+    def prices(self) -> Dict[str, float]:
+        return {symbol: tick["price"] for symbol, tick in self.snapshot().items()}
+
+    def _file_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        if not self.fallback:
+            return {}
+        self.fallbacks += 1
+        snapshot = read_payload(self.snapshot_file, {}) or {}
+        ticks = {}
+        for symbol, entry in (snapshot.get("symbol_data") or {}).items():
+            if not isinstance(entry, dict) or not entry.get("price"):
+                continue
+            book = entry.get("book") or {}
+            bids, asks = book.get("bids") or [], book.get("asks") or []
+            ticks[symbol] = {
+                "symbol": symbol,
+                "price": float(entry["price"]),
+                "bid": float(bids[0][0]) if bids else None,
+                "ask": float(asks[0][0]) if asks else None,
+                "volume": float(entry.get("volume", 0.0)),
+                "change": float(entry.get("change", 0.0)),
+                "timestamp": int(entry.get("timestamp", 0)),
+                "received_at": float(entry.get("received_at", 0.0)),
+                "seq": None,
+                "source": "file",
+            }
+        return ticks
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "attached": self.shm is not None,
+            "heartbeat_age": self.heartbeat_age(),
+            "torn_retries": self.torn_retries,
+            "torn_dropped": self.torn_dropped,
+            "fallbacks": self.fallbacks,
+        }
+
+    def close(self):
+        # the ndarray view must go before the mapping can close
+        self._slots = None
+        self._index = {}
+        if self.shm is not None:
+            try:
+                self.shm.close()
+            except BufferError:
+                pass
+            self.shm = None
@@ -0,0 +1,366 @@
+"""
+Process Registry for Coin Quant R11
+
+Shared table of running services, so finding one no longer means scanning
+the whole process list:
+
+- Services register role/PID/create time at startup (SingletonGuard does
+  it on acquire). One small JSON file per role under
+  `shared_data/processes/`: a lookup by role is one file read plus one
+  liveness check, and registrations of different roles never contend.
+- Entries are validated against the process create time, so a recycled
+  PID is never mistaken for the service.
+- `ProcessSampler` samples RSS/CPU/threads of registered processes only,
+  into per-role `ResourceSeries` ring buffers whose leak slope is updated
+  incrementally as samples enter and leave the window.
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .io import atomic_write_json, safe_read_json
+from .lazy import lazy_import
+from .paths import get_data_dir
+
+# Imported on the first process lookup (None if not installed)
+psutil = lazy_import("psutil", optional=True)
+
+logger = logging.getLogger(__name__)
+
+# create_time is reported with clock-tick precision; allow for rounding
+CREATE_TIME_TOLERANCE_SEC = 1.0
+
+
+@dataclass
+class ProcessEntry:
+    """Registered service process"""
+    role: str
+    pid: int
+    create_time: float
+    registered_at: float
+    cmdline: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProcessEntry":
+        return cls(
+            role=str(data["role"]),
+            pid=int(data["pid"]),
+            create_time=float(data.get("create_time", 0.0)),
+            registered_at=float(data.get("registered_at", 0.0)),
+            cmdline=str(data.get("cmdline", "")),
+        )
+
+
+def _process_identity(pid: int) -> Optional[Tuple[float, str]]:
+    """(create_time, cmdline) of a live process, or None"""
+    if psutil is None:
+        try:
+            os.kill(pid, 0)
+        except OSError:
+            return None
+        return 0.0, ""
+    try:
+        proc = psutil.Process(pid)
+        with proc.oneshot():
+            create_time = proc.create_time()
+            try:
+                cmdline = " ".join(proc.cmdline())
+            except (psutil.AccessDenied, psutil.ZombieProcess):
+                cmdline = ""
+        return create_time, cmdline
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+
+
+class ProcessRegistry:
+    """Role -> process table backed by one file per role"""
+
+    def __init__(self, registry_dir: Optional[Path] = None):
+        self._registry_dir = Path(registry_dir) if registry_dir else None
+
+    @property
+    def registry_dir(self) -> Path:
+        return self._registry_dir or get_data_dir() / "processes"
+
+    def _entry_path(self, role: str) -> Path:
+        return self.registry_dir / f"{role}.json"
+
+    def register(self, role: str, pid: Optional[int] = None) -> Optional[ProcessEntry]:
+        """Register a process (default: this one) under `role`"""
+        pid = pid or os.getpid()
+        identity = _process_identity(pid)
+        if identity is None:
+            return None
+        create_time, cmdline = identity
+        entry = ProcessEntry(role, pid, create_time, time.time(), cmdline[:300])
+        if not atomic_write_json(self._entry_path(role), entry.to_dict()):
+            return None
+        return entry
+
+    def unregister(self, role: str, pid: Optional[int] = None) -> bool:
+        """Remove `role` if it is still registered to `pid` (default: this process)"""
+        pid = pid or os.getpid()
+        entry = self._read(role)
+        if entry is None or entry.pid != pid:
+            return False
+        try:
+            self._entry_path(role).unlink()
+            return True
+        except OSError:
+            return False
+
+    def lookup(self, role: str, validate: bool = True) -> Optional[ProcessEntry]:
+        """Registered process for `role`; None if absent or (validated) no longer alive"""
+        entry = self._read(role)
+        if entry is None or (validate and not self.is_alive(entry)):
+            return None
+        return entry
+
+    def get_pid(self, role: str) -> Optional[int]:
+        entry = self.lookup(role)
+        return entry.pid if entry else None
+
+    def entries(self, validate: bool = True) -> Dict[str, ProcessEntry]:
+        """All registered roles"""
+        result = {}
+        try:
+            names = [p.stem for p in self.registry_dir.glob("*.json")]
+        except OSError:
+            return result
+        for role in names:
+            entry = self.lookup(role, validate)
+            if entry is not None:
+                result[role] = entry
+        return result
+
+    @staticmethod
+    def is_alive(entry: ProcessEntry) -> bool:
+        """Same PID and same create time: the registered process itself"""
+        identity = _process_identity(entry.pid)
+        if identity is None:
+            return False
+        create_time = identity[0]
+        return not entry.create_time or not create_time or \
+            abs(create_time - entry.create_time) <= CREATE_TIME_TOLERANCE_SEC
+
+    def _read(self, role: str) -> Optional[ProcessEntry]:
+        data = safe_read_json(self._entry_path(role))
+        if not data:
+            return None
+        try:
+            return ProcessEntry.from_dict(data)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+class ResourceSeries:
+    """
+    Fixed-capacity ring buffer of resource samples with an incremental leak slope.
+
+    Least-squares sums of RSS over time and the number of RSS decreases are
+    adjusted as each sample enters and is evicted, so the slope, growth and
+    monotonicity of the window are O(1) without copying the history.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = max(2, int(capacity))
+        self._ts = [0.0] * self.capacity
+        self._rss = [0.0] * self.capacity
+        self._cpu = [0.0] * self.capacity
+        self._threads = [0] * self.capacity
+        self._start = 0
+        self._len = 0
+        self._t0 = 0.0
+        self._sum_t = self._sum_r = self._sum_tt = self._sum_tr = 0.0
+        self._drops = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _index(self, i: int) -> int:
+        return (self._start + i) % self.capacity
+
+    def append(self, ts: float, rss_mb: float, cpu_percent: float = 0.0, num_threads: int = 0):
+        if self._len == 0:
+            self._t0 = ts
+        if self._len == self.capacity:
+            self._evict()
+        if self._len and rss_mb < self._rss[self._index(self._len - 1)]:
+            self._drops += 1
+        i = self._index(self._len)
+        self._ts[i], self._rss[i], self._cpu[i], self._threads[i] = ts, rss_mb, cpu_percent, num_threads
+        self._len += 1
+        self._add(ts, rss_mb, 1.0)
+
+    def _add(self, ts: float, rss_mb: float, sign: float):
+        t = ts - self._t0
+        self._sum_t += sign * t
+        self._sum_r += sign * rss_mb
+        self._sum_tt += sign * t * t
+        self._sum_tr += sign * t * rss_mb
+
+    def _evict(self):
+        i = self._index(0)
+        if self._len > 1 and self._rss[self._index(1)] < self._rss[i]:
+            self._drops -= 1
+        self._add(self._ts[i], self._rss[i], -1.0)
+        self._start = self._index(1)
+        self._len -= 1
+        self._evictions += 1
+        if self._evictions >= self.capacity:
+            self._resync()
+
+    def _resync(self):
+        """Recompute the sums from the window (bounds float drift, amortized O(1))"""
+        self._evictions = 0
+        self._t0 = self._ts[self._index(0)] if self._len else 0.0
+        self._sum_t = self._sum_r = self._sum_tt = self._sum_tr = 0.0
+        for k in range(self._len):
+            i = self._index(k)
+            self._add(self._ts[i], self._rss[i], 1.0)
+
+    def latest(self) -> Optional[Tuple[float, float, float, int]]:
+        """(timestamp, rss_mb, cpu_percent, num_threads) of the newest sample"""
+        if not self._len:
+            return None
+        i = self._index(self._len - 1)
+        return self._ts[i], self._rss[i], self._cpu[i], self._threads[i]
+
+    def samples(self) -> List[Tuple[float, float, float, int]]:
+        """Window contents, oldest first (copy; for reporting only)"""
+        return [(self._ts[i], self._rss[i], self._cpu[i], self._threads[i])
+                for i in map(self._index, range(self._len))]
+
+    def span_sec(self) -> float:
+        if self._len < 2:
+            return 0.0
+        return self._ts[self._index(self._len - 1)] - self._ts[self._index(0)]
+
+    def growth_mb(self) -> float:
+        if self._len < 2:
+            return 0.0
+        return self._rss[self._index(self._len - 1)] - self._rss[self._index(0)]
+
+    def slope_mb_per_min(self) -> float:
+        """Least-squares RSS slope over the window"""
+        n = self._len
+        denom = n * self._sum_tt - self._sum_t * self._sum_t
+        if n < 2 or denom <= 0:
+            return 0.0
+        return (n * self._sum_tr - self._sum_t * self._sum_r) / denom * 60.0
+
+    def is_monotonic(self) -> bool:
+        """RSS never decreased within the window"""
+        return self._drops == 0
+
+
+class ProcessSampler:
+    """Single sampler of registered processes shared by all resource consumers"""
+
+    def __init__(self, registry: Optional[ProcessRegistry] = None, capacity: int = 64):
+        self.registry = registry or process_registry
+        self.capacity = capacity
+        self.series: Dict[str, ResourceSeries] = {}
+        self.latest: Dict[str, Dict[str, Any]] = {}
+        self.last_sample_ts = 0.0
+        self._procs: Dict[str, Tuple[int, float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def sample(self, max_age: float = 0.0) -> Dict[str, Dict[str, Any]]:
+        """
+        Sample every registered process once.
+
+        Args:
+            max_age: Reuse the previous sample if it is younger than this
+
+        Returns:
+            Dict of role -> metrics (pid, rss_mb, vms_mb, cpu_percent, ...)
+        """
+        with self._lock:
+            now = time.time()
+            if max_age and now - self.last_sample_ts < max_age:
+                return dict(self.latest)
+            entries = self.registry.entries()
+            latest = {}
+            for role, entry in entries.items():
+                metrics = self._sample_one(role, entry, now)
+                if metrics is not None:
+                    latest[role] = metrics
+            for role in [r for r in self.series if r not in entries]:
+                del self.series[role]
+                self._procs.pop(role, None)
+            self.latest = latest
+            self.last_sample_ts = now
+            return dict(latest)
+
+    def _sample_one(self, role: str, entry: ProcessEntry, now: float) -> Optional[Dict[str, Any]]:
+        if psutil is None:
+            return None
+        cached = self._procs.get(role)
+        if cached is None or cached[:2] != (entry.pid, entry.create_time):
+            # new or restarted process: fresh Process (cpu_percent baseline) and series
+            try:
+                self._procs[role] = cached = (entry.pid, entry.create_time, psutil.Process(entry.pid))
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                return None
+            self.series[role] = ResourceSeries(self.capacity)
+        proc = cached[2]
+        try:
+            with proc.oneshot():
+                name = proc.name()
+                memory = proc.memory_info()
+                cpu_percent = proc.cpu_percent(None)
+                num_threads = proc.num_threads()
+                num_handles = proc.num_handles() if hasattr(proc, "num_handles") else 0
+                status = proc.status()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+        rss_mb = memory.rss / 1024 / 1024
+        series = self.series[role]
+        series.append(now, rss_mb, cpu_percent, num_threads)
+        return {
+            "role": role,
+            "pid": entry.pid,
+            "name": name,
+            "rss_mb": rss_mb,
+            "vms_mb": memory.vms / 1024 / 1024,
+            "cpu_percent": cpu_percent,
+            "num_threads": num_threads,
+            "num_handles": num_handles,
+            "create_time": entry.create_time,
+            "status": status,
+            "timestamp": now,
+            "leak_slope_mb_per_min": series.slope_mb_per_min(),
+        }
+
+    def get(self, role: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self.latest.get(role)
+
+    def leak_candidates(self, min_growth_mb: float, min_samples: int = 5) -> List[Dict[str, Any]]:
+        """Roles whose RSS grew monotonically by more than `min_growth_mb` over their window"""
+        with self._lock:
+            result = []
+            for role, series in self.series.items():
+                if len(series) >= min_samples and series.is_monotonic() and series.growth_mb() > min_growth_mb:
+                    result.append({
+                        "role": role,
+                        "growth_mb": series.growth_mb(),
+                        "span_sec": series.span_sec(),
+                        "slope_mb_per_min": series.slope_mb_per_min(),
+                    })
+            return result
+
+
+# Global instances
+process_registry = ProcessRegistry()
+process_sampler = ProcessSampler(process_registry)
@@ -0,0 +1,278 @@
+"""
+Sampling profiler for Coin Quant R11 services
+
+Opt-in, low-overhead stack sampler for the long-running services. A
+background thread periodically snapshots every other thread's stack via
+`sys._current_frames()`, aggregates collapsed stacks and dumps:
+
+- `<service>.folded`  - flamegraph.pl / speedscope compatible collapsed stacks
+- `<service>_top.json` - top-N hot functions (self and inclusive samples),
+                          sample count and measured sampler overhead
+
+Enable with PROFILING_ENABLED=true (config) or at runtime with the control
+file `shared_data/controls/profiling.json`:
+
+    {"enabled": true, "services": ["feeder", "trader"], "interval_ms": 10}
+
+The sampler measures its own CPU time and backs off its interval whenever
+overhead exceeds PROFILING_MAX_OVERHEAD_PCT (default 2%).
+"""
+
+import logging
+import shutil
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from coin_quant.shared.config import config_manager
+from coin_quant.shared.io import atomic_write_json, safe_read_json, atomic_writer
+from coin_quant.shared.paths import get_data_dir
+from coin_quant.shared.time import utc_now_seconds
+
+logger = logging.getLogger(__name__)
+
+
+def get_profiles_dir() -> Path:
+    """Get profile dump directory path."""
+    return get_data_dir() / "profiles"
+
+
+def get_profiling_control_path() -> Path:
+    """Get profiling control file path."""
+    return get_data_dir() / "controls" / "profiling.json"
+
+
+class StackSampler:
+    """Periodic stack sampler aggregating collapsed stacks"""
+
+    def __init__(self, interval: float = 0.01, max_depth: int = 64,
+                 max_overhead_pct: float = 2.0):
+        self.interval = interval
+        self.base_interval = interval
+        self.max_depth = max_depth
+        self.max_overhead_pct = max_overhead_pct
+
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at = 0.0
+        self.sampler_cpu_sec = 0.0
+        self.running = False
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # code object -> "module:function:line" (frames are re-labelled constantly)
+        self._labels: Dict[Any, str] = {}
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        self.started_at = time.monotonic()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.running = False
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stacks.clear()
+            self.samples = 0
+            self.sampler_cpu_sec = 0.0
+            self.started_at = time.monotonic()
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            module = Path(code.co_filename).stem
+            label = f"{module}:{code.co_name}:{code.co_firstlineno}"
+            self._labels[code] = label
+        return label
+
+    def _loop(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            cpu_start = time.thread_time()
+            frames = sys._current_frames()
+            collapsed = []
+            for ident, frame in frames.items():
+                if ident == own_ident:
+                    continue
+                labels = []
+                depth = 0
+                while frame is not None and depth < self.max_depth:
+                    labels.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                    depth += 1
+                labels.reverse()
+                collapsed.append(";".join(labels))
+            del frames
+
+            with self._lock:
+                for stack in collapsed:
+                    self.stacks[stack] += 1
+                self.samples += 1
+                self.sampler_cpu_sec += time.thread_time() - cpu_start
+
+            self._adapt_interval()
+
+    def _adapt_interval(self) -> None:
+        """Back off (or recover) the sampling interval to respect the overhead budget"""
+        overhead = self.overhead_pct()
+        if overhead > self.max_overhead_pct:
+            self.interval = min(self.interval * 1.5, 1.0)
+        elif overhead < self.max_overhead_pct / 2 and self.interval > self.base_interval:
+            self.interval = max(self.interval / 1.5, self.base_interval)
+
+    def overhead_pct(self) -> float:
+        """Sampler CPU time as a percentage of wall time since start"""
+        elapsed = time.monotonic() - self.started_at
+        if elapsed <= 0:
+            return 0.0
+        return self.sampler_cpu_sec / elapsed * 100.0
+
+    def collapsed(self) -> List[str]:
+        """Collapsed stack lines ("frame;frame;frame count"), hottest first"""
+        with self._lock:
+            items = self.stacks.most_common()
+        return [f"{stack} {count}" for stack, count in items]
+
+    def top_functions(self, n: int = 25) -> Dict[str, List[Dict[str, Any]]]:
+        """Top-N functions by self (leaf) and inclusive samples"""
+        with self._lock:
+            items = list(self.stacks.items())
+        self_counts: Counter = Counter()
+        inclusive_counts: Counter = Counter()
+        total = sum(count for _, count in items) or 1
+        for stack, count in items:
+            frames = stack.split(";")
+            self_counts[frames[-1]] += count
+            for frame in set(frames):
+                inclusive_counts[frame] += count
+
+        def rows(counter: Counter) -> List[Dict[str, Any]]:
+            return [
+                {"function": fn, "samples": c, "percent": round(c / total * 100, 2)}
+                for fn, c in counter.most_common(n)
+            ]
+
+        return {"self": rows(self_counts), "inclusive": rows(inclusive_counts)}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "samples": self.samples,
+            "stack_samples": sum(self.stacks.values()),
+            "unique_stacks": len(self.stacks),
+            "duration_sec": round(time.monotonic() - self.started_at, 3),
+            "interval_ms": round(self.interval * 1000, 3),
+            "overhead_pct": round(self.overhead_pct(), 3),
+        }
+
+
+class ServiceProfiler:
+    """
+    Profiling surface for a service.
+
+    Call `poll()` from the service's periodic loop: it reconciles the sampler
+    with config/control-file state and dumps results every `dump_interval`.
+    """
+
+    def __init__(self, service_name: str, dump_interval: float = 60.0,
+                 profiles_dir: Optional[Path] = None,
+                 control_path: Optional[Path] = None):
+        self.service_name = service_name
+        self.dump_interval = dump_interval
+        self.profiles_dir = profiles_dir or get_profiles_dir()
+        self.control_path = control_path or get_profiling_control_path()
+        self.sampler: Optional[StackSampler] = None
+        self._last_dump = 0.0
+        self._control_mtime: Optional[float] = None
+        self._control: Dict[str, Any] = {}
+
+    def _read_control(self) -> Dict[str, Any]:
+        """Re-read the control file only when its mtime changes"""
+        try:
+            mtime = self.control_path.stat().st_mtime
+        except OSError:
+            self._control_mtime = None
+            self._control = {}
+            return self._control
+        if mtime != self._control_mtime:
+            self._control_mtime = mtime
+            self._control = safe_read_json(self.control_path, default={}) or {}
+        return self._control
+
+    def is_enabled(self) -> bool:
+        control = self._read_control()
+        if "enabled" in control:
+            services = control.get("services")
+            return bool(control["enabled"]) and (not services or self.service_name in services)
+        return config_manager.get_bool("PROFILING_ENABLED", False)
+
+    def poll(self) -> None:
+        """Start/stop the sampler to match the requested state and dump periodically"""
+        try:
+            enabled = self.is_enabled()
+            if enabled and self.sampler is None:
+                interval_ms = float(self._control.get(
+                    "interval_ms", config_manager.get_float("PROFILING_INTERVAL_MS", 10.0)))
+                self.sampler = StackSampler(
+                    interval=max(interval_ms, 1.0) / 1000.0,
+                    max_overhead_pct=config_manager.get_float("PROFILING_MAX_OVERHEAD_PCT", 2.0),
+                )
+                self.sampler.start()
+                self._last_dump = time.monotonic()
+                logger.info(f"Profiling started for {self.service_name} ({interval_ms:.1f}ms)")
+            elif not enabled and self.sampler is not None:
+                self.dump()
+                self.sampler.stop()
+                self.sampler = None
+                logger.info(f"Profiling stopped for {self.service_name}")
+            elif self.sampler is not None and time.monotonic() - self._last_dump >= self.dump_interval:
+                self.dump()
+        except Exception as e:
+            logger.error(f"Profiler poll failed for {self.service_name}: {e}")
+
+    def dump(self, top_n: int = 25) -> Optional[Path]:
+        """Write collapsed stacks and top functions to the profiles directory"""
+        if self.sampler is None:
+            return None
+        self._last_dump = time.monotonic()
+        folded_file = self.profiles_dir / f"{self.service_name}.folded"
+        atomic_writer.write_text(folded_file, "\n".join(self.sampler.collapsed()) + "\n")
+        atomic_write_json(self.profiles_dir / f"{self.service_name}_top.json", {
+            "service": self.service_name,
+            "timestamp": utc_now_seconds(),
+            **self.sampler.stats(),
+            "top": self.sampler.top_functions(top_n),
+        })
+        return folded_file
+
+    def stop(self) -> None:
+        if self.sampler is not None:
+            self.dump()
+            self.sampler.stop()
+            self.sampler = None
+
+
+def export_profiles(output_dir: Path, profiles_dir: Optional[Path] = None) -> List[str]:
+    """Copy the latest profile dumps into a debug bundle directory"""
+    profiles_dir = profiles_dir or get_profiles_dir()
+    if not profiles_dir.exists():
+        return []
+    target = output_dir / "profiles"
+    copied = []
+    for profile_file in sorted(profiles_dir.iterdir()):
+        if profile_file.suffix in (".folded", ".json"):
+            target.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(profile_file, target / profile_file.name)
+            copied.append(profile_file.name)
+    return copied
@@ -0,0 +1,335 @@
+"""
+Read API for Coin Quant R11
+
+Small aggregator that keeps prices, signals, positions and health in memory
+and serves them over HTTP to the dashboard (MONITORING_BACKEND=http), so
+the UI no longer touches the trading host's filesystem and can run
+elsewhere.
+
+- Sources are refreshed from the service files through the DataBus
+  FileCache: one stat per file per refresh, a parse only when it changed.
+- Every resource item carries the version at which it last changed.
+  `GET /v1/<resource>?since=<version>&epoch=<epoch>` returns only newer
+  items plus deletions; a mismatched epoch (server restart) or `since=0`
+  returns the full resource.
+- Responses carry `ETag`; a matching `If-None-Match` gets `304` with no body.
+- HTTP/1.1 keep-alive with a threaded server.
+
+Values are stored without wall-clock ages (prices keep the snapshot file
+mtime, signals the timestamp ages are measured from), so an unchanged
+source never changes a version. Clients derive ages from `server_time`.
+
+Endpoints:
+    GET /v1/snapshot            - all resources with their versions
+    GET /v1/prices|signals|positions|health[?since=N&epoch=E]
+    GET /health                 - liveness of the read API itself
+
+Run: python -m coin_quant.shared.read_api [--host 0.0.0.0] [--port 8765]
+"""
+
+import argparse
+import json
+import logging
+import socket
+import threading
+import time
+import urllib.parse
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from coin_quant.shared.config import config_manager
+from coin_quant.shared.data_access import (FileCache, FileHealthRepo, FilePositionRepo,
+                                           FilePriceSnapshotRepo, FileSignalRepo)
+from coin_quant.shared.price_board import PriceBoardReader
+
+logger = logging.getLogger(__name__)
+
+RESOURCES = ("prices", "signals", "positions", "health")
+
+
+class _Resource:
+    """Versioned key/value set with tombstones for deletions"""
+
+    __slots__ = ("version", "items", "item_versions", "tombstones")
+
+    def __init__(self):
+        self.version = 0
+        self.items: Dict[str, Any] = {}
+        self.item_versions: Dict[str, int] = {}
+        self.tombstones: Dict[str, int] = {}
+
+    def replace(self, items: Dict[str, Any]) -> int:
+        """Replace contents, bumping the version once if anything changed"""
+        changed = [k for k, v in items.items() if self.items.get(k, _MISSING) != v]
+        removed = [k for k in self.items if k not in items]
+        if not changed and not removed:
+            return 0
+        self.version += 1
+        for key in changed:
+            self.items[key] = items[key]
+            self.item_versions[key] = self.version
+            self.tombstones.pop(key, None)
+        for key in removed:
+            del self.items[key]
+            del self.item_versions[key]
+            self.tombstones[key] = self.version
+        return len(changed) + len(removed)
+
+    def delta(self, since: int) -> Tuple[Dict[str, Any], List[str]]:
+        items = {k: self.items[k] for k, v in self.item_versions.items() if v > since}
+        deleted = [k for k, v in self.tombstones.items() if v > since]
+        return items, deleted
+
+
+_MISSING = object()
+
+
+class ReadModel:
+    """In-memory versioned view of the read-side resources"""
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:12]
+        self._lock = threading.Lock()
+        self._resources = {name: _Resource() for name in RESOURCES}
+
+    def update(self, resource: str, items: Dict[str, Any]) -> int:
+        """Replace a resource's items; returns the number of changed keys"""
+        with self._lock:
+            return self._resources[resource].replace(items)
+
+    def version(self, resource: str) -> int:
+        with self._lock:
+            return self._resources[resource].version
+
+    def etag(self, resource: Optional[str] = None) -> str:
+        with self._lock:
+            if resource is None:
+                versions = "-".join(str(self._resources[r].version) for r in RESOURCES)
+                return f'"{self.epoch}-all-{versions}"'
+            return f'"{self.epoch}-{resource}-{self._resources[resource].version}"'
+
+    def query(self, resource: str, since: int = 0, epoch: Optional[str] = None) -> Dict[str, Any]:
+        """Full resource, or only the changes after `since` within the same epoch"""
+        with self._lock:
+            res = self._resources[resource]
+            full = since <= 0 or epoch != self.epoch or since > res.version
+            if full:
+                items, deleted = dict(res.items), []
+            else:
+                items, deleted = res.delta(since)
+            return {
+                "resource": resource,
+                "epoch": self.epoch,
+                "version": res.version,
+                "since": 0 if full else since,
+                "full": full,
+                "server_time": time.time(),
+                "items": items,
+                "deleted": deleted,
+            }
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "epoch": self.epoch,
+            "server_time": time.time(),
+            "resources": {r: self.query(r) for r in RESOURCES},
+        }
+
+
+class FileSource:
+    """Builds resource contents from the service files through a shared FileCache"""
+
+    def __init__(self, cache: Optional[FileCache] = None):
+        self.cache = cache or FileCache()
+        self.prices = FilePriceSnapshotRepo(self.cache, PriceBoardReader(fallback=False))
+        self.signals = FileSignalRepo(self.cache)
+        self.positions = FilePositionRepo(self.cache)
+        self.health = FileHealthRepo(self.cache)
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        price_symbols = self.prices.list_symbols()
+        prices = {
+            symbol: {"data": data, "mtime": mtime}
+            for symbol, (data, mtime) in self.prices.get_many_with_refs(price_symbols).items()
+            if data is not None
+        }
+        signal_symbols = sorted(set(price_symbols) | set(self.signals.list_symbols()))
+        signals = {
+            symbol: {"data": signal, "age_ref": ref}
+            for symbol, (signal, ref) in self.signals.get_many_with_refs(signal_symbols).items()
+            if signal is not None
+        }
+        return {
+            "prices": prices,
+            "signals": signals,
+            "positions": self.positions.get_all(),
+            "health": self.health.get_all().get("components", {}),
+        }
+
+
+class _ReadAPIHTTPServer(ThreadingHTTPServer):
+    """Threaded server that can close its open keep-alive connections on stop"""
+
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._connections = set()
+        self._connections_lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        with self._connections_lock:
+            self._connections.add(request)
+        super().process_request(request, client_address)
+
+    def shutdown_request(self, request):
+        with self._connections_lock:
+            self._connections.discard(request)
+        super().shutdown_request(request)
+
+    def close_connections(self):
+        with self._connections_lock:
+            connections = list(self._connections)
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class ReadAPIServer:
+    """Read API aggregator: refresh thread + threaded HTTP/1.1 server"""
+
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None,
+                 refresh_interval: Optional[float] = None,
+                 source: Optional[FileSource] = None):
+        self.host = host or config_manager.get("READ_API_HOST", "127.0.0.1")
+        self.port = port if port is not None else config_manager.get_int("READ_API_PORT", 8765)
+        self.refresh_interval = refresh_interval or config_manager.get_float("READ_API_REFRESH_SEC", 1.0)
+        self.source = source or FileSource()
+        self.model = ReadModel()
+        self.server: Optional[_ReadAPIHTTPServer] = None
+        self.server_thread: Optional[threading.Thread] = None
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def refresh(self) -> int:
+        """Pull sources into the read model; returns the number of changed keys"""
+        changed = 0
+        for resource, items in self.source.collect().items():
+            changed += self.model.update(resource, items)
+        return changed
+
+    def _refresh_loop(self):
+        while not self._stop_event.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Read API refresh failed: {e}")
+
+    def start(self):
+        """Start refresh loop and HTTP server"""
+        self.refresh()
+        self.server = _ReadAPIHTTPServer((self.host, self.port), ReadAPIHandler)
+        self.server.read_model = self.model
+        self.port = self.server.server_address[1]
+        self._stop_event.clear()
+        self._refresh_thread = threading.Thread(target=self._refresh_loop, name="read-api-refresh", daemon=True)
+        self._refresh_thread.start()
+        self.server_thread = threading.Thread(target=self.server.serve_forever, name="read-api", daemon=True)
+        self.server_thread.start()
+        logger.info(f"Read API started on http://{self.host}:{self.port}")
+
+    def stop(self):
+        """Stop HTTP server and refresh loop"""
+        self._stop_event.set()
+        if self.server:
+            self.server.shutdown()
+            self.server.close_connections()
+            self.server.server_close()
+            self.server = None
+        if self._refresh_thread:
+            self._refresh_thread.join(timeout=5)
+            self._refresh_thread = None
+        logger.info("Read API stopped")
+
+
+class ReadAPIHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 handler for the read API"""
+
+    protocol_version = "HTTP/1.1"
+    timeout = 60  # idle keep-alive connections are dropped after this
+
+    def do_GET(self):
+        try:
+            parsed = urllib.parse.urlparse(self.path)
+            query = urllib.parse.parse_qs(parsed.query)
+            model: ReadModel = self.server.read_model
+            path = parsed.path.rstrip("/")
+
+            if path == "/health":
+                self._send_json({"status": "ok", "epoch": model.epoch,
+                                 "versions": {r: model.version(r) for r in RESOURCES}})
+            elif path == "/v1/snapshot":
+                self._send_cached(model.etag(), model.snapshot)
+            elif path.startswith("/v1/") and path[4:] in RESOURCES:
+                resource = path[4:]
+                since = int(query.get("since", ["0"])[0] or 0)
+                epoch = query.get("epoch", [None])[0]
+                self._send_cached(model.etag(resource), lambda: model.query(resource, since, epoch))
+            else:
+                self._send_json({"error": "Not Found", "path": parsed.path}, 404)
+        except ValueError as e:
+            self._send_json({"error": "Bad Request", "message": str(e)}, 400)
+        except Exception as e:
+            self._send_json({"error": "Internal Server Error", "message": str(e)}, 500)
+
+    def _send_cached(self, etag: str, build):
+        if etag in (tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send_json(build(), etag=etag)
+
+    def _send_json(self, data: Dict[str, Any], status_code: int = 200, etag: Optional[str] = None):
+        body = json.dumps(data, separators=(",", ":"), default=str).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Override to reduce log noise"""
+        pass
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Coin Quant read API")
+    parser.add_argument("--host", help="Bind address (default READ_API_HOST or 127.0.0.1)")
+    parser.add_argument("--port", type=int, help="Port (default READ_API_PORT or 8765)")
+    parser.add_argument("--refresh", type=float, help="Source refresh interval seconds")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    server = ReadAPIServer(args.host, args.port, args.refresh)
+    server.start()
+    print(f"Read API running on http://{server.host}:{server.port}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -11,6 +11,7 @@ from pathlib import Path
 from typing import Optional
 from .paths import get_data_dir
 from .io import atomic_writer, atomic_reader
+from .process_registry import process_registry
 
 
 class SingletonError(Exception):
@@ -41,8 +42,11 @@ class SingletonGuard:
                 if existing_pid and self._is_process_running(existing_pid):
                     return False
             
-            # Write PID file
-            return self._write_pid()
+            # Write PID file and register role in the process registry
+            if not self._write_pid():
+                return False
+            process_registry.register(self.service_name, self.pid)
+            return True
             
         except Exception as e:
             raise SingletonError(f"Failed to acquire singleton lock: {e}")
@@ -57,6 +61,7 @@ class SingletonGuard:
         try:
             if self.pid_file.exists():
                 self.pid_file.unlink()
+            process_registry.unregister(self.service_name, self.pid)
             return True
         except Exception as e:
             raise SingletonError(f"Failed to release singleton lock: {e}")
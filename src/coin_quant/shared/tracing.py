@@ -0,0 +1,251 @@
+"""
+Pipeline trace context for Coin Quant R11
+
+Follows a tick through feeder -> ARES -> trader and records per-stage
+latencies into bounded histograms:
+
+    ws_receive -> snapshot -> signal -> gate -> submit -> ack
+
+The feeder creates a trace when a WebSocket message arrives; the trace is
+carried as a plain dict under the "trace" key of tick data, signals and
+orders. Each service stamps the stages it owns with the monotonic clock
+(system-wide on Linux and Windows, so stamps are comparable between
+processes on the same host) and periodically exports its stage histograms
+to `shared_data/traces/<service>.json` for the monitoring endpoint and the
+CLI report:
+
+    python -m coin_quant.shared.tracing [--json]
+"""
+
+import argparse
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from coin_quant.shared.io import atomic_write_json, safe_read_json
+from coin_quant.shared.metrics import (DEFAULT_LATENCY_BUCKETS, MetricsRegistry,
+                                       metrics_registry, quantile_from_buckets)
+from coin_quant.shared.paths import get_data_dir
+from coin_quant.shared.time import utc_now_seconds
+
+logger = logging.getLogger(__name__)
+
+# Ordered pipeline stages
+STAGES = ("ws_receive", "snapshot", "signal", "gate", "submit", "ack")
+
+# Reported stage transitions ("from->to")
+STAGE_PAIRS = tuple(f"{a}->{b}" for a, b in zip(STAGES, STAGES[1:]))
+
+TRACE_KEY = "trace"
+STAGE_HISTOGRAM = "coin_quant_pipeline_stage_seconds"
+
+
+def get_traces_dir() -> Path:
+    """Get trace export directory path."""
+    return get_data_dir() / "traces"
+
+
+def new_trace(received_ns: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Create a trace context stamped at ws_receive.
+
+    Args:
+        received_ns: time.monotonic_ns() captured when the message arrived
+
+    Returns:
+        JSON-serializable trace dict
+    """
+    return {
+        "trace_id": uuid.uuid4().hex[:16],
+        "received_ts": utc_now_seconds(),
+        "stamps": {"ws_receive": received_ns if received_ns is not None else time.monotonic_ns()},
+    }
+
+
+def get_trace(payload: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Extract a trace context from a tick/signal/order dict"""
+    if not isinstance(payload, dict):
+        return None
+    trace = payload.get(TRACE_KEY)
+    if isinstance(trace, dict) and "trace_id" in trace and isinstance(trace.get("stamps"), dict):
+        return trace
+    return None
+
+
+def child_trace(trace: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Copy a trace so downstream stamps don't mutate the upstream payload"""
+    if trace is None:
+        return None
+    return {
+        "trace_id": trace["trace_id"],
+        "received_ts": trace.get("received_ts", 0.0),
+        "stamps": dict(trace["stamps"]),
+    }
+
+
+class Tracer:
+    """Records stage transitions of pipeline traces into histograms"""
+
+    def __init__(self, service_name: str, registry: Optional[MetricsRegistry] = None,
+                 traces_dir: Optional[Path] = None, dedup_size: int = 10000):
+        self.service_name = service_name
+        self.registry = registry or metrics_registry
+        self.traces_dir = traces_dir or get_traces_dir()
+        self.export_file = self.traces_dir / f"{service_name}.json"
+        self.histogram = self.registry.histogram(
+            STAGE_HISTOGRAM, "Pipeline stage latency", ["stage"], DEFAULT_LATENCY_BUCKETS
+        )
+        self.end_to_end = self.registry.histogram(
+            "coin_quant_pipeline_total_seconds", "ws_receive to stage latency", ["stage"],
+            DEFAULT_LATENCY_BUCKETS
+        )
+        # (trace_id, stage) already recorded - signals are re-read from file
+        # on every trader loop, so the same trace can be seen many times
+        self._seen: "OrderedDict[tuple, None]" = OrderedDict()
+        self._seen_lock = threading.Lock()
+        self._dedup_size = dedup_size
+
+    def stamp(self, trace: Optional[Dict[str, Any]], stage: str,
+              now_ns: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Stamp a stage on a trace and observe the latency since the previous stage.
+
+        Safe to call with None (untraced payloads are ignored).
+
+        Returns:
+            The same trace dict
+        """
+        if trace is None:
+            return None
+        if stage not in STAGES:
+            raise ValueError(f"Unknown pipeline stage: {stage}")
+
+        key = (trace["trace_id"], stage)
+        with self._seen_lock:
+            if key in self._seen:
+                return trace
+            self._seen[key] = None
+            if len(self._seen) > self._dedup_size:
+                self._seen.popitem(last=False)
+
+        now_ns = now_ns if now_ns is not None else time.monotonic_ns()
+        stamps = trace["stamps"]
+        stamps[stage] = now_ns
+
+        index = STAGES.index(stage)
+        for previous in reversed(STAGES[:index]):
+            if previous in stamps:
+                elapsed = (now_ns - stamps[previous]) / 1e9
+                if elapsed >= 0:
+                    self.histogram.labels(stage=f"{previous}->{stage}").observe(elapsed)
+                break
+
+        origin = stamps.get("ws_receive")
+        if origin is not None and index > 0 and now_ns >= origin:
+            self.end_to_end.labels(stage=stage).observe((now_ns - origin) / 1e9)
+        return trace
+
+    def export(self) -> Dict[str, Any]:
+        """Raw bucket counts per stage (mergeable across services)"""
+        stages = {}
+        for family in (self.histogram, self.end_to_end):
+            for (label,), child in family.children():
+                buckets, total, count = child.merged()
+                key = label if family is self.histogram else f"total:{label}"
+                stages[key] = {"buckets": buckets, "sum": total, "count": count}
+        return {
+            "service": self.service_name,
+            "timestamp": utc_now_seconds(),
+            "bounds": list(self.histogram.buckets),
+            "stages": stages,
+        }
+
+    def flush(self) -> bool:
+        """Write the stage histograms to shared_data/traces/<service>.json"""
+        try:
+            return atomic_write_json(self.export_file, self.export())
+        except Exception as e:
+            logger.error(f"Failed to export traces for {self.service_name}: {e}")
+            return False
+
+
+def load_stage_breakdown(traces_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Merge all exported service histograms and compute per-stage percentiles.
+
+    Returns:
+        {"timestamp", "services", "stages": {pair: {count, mean_ms, p50_ms, p90_ms, p99_ms}}}
+    """
+    traces_dir = traces_dir or get_traces_dir()
+    merged: Dict[str, Dict[str, Any]] = {}
+    bounds: Optional[List[float]] = None
+    services = {}
+
+    for export_file in sorted(traces_dir.glob("*.json")) if traces_dir.exists() else []:
+        data = safe_read_json(export_file)
+        if not data or "stages" not in data:
+            continue
+        if bounds is None:
+            bounds = data.get("bounds")
+        elif data.get("bounds") != bounds:
+            logger.warning(f"Skipping {export_file.name}: incompatible bucket bounds")
+            continue
+        services[data.get("service", export_file.stem)] = data.get("timestamp", 0)
+        for stage, hist in data["stages"].items():
+            acc = merged.setdefault(stage, {"buckets": [0] * len(hist["buckets"]),
+                                            "sum": 0.0, "count": 0})
+            acc["buckets"] = [a + b for a, b in zip(acc["buckets"], hist["buckets"])]
+            acc["sum"] += hist["sum"]
+            acc["count"] += hist["count"]
+
+    def _ms(value):
+        return round(value * 1000, 3) if value is not None else None
+
+    stages = {}
+    ordered = [p for p in STAGE_PAIRS if p in merged] + sorted(p for p in merged if p not in STAGE_PAIRS)
+    for stage in ordered:
+        hist = merged[stage]
+        stages[stage] = {
+            "count": hist["count"],
+            "mean_ms": _ms(hist["sum"] / hist["count"]) if hist["count"] else None,
+            "p50_ms": _ms(quantile_from_buckets(bounds, hist["buckets"], 0.50)),
+            "p90_ms": _ms(quantile_from_buckets(bounds, hist["buckets"], 0.90)),
+            "p99_ms": _ms(quantile_from_buckets(bounds, hist["buckets"], 0.99)),
+        }
+
+    return {"timestamp": utc_now_seconds(), "services": services, "stages": stages}
+
+
+def format_breakdown(breakdown: Dict[str, Any]) -> str:
+    """Render a stage breakdown as a text table"""
+    lines = [f"{'stage':<28}{'count':>10}{'p50 ms':>12}{'p90 ms':>12}{'p99 ms':>12}"]
+    lines.append("-" * len(lines[0]))
+    for stage, row in breakdown["stages"].items():
+        cells = [row[k] if row[k] is not None else "-" for k in ("p50_ms", "p90_ms", "p99_ms")]
+        lines.append(f"{stage:<28}{row['count']:>10}" + "".join(f"{c:>12}" for c in cells))
+    if not breakdown["stages"]:
+        lines.append("(no trace exports found)")
+    return "\n".join(lines)
+
+
+def main():
+    """CLI report of pipeline stage latencies"""
+    parser = argparse.ArgumentParser(description="Pipeline stage latency report")
+    parser.add_argument("--dir", type=Path, default=None, help="Trace export directory")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    breakdown = load_stage_breakdown(args.dir)
+    if args.json:
+        print(json.dumps(breakdown, indent=2))
+    else:
+        print(format_breakdown(breakdown))
+
+
+if __name__ == "__main__":
+    main()
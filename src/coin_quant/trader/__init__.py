@@ -6,8 +6,11 @@ Honors simulation mode, performs pre-order balance checks,
 down-scales order size, bounded retries, symbol quarantine.
 """
 
-from . import service
+from coin_quant.shared.lazy import lazy_submodules
 
 __all__ = [
     "service",
 ]
+
+# Submodules are imported on first access: importing the package stays cheap
+__getattr__, __dir__ = lazy_submodules(__name__, __all__)
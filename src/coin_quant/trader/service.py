@@ -10,18 +10,65 @@ import time
 import signal
 import sys
 import json
-import requests
+import uuid
 from typing import Dict, Any, List, Optional
 from pathlib import Path
+from coin_quant.shared.lazy import lazy_import
 from coin_quant.shared.logging import get_service_logger
 from coin_quant.shared.health import health_manager
 from coin_quant.shared.config import config_manager
 from coin_quant.shared.singleton import create_singleton_guard
-from coin_quant.shared.paths import get_data_dir
+from coin_quant.shared.paths import get_data_dir, get_account_snapshot_path
 from coin_quant.shared.time import utc_now_seconds, age_seconds, is_fresh
-from coin_quant.shared.io import atomic_write_json, safe_read_json
+from coin_quant.shared.io import atomic_write_json
+from coin_quant.shared.codec import read_payload
+from coin_quant.shared.profiling import ServiceProfiler
+from coin_quant.shared.tracing import Tracer, get_trace
 from coin_quant.memory.client import MemoryClient
 
+# Imported on the first exchange request, not when the module is imported
+requests = lazy_import("requests")
+
+
+class RestOrderClient:
+    """new_order/get_order over the REST API, as OrderRouterResilience calls them"""
+    
+    def __init__(self, base_url: str, api_key: str):
+        self.base_url = base_url
+        self.api_key = api_key
+    
+    def new_order(self, symbol, side, type, quantity, price, newClientOrderId):
+        """Place an order; 4xx/5xx raise HTTPError (the router reads status and Retry-After)"""
+        params = {
+            "symbol": symbol,
+            "side": side,
+            "type": type,
+            "quantity": quantity,
+            "newClientOrderId": newClientOrderId,
+            "timestamp": int(time.time() * 1000)
+        }
+        if type != "MARKET":
+            params["price"] = price
+        response = requests.post(f"{self.base_url}/api/v3/order", headers={"X-MBX-APIKEY": self.api_key},
+                                 data=params, timeout=10)
+        response.raise_for_status()
+        return response.json()
+    
+    def get_order(self, symbol, origClientOrderId):
+        """Look an order up by clientOrderId; None if the exchange does not know it (-2013)"""
+        response = requests.get(f"{self.base_url}/api/v3/order", headers={"X-MBX-APIKEY": self.api_key},
+                                params={"symbol": symbol, "origClientOrderId": origClientOrderId,
+                                        "timestamp": int(time.time() * 1000)},
+                                timeout=10)
+        if response.status_code == 400:
+            try:
+                if response.json().get("code") == -2013:
+                    return None
+            except ValueError:
+                pass
+        response.raise_for_status()
+        return response.json()
+
 
 class TraderService:
     """Trader service with real order execution and failsafe logic"""
@@ -42,6 +89,11 @@ class TraderService:
         self.heartbeat_interval = config_manager.get_float("TRADER_HEARTBEAT_INTERVAL", 30.0)
         self.order_cooldown = self.config.get("order_cooldown", 1)
         self.simulation_mode = self.trading_config.get("simulation", True)
+        # Spread/slippage gate on the feeder's book estimates (opt-in: the caps need per-market tuning)
+        self.market_gate_enabled = config_manager.get_bool("TRADER_MARKET_GATE", False)
+        self.max_spread_bps = config_manager.get_float("TRADER_MAX_SPREAD_BPS", 8.0)
+        self.max_slippage_bps = config_manager.get_float("TRADER_MAX_SLIPPAGE_BPS", 20.0)
+        self.book_max_age = config_manager.get_float("TRADER_BOOK_MAX_AGE_SEC", 5.0)
         
         # API Configuration
         self.api_key = config_manager.get("BINANCE_API_KEY", "")
@@ -60,10 +112,17 @@ class TraderService:
         self.orders_file = self.data_dir / "trader_orders.json"
         self.balance_file = self.data_dir / "account_balance.json"
         self.memory_client = MemoryClient(self.data_dir)
+        self.tracer = Tracer("trader")
+        self.profiler = ServiceProfiler("trader")
         
         # Order execution state
         self.account_balance = {}
         self.last_balance_check = 0
+        self._paper_router = None  # legacy PAPER router (matching engine), loaded on first use
+        self._paper_router_failed = False
+        self._order_resilience = None  # retry scheduler for live orders, loaded on first use
+        self._order_resilience_failed = False
+        self.order_client = RestOrderClient(self.base_url, self.api_key)
         
         # Signal handlers
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -101,6 +160,9 @@ class TraderService:
                 self.logger.error(f"Configuration validation error: {e}")
                 return False
             
+            # Capital limit filter: account balance from the snapshot, then BALANCE_UPDATE events
+            self._wire_balance_events()
+            
             # Start main loop
             self.running = True
             self._main_loop()
@@ -117,15 +179,29 @@ class TraderService:
         """Stop trader service"""
         self.logger.info("Stopping trader service...")
         self.running = False
+        self.profiler.stop()
         
         # Update health status
-        health_manager.set_component_status("trader", "RED", {
-            "last_update_ts": utc_now_seconds(),
-            "updated_within_sec": 0,
-            "orders_count": self.orders_count,
-            "fills_count": self.fills_count,
-            "status": "stopped"
-        })
+        health_manager.set_trader_health(
+            "RED", self.orders_count,
+            fills_count=self.fills_count,
+            state="stopped",
+        )
+    
+    def _wire_balance_events(self):
+        """Seed the integrity filters' balance view and keep it current from BALANCE_UPDATE events"""
+        try:
+            from shared.integrity_filters import attach_balance_events, seed_balance_view
+            from shared.ui_event_bus import get_event_subscriber
+        except Exception as e:
+            self.logger.debug(f"Integrity filters unavailable, balance events not wired: {e}")
+            return
+        try:
+            if not seed_balance_view(get_account_snapshot_path()):
+                self.logger.warning("No account snapshot balance; capital limit uses the fallback until the first balance event")
+            attach_balance_events(get_event_subscriber())
+        except Exception as e:
+            self.logger.error(f"Failed to wire balance events: {e}")
     
     def _main_loop(self):
         """Main service loop"""
@@ -133,6 +209,11 @@ class TraderService:
         
         while self.running:
             try:
+                # Resting PAPER orders fill against the latest market data
+                self._poll_paper_fills()
+                # Scheduled retries / clientOrderId lookups of live orders
+                self._poll_order_retries()
+                
                 # Check ARES health
                 if not self._check_ares_health():
                     self.logger.warning("ARES health check failed, skipping order processing")
@@ -225,10 +306,9 @@ class TraderService:
     def _load_ares_signals(self) -> List[Dict[str, Any]]:
         """Load signals from ARES service"""
         try:
-            if self.signals_file.exists():
-                data = safe_read_json(self.signals_file)
-                if data and 'signals' in data:
-                    return data['signals']
+            data = read_payload(self.signals_file)
+            if data and 'signals' in data:
+                return data['signals']
             return []
         except Exception as e:
             self.logger.error(f"Failed to load signals: {e}")
@@ -244,12 +324,19 @@ class TraderService:
                 self.logger.warning(f"Symbol {symbol} is quarantined, skipping order")
                 return False
             
+            # Measured market conditions (spread / expected slippage)
+            if not self._check_market(trading_signal):
+                return False
+            
             # Pre-order balance check
             if not self._check_balance(trading_signal):
                 self.logger.warning(f"Insufficient balance for {symbol}")
                 self._quarantine_symbol(symbol, "Insufficient balance")
                 return False
             
+            # Gate checks passed
+            self.tracer.stamp(get_trace(trading_signal), 'gate')
+            
             # Down-scale order size if needed
             adjusted_signal = self._adjust_order_size(trading_signal)
             
@@ -264,6 +351,31 @@ class TraderService:
             self.logger.error(f"Failed to process signal {trading_signal}: {e}")
             return False
     
+    def _check_market(self, trading_signal: Dict[str, Any]) -> bool:
+        """Reject orders into a wide or thin book (skipped if disabled or no fresh book is attached)"""
+        market = trading_signal.get("market")
+        if not self.market_gate_enabled or not market:
+            return True
+        age = age_seconds(market.get("book_updated_at"))
+        if age is None or age > self.book_max_age:
+            return True
+        
+        symbol = trading_signal["symbol"]
+        spread_bps = market.get("spread_bps")
+        if spread_bps is not None and spread_bps > self.max_spread_bps:
+            self.logger.warning(f"Spread too wide for {symbol}: {spread_bps:.1f} > {self.max_spread_bps} bps, skipping order")
+            return False
+        
+        slippage_bps = market.get("expected_slippage_bps")
+        if slippage_bps is None:
+            # order larger than the exported depth: cost unknown, not known to be too high
+            self.logger.info(f"Expected slippage for {symbol} unknown (order exceeds exported book depth), allowing order")
+            return True
+        if slippage_bps > self.max_slippage_bps:
+            self.logger.warning(f"Expected slippage for {symbol} exceeds {self.max_slippage_bps} bps ({slippage_bps:.1f}), skipping order")
+            return False
+        return True
+    
     def _check_balance(self, trading_signal: Dict[str, Any]) -> bool:
         """Check if sufficient balance exists for order"""
         try:
@@ -364,13 +476,123 @@ class TraderService:
             self.logger.error(f"Failed to adjust order size: {e}")
             return trading_signal
     
+    def _get_paper_router(self):
+        """
+        Legacy order router in PAPER mode, whose matching engine fills
+        simulated orders against the feeder's snapshots.
+        
+        Returns None (flat simulated fills) when the legacy module or its
+        dependencies are not importable.
+        """
+        if self._paper_router is None and not self._paper_router_failed:
+            try:
+                from shared.order_router import OrderMode, get_order_router
+                self._paper_router = get_order_router(OrderMode.PAPER)
+                self._paper_router.set_mode(OrderMode.PAPER)
+            except Exception as e:
+                self._paper_router_failed = True
+                self.logger.debug(f"PAPER order router unavailable, using flat simulated fills: {e}")
+        return self._paper_router
+    
+    def _poll_paper_fills(self):
+        """Record fills of resting PAPER orders on this market-data tick"""
+        if not self.simulation_mode or self._paper_router is None:
+            return
+        try:
+            self._paper_router.poll_paper_fills()
+        except Exception as e:
+            self.logger.error(f"Failed to poll paper fills: {e}")
+    
+    def _get_order_resilience(self):
+        """
+        Legacy OrderRouterResilience: live orders are submitted without
+        blocking, retried on its timer heap and looked up by clientOrderId
+        when a send's outcome is unknown.
+        
+        Returns None (single direct request) when the legacy module is not
+        importable.
+        """
+        if self._order_resilience is None and not self._order_resilience_failed:
+            try:
+                from shared.order_router_resilience import get_order_router_resilience
+                self._order_resilience = get_order_router_resilience()
+            except Exception as e:
+                self._order_resilience_failed = True
+                self.logger.debug(f"Order router resilience unavailable, sending orders once: {e}")
+        return self._order_resilience
+    
+    def _poll_order_retries(self):
+        """Run live-order retries whose backoff has elapsed (never sleeps)"""
+        if self.simulation_mode or self._order_resilience is None:
+            return
+        try:
+            self._order_resilience.poll()
+        except Exception as e:
+            self.logger.error(f"Failed to poll order retries: {e}")
+    
+    def _on_order_routed(self, routed):
+        """Final outcome of a live order whose first attempt was retried"""
+        if not routed.attempts:
+            return  # settled by its first attempt: _submit_live_order reports it
+        request = routed.request
+        if routed.response is not None and routed.response.success:
+            self.logger.info(f"Order executed after retry: {request.symbol} {request.side} (coid={request.client_order_id})")
+        elif routed.unknown:
+            self.logger.error(f"Order outcome unknown, reconcile with the exchange: {request.symbol} (coid={request.client_order_id})")
+        else:
+            error = routed.response.error_code if routed.response is not None else None
+            self._quarantine_symbol(request.symbol, f"Order execution failed after retries ({error})")
+    
+    def _submit_live_order(self, router, trading_signal: Dict[str, Any], trace) -> bool:
+        """Submit through the retry scheduler; True if filled or still being retried"""
+        from shared.order_router_resilience import OrderRequest
+        routed = router.submit_order(OrderRequest(
+            symbol=trading_signal["symbol"],
+            side=trading_signal["side"],
+            qty=trading_signal["size"],
+            price=trading_signal.get("price", 0.0),
+            order_type="MARKET",
+            # the trace id makes re-read signals idempotent at the exchange
+            client_order_id=(trace or {}).get("trace_id") or uuid.uuid4().hex[:16],
+        ), self.order_client, callback=self._on_order_routed)
+        self.tracer.stamp(trace, 'ack')
+        if not routed.done:
+            self.logger.warning(f"Order {routed.request.client_order_id} for {trading_signal['symbol']} scheduled for retry ({routed.response.error_code})")
+            return True
+        if routed.response.success:
+            self.logger.info(f"Order executed: {routed.response.raw_response}")
+            return True
+        self.logger.error(f"Order failed: {routed.response.error_code} - {routed.response.error_message}")
+        return False
+    
     def _execute_order(self, trading_signal: Dict[str, Any]) -> bool:
         """Execute order on exchange"""
+        trace = get_trace(trading_signal)
         try:
+            self.tracer.stamp(trace, 'submit')
             if self.simulation_mode:
-                # Simulate order execution
+                router = self._get_paper_router()
+                if router is None:
+                    # Simulate order execution
+                    self.tracer.stamp(trace, 'ack')
+                    return True
+                from shared.order_router import OrderRequest
+                result = router.place_order(OrderRequest(
+                    symbol=trading_signal["symbol"],
+                    side=trading_signal["side"],
+                    order_type="MARKET",
+                    quantity=trading_signal["size"],
+                ))
+                self.tracer.stamp(trace, 'ack')
+                if not result.success or result.status == "REJECTED":
+                    self.logger.error(f"Paper order failed: {result.error_message}")
+                    return False
                 return True
             else:
+                router = self._get_order_resilience()
+                if router is not None:
+                    return self._submit_live_order(router, trading_signal, trace)
+                
                 # Real order execution
                 url = f"{self.base_url}/api/v3/order"
                 headers = {
@@ -386,6 +608,7 @@ class TraderService:
                 }
                 
                 response = requests.post(url, headers=headers, data=params, timeout=10)
+                self.tracer.stamp(trace, 'ack')
                 if response.status_code == 200:
                     order_data = response.json()
                     self.logger.info(f"Order executed: {order_data}")
@@ -440,16 +663,15 @@ class TraderService:
             self._check_ares_health()
             
             # Update health
-            health_manager.set_component_status("trader", status, {
-                "last_update_ts": current_time,
-                "updated_within_sec": age_seconds(self.last_order_time) or 0,
-                "orders_count": self.orders_count,
-                "fills_count": self.fills_count,
-                "last_order_time": self.last_order_time,
-                "simulation_mode": self.simulation_mode,
-                "quarantined_symbols": list(self.quarantined_symbols),
-                "status": "running"
-            })
+            health_manager.set_trader_health(
+                status, self.orders_count,
+                order_age_sec=age_seconds(self.last_order_time) if self.last_order_time else None,
+                fills_count=self.fills_count,
+                last_order_time=self.last_order_time,
+                simulation_mode=self.simulation_mode,
+                quarantined_symbols=list(self.quarantined_symbols),
+                state="running",
+            )
             
             # Log status periodically
             if int(current_time) % 30 == 0:  # Every 30 seconds
@@ -457,6 +679,10 @@ class TraderService:
                 
         except Exception as e:
             self.logger.error(f"Failed to update health: {e}")
+        
+        # Stage latencies and profiler dumps run on every pass, whatever happened above
+        self.tracer.flush()
+        self.profiler.poll()
 
     def _check_ares_health(self) -> bool:
         """
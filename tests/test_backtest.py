@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for the backtest engine and its data loaders
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pytest
+
+from coin_quant.ares.strategies import SimpleMAParams, simple_ma_signal, simple_ma_vectorized
+from coin_quant.backtest.data import PriceSeries, load_klines, load_ticker_events
+from coin_quant.backtest.engine import BacktestConfig, CostModel, run_backtest
+from coin_quant.backtest.optimizer import ParameterOptimizer, walk_forward_splits
+
+MINUTE_MS = 60_000
+
+
+def test_vectorized_strategy_matches_live_signal():
+    """Backtests must take exactly the decisions ARES takes live"""
+    rng = np.random.default_rng(7)
+    change = rng.normal(0, 3, 2000)
+    price = rng.uniform(-1, 100, 2000)
+    params = SimpleMAParams(change_threshold_pct=1.5)
+    side, size, confidence = simple_ma_vectorized(price, change, params)
+    for i in range(len(change)):
+        signal = simple_ma_signal("BTCUSDT", price[i], change[i], params, timestamp=0)
+        if signal is None:
+            assert side[i] == 0
+        else:
+            assert side[i] == (1 if signal["side"] == "BUY" else -1)
+            assert size[i] == pytest.approx(signal["size"])
+            assert confidence[i] == pytest.approx(signal["confidence"])
+
+
+def test_round_trip_pnl_uses_cost_model():
+    """Buy on +change, sell on -change; net = gross - per-fill costs"""
+    prices = np.array([100, 100, 103, 104, 106, 101, 99, 99], dtype=float)
+    ts = np.arange(len(prices), dtype=np.int64) * MINUTE_MS
+    config = BacktestConfig(
+        initial_capital=1000.0,
+        change_window_ms=MINUTE_MS,
+        params=SimpleMAParams(change_threshold_pct=2.0, size_divisor=1.0),
+        costs=CostModel(fee_bps=4.0, slippage_bps=20.0),
+    )
+    result = run_backtest({"BTCUSDT": PriceSeries("BTCUSDT", ts, prices)}, config)
+
+    trades = result.trades
+    assert len(trades) == 1
+    trade = trades[0]
+    # +3% at bar 2 opens (size capped at 1.0), -4.7% at bar 5 closes
+    assert (trade.entry_price, trade.exit_price) == (103, 101)
+    assert trade.notional == pytest.approx(1000.0)
+    assert trade.gross_pnl == pytest.approx(1000.0 / 103 * (101 - 103))
+    exit_notional = 1000.0 / 103 * 101
+    assert trade.fee == pytest.approx((1000.0 + exit_notional) * 0.0004)
+    assert trade.slippage_cost == pytest.approx((1000.0 + exit_notional) * 0.0020)
+
+    summary = result.summary()
+    assert summary["net_pnl"] == pytest.approx(trade.net_pnl)
+    assert summary["final_equity"] == pytest.approx(result.equity[-1])
+    assert summary["max_drawdown"] >= -trade.net_pnl - 1e-9
+    assert summary["win_rate"] == 0.0
+
+
+def test_open_position_is_marked_to_market():
+    prices = np.array([100, 100, 105, 110], dtype=float)
+    ts = np.arange(len(prices), dtype=np.int64) * MINUTE_MS
+    config = BacktestConfig(initial_capital=100.0, change_window_ms=MINUTE_MS,
+                            costs=CostModel(fee_bps=0.0, slippage_bps=0.0))
+    result = run_backtest({"ETHUSDT": PriceSeries("ETHUSDT", ts, prices)}, config)
+    assert [t.is_open for t in result.trades] == [True]
+    # 50% size (5% change / 10) of 100 USDT bought at 105, marked at 110
+    assert result.summary()["net_pnl"] == pytest.approx(50.0 / 105 * 5)
+
+
+def test_loaders_read_history_and_memory_events():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        history = tmp / "history"
+        history.mkdir()
+        rows = [{"timestamp": 2 * MINUTE_MS, "close": 11.0},
+                {"t": 1 * MINUTE_MS, "c": "10.5"},  # Binance kline keys, out of order
+                {"timestamp": 2 * MINUTE_MS, "close": 11.5}]  # duplicate, last wins
+        (history / "btcusdt_1m.jsonl").write_text("\n".join(json.dumps(r) for r in rows) + "\n")
+
+        series = load_klines("BTCUSDT", history)
+        assert series.timestamps.tolist() == [MINUTE_MS, 2 * MINUTE_MS]
+        assert series.prices.tolist() == [10.5, 11.5]
+        assert (history / ".cache" / "btcusdt_1m.npz").exists()
+        assert load_klines("BTCUSDT", history).prices.tolist() == [10.5, 11.5]
+
+        events = tmp / "events.jsonl"
+        with open(events, "w") as f:
+            for i, (symbol, price) in enumerate([("BTCUSDT", 1.0), ("ETHUSDT", 2.0), ("BTCUSDT", 3.0)]):
+                f.write(json.dumps({"timestamp": i, "event_type": "ticker_update", "source": "feeder",
+                                    "data": {"symbol": symbol, "price": price, "change": 1.5,
+                                             "timestamp": i * 1000}}) + "\n")
+            f.write(json.dumps({"timestamp": 9, "event_type": "signal_generated", "data": {}}) + "\n")
+        loaded = load_ticker_events(["BTCUSDT"], events)
+        assert list(loaded) == ["BTCUSDT"]
+        assert loaded["BTCUSDT"].prices.tolist() == [1.0, 3.0]
+        assert loaded["BTCUSDT"].changes.tolist() == [1.5, 1.5]
+
+
+def _random_walks(n_symbols=3, bars=3 * 1440):
+    rng = np.random.default_rng(3)
+    ts = np.arange(bars, dtype=np.int64) * MINUTE_MS
+    return {f"S{i}USDT": PriceSeries(f"S{i}USDT", ts, 100 * np.exp(np.cumsum(rng.normal(0, 0.002, bars))))
+            for i in range(n_symbols)}
+
+
+def test_walk_forward_splits_roll_and_anchor():
+    rolling = walk_forward_splits(0, 100, train_ms=40, test_ms=20)
+    assert [(s.train.to_list(), s.test.to_list()) for s in rolling] == [
+        ([0, 40], [40, 60]), ([20, 60], [60, 80]), ([40, 80], [80, 100])]
+    anchored = walk_forward_splits(0, 100, train_ms=40, test_ms=20, anchored=True)
+    assert [s.train.start_ms for s in anchored] == [0, 0, 0]
+
+
+def test_parallel_sweep_matches_serial_and_caches_cells():
+    series = _random_walks()
+    config = BacktestConfig(change_window_ms=60 * MINUTE_MS)
+    grid = {"change_threshold_pct": [0.5, 1.0, 2.0], "size_divisor": [5.0, 10.0]}
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = Path(tmp) / "sweep.jsonl"
+        with ParameterOptimizer(series, config, workers=1, use_cache=False) as serial:
+            expected = serial.sweep(grid)
+        with ParameterOptimizer(series, config, workers=2, cache_path=cache) as parallel:
+            results = parallel.sweep(grid)
+            assert parallel.stats()["computed"] == 6
+        assert [r["params"] for r in results] == [r["params"] for r in expected]
+        assert [r["net_pnl"] for r in results] == pytest.approx([r["net_pnl"] for r in expected])
+
+        with ParameterOptimizer(series, config, workers=2, cache_path=cache) as rerun:
+            splits = walk_forward_splits(0, 3 * 1440 * MINUTE_MS, 1440 * MINUTE_MS, 720 * MINUTE_MS)
+            rerun.sweep({**grid, "change_threshold_pct": [1.0, 3.0]})
+            assert rerun.stats()["computed"] == 2 and rerun.stats()["cache_hits"] == 2
+            report = rerun.walk_forward(grid, splits)
+        assert len(report["splits"]) == 4
+        assert report["oos_trades"] == sum(row["test"]["trades"] for row in report["splits"])
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for the event-driven circuit breaker
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add the repository root to path (legacy shared package)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from shared.circuit_breaker import (CircuitBreaker, CircuitBreakerReason, CircuitBreakerState,
+                                    RingCounter)
+
+
+@pytest.fixture
+def breaker(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cb = CircuitBreaker()
+    cb.record_heartbeat("feeder")
+    yield cb
+    cb.stop()
+
+
+def test_ring_counter_slides_by_bucket():
+    counter = RingCounter(window=10.0, buckets=10)
+    assert counter.add(100.0) == 1
+    assert counter.add(100.5) == 2
+    assert counter.add(105.0) == 3
+    assert counter.count(109.9) == 3
+    assert counter.count(110.0) == 1  # the bucket of 100.x has left the window
+    assert counter.count(200.0) == 0
+
+
+def test_errors_trip_on_arrival_and_reset(breaker):
+    assert breaker.is_trading_allowed()
+    breaker.record_exchange_error("HTTP 503")
+    breaker.record_exchange_error("HTTP 503")
+    assert breaker.is_trading_allowed()
+    breaker.record_exchange_error("HTTP 503")
+    # no monitor pass needed: the third error blocks trading immediately
+    assert not breaker.is_trading_allowed()
+    status = breaker.get_status()["circuit_breaker"]
+    assert status["reason"] == CircuitBreakerReason.EXCHANGE_ERROR.value
+    assert status["active_conditions"] == ["exchange_errors"]
+
+    breaker.manual_reset()
+    assert breaker.is_trading_allowed()
+    breaker.update_pnl(-breaker.cb_config.daily_loss_threshold - 1)
+    assert breaker.cb_status.reason == CircuitBreakerReason.DAILY_LOSS_LIMIT
+
+    breaker.manual_reset()
+    breaker.activate_estop(reason="test")
+    assert not breaker.is_trading_allowed()
+    breaker.deactivate_estop()
+    assert breaker.is_trading_allowed()
+
+
+def test_feeder_lag_trips_at_the_heartbeat_deadline(breaker):
+    breaker.cb_config.feeder_lag_threshold = 0.3
+    breaker.config.E_STOP = False
+    breaker.start()
+    # heartbeats keep extending the deadline
+    beats_until = time.time() + 0.5
+    while time.time() < beats_until:
+        breaker.record_heartbeat("feeder")
+        time.sleep(0.05)
+    deadline = time.time() + 5.0
+    assert breaker.is_trading_allowed()
+    while breaker.is_trading_allowed() and time.time() < deadline:
+        time.sleep(0.01)
+    assert breaker.cb_status.state == CircuitBreakerState.OPEN
+    assert breaker.cb_status.reason == CircuitBreakerReason.FEEDER_LAG
+    assert time.time() - breaker._last_feeder_heartbeat < 1.0
+
+
+def test_config_poll_does_not_clear_manual_estop(breaker):
+    breaker.config.E_STOP = False
+    breaker._check_estop_status()
+    breaker.activate_estop(reason="operator halt")
+    for _ in range(3):
+        breaker._check_estop_status()
+    assert breaker.estop_status.active
+    assert not breaker.is_trading_allowed()
+
+    # an E-STOP raised by the flag is cleared when the flag goes back off
+    breaker.deactivate_estop()
+    breaker.config.E_STOP = True
+    breaker._check_estop_status()
+    assert breaker.estop_status.triggered_by == "system"
+    breaker.config.E_STOP = False
+    breaker._check_estop_status()
+    assert breaker.is_trading_allowed()
+
+
+def test_feeder_lag_rereads_state_bus_before_tripping(breaker, monkeypatch):
+    class Heartbeat:
+        @property
+        def ts(self):
+            return time.time()  # the feeder keeps beating through StateBus only
+
+    monkeypatch.setattr(breaker.state_bus, "get_service_status",
+                        lambda service: Heartbeat() if service == "feeder" else None)
+    breaker.cb_config.feeder_lag_threshold = 0.2
+    breaker.config.E_STOP = False
+    breaker.start()
+    time.sleep(0.8)  # several deadlines, well inside one 5 s poll interval
+    assert breaker.is_trading_allowed()
+    assert breaker.cb_status.state == CircuitBreakerState.CLOSED
+
+
+def test_state_bus_updates_reach_the_breaker(breaker):
+    before = breaker._last_feeder_heartbeat
+    time.sleep(0.01)
+    breaker.state_bus.update_service_heartbeat("feeder", "ok")
+    assert breaker._last_feeder_heartbeat > before
+
+    breaker.state_bus.update_risk_state(realized_pnl_today=-breaker.cb_config.daily_loss_threshold - 1)
+    # the risk update trips the breaker without a monitor pass
+    assert not breaker.is_trading_allowed()
+    assert breaker.cb_status.reason == CircuitBreakerReason.DAILY_LOSS_LIMIT
+    breaker.state_bus.update_risk_state(realized_pnl_today=0.0)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the binary payload codec
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+
+from coin_quant.shared import codec
+from coin_quant.shared.codec import CodecError, Field, Schema
+
+
+def _snapshot():
+    return {
+        "timestamp": 1_792_358_001.25,
+        "symbols": ["BTCUSDT", "ETHUSDT"],
+        "symbol_data": {
+            "BTCUSDT": {"symbol": "BTCUSDT", "price": 65000.5, "volume": 12.5, "change": 2,
+                        "timestamp": 1_792_358_000_123, "received_at": 1_792_358_000.5,
+                        "trace": {"trace_id": "ab", "stamps": {"ws_receive": 1}},
+                        "book": {"symbol": "BTCUSDT", "bids": [[65000.0, 1.5]], "asks": [[65001.0, 0.25]],
+                                 "mid": 65000.5, "spread_bps": 0.15, "imbalance": None,
+                                 "last_update_id": 42, "updated_at": 1_792_358_000.4}},
+            "ETHUSDT": {"symbol": "ETHUSDT", "price": 3000.0, "book": None, "note": "ünïcode"},
+        },
+        "ws_connected": True,
+        "rest_api_ok": "unknown",
+        "last_update": 1_792_358_000.5,
+        "added_later": [1, 2],
+    }
+
+
+def test_round_trip_keeps_none_mistyped_and_unknown_keys():
+    data = _snapshot()
+    payload = codec.encode("feeder_snapshot", data)
+    name, version, decoded = codec.decode(payload)
+    assert (name, version) == ("feeder_snapshot", 1)
+    assert decoded == data
+    assert len(payload) < len(json.dumps(data, separators=(",", ":")))
+
+    signals = {"timestamp": 1.0, "count": 1, "signals": [
+        {"symbol": "BTCUSDT", "side": "BUY", "price": 1.5, "size": 0.1, "reason": "x",
+         "market": {"spread_bps": 1.0, "expected_slippage_bps": None}}]}
+    assert codec.decode(codec.encode("ares_signals", signals))[2] == signals
+
+    with pytest.raises(CodecError):
+        codec.decode(b"{}")
+    with pytest.raises(CodecError):
+        codec.decode(payload[:-3])
+
+
+def test_schema_evolution_old_and_new_readers():
+    v1 = Schema("probe", [Field("a", "f64"), Field("b", "str")], schema_id=99, version=1)
+    v2 = Schema("probe", [Field("a", "f64"), Field("b", "str"), Field("c", "i64"), Field("d", "str")],
+                schema_id=99, version=2)
+    new, old = bytearray(), bytearray()
+    v2.pack(new, {"a": 1.0, "b": "x", "c": 7, "d": "y", "z": True})
+    v1.pack(old, {"a": 2.0, "b": "w"})
+
+    # old reader skips appended fields; unknown keys still arrive via extra
+    assert v1.unpack(memoryview(bytes(new)), 0) == ({"a": 1.0, "b": "x", "z": True}, len(new))
+    # new reader of an old record: appended fields are simply absent
+    assert v2.unpack(memoryview(bytes(old)), 0) == ({"a": 2.0, "b": "w"}, len(old))
+
+
+def test_payload_files_prefer_binary_and_dump_tool(tmp_path, capsys):
+    path = tmp_path / "feeder_snapshot.json"
+    data = _snapshot()
+    assert codec.write_payload(path, "feeder_snapshot", data, "binary")
+    assert not path.exists() and codec.binary_path(path).exists()
+    assert codec.read_payload(path) == data
+
+    # "both" writes the JSON copy last; the binary file still wins
+    assert codec.write_payload(path, "feeder_snapshot", data, "both")
+    path.write_text('{"timestamp": 0.0}')
+    assert codec.read_payload(path) == data
+
+    # IPC_ENCODING switched back to json: the stale .bin is removed
+    assert codec.write_payload(path, "feeder_snapshot", {"timestamp": 2.0}, "json")
+    assert not codec.binary_path(path).exists()
+    assert codec.read_payload(path) == {"timestamp": 2.0}
+    codec.write_payload(path, "feeder_snapshot", data, "binary")
+
+    assert codec.main([str(codec.binary_path(path)), "--header"]) == 0
+    dumped = json.loads(capsys.readouterr().out)
+    assert dumped["schema"] == "feeder_snapshot" and dumped["data"] == data
+
+    codec.binary_path(path).write_bytes(b"CQBN\x01\x00\x01\x00garbage")
+    assert codec.main([str(codec.binary_path(path))]) == 1
+    assert codec.read_payload(path) == {"timestamp": 2.0}
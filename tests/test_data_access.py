@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the DataBus bulk symbol path and file memoization
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+
+from coin_quant.shared import data_access, pathing
+
+
+@pytest.fixture
+def shared_data(tmp_path, monkeypatch):
+    monkeypatch.setenv("SHARED_DATA_DIR", str(tmp_path))
+    paths = pathing.Paths()
+    monkeypatch.setattr(data_access, "get_paths", lambda: paths)
+    (tmp_path / "snapshots").mkdir()
+    (tmp_path / "ares").mkdir()
+    now = time.time()
+    for symbol, price in (("BTCUSDT", 50000.0), ("ETHUSDT", 3000.0)):
+        (tmp_path / "snapshots" / f"prices_{symbol.lower()}.json").write_text(
+            json.dumps({"symbol": symbol, "last_price": price, "last_update": now}))
+    # BTC resolved from ares_signals.json, ETH and SOL from ARES files (latest timestamp wins the age)
+    (tmp_path / "ares_signals.json").write_text(json.dumps(
+        {"BTCUSDT": {"signal": "BUY", "confidence": 0.7, "timestamp": now - 5}}))
+    (tmp_path / "ares" / "a.json").write_text(json.dumps({"symbol": "ETHUSDT", "signal": "SELL", "timestamp": now - 30}))
+    (tmp_path / "ares" / "b.json").write_text(json.dumps({"symbol": "ETHUSDT", "signal": "SELL", "timestamp": now - 10}))
+    (tmp_path / "ares" / "c.json").write_text(json.dumps({"symbol": "SOLUSDT", "signal": "HOLD"}))
+    (tmp_path / "positions_snapshot.json").write_text(json.dumps({"ETHUSDT": {"side": "LONG", "size": 2.0}}))
+    return tmp_path
+
+
+def _strip_ages(cards):
+    return {s: {k: v for k, v in card.items() if not k.endswith("age_seconds")} for s, card in cards.items()}
+
+
+def test_bulk_cards_match_per_symbol_lookup(shared_data):
+    symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT"]
+    legacy = data_access.DataBus(file_cache=False)
+    expected = {s: legacy.get_symbol_data(s) for s in symbols}
+    cards = data_access.DataBus().get_all_symbols_data(symbols)
+
+    assert _strip_ages(cards) == _strip_ages(expected)
+    for symbol in symbols:
+        for key in ("price_age_seconds", "signal_age_seconds"):
+            if expected[symbol][key] is None:
+                assert cards[symbol][key] is None
+            else:
+                assert cards[symbol][key] == pytest.approx(expected[symbol][key], abs=1.0)
+    assert cards["ETHUSDT"]["signal_age_seconds"] == pytest.approx(10, abs=1.0)
+    assert cards["SOLUSDT"]["signal_age_seconds"] is None
+
+
+def test_each_file_parsed_once_and_revalidated_on_change(shared_data):
+    bus = data_access.DataBus()
+    symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    bus.get_all_symbols_data(symbols)
+    # 2 snapshots + ares_signals + 3 ARES files + positions
+    assert bus.file_cache.misses == 7
+
+    bus.get_all_symbols_data(symbols)
+    assert bus.file_cache.misses == 7
+
+    positions = shared_data / "positions_snapshot.json"
+    tmp = positions.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"BTCUSDT": {"side": "LONG", "size": 1.0}}))
+    os.replace(tmp, positions)
+    cards = bus.get_all_symbols_data(symbols)
+    assert bus.file_cache.misses == 8
+    assert cards["BTCUSDT"]["has_position_data"] and not cards["ETHUSDT"]["has_position_data"]
+
+
+def test_http_backend_mirrors_read_api_with_deltas(shared_data):
+    from coin_quant.shared.read_api import ReadAPIServer
+
+    server = ReadAPIServer(host="127.0.0.1", port=0, refresh_interval=60)
+    server.start()
+    try:
+        symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+        file_cards = data_access.DataBus().get_all_symbols_data(symbols)
+        bus = data_access.DataBus("http", f"http://127.0.0.1:{server.port}")
+        bus.backend.min_sync_interval = 0
+        http_cards = bus.get_all_symbols_data(symbols)
+        assert _strip_ages(http_cards) == _strip_ages(file_cards)
+        assert http_cards["ETHUSDT"]["signal_age_seconds"] == pytest.approx(10, abs=1.0)
+        assert bus.get_health_summary()["components"] == {}
+
+        # Unchanged sources: conditional requests come back 304
+        bus.get_all_symbols_data(symbols)
+        assert bus.backend.not_modified >= 3
+
+        # A changed file bumps only its own item; a removed one becomes a deletion
+        (shared_data / "snapshots" / "prices_btcusdt.json").write_text(json.dumps({"price": 1.0}))
+        (shared_data / "snapshots" / "prices_ethusdt.json").unlink()
+        assert server.refresh() == 2
+        delta = server.model.query("prices", since=1, epoch=server.model.epoch)
+        assert list(delta["items"]) == ["BTCUSDT"] and delta["deleted"] == ["ETHUSDT"]
+
+        cards = bus.get_all_symbols_data(symbols)
+        assert cards["BTCUSDT"]["price"]["price"] == 1.0
+        assert not cards["ETHUSDT"]["has_price_data"]
+    finally:
+        server.stop()
+
+    # Server gone: the last mirror keeps serving
+    assert bus.get_all_symbols_data(symbols)["BTCUSDT"]["has_price_data"]
+    assert bus.backend.failures > 0
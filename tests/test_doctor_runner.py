@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the concurrent doctor check runner
+"""
+
+import importlib
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+
+# Add the repository root to path (legacy shared package)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+
+@pytest.fixture
+def doctor(tmp_path, monkeypatch):
+    # environment_guardrails validates the interpreter on import; stub the two helpers used
+    paths = {"repo_root": tmp_path, "shared_data": tmp_path / "shared_data",
+             "shared_data_reports": tmp_path / "shared_data" / "reports"}
+    guardrails = types.ModuleType("shared.environment_guardrails")
+    guardrails.get_repo_paths = lambda: paths
+    guardrails.check_service_pid_lock = lambda service: (False, None)
+    monkeypatch.setitem(sys.modules, "shared.environment_guardrails", guardrails)
+    for name in ("shared.atomic_io", "shared.doctor_runner"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    module = importlib.import_module("shared.doctor_runner")
+    module.clear_check_cache()
+    yield module
+    for name in ("shared.atomic_io", "shared.doctor_runner"):
+        sys.modules.pop(name, None)
+
+
+def _runner(module, checks, **kwargs):
+    runner = module.DoctorRunner(**kwargs)
+    runner._build_checks = lambda: checks
+    return runner
+
+
+def test_dependencies_run_in_order_and_skip_after_failure(doctor):
+    started = []
+    lock = threading.Lock()
+
+    def check(name, ok=True, error=None):
+        def run():
+            with lock:
+                started.append(name)
+            if error:
+                raise error
+            return ok, {"metric": {"name": name}}
+        return run
+
+    checks = [
+        doctor.DoctorCheck("base", check("base")),
+        doctor.DoctorCheck("broken", check("broken", error=RuntimeError("probe crashed"))),
+        doctor.DoctorCheck("after_base", check("after_base"), depends_on=("base",)),
+        doctor.DoctorCheck("after_broken", check("after_broken"), depends_on=("broken",)),
+        doctor.DoctorCheck("chained", check("chained"), depends_on=("after_broken",)),
+        doctor.DoctorCheck("cycle", check("cycle"), depends_on=("cycle",)),
+    ]
+    runner = _runner(doctor, checks)
+    assert runner._run_checks("quick") is False
+
+    assert started.index("base") < started.index("after_base")
+    assert "after_broken" not in started and "chained" not in started
+    statuses = {step["step"]: step["status"] for step in runner.steps}
+    assert statuses == {"base": "pass", "broken": "fail", "after_base": "pass",
+                        "after_broken": "skip", "chained": "skip", "cycle": "skip"}
+    assert [step["step"] for step in runner.steps] == [check.name for check in checks]
+    assert max(step["pct"] for step in runner.steps) == 100
+
+
+def test_hung_check_times_out_without_blocking_the_rest(doctor):
+    release = threading.Event()
+
+    def hung():
+        release.wait(5.0)
+        return True, {}
+
+    checks = [
+        doctor.DoctorCheck("hung", hung, timeout_sec=0.2),
+        doctor.DoctorCheck("fast", lambda: (True, {})),
+        doctor.DoctorCheck("needs_hung", lambda: (True, {}), depends_on=("hung",)),
+    ]
+    runner = _runner(doctor, checks)
+    start = time.monotonic()
+    assert runner._run_checks("quick") is False
+    elapsed = time.monotonic() - start
+    release.set()
+
+    assert elapsed < 2.0
+    steps = {step["step"]: step for step in runner.steps}
+    assert steps["hung"]["status"] == "fail" and steps["hung"]["timed_out"]
+    assert steps["fast"]["status"] == "pass"
+    assert steps["needs_hung"]["status"] == "skip"
+
+
+def test_expensive_checks_reuse_cached_results(doctor):
+    calls = []
+
+    def scan():
+        calls.append(1)
+        return True, {"metric": {"scanned": len(calls)}}
+
+    checks = [doctor.DoctorCheck("scan", scan, cache_ttl_sec=30.0)]
+    first = _runner(doctor, checks)
+    assert first._run_checks("quick")
+    second = _runner(doctor, checks)
+    assert second._run_checks("quick")
+    assert len(calls) == 1
+    assert second.steps[0]["cached"] and second.steps[0]["metric"] == {"scanned": 1}
+
+    # full mode ignores the cache, and clearing it forces a fresh run
+    assert _runner(doctor, checks)._run_checks("full")
+    assert len(calls) == 2
+    doctor.clear_check_cache()
+    third = _runner(doctor, checks)
+    assert third._run_checks("quick") and "cached" not in third.steps[0]
+    assert len(calls) == 3
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched egress emitter
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add the repository root to path (legacy shared package)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.egress_emitter import EgressEmitter
+
+
+def test_unchanged_views_are_skipped_and_aliases_linked(tmp_path):
+    emitter = EgressEmitter()
+    health, uds = tmp_path / "health.json", tmp_path / "health" / "uds.json"
+    emitter.stage(health, b'{"ts":1}', aliases=(uds,))
+    emitter.stage(tmp_path / "snapshots" / "prices_BTCUSDT.json", b'{"p":1}')
+    counts = emitter.flush()
+    assert counts["writes"] == 2 and counts["skipped"] == 0 and counts["fsyncs"] == 0
+    assert uds.read_bytes() == b'{"ts":1}'
+    if counts["links"]:
+        assert os.stat(health).st_ino == os.stat(uds).st_ino
+
+    counts = emitter.emit(health, b'{"ts":1}', aliases=(uds,))
+    assert counts["skipped"] == 1 and counts["syscalls"] == 0
+
+    counts = emitter.emit(health, b'{"ts":2}', aliases=(uds,))
+    assert counts["writes"] == 1 and uds.read_bytes() == b'{"ts":2}'
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["health", "health.json", "snapshots"]
+
+
+def test_fsync_follows_durability_class(tmp_path):
+    clock = [0.0]
+    emitter = EgressEmitter({"periodic": 5.0}, clock=lambda: clock[0])
+    fsyncs = []
+    for tick in range(10):
+        clock[0] = float(tick)
+        emitter.stage(tmp_path / "databus.json", b"%d" % tick, "periodic")
+        emitter.stage(tmp_path / "orders.json", b"%d" % tick, "critical")
+        emitter.stage(tmp_path / "prices.json", b"%d" % tick, "volatile")
+        fsyncs.append(emitter.flush()["fsyncs"])
+    # critical: file + directory every tick; periodic: at t=0 and t=5
+    expected_critical = 2 if os.name == "posix" else 1
+    assert sum(fsyncs) == 10 * expected_critical + 2
+    assert emitter.stats()["writes"] == 30
+
+
+def test_content_key_skips_timestamp_only_changes_until_refresh(tmp_path):
+    clock = [0.0]
+    emitter = EgressEmitter(clock=lambda: clock[0], refresh_interval=5.0)
+    path = tmp_path / "prices_BTCUSDT.json"
+    written = []
+    for tick in range(12):
+        clock[0] = float(tick)
+        price = 1 if tick < 8 else 2
+        payload = b'{"ts":%d,"p":%d}' % (tick, price)
+        written.append(emitter.emit(path, payload, key=b'{"p":%d}' % price)["writes"])
+    # first write, refresh at t=5, content change at t=8
+    assert [t for t, n in enumerate(written) if n] == [0, 5, 8]
+    assert path.read_bytes() == b'{"ts":8,"p":2}'
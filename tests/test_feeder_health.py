@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the feeder's health pass (health manager and legacy egress views)
+"""
+
+import json
+import logging
+import sys
+import types
+from pathlib import Path
+
+# Add src and the repository root to path (legacy shared package)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from coin_quant.feeder import service as feeder_service
+from coin_quant.shared.time import utc_now_seconds
+
+
+@pytest.fixture
+def egress_root(tmp_path, monkeypatch):
+    # path_registry validates the deployment root on import; resolve views under tmp_path
+    registry = types.ModuleType("shared.path_registry")
+    registry.get_absolute_path = lambda *segments: tmp_path.joinpath(*segments)
+    monkeypatch.setitem(sys.modules, "shared.path_registry", registry)
+    monkeypatch.delitem(sys.modules, "shared.feeder_egress_writer", raising=False)
+    yield tmp_path / "shared_data"
+    sys.modules.pop("shared.feeder_egress_writer", None)
+
+
+class _HealthManager:
+    def __init__(self):
+        self.calls = []
+
+    def set_feeder_health(self, status, symbols=None, **kwargs):
+        self.calls.append((status, symbols, kwargs))
+        return True
+
+
+def _feeder(last_update):
+    feeder = feeder_service.FeederService.__new__(feeder_service.FeederService)
+    feeder.logger = logging.getLogger("test_feeder_health")
+    feeder.price_board = None
+    feeder.last_update = last_update
+    feeder.ws_connected = True
+    feeder.rest_api_ok = True
+    feeder.freshness_threshold = 10.0
+    feeder.symbols = ["BTCUSDT", "ETHUSDT"]
+    feeder.symbol_data = {}
+    feeder.flushes = []
+    feeder.tracer = types.SimpleNamespace(flush=lambda: feeder.flushes.append(1))
+    feeder.profiler = types.SimpleNamespace(poll=lambda: feeder.flushes.append(2))
+    feeder._egress_writer = None
+    feeder._egress_writer_failed = False
+    return feeder
+
+
+def test_health_pass_reports_status_and_writes_health_json(egress_root, monkeypatch):
+    manager = _HealthManager()
+    monkeypatch.setattr(feeder_service, "health_manager", manager)
+
+    feeder = _feeder(utc_now_seconds())
+    feeder._update_health()
+    status, symbols, fields = manager.calls[-1]
+    assert status == "GREEN" and symbols == ["BTCUSDT", "ETHUSDT"]
+    assert fields["ws_connected"] and fields["state"] == "running"
+    health = json.loads((egress_root / "health.json").read_text())
+    assert health["service"] == "feeder" and health["status"] == "GREEN" and not health["stale"]
+    assert (egress_root / "health" / "uds.json").exists()
+
+    # ticks stopped and the health manager failing: health.json still reports it
+    def fail(*args, **kwargs):
+        raise OSError("health dir unavailable")
+
+    manager.set_feeder_health = fail
+    feeder.last_update = utc_now_seconds() - 60
+    feeder._update_health()
+    health = json.loads((egress_root / "health.json").read_text())
+    assert health["status"] == "RED" and health["stale"]
+    # stage latencies are exported and the profiler polled on both passes
+    assert feeder.flushes == [1, 2, 1, 2]
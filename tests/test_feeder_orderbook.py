@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for the feeder's local order books (diff depth sync and estimates)
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pytest
+
+from coin_quant.feeder.orderbook import (APPLIED, BUFFERED, GAP, STALE, BookLevels, OrderBook,
+                                         OrderBookManager, ResyncBackoff, RestWeightLimiter,
+                                         book_from_symbol_data, retry_after_seconds,
+                                         snapshot_weight)
+
+
+def _diff(first, final, bids=(), asks=(), symbol="BTCUSDT"):
+    return {"e": "depthUpdate", "s": symbol, "U": first, "u": final,
+            "b": [[str(p), str(q)] for p, q in bids], "a": [[str(p), str(q)] for p, q in asks]}
+
+
+def test_sync_procedure_buffers_drops_stale_and_detects_gaps():
+    book = OrderBook("BTCUSDT", capacity=10)
+    assert book.apply_diff(_diff(95, 99, bids=[(99.0, 9)])) == BUFFERED
+    assert book.apply_diff(_diff(100, 102, bids=[(100.0, 0), (100.5, 2)])) == BUFFERED
+    assert book.apply_diff(_diff(103, 103, asks=[(101.0, 0)])) == BUFFERED
+
+    assert book.load_snapshot({"lastUpdateId": 100,
+                               "bids": [["100.0", "1"], ["99.5", "3"]],
+                               "asks": [["101.0", "2"], ["102.0", "4"]]})
+    assert book.synced and book.last_update_id == 103
+    # 95-99 predates the snapshot; 100-102 straddles it and is applied
+    assert book.bids[:, :book.n_bids].T.tolist() == [[100.5, 2], [99.5, 3]]
+    assert book.asks[:, :book.n_asks].T.tolist() == [[102.0, 4]]
+
+    assert book.apply_diff(_diff(101, 103)) == STALE
+    assert book.apply_diff(_diff(104, 105, asks=[(101.5, 1)])) == APPLIED
+    assert book.best_ask == 101.5
+    assert book.apply_diff(_diff(107, 108)) == GAP
+    assert not book.synced and book.gaps == 1
+    # a snapshot older than the buffered diffs cannot be used
+    assert not book.load_snapshot({"lastUpdateId": 105, "bids": [], "asks": []})
+
+
+def test_merge_matches_reference_book_and_keeps_capacity():
+    rng = np.random.default_rng(3)
+    book = OrderBook("ETHUSDT", capacity=15)
+    book.load_snapshot({"lastUpdateId": 0, "bids": [], "asks": []})
+    reference = {"b": {}, "a": {}}
+    for update_id in range(1, 300):
+        sides = {}
+        for key, base in (("b", 100.0), ("a", 101.0)):
+            prices = base + (rng.integers(0, 40, 5) * (-0.5 if key == "b" else 0.5))
+            levels = [(float(p), float(rng.choice([0, rng.uniform(0.1, 5)]))) for p in np.unique(prices)]
+            for p, q in levels:
+                if q:
+                    reference[key][p] = q
+                else:
+                    reference[key].pop(p, None)
+            sides[key] = levels
+        assert book.apply_diff(_diff(update_id, update_id, sides["b"], sides["a"])) == APPLIED
+        expected_bids = sorted(reference["b"].items(), reverse=True)[:15]
+        expected_asks = sorted(reference["a"].items())[:15]
+        # levels beyond capacity are forgotten, as in the live book
+        reference["b"] = dict(expected_bids)
+        reference["a"] = dict(expected_asks)
+        assert book.bids[:, :book.n_bids].T.tolist() == [list(x) for x in expected_bids]
+        assert book.asks[:, :book.n_asks].T.tolist() == [list(x) for x in expected_asks]
+
+
+def test_estimates_and_exported_round_trip():
+    manager = OrderBookManager(capacity=10, depth=3)
+    assert manager.on_diff(_diff(11, 11, bids=[(99.0, 1)])) == "BTCUSDT"
+    assert manager.export("BTCUSDT") is None
+    assert manager.on_snapshot("BTCUSDT", {
+        "lastUpdateId": 10,
+        "bids": [["100", "1"], ["99", "2"], ["98", "5"], ["97", "10"]],
+        "asks": [["101", "1"], ["102", "2"], ["103", "5"], ["104", "10"]],
+    })
+    book = manager.books["BTCUSDT"]
+    assert book.mid() == 100.5
+    assert book.spread_bps() == pytest.approx(1 / 100.5 * 1e4)
+    # the buffered diff set 99 to qty 1
+    assert book.imbalance(2) == pytest.approx((2 - 3) / (2 + 3))
+
+    # buy 305 USDT: 1 @ 101, 2 @ 102 (=305) -> vwap 305/3
+    assert book.expected_slippage_bps(305, "BUY") == pytest.approx((305 / 3 - 100.5) / 100.5 * 1e4)
+    # sell 150 USDT: 1 @ 100 + 50/99 (99 holds 1 after the diff)
+    vwap = 150 / (1 + 50 / 99)
+    assert book.expected_slippage_bps(150, "SELL") == pytest.approx((100.5 - vwap) / 100.5 * 1e4)
+    assert book.expected_slippage_bps(1e9, "BUY") is None
+
+    exported = manager.export("BTCUSDT")
+    assert len(exported["bids"]) == 3
+    view = book_from_symbol_data({"price": 100.5, "book": exported})
+    assert isinstance(view, BookLevels)
+    assert view.expected_slippage_bps(305, "BUY") == book.expected_slippage_bps(305, "BUY")
+    assert view.execution_estimate(305, "BUY")["spread_bps"] == exported["spread_bps"]
+    assert book_from_symbol_data({"price": 1.0, "book": None}) is None
+
+
+def test_resync_pacing_backoff_retry_after_and_weight_budget():
+    backoff = ResyncBackoff(base=1.0, maximum=8.0, jitter=0.0)
+    assert [backoff.next_delay("BTCUSDT") for _ in range(5)] == [1.0, 2.0, 4.0, 8.0, 8.0]
+    assert backoff.next_delay("ETHUSDT") == 1.0
+    # the server's Retry-After wins over a shorter backoff
+    assert backoff.next_delay("ETHUSDT", retry_after=30.0) == 30.0
+    backoff.reset("BTCUSDT")
+    assert backoff.next_delay("BTCUSDT") == 1.0
+
+    assert retry_after_seconds({"Retry-After": "12"}) == 12.0
+    assert retry_after_seconds({}) is None
+    assert retry_after_seconds({"Retry-After": "soon"}) is None
+    assert snapshot_weight(100) == 5 and snapshot_weight(500) == 25 and snapshot_weight(5000) == 250
+
+    now = [0.0]
+    limiter = RestWeightLimiter(weight_per_minute=60, clock=lambda: now[0])
+    # 60 weight/min: twelve 5-weight snapshots go out at once, the next waits 5s
+    assert [limiter.reserve(5) for _ in range(12)] == [0.0] * 12
+    assert limiter.reserve(5) == pytest.approx(5.0)
+    now[0] = 10.0
+    assert limiter.reserve(5) == pytest.approx(0.0)
+    limiter.pause(30.0)
+    assert limiter.reserve(0) == pytest.approx(30.0)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for the stream-ranked feeder universe and its subscription requests
+"""
+
+import asyncio
+import json
+import logging
+import sys
+import types
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from coin_quant.feeder.universe import UniverseRanker, subscription_messages, ticker_stream
+
+
+def _tickers(volumes, price=1.0):
+    return [{"e": "24hrTicker", "s": s, "c": str(price), "q": str(v)} for s, v in volumes.items()]
+
+
+def test_ranker_filters_and_ranks_with_pinned_first():
+    ranker = UniverseRanker(top_n=3, pinned=["ETHUSDT"], min_quote_volume=1e6, rank_interval=60)
+    kept = ranker.update(_tickers({
+        "BTCUSDT": 9e9, "ETHUSDT": 1e6, "SOLUSDT": 5e8, "XRPUSDT": 7e8,
+        "BTCUPUSDT": 8e9, "USDCUSDT": 8e9, "ETHBTC": 8e9, "DUSTUSDT": 1e3,
+    }))
+    assert kept == 5  # BTCUP/USDC excluded by name, ETHBTC by quote
+    ranker.seed([])
+    change = ranker.maybe_rotate(now=1000.0)
+    assert change.symbols == ["ETHUSDT", "BTCUSDT", "XRPUSDT"]
+    assert change.added == ["BTCUSDT", "XRPUSDT"] and change.removed == []
+    # not due yet
+    ranker.update(_tickers({"SOLUSDT": 9e10}))
+    assert ranker.maybe_rotate(now=1030.0) is None
+
+
+def test_rotation_hysteresis_and_incumbents_that_stop_qualifying():
+    ranker = UniverseRanker(top_n=2, hysteresis=0.2, rank_interval=10)
+    ranker.seed(["BTCUSDT", "ETHUSDT"])
+    ranker.update(_tickers({"BTCUSDT": 9e9, "ETHUSDT": 1.0e9, "SOLUSDT": 1.1e9}))
+    # SOL outranks ETH, but not by 20%: no flap
+    assert ranker.maybe_rotate(now=100.0) is None
+    assert ranker.rank() == ["BTCUSDT", "SOLUSDT"]
+
+    ranker.update(_tickers({"SOLUSDT": 1.3e9}))
+    change = ranker.maybe_rotate(now=110.0)
+    assert (change.added, change.removed, change.symbols) == (["SOLUSDT"], ["ETHUSDT"], ["BTCUSDT", "SOLUSDT"])
+
+    # an incumbent below the volume floor leaves without hysteresis
+    ranker.update(_tickers({"BTCUSDT": 10.0, "ETHUSDT": 1.0e9}))
+    change = ranker.maybe_rotate(now=120.0)
+    assert change.removed == ["BTCUSDT"] and change.symbols == ["SOLUSDT", "ETHUSDT"]
+    assert ranker.rotations == 2
+
+
+def test_subscription_messages_unsubscribe_first_one_request_each():
+    ranker = UniverseRanker(top_n=3, rank_interval=0)
+    ranker.seed(["BTCUSDT", "ETHUSDT", "ADAUSDT"])
+    ranker.update(_tickers({"BTCUSDT": 9e9, "SOLUSDT": 8e9, "XRPUSDT": 7e9, "ETHUSDT": 1e7, "ADAUSDT": 2e7}))
+    change = ranker.maybe_rotate(now=1.0)
+    assert sorted(change.removed) == ["ADAUSDT", "ETHUSDT"]
+
+    messages = subscription_messages(change, next_id=7)
+    assert [m["method"] for m in messages] == ["UNSUBSCRIBE", "SUBSCRIBE"]
+    assert [m["id"] for m in messages] == [7, 8]
+    assert messages[0]["params"] == ["ethusdt@ticker", "adausdt@ticker"]
+    assert messages[1]["params"] == ["solusdt@ticker", "xrpusdt@ticker"]
+    assert subscription_messages(type(change)([], [], change.symbols), 9) == []
+
+
+class _WebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+
+def test_rejected_subscription_rolls_the_universe_back():
+    from coin_quant.feeder.orderbook import OrderBookManager, ResyncBackoff
+    from coin_quant.feeder.service import FeederService
+
+    ranker = UniverseRanker(top_n=3, rank_interval=0)
+    ranker.seed(["BTCUSDT", "ETHUSDT", "ADAUSDT"])
+    ranker.update(_tickers({"BTCUSDT": 9e9, "SOLUSDT": 8e9, "XRPUSDT": 7e9, "ETHUSDT": 1e7, "ADAUSDT": 2e7}))
+    change = ranker.maybe_rotate(now=1.0)
+
+    feeder = FeederService.__new__(FeederService)
+    feeder.logger = logging.getLogger("test_feeder_universe")
+    feeder.universe = ranker
+    feeder.symbols = ["BTCUSDT", "ETHUSDT", "ADAUSDT"]
+    feeder._symbol_set = set(feeder.symbols)
+    feeder.symbol_data = {s: {"price": 1.0} for s in feeder.symbols}
+    feeder.books = OrderBookManager()
+    feeder.book_backoff = ResyncBackoff()
+    feeder.price_board = None
+    feeder.stream_builders = (ticker_stream,)
+    feeder._request_id = 0
+    feeder._pending_requests = {}
+    saved, events = [], []
+    feeder._save_snapshot = lambda: None
+    feeder._save_universe = saved.append
+    feeder.memory_client = types.SimpleNamespace(append_event=lambda kind, data, source: events.append(kind))
+    websocket = _WebSocket()
+
+    asyncio.run(feeder._apply_universe_change(websocket, change))
+    assert feeder.symbols == ["BTCUSDT", "SOLUSDT", "XRPUSDT"]
+    unsubscribe, subscribe = websocket.sent
+
+    # the SUBSCRIBE is rejected: SOL and XRP never streamed and leave the universe again
+    feeder._handle_request_response({"id": unsubscribe["id"], "result": None})
+    feeder._handle_request_response({"id": subscribe["id"], "error": {"code": 2, "msg": "Invalid request"}})
+    assert feeder.symbols == ["BTCUSDT"] and feeder._symbol_set == {"BTCUSDT"}
+    assert ranker.symbols == ["BTCUSDT"]
+    assert saved[-1].removed == ["SOLUSDT", "XRPUSDT"] and events[-1] == "universe_rollback"
+    assert feeder._pending_requests == {}
+
+    # a rejected UNSUBSCRIBE keeps the still-streaming symbols
+    feeder._pending_requests[9] = {"method": "UNSUBSCRIBE", "params": ["btcusdt@ticker"], "id": 9}
+    feeder.symbols, feeder._symbol_set = [], set()
+    feeder._handle_request_response({"id": 9, "error": {"code": 2, "msg": "Invalid request"}})
+    assert feeder.symbols == ["BTCUSDT"] and saved[-1].added == ["BTCUSDT"]
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the push-based health registry and its HealthManager integration
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from coin_quant.shared.health import HealthManager
+from coin_quant.shared.health_registry import (HealthRegistry, HealthRegistryClient,
+                                               HealthRegistryServer, HealthSubscriber)
+
+
+def _wait(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_staleness_is_pushed_at_the_deadline_and_export_skips_unchanged(tmp_path):
+    registry = HealthRegistry(stale_after=0.2, export_dir=tmp_path, export_interval=0.01)
+    events = []
+    stale_seen = threading.Event()
+
+    def on_event(event):
+        events.append((time.monotonic(), event))
+        if event["type"] == "stale":
+            stale_seen.set()
+
+    registry.subscribe(on_event)
+    registry.start()
+    try:
+        pushed_at = time.monotonic()
+        registry.update("feeder", {"service": "feeder", "status": "ok", "last_update_ts": time.time()})
+        assert _wait(lambda: (tmp_path / "feeder.json").exists())
+        exported = json.loads((tmp_path / "feeder.json").read_text())
+        assert exported["status"] == "ok" and exported["updated_within_sec"] == 0
+
+        assert stale_seen.wait(2.0)
+        detected_at, stale = events[-1]
+        assert stale["component"] == "feeder" and stale["health"]["stale"]
+        assert 0.2 <= detected_at - pushed_at < 0.35
+        assert registry.snapshot()["components"]["feeder"]["stale"]
+
+        # staleness alone does not rewrite the export; a recovery push does
+        exports = registry.exports
+        time.sleep(0.05)
+        assert registry.exports == exports
+        registry.update("feeder", {"service": "feeder", "status": "ok"})
+        assert events[-1][1]["type"] == "update" and events[-1][1]["recovered"]
+        assert _wait(lambda: registry.exports == exports + 1)
+    finally:
+        registry.stop()
+
+
+def test_health_manager_pushes_and_reads_one_snapshot(tmp_path):
+    registry = HealthRegistry(stale_after=30, export_dir=tmp_path / "export", export_interval=0.01)
+    server = HealthRegistryServer(registry, host="127.0.0.1", port=0)
+    server.start()
+    manager = HealthManager()
+    for component in ("feeder", "ares", "trader", "memory"):
+        setattr(manager, f"{component}_health_path", tmp_path / f"{component}.json")
+    manager._registry = HealthRegistryClient(host="127.0.0.1", port=server.port, timeout=1.0)
+    subscriber_events = []
+    subscriber = HealthSubscriber(subscriber_events.append, host="127.0.0.1", port=server.port)
+    subscriber.start()
+    try:
+        assert _wait(lambda: subscriber.connected)
+        assert manager.set_feeder_health("ok", symbols=["BTCUSDT"])
+        assert manager.set_memory_health("ok", integrity_ok=True)
+        assert _wait(lambda: registry.pushes == 2)
+        # registry answered, so the files are left to its export
+        assert not (tmp_path / "feeder.json").exists()
+        assert _wait(lambda: (tmp_path / "export" / "feeder.json").exists())
+
+        health = manager.get_feeder_health()
+        assert health["symbols"] == ["BTCUSDT"] and health["updated_within_sec"] < 5
+        assert manager.is_feeder_healthy() and manager.is_memory_healthy()
+        assert manager.get_overall_health()["components"]["ares"] is None
+
+        assert _wait(lambda: set(subscriber.components) == {"feeder", "memory"})
+        assert any(e["type"] == "update" and e["component"] == "memory" for e in subscriber_events)
+    finally:
+        subscriber.stop()
+        server.stop()
+
+    # no registry: writes and reads fall back to the files
+    manager.registry.probe_interval = 0
+    manager._snapshot = None
+    assert manager.set_trader_health("degraded", orders_count=3)
+    assert json.loads((tmp_path / "trader.json").read_text())["status"] == "degraded"
+    assert manager.get_trader_health()["orders_count"] == 3
+    assert manager.registry.is_available() is False
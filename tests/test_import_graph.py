@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the service import graph: lazy packages, deferred heavy
+dependencies and no import-time side effects
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+
+from coin_quant.shared.lazy import lazy_import
+
+ROOT = Path(__file__).parent.parent
+
+
+def _import_in_subprocess(statement: str, data_dir: Path) -> set:
+    """Modules in sys.modules after `statement` in a fresh interpreter (lazy stubs excluded)"""
+    code = (
+        f"{statement}\n"
+        "import importlib.util, json, sys\n"
+        "print(json.dumps([n for n, m in sys.modules.items()\n"
+        "                  if not isinstance(m, importlib.util._LazyModule)]))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"), COIN_QUANT_DATA_DIR=str(data_dir))
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            env=env, cwd=ROOT, timeout=120)
+    assert result.returncode == 0, result.stderr
+    return set(json.loads(result.stdout.strip().splitlines()[-1]))
+
+
+def test_services_import_without_side_effects_or_unused_dependencies(tmp_path):
+    data_dir = tmp_path / "shared_data"
+
+    modules = _import_in_subprocess("import coin_quant", data_dir)
+    assert not {m for m in modules if m.startswith("coin_quant.")} - {"coin_quant.shared",
+                                                                      "coin_quant.shared.lazy"}
+
+    modules = _import_in_subprocess("import coin_quant.trader.service", data_dir)
+    assert "coin_quant.feeder" not in modules
+    assert not {"requests", "websockets", "psutil", "numpy"} & modules
+
+    modules = _import_in_subprocess("import coin_quant.feeder.service", data_dir)
+    assert not {"requests", "websockets", "coin_quant.trader"} & modules
+
+    # package attributes still resolve on first access
+    modules = _import_in_subprocess("import coin_quant; coin_quant.shared.config.config_manager",
+                                    data_dir)
+    assert "coin_quant.shared.config" in modules
+
+    assert not data_dir.exists()
+
+
+def test_legacy_shared_package_defers_its_exports(tmp_path):
+    modules = _import_in_subprocess("import shared", tmp_path)
+    assert "shared.metrics_collector" not in modules
+    modules = _import_in_subprocess("import shared; shared.normalize_symbol('BTCUSDT')", tmp_path)
+    assert "shared.symbol_utils" in modules
+
+
+def test_lazy_import_defers_execution_until_attribute_access():
+    assert lazy_import("json") is sys.modules["json"]
+    assert lazy_import("coin_quant_no_such_module", optional=True) is None
+    with pytest.raises(ImportError):
+        lazy_import("coin_quant_no_such_module")
+
+    sys.modules.pop("colorsys", None)
+    module = lazy_import("colorsys")
+    assert type(module).__name__ == "_LazyModule"
+    assert module.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert type(module).__name__ == "module"
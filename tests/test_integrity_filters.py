@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the pre-resolved integrity filter chain
+"""
+
+import sys
+from pathlib import Path
+
+# Add the repository root to path (legacy shared package)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.integrity_filters import BalanceView, IntegrityFilters
+
+
+def _trade(n: int, **extra):
+    return {"strategy_id": "s1", "strategy_name": "trend_multi_tf", "symbol": "BTCUSDT",
+            "order_id": str(n), "trade_id": str(n), "ts_ns": n * 10**9, "notional": 1000.0,
+            "net_pnl": 5.0, "calculation_source": "SOT_PnLCalculator", **extra}
+
+
+def _filters(clock, balance_view=None):
+    return IntegrityFilters(
+        {"global_cooldown_sec": 60},
+        balance_view=balance_view,
+        verify_pnl=lambda trade: (True, "ok"),
+        clock=lambda: clock[0],
+    )
+
+
+def test_balance_view_drives_capital_limit():
+    clock = [0.0]
+    view = BalanceView()
+    filters = _filters(clock, view)
+    # no balance yet: the 10,000 fallback allows 3,000
+    assert filters.filter_3_capital_limit(_trade(1, notional=2500.0)).passed
+    assert filters.get_counters()["capital_limit"]["FALLBACK_BALANCE"] == 1
+
+    assert view.on_account_event({"balance": 5000.0, "currency": "USDT"})
+    assert filters.filter_3_capital_limit(_trade(2, notional=2500.0)).action == "BLOCK"
+    view.on_account_event({"balance_usdt": 100000.0})
+    assert filters.filter_3_capital_limit(_trade(3, notional=25000.0)).passed
+
+
+def test_chain_counts_and_cooldown_on_monotonic_clock():
+    clock = [100.0]
+    filters = _filters(clock, BalanceView(100000.0))
+    passed, results = filters.apply_all_filters(_trade(1))
+    assert passed and len(results) == 7
+
+    clock[0] += 30
+    passed, results = filters.apply_all_filters(_trade(2))
+    assert not passed and results[-1].filter_name == "global_cooldown"
+
+    clock[0] += 31  # 61 s after the first trade
+    assert filters.apply_all_filters(_trade(3))[0]
+    passed, results = filters.apply_all_filters(_trade(3))  # replayed trade
+    assert not passed and results[-1].filter_name == "duplicate_prevention"
+
+    counters = filters.get_counters()
+    assert counters["all"] == {"PASS": 2, "BLOCK": 2}
+    assert counters["global_cooldown"] == {"PASS": 2, "BLOCK": 1}
+    assert counters["duplicate_prevention"] == {"PASS": 3, "BLOCK": 1}
+
+
+def test_balance_view_seeded_from_snapshot_and_events(tmp_path, monkeypatch):
+    import json
+
+    from shared import integrity_filters
+    from shared.ui_event_bus import UIEvent, UIEventType
+
+    filters = _filters([0.0])
+    monkeypatch.setattr(integrity_filters, "_integrity_filters", filters)
+    snapshot = tmp_path / "account_snapshot.json"
+    snapshot.write_text(json.dumps({"balance": 5000.0, "currency": "USDT"}))
+    assert integrity_filters.seed_balance_view(snapshot)
+    assert not integrity_filters.seed_balance_view(tmp_path / "missing.json")
+    assert filters.balance_view.total_balance == 5000.0
+
+    class Subscriber:
+        handlers = {}
+
+        def subscribe(self, event_type, handler):
+            self.handlers[event_type] = handler
+
+    subscriber = Subscriber()
+    integrity_filters.attach_balance_events(subscriber)
+    subscriber.handlers[UIEventType.BALANCE_UPDATE](UIEvent(
+        type=UIEventType.BALANCE_UPDATE, ts=0,
+        payload={"balance_usdt": 20000.0, "available_balance": 15000.0}))
+    assert filters.balance_view.total_balance == 20000.0
+    assert filters.filter_3_capital_limit(_trade(1, notional=5000.0)).passed
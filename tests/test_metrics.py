@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for the unified metrics registry
+
+Covers counters/gauges/histograms, label handling, Prometheus exposition
+and the bounded on-disk rollup.
+"""
+
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+
+from coin_quant.shared.metrics import MetricsError, MetricsRegistry, MetricsRollup
+
+
+def test_counter_threads_do_not_lose_increments():
+    """Per-thread shards must sum to the exact total"""
+    registry = MetricsRegistry()
+    counter = registry.counter("orders_total", "Orders", ["side"])
+
+    def worker():
+        child = counter.labels(side="BUY")
+        for _ in range(10000):
+            child.inc()
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert counter.labels(side="BUY").get() == 80000
+
+
+def test_registry_rejects_conflicting_registration():
+    """Same name with a different type or label set is an error"""
+    registry = MetricsRegistry()
+    registry.counter("x_total", labelnames=["a"])
+    assert registry.counter("x_total", labelnames=["a"]) is registry.get("x_total")
+    with pytest.raises(MetricsError):
+        registry.gauge("x_total")
+    with pytest.raises(MetricsError):
+        registry.counter("x_total", labelnames=["b"])
+
+
+def test_histogram_quantiles_and_exposition():
+    """Histogram buckets are cumulative in exposition and quantiles are bounded"""
+    registry = MetricsRegistry()
+    hist = registry.histogram("latency_seconds", "Latency", buckets=(0.01, 0.1, 1.0))
+    for _ in range(90):
+        hist.observe(0.005)
+    for _ in range(10):
+        hist.observe(0.5)
+
+    assert hist.quantile(0.5) <= 0.01
+    assert 0.1 < hist.quantile(0.99) <= 1.0
+
+    text = registry.render_prometheus()
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{le="0.01"} 90' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 100' in text
+    assert "latency_seconds_count 100" in text
+
+
+def test_rollup_is_bounded():
+    """Rollup history rotates instead of growing without bound"""
+    registry = MetricsRegistry()
+    registry.gauge("g").set(1.5)
+    with tempfile.TemporaryDirectory() as tmp:
+        rollup = MetricsRollup(registry, Path(tmp), max_bytes=200)
+        for _ in range(20):
+            assert rollup.flush()
+
+        files = sorted(p.name for p in (Path(tmp) / "metrics").iterdir())
+        assert files == ["rollup.ndjson", "rollup.ndjson.1", "rollup_latest.json"]
+        assert rollup.read_history()[-1]["metrics"]["g"]["series"][""] == 1.5
+
+
+def test_metrics_endpoint_keeps_json_and_serves_prometheus(tmp_path):
+    import json
+    import urllib.request
+
+    from coin_quant.shared.monitoring import MonitoringEndpoint
+
+    endpoint = MonitoringEndpoint(port=0, data_dir=tmp_path)
+    endpoint.start()
+    try:
+        base = f"http://localhost:{endpoint.server.server_address[1]}"
+        with urllib.request.urlopen(f"{base}/metrics?hours=1") as response:
+            assert response.headers["Content-Type"] == "application/json"
+            json.loads(response.read())
+        scrape = urllib.request.Request(f"{base}/metrics", headers={
+            "Accept": "application/openmetrics-text;version=1.0.0,text/plain;version=0.0.4;q=0.5"})
+        for request in (scrape, f"{base}/metrics/prometheus"):
+            with urllib.request.urlopen(request) as response:
+                assert response.headers["Content-Type"].startswith("text/plain")
+    finally:
+        endpoint.stop()
+
+
+def test_accept_negotiation_uses_q_values():
+    from coin_quant.shared.monitoring import _prefers_prometheus
+
+    assert _prefers_prometheus("application/openmetrics-text;version=1.0.0;q=0.5,"
+                               "text/plain;version=0.0.4;q=0.4,*/*;q=0.1")
+    assert _prefers_prometheus("text/plain")
+    assert not _prefers_prometheus("")
+    assert not _prefers_prometheus("*/*")
+    assert not _prefers_prometheus("text/html,application/xhtml+xml,*/*;q=0.8")
+    assert not _prefers_prometheus("application/json, text/plain, */*")
+    assert not _prefers_prometheus("text/plain;q=0.5, application/json")
+    assert not _prefers_prometheus("text/plain;q=0")
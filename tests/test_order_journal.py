@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the indexed order journal behind StateStore and OrderRouter
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add the repository root to path (legacy shared package)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.order_journal import OrderJournal
+
+
+def _order(n: int, status: str = "NEW", **extra):
+    return {"order_id": f"o{n}", "client_order_id": f"c{n}", "symbol": "BTCUSDT",
+            "status": status, "filled_quantity": 0.0, **extra}
+
+
+def test_last_write_wins_and_checkpoint_bounds_replay(tmp_path):
+    path = tmp_path / "orders.ndjson"
+    # a legacy line written through append_ndjson_atomic (with _metadata)
+    path.write_text(json.dumps({**_order(0), "_metadata": {"producer": "x"}}) + "\n")
+
+    journal = OrderJournal(path, checkpoint_every=4)
+    for n in range(1, 4):
+        journal.append(_order(n))
+    journal.append(_order(1, "PARTIALLY_FILLED", filled_quantity=0.5))
+    journal.append(_order(1, "FILLED", filled_quantity=1.0))
+    journal.append(_order(2, "CANCELLED"))
+
+    assert journal.get_by_client_id("c1")["status"] == "FILLED"
+    assert journal.get("o0")["_metadata"] == {"producer": "x"}
+    assert journal.get_by_client_id("missing") is None
+    assert set(journal.open_orders()) == {"o0", "o3"}
+    assert journal.stats()["checkpoints"] == 1
+    journal.close()
+
+    reopened = OrderJournal(path, checkpoint_every=4)
+    stats = reopened.stats()
+    assert stats["checkpoint_loaded"] and stats["replayed_lines"] == 3
+    assert set(reopened.open_orders()) == {"o0", "o3"}
+    assert reopened.get_by_client_id("c2")["status"] == "CANCELLED"
+
+    # another writer appends: picked up on the next lookup
+    with open(path, "a") as f:
+        f.write(json.dumps(_order(3, "FILLED")) + "\n")
+    assert reopened.get_by_client_id("c3")["status"] == "FILLED"
+    assert set(reopened.open_orders()) == {"o0"}
+
+
+def test_stale_checkpoint_and_compaction(tmp_path):
+    path = tmp_path / "orders.ndjson"
+    journal = OrderJournal(path, checkpoint_every=0)
+    for n in range(5):
+        journal.append(_order(n))
+        journal.append(_order(n, "FILLED" if n % 2 else "NEW", filled_quantity=1.0))
+    journal.checkpoint()
+    journal.close()
+
+    # the journal was replaced by one with different content: the checkpoint is ignored
+    lines = path.read_text().splitlines()
+    path.write_text("\n".join([json.dumps(_order(9))] + lines[1:]) + "\n")
+    replaced = OrderJournal(path)
+    assert not replaced.stats()["checkpoint_loaded"]
+    assert replaced.get_by_client_id("c9")["status"] == "NEW"
+    replaced.close()
+
+    path.write_text("\n".join(lines) + "\n")
+    journal = OrderJournal(path, checkpoint_every=0)
+    assert journal.compact()
+    assert len(path.read_text().splitlines()) == 5
+    assert set(journal.open_orders()) == {"o0", "o2", "o4"}
+    assert journal.get("o1")["filled_quantity"] == 1.0
+    journal.append(_order(5))
+    journal.close()
+    reopened = OrderJournal(path)
+    assert reopened.stats()["checkpoint_loaded"]
+    assert set(reopened.open_orders()) == {"o0", "o2", "o4", "o5"}
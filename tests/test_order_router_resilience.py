@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the non-blocking retry scheduler in OrderRouterResilience
+"""
+
+import sys
+from pathlib import Path
+
+# Add the repository root to path (legacy shared package)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import requests
+
+from shared.order_router_resilience import OrderRequest, OrderRouterResilience, RetryConfig
+
+
+class FakeExchange:
+    """new_order/get_order client whose first sends time out after reaching the book"""
+
+    def __init__(self, timeouts=1, accepted_on_timeout=True):
+        self.timeouts = timeouts
+        self.accepted_on_timeout = accepted_on_timeout
+        self.book = {}
+        self.sent = []
+        self.queried = []
+
+    def new_order(self, symbol, side, type, quantity, price, newClientOrderId):
+        self.sent.append(newClientOrderId)
+        if self.timeouts:
+            self.timeouts -= 1
+            if self.accepted_on_timeout:
+                self.book[newClientOrderId] = {"orderId": len(self.sent), "symbol": symbol}
+            raise requests.exceptions.Timeout("read timed out")
+        self.book[newClientOrderId] = {"orderId": len(self.sent), "symbol": symbol}
+        return self.book[newClientOrderId]
+
+    def get_order(self, symbol, origClientOrderId):
+        self.queried.append(origClientOrderId)
+        if origClientOrderId not in self.book:
+            raise Exception("APIError(code=-2013): Order does not exist.")
+        return self.book[origClientOrderId]
+
+
+def _router(clock, **config):
+    return OrderRouterResilience(RetryConfig(jitter=False, **config), clock=lambda: clock[0],
+                                 sleep=lambda s: clock.__setitem__(0, clock[0] + s))
+
+
+def _order(coid):
+    return OrderRequest(symbol="BTCUSDT", side="BUY", qty=0.001, price=65000.0, client_order_id=coid)
+
+
+def test_timeout_resolved_by_query_without_resubmit():
+    clock = [0.0]
+    router = _router(clock)
+    exchange = FakeExchange(timeouts=1, accepted_on_timeout=True)
+    routed = router.submit_order(_order("a1"), exchange)
+    assert not routed.done and router.pending_count() == 1  # returned without sleeping
+
+    # another order goes through while a1 waits for its retry
+    other = FakeExchange(timeouts=0)
+    assert router.submit_order(_order("b1"), other).response.success
+
+    assert router.poll() == 0
+    clock[0] = 1.0
+    assert router.poll() == 1
+    assert routed.done and routed.response.success and routed.response.order_id == 1
+    assert exchange.sent == ["a1"] and exchange.queried == ["a1"]
+    assert router.stats["resolved_by_query"] == 1
+
+
+def test_not_found_resubmits_and_route_order_waits_for_its_own_order():
+    clock = [0.0]
+    router = _router(clock)
+    exchange = FakeExchange(timeouts=2, accepted_on_timeout=False)
+    response, attempts = router.route_order(_order("c1"), exchange)
+    assert response.success and len(attempts) == 2
+    assert exchange.sent == ["c1", "c1", "c1"] and exchange.queried == ["c1", "c1"]
+    assert clock[0] == 3.0  # 1 s + 2 s backoff on the injected clock
+
+
+def test_retry_budget_stops_retry_storm():
+    clock = [0.0]
+    router = _router(clock, budget_max_tokens=2.0, budget_ratio=0.0, budget_min_per_sec=0.0)
+    exchange = FakeExchange(timeouts=100, accepted_on_timeout=False)
+    routed = [router.submit_order(_order(f"d{n}"), exchange) for n in range(5)]
+    assert router.pending_count() == 2
+    done = [r for r in routed if r.done]
+    assert len(done) == 3 and all(r.unknown for r in done)
+    assert router.get_stats()["retry_budgets"]["new_order"]["denied"] == 3
+
+
+def test_http_5xx_is_ambiguous_and_reads_retry_after():
+    response = requests.Response()
+    response.status_code = 503
+    response.headers["Retry-After"] = "7"
+    assert not response  # falsy for 4xx/5xx: must not hide the status
+    error = requests.exceptions.HTTPError("503 Service Unavailable", response=response)
+
+    result = OrderRouterResilience._response_for_exception(error)
+    assert result.error_code == "HTTP_503" and result.http_status == 503 and result.retry_after == 7
+    assert OrderRouterResilience._is_ambiguous(result)
+    assert _router([0.0])._analyze_error(result) == (True, 7)
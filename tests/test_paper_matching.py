@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the deterministic PAPER matching engine
+"""
+
+import sys
+from pathlib import Path
+
+# Add the repository root to path (legacy shared package)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from shared.paper_matching import FeeSchedule, PaperMatchingEngine, PaperOrder
+
+
+def _book(engine, ts, bids=((99.0, 2.0), (98.0, 5.0)), asks=((101.0, 1.0), (102.0, 3.0))):
+    return engine.on_book("BTCUSDT", ts, bids, asks)
+
+
+def test_market_order_walks_depth_after_latency():
+    engine = PaperMatchingEngine(latency_ms=100, fee_schedule=FeeSchedule([(0, 2.0, 5.0)]))
+    _book(engine, 0.0)
+    order = engine.submit(PaperOrder("m1", "BTCUSDT", "BUY", "MARKET", 3.0), ts=0.0)
+    assert order.status == "PENDING"
+
+    # the book moves before the order arrives: it fills against the new depth
+    assert _book(engine, 0.05, asks=((101.5, 2.0), (103.0, 10.0))) == []
+    fills = engine.advance(0.2)
+    assert [(f.qty, f.price, f.liquidity) for f in fills] == [(2.0, 101.5, "TAKER"), (1.0, 103.0, "TAKER")]
+    assert order.status == "FILLED" and order.avg_price == pytest.approx(102.0)
+    assert order.fees == pytest.approx(306.0 * 5.0 / 10000)
+
+    # depth already taken is not available to the next order until a new snapshot
+    fok = engine.submit(PaperOrder("f1", "BTCUSDT", "BUY", "LIMIT", 10.0, price=103.0,
+                                   time_in_force="FOK"), ts=0.2)
+    assert engine.advance(0.4) == [] and fok.status == "EXPIRED"
+    stats = engine.stats()["BTCUSDT"]
+    assert stats["slippage_bps"] == pytest.approx((102.0 - 100.0) / 100.0 * 10000)
+    assert stats["unfilled_qty"] == 10.0
+
+
+def test_resting_limit_order_waits_for_its_queue():
+    engine = PaperMatchingEngine(latency_ms=0)
+    _book(engine, 0.0)
+    order = engine.submit(PaperOrder("l1", "BTCUSDT", "BUY", "LIMIT", 1.0, price=99.0), ts=0.0)
+    engine.advance(0.0)
+    assert order.status == "NEW" and order.queue_ahead == 2.0
+
+    assert engine.on_trade("BTCUSDT", 1.0, 99.0, 1.5, "SELL") == []
+    assert order.queue_ahead == 0.5
+    _book(engine, 2.0, bids=((99.0, 0.3),))  # level shrank below our queue position
+    assert order.queue_ahead == 0.3
+    fills = engine.on_trade("BTCUSDT", 3.0, 99.0, 0.8, "SELL")
+    assert [(f.qty, f.liquidity) for f in fills] == [(pytest.approx(0.5), "MAKER")]
+    fills = engine.on_trade("BTCUSDT", 4.0, 98.5, 5.0, "SELL")  # trades through the price
+    assert fills[0].price == 99.0 and order.status == "FILLED"
+    assert engine.stats()["BTCUSDT"]["maker_ratio"] == 1.0
+
+
+def test_replay_is_deterministic_for_a_seed():
+    events = [{"type": "book", "symbol": "BTCUSDT", "ts": t / 10, "bids": [[99.0 + t, 1.0]],
+               "asks": [[100.0 + t, 0.5], [100.5 + t, 1.0]]} for t in range(20)]
+
+    def run(seed):
+        engine = PaperMatchingEngine(latency_ms=50, latency_jitter_ms=300, seed=seed)
+        orders = [(t / 10, PaperOrder(f"o{t}", "BTCUSDT", "BUY", "MARKET", 0.7)) for t in range(0, 18, 3)]
+        return [(f.client_order_id, f.qty, f.price) for f in engine.replay(events, orders)]
+
+    assert run(7) == run(7)
+    assert len(run(7)) >= 6
+
+
+def test_limit_orders_match_last_price_without_depth():
+    engine = PaperMatchingEngine(latency_ms=0, no_depth_slippage_bps=10)
+    engine.on_price("BTCUSDT", 0.0, 65000.0)
+
+    # marketable GTC limit (health.json fallback, no book): takes at last + slippage
+    buy = engine.submit(PaperOrder("p1", "BTCUSDT", "BUY", "LIMIT", 1.0, price=70000.0), ts=0.0)
+    fills = engine.advance(0.0)
+    assert buy.status == "FILLED" and fills[0].liquidity == "TAKER"
+    assert fills[0].price == pytest.approx(65000.0 * 1.001)
+
+    # a resting limit fills once the last price reaches it
+    sell = engine.submit(PaperOrder("p2", "BTCUSDT", "SELL", "LIMIT", 1.0, price=66000.0), ts=0.0)
+    assert engine.advance(0.0) == [] and sell.status == "NEW"
+    assert engine.on_price("BTCUSDT", 1.0, 65500.0) == []
+    fills = engine.on_event({"symbol": "BTCUSDT", "ts": 2.0, "last_price": 66100.0,
+                             "orderbook": {"bids": [], "asks": []}})  # STALE_NO_OB snapshot
+    assert [(f.price, f.liquidity) for f in fills] == [(66000.0, "MAKER")]
+    assert sell.status == "FILLED" and engine.open_orders() == []
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched PositionOracle reconciliation
+"""
+
+import json
+import os
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+# Add the repository root to path (legacy shared package)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.position_oracle import PositionOracle
+
+
+def _write_position(path: Path, qty: float, ts: float, avg_price: float = 100.0):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"qty": qty, "avg_price": avg_price, "timestamp": ts}))
+
+
+def test_reconcile_diffs_all_symbols_in_one_call(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+
+    def fetch_account():
+        calls.append(1)
+        return {"updateTime": 1, "balances": [
+            {"asset": "BTC", "free": "0.5", "locked": "0.1"},
+            {"asset": "ETH", "free": "2", "locked": "0"},
+            {"asset": "USDT", "free": "1000", "locked": "0"},
+            {"asset": "BNB", "free": "0", "locked": "0"},
+        ]}
+
+    stale = time.time() - 3600
+    _write_position(tmp_path / "shared_data/positions/btcusdt_position.json", 0.6, stale)
+    _write_position(tmp_path / "shared_data/positions/ETHUSDT_position.json", 1.5, stale)
+    _write_position(tmp_path / "shared_data/solusdt_position.json", 3.0, stale)
+
+    oracle = PositionOracle(fetch_account=fetch_account)
+    assert oracle.reconcile()
+    assert len(calls) == 1
+
+    version, positions = oracle.get_positions()
+    assert set(positions) == {"BTCUSDT", "ETHUSDT", "SOLUSDT"}
+    assert positions["BTCUSDT"].source == "exchange" and positions["BTCUSDT"].qty == Decimal("0.6")
+    assert positions["BTCUSDT"].entry == Decimal("100.0")  # entry price carried from the local file
+    assert positions["SOLUSDT"].source == "local"
+
+    metrics = oracle.get_drift_metrics()
+    assert metrics["drift"] == {"ETHUSDT": 0.5, "SOLUSDT": -3.0}
+    assert metrics["drift_symbols"] == 2 and metrics["max_abs_drift"] == 3.0
+    assert metrics["reconciles"] == 1 and metrics["local_files_parsed"] == 3
+
+    # a user data stream update closes the ETH drift without another account call
+    oracle.on_account_update({"e": "outboundAccountPosition", "u": 2,
+                              "B": [{"a": "ETH", "f": "1.5", "l": "0"}]})
+    assert oracle.get_positions()[0] > version
+    assert oracle.get_drift_metrics()["drift"] == {"SOLUSDT": -3.0}
+    assert len(calls) == 1
+
+
+def test_local_lookup_precedence_and_change_detection(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    oracle = PositionOracle(fetch_account=lambda: {"balances": []})
+    oracle.LOCAL_SCAN_INTERVAL = 0.0
+    now = time.time()
+    _write_position(tmp_path / "shared_data/btcusdt_position.json", 1.0, now)
+    assert oracle.get_position("BTCUSDT").qty == Decimal("1.0")
+
+    upper = tmp_path / "shared_data/positions/BTCUSDT_position.json"
+    _write_position(upper, -2.0, now)
+    assert oracle.get_position("btcusdt").side == "SHORT"
+    parsed = oracle.metrics["local_files_parsed"]
+    for _ in range(5):
+        oracle.get_position("BTCUSDT")
+    assert oracle.metrics["local_files_parsed"] == parsed  # unchanged files are not re-read
+
+    _write_position(upper, 3.0, now)
+    os.utime(upper, ns=(1, 1))
+    assert oracle.get_position("BTCUSDT").qty == Decimal("3.0")
+    assert oracle.get_position("ETHUSDT").side == "FLAT"
+
+
+def test_last_fill_price_reads_the_tail(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    trades = tmp_path / "shared_data/trades/btcusdt_trades.jsonl"
+    trades.parent.mkdir(parents=True)
+    trades.write_text("".join(json.dumps({"price": 100 + n, "pad": "x" * 500}) + "\n" for n in range(50)))
+    oracle = PositionOracle(fetch_account=lambda: {})
+    assert oracle.get_last_fill_price("BTCUSDT") == Decimal("149")
+    with open(trades, "a") as f:
+        f.write(json.dumps({"price": 200.5}) + "\n")
+    assert oracle.get_last_fill_price("BTCUSDT") == Decimal("200.5")
+    assert oracle.get_last_fill_price("ETHUSDT") is None
+
+
+def test_spot_dust_and_fee_assets_are_not_positions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _write_position(tmp_path / "shared_data/positions/ethusdt_position.json", 0.01, time.time(), 3000.0)
+    trades = tmp_path / "shared_data/trades/dogeusdt_trades.jsonl"
+    trades.parent.mkdir(parents=True)
+    trades.write_text(json.dumps({"price": 0.1}) + "\n")
+
+    oracle = PositionOracle(fetch_account=lambda: {"balances": [
+        {"asset": "BNB", "free": "0.2", "locked": "0"},      # fee asset, no local position
+        {"asset": "DOGE", "free": "12", "locked": "0"},      # 1.2 USDT: dust
+        {"asset": "ETH", "free": "0.01", "locked": "0"},     # 30 USDT
+        {"asset": "XRP", "free": "3", "locked": "0"},        # never traded, no price: dropped
+    ]})
+    assert oracle.reconcile()
+    assert set(oracle._exchange) == {"ETHUSDT"}
+    assert oracle.get_position("XRPUSDT").side == "FLAT"
+
+
+def test_default_account_fetch_follows_testnet(tmp_path, monkeypatch):
+    import shared.binance_api_client as api_client
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("BINANCE_USE_TESTNET", "false")
+    monkeypatch.setenv("BINANCE_MODE", "SPOT")
+    seen = []
+
+    class Client:
+        def __init__(self, config=None):
+            seen.append(config.base_url)
+
+        def get_account(self):
+            return {"balances": []}
+
+    monkeypatch.setattr(api_client, "BinanceAPIClient", Client)
+    assert PositionOracle(testnet=True).reconcile()
+    assert seen == ["https://testnet.binance.vision"]
+
+
+def test_reconcile_loop_needs_credentials(tmp_path, monkeypatch):
+    import shared.position_oracle as position_oracle
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("BINANCE_API_KEY", raising=False)
+    monkeypatch.delenv("BINANCE_API_SECRET", raising=False)
+    monkeypatch.delenv("BINANCE_SECRET_KEY", raising=False)
+    monkeypatch.setattr(position_oracle, "_position_oracle", None)
+    oracle = position_oracle.get_position_oracle()
+    assert not oracle.has_credentials()
+    assert oracle._thread is None  # no reconcile attempts (and failures) every POS_TTL
+    assert oracle.get_position("BTCUSDT").side == "FLAT"
+
+    assert PositionOracle(fetch_account=lambda: {}).has_credentials()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared-memory price board
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+
+from coin_quant.shared.price_board import (HEADER_SIZE, SLOT_SIZE, PriceBoardReader,
+                                           PriceBoardWriter, slot_dtype)
+
+
+@pytest.fixture
+def board_name(request):
+    return f"cqtest_{os.getpid()}_{request.node.name[-20:]}"
+
+
+def test_publish_snapshot_and_slot_reuse(board_name, tmp_path):
+    assert slot_dtype().itemsize == SLOT_SIZE
+    writer = PriceBoardWriter(board_name, capacity=3)
+    reader = PriceBoardReader(board_name, data_dir=tmp_path)
+    try:
+        assert writer.publish("BTCUSDT", 65000.5, bid=65000.0, ask=65001.0, volume=12.5,
+                              change=1.5, event_time=1_792_358_000_123)
+        assert writer.publish("ETHUSDT", 3200.0)
+        assert writer.publish("BTCUSDT", 65002.0, bid=65001.5, ask=65002.5)
+        ticks = reader.snapshot()
+        assert set(ticks) == {"BTCUSDT", "ETHUSDT"}
+        btc = ticks["BTCUSDT"]
+        assert (btc["price"], btc["bid"], btc["ask"], btc["source"]) == (65002.0, 65001.5, 65002.5, "shm")
+        assert btc["seq"] == 3
+        assert ticks["ETHUSDT"]["bid"] is None
+        assert reader.get("ETHUSDT")["price"] == 3200.0
+
+        writer.publish("SOLUSDT", 150.0)
+        assert not writer.publish("XRPUSDT", 0.5)
+        writer.remove(["ETHUSDT"])
+        assert reader.get("ETHUSDT") is None
+        # a freed slot is reused, and get() re-locates moved symbols
+        assert writer.publish("XRPUSDT", 0.5)
+        assert reader.get("XRPUSDT")["price"] == 0.5
+        assert set(reader.prices()) == {"BTCUSDT", "SOLUSDT", "XRPUSDT"}
+        assert writer.stats()["full_drops"] == 1
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_torn_slots_and_dead_writer_fall_back_to_files(board_name, tmp_path):
+    (tmp_path / "feeder_snapshot.json").write_text(json.dumps({"symbol_data": {
+        "BTCUSDT": {"symbol": "BTCUSDT", "price": 64000.0, "volume": 1.0, "change": 0.5,
+                    "timestamp": 1, "received_at": 2.0,
+                    "book": {"bids": [[63999.0, 1.0]], "asks": [[64001.0, 2.0]]}},
+    }}))
+    writer = PriceBoardWriter(board_name, capacity=4)
+    reader = PriceBoardReader(board_name, data_dir=tmp_path, stale_after=5.0, attach_interval=0.0)
+    try:
+        writer.publish("BTCUSDT", 65000.0)
+        writer.publish("ETHUSDT", 3200.0)
+        # a write in progress (odd counter) is never returned
+        slot = writer.index["ETHUSDT"]
+        seq_offset = HEADER_SIZE + slot * SLOT_SIZE
+        writer.buf[seq_offset] += 1
+        assert set(reader.snapshot()) == {"BTCUSDT"}
+        assert reader.get("ETHUSDT") is None
+        assert reader.stats()["torn_dropped"] == 2
+        writer.buf[seq_offset] -= 1
+        assert reader.get("ETHUSDT")["price"] == 3200.0
+
+        # heartbeat older than stale_after: the writer is presumed dead
+        writer.heartbeat(time.time() - 60)
+        assert not reader.alive()
+        fallback = reader.snapshot()
+        assert fallback["BTCUSDT"]["source"] == "file"
+        assert (fallback["BTCUSDT"]["bid"], fallback["BTCUSDT"]["ask"]) == (63999.0, 64001.0)
+        writer.heartbeat()
+        assert reader.get("BTCUSDT")["source"] == "shm"
+    finally:
+        writer.close()
+    # closed writer: heartbeat zeroed and the segment unlinked
+    assert not reader.alive()
+    assert reader.get("BTCUSDT")["price"] == 64000.0
+    assert PriceBoardReader(board_name, fallback=False).snapshot() == {}
+    reader.close()
+
+
+def test_reader_process_exit_keeps_segment(board_name, tmp_path):
+    writer = PriceBoardWriter(board_name, capacity=8)
+    try:
+        writer.publish("BTCUSDT", 65000.0)
+        code = (
+            "import sys; sys.path.insert(0, sys.argv[1]);"
+            "from coin_quant.shared.price_board import PriceBoardReader;"
+            "r = PriceBoardReader(sys.argv[2], fallback=False);"
+            "print(r.get('BTCUSDT')['price'])"
+        )
+        src = str(Path(__file__).parent.parent / "src")
+        out = subprocess.run([sys.executable, "-c", code, src, board_name],
+                             capture_output=True, text=True, timeout=60)
+        assert out.stdout.strip() == "65000.0", out.stderr
+        # the reader's resource tracker must not have unlinked the segment
+        reader = PriceBoardReader(board_name, fallback=False)
+        assert reader.get("BTCUSDT")["price"] == 65000.0
+        reader.close()
+    finally:
+        writer.close()
+
+
+def test_reader_defaults_come_from_config_manager(monkeypatch):
+    from coin_quant.shared import price_board
+    from coin_quant.shared.config import config_manager
+
+    settings = {"PRICE_BOARD_NAME": "cq_from_ssot", "PRICE_BOARD_STALE_SEC": "7.5"}
+    monkeypatch.setattr(config_manager, "get", lambda key, default=None: settings.get(key, default))
+    monkeypatch.setenv("PRICE_BOARD_NAME", "cq_from_env")
+
+    assert price_board.board_name() == "cq_from_ssot"
+    reader = PriceBoardReader(fallback=False)
+    assert reader.name == "cq_from_ssot"
+    assert reader.stale_after == 7.5
+    reader.close()
+
+
+def test_ares_reads_ticks_from_the_board(board_name, tmp_path):
+    import logging
+
+    from coin_quant.ares.service import ARESService
+
+    snapshot = tmp_path / "feeder_snapshot.json"
+    snapshot.write_text(json.dumps({"symbol_data": {
+        "BTCUSDT": {"price": 64000.0, "change": 0.5, "book": {"bids": [[63999.0, 1.0]]}}}}))
+    ares = ARESService.__new__(ARESService)
+    ares.logger = logging.getLogger("test_price_board")
+    ares.feeder_snapshot_file = snapshot
+    ares.price_board = PriceBoardReader(board_name, data_dir=tmp_path, fallback=False)
+    ares._snapshot_entries = None
+
+    # no board yet: the snapshot file
+    assert ares._load_feeder_data()["BTCUSDT"]["price"] == 64000.0
+
+    writer = PriceBoardWriter(board_name, capacity=4)
+    try:
+        ares.price_board._last_attach = 0.0
+        writer.publish("BTCUSDT", 65000.0, change=1.5)
+        ticks = ares._load_feeder_data()
+        assert ticks["BTCUSDT"]["price"] == 65000.0 and ticks["BTCUSDT"]["source"] == "shm"
+        assert ares._snapshot_entries is None  # the file is only read for a signal's book/trace
+        assert ares._snapshot_entry("BTCUSDT")["book"]["bids"] == [[63999.0, 1.0]]
+    finally:
+        ares.price_board.close()
+        writer.close()
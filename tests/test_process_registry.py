@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared process registry, sampler and leak ring buffer
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pytest
+
+from coin_quant.shared.process_registry import (ProcessRegistry, ProcessSampler,
+                                                ResourceSeries)
+from coin_quant.shared.singleton import SingletonGuard
+
+
+def test_ring_buffer_slope_matches_full_fit_after_wraparound():
+    rng = np.random.default_rng(5)
+    series = ResourceSeries(capacity=16)
+    ts = 1_700_000_000 + np.cumsum(rng.uniform(5, 15, 200))
+    rss = 300 + np.cumsum(rng.normal(0.5, 2.0, 200))
+    for i in range(200):
+        series.append(ts[i], rss[i])
+        window = slice(max(0, i - 15), i + 1)
+        if i >= 1:
+            expected = np.polyfit(ts[window], rss[window], 1)[0] * 60
+            assert series.slope_mb_per_min() == pytest.approx(expected, rel=1e-6, abs=1e-4)
+        diffs = np.diff(rss[window])
+        assert series.is_monotonic() == bool(np.all(diffs >= 0))
+    assert len(series) == 16
+    assert series.growth_mb() == pytest.approx(rss[-1] - rss[-16])
+    assert [s[0] for s in series.samples()] == pytest.approx(list(ts[-16:]))
+
+
+def test_registry_lookup_validates_identity(tmp_path):
+    registry = ProcessRegistry(tmp_path)
+    entry = registry.register("feeder")
+    assert entry.pid == os.getpid()
+    assert registry.get_pid("feeder") == os.getpid()
+    assert registry.lookup("ares") is None
+
+    # a recycled PID (different create time) is not the registered service
+    stale = dict(entry.to_dict(), create_time=entry.create_time - 3600)
+    (tmp_path / "feeder.json").write_text(json.dumps(stale))
+    assert registry.lookup("feeder") is None
+    assert registry.lookup("feeder", validate=False).pid == os.getpid()
+
+    # exited process
+    child = subprocess.Popen([sys.executable, "-c", "pass"])
+    child.wait()
+    registry.register("trader", child.pid)
+    assert "trader" not in registry.entries()
+
+    assert not registry.unregister("feeder", pid=child.pid)
+    assert registry.unregister("feeder")
+    assert registry.lookup("feeder", validate=False) is None
+
+
+def test_singleton_guard_registers_and_sampler_reads_only_registered(tmp_path, monkeypatch):
+    registry = ProcessRegistry(tmp_path / "processes")
+    monkeypatch.setattr("coin_quant.shared.singleton.process_registry", registry)
+    guard = SingletonGuard("ares", data_dir=tmp_path)
+    assert guard.acquire()
+    try:
+        sampler = ProcessSampler(registry, capacity=8)
+        first = sampler.sample()
+        assert list(first) == ["ares"]
+        assert first["ares"]["pid"] == os.getpid() and first["ares"]["rss_mb"] > 0
+        assert sampler.sample(max_age=60) == first
+        sampler.sample()
+        assert len(sampler.series["ares"]) == 2
+    finally:
+        guard.release()
+    assert registry.lookup("ares") is None
+    assert sampler.sample() == {} and sampler.series == {}
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for the sampling profiler control surface and dumps
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from coin_quant.shared.profiling import ServiceProfiler, export_profiles
+
+
+def _busy(stop: threading.Event):
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+def test_control_file_enables_sampling_and_dumps():
+    """Control file toggles the sampler; dumps are flamegraph-compatible"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        control = tmp / "controls" / "profiling.json"
+        control.parent.mkdir()
+        control.write_text(json.dumps({"enabled": True, "services": ["feeder"], "interval_ms": 2}))
+
+        profiler = ServiceProfiler("feeder", profiles_dir=tmp / "profiles", control_path=control)
+        other = ServiceProfiler("trader", profiles_dir=tmp / "profiles", control_path=control)
+        assert not other.is_enabled()
+
+        stop = threading.Event()
+        worker = threading.Thread(target=_busy, args=(stop,))
+        worker.start()
+        try:
+            profiler.poll()
+            assert profiler.sampler is not None
+            time.sleep(0.3)
+        finally:
+            stop.set()
+            worker.join()
+
+        control.write_text(json.dumps({"enabled": False}))
+        profiler.poll()
+        assert profiler.sampler is None
+
+        folded = (tmp / "profiles" / "feeder.folded").read_text().splitlines()
+        assert folded and all(line.rsplit(" ", 1)[1].isdigit() for line in folded)
+        top = json.loads((tmp / "profiles" / "feeder_top.json").read_text())
+        assert top["samples"] > 0
+        assert any("_busy" in row["function"] for row in top["top"]["inclusive"])
+
+        bundle = tmp / "bundle"
+        assert sorted(export_profiles(bundle, tmp / "profiles")) == ["feeder.folded", "feeder_top.json"]
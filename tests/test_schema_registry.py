@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled schema registry
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add the repository root to path (legacy shared package)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from shared.schema_registry import SchemaError, SchemaRegistry, compile_schema
+
+
+def test_compiled_validator_reports_first_error():
+    validate = compile_schema({
+        "type": "object",
+        "required": ["ts", "side"],
+        "properties": {
+            "ts": {"type": "integer", "minimum": 1},
+            "side": {"enum": ["BUY", "SELL"]},
+            "fills": {"type": "array", "items": {"type": "object", "required": ["qty"],
+                                                  "properties": {"qty": {"type": "number"}}}},
+        },
+    })
+    assert validate({"ts": 5, "side": "BUY", "fills": [{"qty": 1.5}]}) is None
+    assert validate({"ts": 5}) == "missing required field: side"
+    assert validate({"ts": True, "side": "BUY"}) == "ts: must be integer, got bool"
+    assert validate({"ts": 5.0, "side": "BUY"}) is None  # jsonschema: 5.0 is an integer
+    assert validate({"ts": 5.5, "side": "BUY"}) == "ts: must be integer, got float"
+    assert validate({"ts": 0, "side": "BUY"}) == "ts: 0 is less than the minimum 1"
+    assert validate({"ts": 5, "side": "HOLD"}) == "side: must be one of ['BUY', 'SELL'], got 'HOLD'"
+    assert validate({"ts": 5, "side": "BUY", "fills": [{"qty": "1"}]}) == "fills[].qty: must be number, got str"
+    with pytest.raises(SchemaError):
+        compile_schema({"type": "decimal"})
+
+
+def test_watched_file_and_modes(tmp_path):
+    path = tmp_path / "trade_schema.json"
+    registry = SchemaRegistry(mode="strict", check_interval=0.0)
+    registry.register("trade", path=path)
+    assert registry.validate("trade", {}) == (False, f"schema file not found: {path}")
+
+    path.write_text(json.dumps({"type": "object", "required": ["qty"]}))
+    assert registry.validate("trade", {"qty": 1}) == (True, None)
+    path.write_text(json.dumps({"type": "object", "required": ["qty", "price"]}))
+    os.utime(path, ns=(1, 1))  # a different mtime even on coarse clocks
+    assert registry.validate("trade", {"qty": 1}) == (False, "missing required field: price")
+    assert registry.stats()["schemas"]["trade"]["reloads"] == 2
+
+    registry.set_mode("sampled", sample_every=10)
+    results = [registry.check("trade", {"qty": 1})[0] for _ in range(30)]
+    assert results.count(False) == 3
+    registry.set_mode("off")
+    assert registry.check("trade", {}) == (True, None)
+    assert registry.validate("trade", {})[0] is False  # validate() ignores the mode
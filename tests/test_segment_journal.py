@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the append-only segment journal and the auditable signal manager on top of it
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add the repository root to path (legacy shared package)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.segment_journal import SegmentJournal
+
+
+def test_rotation_lookup_recent_and_since(tmp_path):
+    journal = SegmentJournal(tmp_path, prefix="orders", max_segment_bytes=200)
+    for i in range(20):
+        journal.append(f"id{i % 5}", {"n": i}, ts=1000.0 + i)
+    stats = journal.stats()
+    assert stats["segments"] > 2 and stats["rotations"] == stats["segments"] - 1
+    assert sorted(p.suffix for p in tmp_path.iterdir()).count(".idx") == stats["segments"] - 1
+
+    # last write wins
+    assert journal.get("id0") == {"n": 15}
+    assert journal.get("missing") is None
+    assert [rec["n"] for _, _, rec in journal.recent(3)] == [19, 18, 17]
+    assert [rec["n"] for _, _, rec in journal.since(1012.0)] == list(range(12, 20))
+    journal.close()
+
+    # a fresh instance only scans the active segment; sealed indexes load on a miss
+    reopened = SegmentJournal(tmp_path, prefix="orders", max_segment_bytes=200)
+    assert reopened.get("id4") == {"n": 19}
+    assert reopened.get("id1") == {"n": 16}
+    assert len(reopened.recent(100)) == 20
+    assert reopened.stats()["index_loads"] >= 1
+
+
+def test_partial_trailing_line_is_cut_and_retention(tmp_path):
+    journal = SegmentJournal(tmp_path, prefix="audit", max_segment_bytes=300, max_segments=2)
+    for i in range(30):
+        journal.append(f"r{i}", {"n": i}, ts=float(i))
+    journal.close()
+    assert len(list(tmp_path.glob("audit_*.ndjson"))) == 2
+    assert journal.get("r0") is None
+
+    active = sorted(tmp_path.glob("audit_*.ndjson"))[-1]
+    with open(active, "ab") as f:
+        f.write(b'{"id":"torn","ts":31.0,"rec":{"n"')
+    reopened = SegmentJournal(tmp_path, prefix="audit", max_segment_bytes=300, max_segments=2)
+    assert reopened.stats()["truncated_bytes"] > 0
+    assert active.read_bytes().endswith(b"\n")
+    reopened.append("r30", {"n": 30}, ts=30.0)
+    assert reopened.get("r30") == {"n": 30}
+    assert reopened.recent(1)[0][2] == {"n": 30}
+
+
+def test_auditable_manager_journals_records(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from shared.auditable_signal_manager import AuditableSignalManager
+
+    manager = AuditableSignalManager()
+    signal = manager.record_signal("BTCUSDT", "BUY", 0.8, 5.0, 0.75, "trend", 65000.0, 100.0, "abc")
+    order = manager.record_order_intent(signal, 0.001, 65000.0)
+    assert manager.update_order_status(order.client_order_id, "FILLED")
+
+    assert manager._load_order_record(order.client_order_id).status == "FILLED"
+    recent = manager.get_recent_orders()
+    assert [o.status for o in recent] == ["FILLED"]
+    assert manager.get_recent_signals()[0].signal_id == signal.signal_id
+    actions = [e["action"] for e in manager.get_audit_log(since=0)]
+    assert actions == ["SIGNAL_RECORDED", "ORDER_INTENT_RECORDED", "ORDER_STATUS_UPDATED"]
+    # no per-record files and no rewritten daily audit array
+    for name in ("signals_outbox", "order_intents", "audit_logs"):
+        assert not list((tmp_path / "shared_data" / name).glob("*.json"))
+    lines = (tmp_path / "shared_data/audit_logs/audit_00000001.ndjson").read_text().splitlines()
+    assert json.loads(lines[-1])["rec"]["action"] == "ORDER_STATUS_UPDATED"
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for pipeline trace propagation and stage breakdown
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from coin_quant.shared.metrics import MetricsRegistry
+from coin_quant.shared.tracing import (STAGE_PAIRS, Tracer, child_trace, format_breakdown,
+                                       get_trace, load_stage_breakdown, new_trace)
+
+
+def test_trace_propagates_across_services():
+    """Each service records its own stage pairs and the exports merge"""
+    with tempfile.TemporaryDirectory() as tmp:
+        traces_dir = Path(tmp)
+        feeder = Tracer("feeder", MetricsRegistry(), traces_dir)
+        ares = Tracer("ares", MetricsRegistry(), traces_dir)
+        trader = Tracer("trader", MetricsRegistry(), traces_dir)
+
+        ms = 1_000_000
+        tick = {"price": 1.0, "trace": new_trace(received_ns=0)}
+        feeder.stamp(tick["trace"], "snapshot", now_ns=2 * ms)
+
+        signal = {"symbol": "BTCUSDT", "trace": child_trace(get_trace(tick))}
+        ares.stamp(signal["trace"], "signal", now_ns=50 * ms)
+        assert "signal" not in tick["trace"]["stamps"], "upstream payload must not be mutated"
+
+        trace = get_trace(signal)
+        trader.stamp(trace, "gate", now_ns=51 * ms)
+        trader.stamp(trace, "submit", now_ns=52 * ms)
+        trader.stamp(trace, "ack", now_ns=80 * ms)
+        # Re-reading the same signal must not double count
+        trader.stamp(trace, "ack", now_ns=999 * ms)
+
+        for tracer in (feeder, ares, trader):
+            assert tracer.flush()
+
+        breakdown = load_stage_breakdown(traces_dir)
+        assert set(breakdown["services"]) == {"feeder", "ares", "trader"}
+        assert [s for s in breakdown["stages"] if "->" in s and not s.startswith("total")] == list(STAGE_PAIRS)
+        assert all(row["count"] == 1 for row in breakdown["stages"].values())
+        assert 25 <= breakdown["stages"]["submit->ack"]["p50_ms"] <= 50
+        assert "ws_receive->snapshot" in format_breakdown(breakdown)
+
+
+def test_untraced_payloads_are_ignored():
+    """Signals without a trace (e.g. older files) pass through untouched"""
+    tracer = Tracer("trader", MetricsRegistry(), Path(tempfile.gettempdir()))
+    assert get_trace({"symbol": "BTCUSDT"}) is None
+    assert tracer.stamp(None, "gate") is None
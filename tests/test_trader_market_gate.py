@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Tests for the trader's spread/slippage gate on the feeder's book estimates
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from coin_quant.shared.time import utc_now_seconds
+from coin_quant.trader.service import TraderService
+
+
+def _trader(enabled):
+    trader = TraderService.__new__(TraderService)
+    trader.logger = logging.getLogger("test_trader_market_gate")
+    trader.market_gate_enabled = enabled
+    trader.max_spread_bps = 8.0
+    trader.max_slippage_bps = 20.0
+    trader.book_max_age = 5.0
+    return trader
+
+
+def _signal(spread_bps, slippage_bps):
+    return {"symbol": "ALTUSDT", "side": "BUY", "market": {
+        "spread_bps": spread_bps, "expected_slippage_bps": slippage_bps,
+        "book_updated_at": utc_now_seconds()}}
+
+
+def test_market_gate_is_opt_in_and_allows_unknown_slippage():
+    # off by default: a wide altcoin spread does not block the order
+    assert _trader(False)._check_market(_signal(35.0, 50.0))
+
+    trader = _trader(True)
+    assert not trader._check_market(_signal(35.0, 5.0))
+    assert not trader._check_market(_signal(2.0, 50.0))
+    assert trader._check_market(_signal(2.0, 5.0))
+    # order larger than the exported depth: unknown cost is not a rejection
+    assert trader._check_market(_signal(2.0, None))